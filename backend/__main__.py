@@ -0,0 +1,196 @@
+"""
+Ponto de entrada de linha de comando do Buscador de Revistas Científicas.
+
+Uso (a partir da raiz do projeto):
+    python -m backend serve [--workers N] [--threads T] [--host H] [--port P]
+    python -m backend dev [--host H] [--port P]
+    python -m backend atualizar-buscas [--todas] [--ids ID ...] [--intervalo MIN]
+
+O comando serve executa a aplicação em um servidor WSGI de produção: o
+Gunicorn com vários processos (workers), cada um com várias threads, ou o
+Waitress (apenas threads) onde o Gunicorn não está disponível, como no
+Windows. O comando dev executa o servidor de desenvolvimento do Flask. O
+comando atualizar-buscas atualiza as buscas salvas vencidas (ver
+core.buscas_salvas), uma vez ou a cada --intervalo minutos, para ser
+agendado (cron, por exemplo) ou mantido em execução.
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+
+DIRETORIO_BACKEND = os.path.dirname(os.path.abspath(__file__))
+
+# Configuração padrão do servidor de produção
+WORKERS_PADRAO = 2
+THREADS_PADRAO = 8
+TEMPO_LIMITE_PADRAO = 120
+
+logger = logging.getLogger('buscador')
+
+def preparar_ambiente():
+    """
+    Torna o diretório backend o diretório de trabalho e o primeiro item do
+    caminho de importação, como ao executar python app.py a partir dele
+    (os caminhos da configuração, como ../dados, são relativos a ele).
+    """
+    os.chdir(DIRETORIO_BACKEND)
+    if DIRETORIO_BACKEND not in sys.path:
+        sys.path.insert(0, DIRETORIO_BACKEND)
+
+def carregar_aplicacao(workers):
+    """
+    Importa e prepara a aplicação para produção.
+    
+    Chamada no processo principal antes da criação dos workers: a
+    configuração, a chave secreta e os módulos já carregados são herdados
+    por todos eles.
+    
+    Args:
+        workers (int): Número de processos que servirão a aplicação
+    
+    Returns:
+        Flask: Aplicação configurada
+    """
+    import app as aplicacao
+    
+    aplicacao.configurar_producao(workers)
+    return aplicacao.app
+
+def iniciar_worker(servidor=None, worker=None):
+    """
+    Inicia as threads de segundo plano de um processo que atende
+    requisições (no Gunicorn, chamada em cada worker após o fork: threads
+    iniciadas no processo principal não passariam aos workers).
+    """
+    from core import aquecimento
+    
+    aquecimento.iniciar()
+
+def servir_gunicorn(host, port, workers, threads, tempo_limite):
+    """
+    Executa a aplicação no Gunicorn (workers gthread, aplicação pré-carregada).
+    
+    Args:
+        host (str): Endereço de escuta
+        port (int): Porta
+        workers (int): Número de processos
+        threads (int): Threads por processo
+        tempo_limite (int): Segundos até um worker sem resposta ser reiniciado
+    """
+    from gunicorn.app.base import BaseApplication
+    
+    class ServidorGunicorn(BaseApplication):
+        """Aplicação Gunicorn configurada pela linha de comando."""
+        
+        def load_config(self):
+            opcoes = {
+                'bind': f"{host}:{port}",
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread',
+                'timeout': tempo_limite,
+                'preload_app': True,
+                'post_fork': iniciar_worker
+            }
+            for nome, valor in opcoes.items():
+                self.cfg.set(nome, valor)
+        
+        def load(self):
+            return carregar_aplicacao(workers)
+    
+    ServidorGunicorn().run()
+
+def servir_waitress(host, port, threads):
+    """
+    Executa a aplicação no Waitress (um processo, várias threads).
+    
+    Args:
+        host (str): Endereço de escuta
+        port (int): Porta
+        threads (int): Número de threads
+    """
+    import waitress
+    
+    aplicacao = carregar_aplicacao(1)
+    iniciar_worker()
+    waitress.serve(aplicacao, host=host, port=port, threads=threads)
+
+def comando_serve(argumentos):
+    """Executa o servidor de produção."""
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        gunicorn = None
+    
+    if gunicorn is not None and os.name != 'nt':
+        servir_gunicorn(argumentos.host, argumentos.port, argumentos.workers,
+                        argumentos.threads, argumentos.timeout)
+        return
+    
+    if argumentos.workers > 1:
+        logger.warning("Gunicorn indisponível: servindo com o Waitress em um único processo")
+    servir_waitress(argumentos.host, argumentos.port, argumentos.threads)
+
+def comando_dev(argumentos):
+    """Executa o servidor de desenvolvimento do Flask."""
+    import app as aplicacao
+    
+    aplicacao.iniciar_servidor(argumentos.host, argumentos.port)
+
+def comando_atualizar_buscas(argumentos):
+    """Atualiza as buscas salvas em lote."""
+    import app  # noqa: F401 (configura o cache, os limites das APIs e os logs)
+    from core import buscas_salvas
+    
+    while True:
+        atualizadas = buscas_salvas.atualizar_todas(
+            somente_pendentes=not argumentos.todas, ids=argumentos.ids
+        )
+        for busca, resultado in atualizadas:
+            if isinstance(resultado, Exception):
+                print(f"{busca['id']}  {busca['nome']}: erro ({resultado})")
+            elif resultado is not None:
+                falhas = [api for api, dados in resultado['apis'].items() if dados.get('erro')]
+                print(f"{busca['id']}  {busca['nome']}: {len(resultado['novos'])} novos"
+                      + (f" (falharam: {', '.join(falhas)})" if falhas else ""))
+        if not atualizadas:
+            print("Nenhuma busca salva a atualizar")
+        
+        if not argumentos.intervalo:
+            return
+        time.sleep(argumentos.intervalo * 60)
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m backend', description="Buscador de Revistas Científicas")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    
+    serve = comandos.add_parser('serve', help="servidor de produção")
+    serve.add_argument('--host', default='0.0.0.0')
+    serve.add_argument('--port', type=int, default=5563)
+    serve.add_argument('--workers', type=int, default=WORKERS_PADRAO, help="processos (Gunicorn)")
+    serve.add_argument('--threads', type=int, default=THREADS_PADRAO, help="threads por processo")
+    serve.add_argument('--timeout', type=int, default=TEMPO_LIMITE_PADRAO,
+                       help="segundos até um worker sem resposta ser reiniciado")
+    serve.set_defaults(executar=comando_serve)
+    
+    dev = comandos.add_parser('dev', help="servidor de desenvolvimento do Flask")
+    dev.add_argument('--host', default='0.0.0.0')
+    dev.add_argument('--port', type=int, default=5563)
+    dev.set_defaults(executar=comando_dev)
+    
+    atualizar = comandos.add_parser('atualizar-buscas', help="atualiza as buscas salvas")
+    atualizar.add_argument('--todas', action='store_true',
+                           help="atualiza todas, não só as vencidas (pela frequência de cada uma)")
+    atualizar.add_argument('--ids', nargs='+', help="atualiza apenas estas buscas")
+    atualizar.add_argument('--intervalo', type=float, default=0,
+                           help="repete a cada N minutos (0 executa uma vez)")
+    atualizar.set_defaults(executar=comando_atualizar_buscas)
+    
+    argumentos = parser.parse_args()
+    preparar_ambiente()
+    argumentos.executar(argumentos)
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,9 @@ Adaptador para a API Crossref.
 Realiza buscas de artigos científicos na base de dados Crossref.
 """
 import logging
-import requests
 from datetime import datetime
 
-from utils import normalizacao
+from utils import normalizacao, conexoes, metricas, rastreamento, revistas as catalogo_revistas
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +20,10 @@ API_PARAMS = {
     "mailto": "contato@buscadorrevistas.com"  # Boa prática para identificação
 }
 
+# O período pode ser filtrado pela data de indexação (from-index-date),
+# usada na atualização incremental das buscas salvas (ver core.buscas_salvas)
+FILTRA_DATA_INDEXACAO = True
+
 def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
     """
     Realiza busca na API Crossref.
@@ -37,38 +40,75 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         list: Lista de resultados normalizados
     """
     try:
-        logger.info(f"Iniciando busca no Crossref: {termos}")
-        
-        # Prepara parâmetros da requisição
-        params = {
-            **API_PARAMS,
-            "query": termos,
-            "rows": min(limite, 100)  # Limita a 100 resultados por requisição
-        }
-        
-        # Adiciona filtro de autor
-        if autor:
-            params["query.author"] = autor
-        
-        # Adiciona filtro de data
-        if data_inicio and data_fim:
-            params["filter"] = f"from-pub-date:{data_inicio},until-pub-date:{data_fim}"
-        
-        # Adiciona filtro de revistas (ISSN)
-        if revistas and len(revistas) > 0:
-            # Mapeia IDs internos para ISSNs
-            # Isso depende de um mapeamento específico que deve ser implementado
-            # Por enquanto, usamos os IDs diretamente como exemplo
-            issn_list = ",".join([f"issn:{r}" for r in revistas])
-            if "filter" in params:
-                params["filter"] += f",{issn_list}"
-            else:
-                params["filter"] = issn_list
-        
-        # Realiza a requisição
-        response = requests.get(BASE_URL, params=params)
+        resultados, _ = buscar_pagina(termos, autor, data_inicio, data_fim, revistas, limite)
+        return resultados
+    
+    except Exception as e:
+        logger.error(f"Erro na busca do Crossref: {str(e)}")
+        metricas.registrar_erro_api('crossref', e)
+        return []
+
+def buscar_pagina(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, cursor=None,
+                  data_indexacao=False):
+    """
+    Busca uma página de resultados na API Crossref (paginação profunda).
+    
+    Args:
+        termos (str): Termos de busca
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        limite (int, opcional): Número máximo de resultados
+        cursor (str, opcional): Cursor devolvido pela página anterior
+        data_indexacao (bool, opcional): Filtra o período pela data de
+            indexação em vez da data de publicação
+    
+    Returns:
+        tuple: (lista de resultados normalizados, cursor da página seguinte
+            ou None se não houver mais resultados)
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
+    """
+    logger.info("Iniciando busca no Crossref: %s", termos)
+    
+    # Prepara parâmetros da requisição
+    params = {
+        **API_PARAMS,
+        "query": termos,
+        "rows": min(limite, 100)  # Limita a 100 resultados por requisição
+    }
+    
+    # Adiciona filtro de autor
+    if autor:
+        params["query.author"] = autor
+    
+    # Adiciona filtro de data
+    if data_inicio and data_fim:
+        campo = 'index' if data_indexacao else 'pub'
+        params["filter"] = f"from-{campo}-date:{data_inicio},until-{campo}-date:{data_fim}"
+    
+    # Adiciona filtro de revistas (ISSN)
+    issns = catalogo_revistas.issns(revistas)
+    if issns:
+        # Mapeia IDs internos para ISSNs pelo catálogo de revistas
+        issn_list = ",".join([f"issn:{issn}" for issn in issns])
+        if "filter" in params:
+            params["filter"] += f",{issn_list}"
+        else:
+            params["filter"] = issn_list
+    
+    # Paginação por cursor ('*' na primeira página), sem o limite de
+    # deslocamento da paginação por offset
+    params["cursor"] = cursor or "*"
+    
+    # Realiza a requisição
+    with rastreamento.span('crossref.http'):
+        response = conexoes.obter('crossref', BASE_URL, params=params)
         response.raise_for_status()
-        
+    
+    with rastreamento.span('crossref.processar') as etapa:
         # Processa a resposta
         data = response.json()
         
@@ -80,13 +120,13 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         
         # Filtra resultados inválidos
         resultados = [r for r in resultados if r.get('titulo')]
-        
-        logger.info(f"Busca no Crossref concluída: {len(resultados)} resultados")
-        return resultados
+        etapa.definir(itens=len(items), resultados=len(resultados))
     
-    except Exception as e:
-        logger.error(f"Erro na busca do Crossref: {str(e)}")
-        return []
+    logger.info("Busca no Crossref concluída: %s resultados", len(resultados))
+    
+    # Uma página incompleta é a última
+    proximo = data.get("message", {}).get("next-cursor") if len(items) >= params["rows"] else None
+    return resultados, proximo
 
 def processar_resultado(item):
     """
@@ -3,10 +3,9 @@ Adaptador para a API OpenAlex.
 Realiza buscas de artigos científicos na base de dados OpenAlex.
 """
 import logging
-import requests
 from datetime import datetime
 
-from utils import normalizacao
+from utils import normalizacao, conexoes, metricas, rastreamento, revistas as catalogo_revistas
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +19,18 @@ API_PARAMS = {
     "mailto": "contato@buscadorrevistas.com"  # Boa prática para identificação
 }
 
+# Resultados por requisição aceitos pela API
+MAX_RESULTADOS = 200
+
+# A busca aceita AND, OR e NOT (em maiúsculas) e parênteses; a busca em
+# lote combina consultas com OR (ver core.lote)
+SUPORTA_OR = True
+
+# O período pode ser filtrado pela data de inclusão na base
+# (from_created_date), usada na atualização incremental das buscas salvas
+# (ver core.buscas_salvas)
+FILTRA_DATA_INDEXACAO = True
+
 def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
     """
     Realiza busca na API OpenAlex.
@@ -36,43 +47,82 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         list: Lista de resultados normalizados
     """
     try:
-        logger.info(f"Iniciando busca no OpenAlex: {termos}")
-        
-        # Prepara filtros
-        filtros = []
-        
-        # Adiciona filtro de data
-        if data_inicio or data_fim:
-            inicio = data_inicio or "1900-01-01"
-            fim = data_fim or datetime.now().strftime("%Y-%m-%d")
+        resultados, _ = buscar_pagina(termos, autor, data_inicio, data_fim, revistas, limite)
+        return resultados
+    
+    except Exception as e:
+        logger.error(f"Erro na busca do OpenAlex: {str(e)}")
+        metricas.registrar_erro_api('openalex', e)
+        return []
+
+def buscar_pagina(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, cursor=None,
+                  data_indexacao=False):
+    """
+    Busca uma página de resultados na API OpenAlex (paginação por cursor).
+    
+    Args:
+        termos (str): Termos de busca
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        limite (int, opcional): Número máximo de resultados
+        cursor (str, opcional): Cursor devolvido pela página anterior
+        data_indexacao (bool, opcional): Filtra o período pela data de
+            indexação em vez da data de publicação
+    
+    Returns:
+        tuple: (lista de resultados normalizados, cursor da página seguinte
+            ou None se não houver mais resultados)
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
+    """
+    logger.info("Iniciando busca no OpenAlex: %s", termos)
+    
+    # Prepara filtros
+    filtros = []
+    
+    # Adiciona filtro de data
+    if data_inicio or data_fim:
+        inicio = data_inicio or "1900-01-01"
+        fim = data_fim or datetime.now().strftime("%Y-%m-%d")
+        if data_indexacao:
+            filtros.append(f"from_created_date:{inicio},to_created_date:{fim}")
+        else:
             filtros.append(f"publication_date:{inicio}:{fim}")
-        
-        # Adiciona filtro de autor
-        if autor:
-            filtros.append(f"author.display_name:\"{autor}\"")
-        
-        # Adiciona filtro de revistas
-        if revistas and len(revistas) > 0:
-            # OpenAlex usa ISSNs para revistas
-            # Isso depende de um mapeamento específico que deve ser implementado
-            # Por enquanto, não aplicamos filtro de revista
-            pass
-        
-        # Prepara parâmetros da requisição
-        params = {
-            **API_PARAMS,
-            "search": termos,
-            "per_page": min(limite, 50)  # Limita a 50 resultados por requisição
-        }
-        
-        # Adiciona filtros
-        if filtros:
-            params["filter"] = ",".join(filtros)
-        
-        # Realiza a requisição
-        response = requests.get(BASE_URL, params=params)
+    
+    # Adiciona filtro de autor
+    if autor:
+        filtros.append(f"author.display_name:\"{autor}\"")
+    
+    # Adiciona filtro de revistas
+    issns = catalogo_revistas.issns(revistas)
+    if issns:
+        # OpenAlex filtra revistas por ISSN (mapeados pelo catálogo de revistas)
+        filtros.append(f"primary_location.source.issn:{'|'.join(issns)}")
+    
+    # Prepara parâmetros da requisição
+    params = {
+        **API_PARAMS,
+        "search": termos,
+        "per_page": min(limite, MAX_RESULTADOS)
+    }
+    
+    # Adiciona filtros
+    if filtros:
+        params["filter"] = ",".join(filtros)
+    
+    # Paginação por cursor ('*' na primeira página), sem o limite de
+    # 10 mil resultados da paginação por número de página
+    params["cursor"] = cursor or "*"
+    
+    # Realiza a requisição
+    with rastreamento.span('openalex.http'):
+        response = conexoes.obter('openalex', BASE_URL, params=params)
         response.raise_for_status()
-        
+    
+    with rastreamento.span('openalex.processar') as etapa:
         # Processa a resposta
         data = response.json()
         
@@ -84,13 +134,12 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         
         # Filtra resultados inválidos
         resultados = [r for r in resultados if r.get('titulo')]
-        
-        logger.info(f"Busca no OpenAlex concluída: {len(resultados)} resultados")
-        return resultados
+        etapa.definir(itens=len(works), resultados=len(resultados))
     
-    except Exception as e:
-        logger.error(f"Erro na busca do OpenAlex: {str(e)}")
-        return []
+    logger.info("Busca no OpenAlex concluída: %s resultados", len(resultados))
+    
+    proximo = data.get("meta", {}).get("next_cursor") if works else None
+    return resultados, proximo
 
 def processar_resultado(work):
     """
@@ -130,12 +179,9 @@ def processar_resultado(work):
             url = f"https://doi.org/{doi}"
         
         # Extrai resumo
-        resumo = work.get("abstract_inverted_index", "")
-        if resumo:
-            # OpenAlex usa um formato especial para resumos
-            # Aqui precisaríamos converter o índice invertido para texto
-            # Por simplicidade, deixamos em branco
-            resumo = ""
+        # OpenAlex usa um índice invertido (palavra -> posições); o texto é
+        # reconstruído no processador, que pode executar em outro processo
+        resumo_indice = work.get("abstract_inverted_index") or None
         
         # Cria o resultado normalizado
         resultado = {
@@ -146,7 +192,8 @@ def processar_resultado(work):
             'data_publicacao': data_publicacao,
             'doi': doi,
             'url': url,
-            'resumo': resumo,
+            'resumo': "",
+            'resumo_indice': resumo_indice,
             'fonte': 'openalex'
         }
         
@@ -3,11 +3,10 @@ Adaptador para a API PubMed.
 Realiza buscas de artigos científicos na base de dados PubMed.
 """
 import logging
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime
 
-from utils import normalizacao
+from utils import normalizacao, conexoes, metricas, rastreamento, revistas as catalogo_revistas
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +24,17 @@ API_PARAMS = {
     "api_key": ""  # Opcional, mas recomendado para mais requisições
 }
 
+# IDs detalhados por requisição ao efetch
+MAX_RESULTADOS = 200
+
+# A busca em lote agrupa as consultas com os mesmos filtros e as resolve
+# com buscar_lote (ver core.lote)
+SUPORTA_OR = True
+
+# O período pode ser filtrado pela data de entrada no PubMed ([Date - Entry]),
+# usada na atualização incremental das buscas salvas (ver core.buscas_salvas)
+FILTRA_DATA_INDEXACAO = True
+
 def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
     """
     Realiza busca na API PubMed.
@@ -41,29 +51,100 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         list: Lista de resultados normalizados
     """
     try:
-        logger.info(f"Iniciando busca no PubMed: {termos}")
-        
-        # Constrói a query para o PubMed
-        query = construir_query(termos, autor, data_inicio, data_fim, revistas)
-        
-        # Realiza a busca para obter IDs
-        ids = buscar_ids(query, limite)
-        
-        if not ids:
-            logger.info("Nenhum resultado encontrado no PubMed")
-            return []
-        
-        # Obtém detalhes dos artigos
-        resultados = obter_detalhes_artigos(ids)
-        
-        logger.info(f"Busca no PubMed concluída: {len(resultados)} resultados")
+        resultados, _ = buscar_pagina(termos, autor, data_inicio, data_fim, revistas, limite)
         return resultados
     
     except Exception as e:
         logger.error(f"Erro na busca do PubMed: {str(e)}")
+        metricas.registrar_erro_api('pubmed', e)
         return []
 
-def construir_query(termos, autor, data_inicio, data_fim, revistas):
+def buscar_pagina(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, cursor=None,
+                  data_indexacao=False):
+    """
+    Busca uma página de resultados na API PubMed (paginação profunda).
+    
+    Args:
+        termos (str): Termos de busca
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        limite (int, opcional): Número máximo de resultados
+        cursor (str, opcional): Cursor devolvido pela página anterior (o
+            retstart da próxima página)
+        data_indexacao (bool, opcional): Filtra o período pela data de
+            entrada no PubMed em vez da data de publicação
+    
+    Returns:
+        tuple: (lista de resultados normalizados, cursor da página seguinte
+            ou None se não houver mais resultados)
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
+    """
+    logger.info("Iniciando busca no PubMed: %s", termos)
+    
+    # Constrói a query para o PubMed
+    query = construir_query(termos, autor, data_inicio, data_fim, revistas, data_indexacao)
+    
+    # Realiza a busca para obter IDs
+    inicio = int(cursor) if cursor else 0
+    ids, total = buscar_ids(query, min(limite, MAX_RESULTADOS), inicio)
+    
+    if not ids:
+        logger.info("Nenhum resultado encontrado no PubMed")
+        return [], None
+    
+    # Obtém detalhes dos artigos
+    resultados = obter_detalhes_artigos(ids)
+    
+    logger.info("Busca no PubMed concluída: %s resultados", len(resultados))
+    
+    proximo = inicio + len(ids) if inicio + len(ids) < total else None
+    return resultados, proximo
+
+def buscar_lote(consultas, autor='', data_inicio=None, data_fim=None, revistas=None):
+    """
+    Realiza várias buscas com os mesmos filtros (busca em lote, ver
+    core.lote): um esearch por consulta, que traz exatamente os artigos
+    que o PubMed associa a ela (inclusive por descritores MeSH), e um único
+    efetch com os artigos de todas.
+    
+    Args:
+        consultas (dict): Termos de busca -> número máximo de resultados
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+    
+    Returns:
+        dict: Termos -> lista de resultados normalizados
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
+    """
+    logger.info("Iniciando busca em lote no PubMed: %s consultas", len(consultas))
+    
+    ids_consultas = {}
+    for termos, limite in consultas.items():
+        query = construir_query(termos, autor, data_inicio, data_fim, revistas)
+        ids_consultas[termos], _ = buscar_ids(query, min(limite, MAX_RESULTADOS))
+    
+    # Cada artigo é detalhado uma vez, mesmo que pertença a várias consultas
+    unicos = list(dict.fromkeys(pmid for ids in ids_consultas.values() for pmid in ids))
+    detalhes = {}
+    for inicio in range(0, len(unicos), MAX_RESULTADOS):
+        for resultado in obter_detalhes_artigos(unicos[inicio:inicio + MAX_RESULTADOS]):
+            detalhes[resultado['id']] = resultado
+    
+    logger.info("Busca em lote no PubMed concluída: %s artigos", len(detalhes))
+    return {
+        termos: [dict(detalhes[f"pubmed-{pmid}"]) for pmid in ids if f"pubmed-{pmid}" in detalhes]
+        for termos, ids in ids_consultas.items()
+    }
+
+def construir_query(termos, autor, data_inicio, data_fim, revistas, data_indexacao=False):
     """
     Constrói a query para a API PubMed.
     
@@ -73,6 +154,7 @@ def construir_query(termos, autor, data_inicio, data_fim, revistas):
         data_inicio (str): Data inicial
         data_fim (str): Data final
         revistas (list): Lista de IDs de revistas
+        data_indexacao (bool, opcional): Filtra pela data de entrada no PubMed
     
     Returns:
         str: Query formatada para o PubMed
@@ -86,53 +168,52 @@ def construir_query(termos, autor, data_inicio, data_fim, revistas):
     
     # Adiciona filtro de data
     if data_inicio and data_fim:
-        query_parts.append(f"{data_inicio}:{data_fim}[Date - Publication]")
+        campo = "Date - Entry" if data_indexacao else "Date - Publication"
+        query_parts.append(f"{data_inicio}:{data_fim}[{campo}]")
     
     # Adiciona filtro de revistas
     if revistas and len(revistas) > 0:
-        # Mapeia IDs internos para ISSNs ou nomes de revistas do PubMed
-        # Isso depende de um mapeamento específico que deve ser implementado
-        # Por enquanto, usamos os IDs diretamente como exemplo
-        revistas_query = " OR ".join([f"{r}[Journal]" for r in revistas])
+        # Mapeia IDs internos para ISSNs pelo catálogo de revistas
+        revistas_query = " OR ".join([f"{issn}[is]" for issn in catalogo_revistas.issns(revistas)])
         if revistas_query:
             query_parts.append(f"({revistas_query})")
     
     # Combina todas as partes com AND
     return " AND ".join(query_parts)
 
-def buscar_ids(query, limite):
+def buscar_ids(query, limite, inicio=0):
     """
     Busca IDs de artigos no PubMed.
     
     Args:
         query (str): Query de busca
         limite (int): Número máximo de resultados
+        inicio (int, opcional): Posição do primeiro ID (retstart)
     
     Returns:
-        list: Lista de IDs de artigos
+        tuple: (lista de IDs de artigos, total de artigos encontrados)
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
     """
     params = {
         **API_PARAMS,
         "term": query,
         "retmax": limite,
+        "retstart": inicio,
         "sort": "relevance"
     }
     
-    try:
-        response = requests.get(ESEARCH_URL, params=params)
+    with rastreamento.span('pubmed.esearch'):
+        response = conexoes.obter('pubmed', ESEARCH_URL, params=params)
         response.raise_for_status()
         
         # Processa a resposta
         data = response.json()
-        
-        # Extrai os IDs
-        ids = data.get("esearchresult", {}).get("idlist", [])
-        
-        return ids
     
-    except Exception as e:
-        logger.error(f"Erro ao buscar IDs no PubMed: {str(e)}")
-        return []
+    # Extrai os IDs e o total de artigos
+    resultado = data.get("esearchresult", {})
+    return resultado.get("idlist", []), int(resultado.get("count", 0))
 
 def obter_detalhes_artigos(ids):
     """
@@ -143,12 +224,15 @@ def obter_detalhes_artigos(ids):
     
     Returns:
         list: Lista de resultados normalizados
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
     """
     if not ids:
         return []
     
     # Limita o número de IDs por requisição
-    ids_str = ",".join(ids[:200])
+    ids_str = ",".join(ids[:MAX_RESULTADOS])
     
     params = {
         **API_PARAMS,
@@ -156,16 +240,15 @@ def obter_detalhes_artigos(ids):
         "retmode": "xml"  # XML fornece mais detalhes
     }
     
-    try:
-        response = requests.get(EFETCH_URL, params=params)
+    with rastreamento.span('pubmed.efetch', ids=len(ids)):
+        response = conexoes.obter('pubmed', EFETCH_URL, params=params)
         response.raise_for_status()
-        
-        # Processa o XML
-        return processar_xml_resultados(response.text)
     
-    except Exception as e:
-        logger.error(f"Erro ao obter detalhes de artigos no PubMed: {str(e)}")
-        return []
+    # Processa o XML
+    with rastreamento.span('pubmed.processar_xml') as etapa:
+        resultados = processar_xml_resultados(response.text)
+        etapa.definir(resultados=len(resultados))
+    return resultados
 
 def processar_xml_resultados(xml_text):
     """
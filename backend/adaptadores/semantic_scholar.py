@@ -3,10 +3,9 @@ Adaptador para a API Semantic Scholar.
 Realiza buscas de artigos científicos na base de dados Semantic Scholar.
 """
 import logging
-import requests
 from datetime import datetime
 
-from utils import normalizacao
+from utils import normalizacao, conexoes, metricas, rastreamento
 
 logger = logging.getLogger(__name__)
 
@@ -36,29 +35,64 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         list: Lista de resultados normalizados
     """
     try:
-        logger.info(f"Iniciando busca no Semantic Scholar: {termos}")
-        
-        # Prepara a query
-        query = termos
-        if autor:
-            query += f" author:{autor}"
-        
-        # Prepara parâmetros da requisição
-        params = {
-            **API_PARAMS,
-            "query": query,
-            "limit": min(limite, 100)  # Limita a 100 resultados por requisição
-        }
-        
-        # Adiciona cabeçalhos
-        headers = {
-            "Accept": "application/json"
-        }
-        
-        # Realiza a requisição
-        response = requests.get(PAPER_SEARCH_URL, params=params, headers=headers)
+        resultados, _ = buscar_pagina(termos, autor, data_inicio, data_fim, revistas, limite)
+        return resultados
+    
+    except Exception as e:
+        logger.error(f"Erro na busca do Semantic Scholar: {str(e)}")
+        metricas.registrar_erro_api('semantic_scholar', e)
+        return []
+
+def buscar_pagina(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, cursor=None):
+    """
+    Busca uma página de resultados na API Semantic Scholar (paginação profunda).
+    
+    Args:
+        termos (str): Termos de busca
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        limite (int, opcional): Número máximo de resultados
+        cursor (str, opcional): Cursor devolvido pela página anterior
+    
+    Returns:
+        tuple: (lista de resultados normalizados, cursor da página seguinte
+            ou None se não houver mais resultados)
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
+    """
+    logger.info("Iniciando busca no Semantic Scholar: %s", termos)
+    
+    # Prepara a query
+    query = termos
+    if autor:
+        query += f" author:{autor}"
+    
+    # Prepara parâmetros da requisição
+    params = {
+        **API_PARAMS,
+        "query": query,
+        "limit": min(limite, 100)  # Limita a 100 resultados por requisição
+    }
+    
+    # A busca por relevância pagina por deslocamento (o cursor é o
+    # deslocamento da próxima página, informado pela API em 'next')
+    if cursor:
+        params["offset"] = int(cursor)
+    
+    # Adiciona cabeçalhos
+    headers = {
+        "Accept": "application/json"
+    }
+    
+    # Realiza a requisição
+    with rastreamento.span('semantic_scholar.http'):
+        response = conexoes.obter('semantic_scholar', PAPER_SEARCH_URL, params=params, headers=headers)
         response.raise_for_status()
-        
+    
+    with rastreamento.span('semantic_scholar.processar') as etapa:
         # Processa a resposta
         data = response.json()
         
@@ -90,12 +124,12 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
             
             resultados.append(resultado)
         
-        logger.info(f"Busca no Semantic Scholar concluída: {len(resultados)} resultados")
-        return resultados
+        etapa.definir(itens=len(papers), resultados=len(resultados))
     
-    except Exception as e:
-        logger.error(f"Erro na busca do Semantic Scholar: {str(e)}")
-        return []
+    logger.info("Busca no Semantic Scholar concluída: %s resultados", len(resultados))
+    
+    proximo = data.get("next") if papers else None
+    return resultados, proximo
 
 def processar_resultado(paper):
     """
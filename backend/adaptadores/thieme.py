@@ -3,11 +3,10 @@ Adaptador para a API Thieme Connect.
 Realiza buscas de artigos científicos na base de dados Thieme Connect.
 """
 import logging
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 
-from utils import normalizacao
+from utils import normalizacao, conexoes, metricas, rastreamento
 
 logger = logging.getLogger(__name__)
 
@@ -37,45 +36,80 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         list: Lista de resultados normalizados
     """
     try:
-        logger.info(f"Iniciando busca no Thieme Connect: {termos}")
-        
-        # Prepara parâmetros da requisição
-        params = {
-            **API_PARAMS,
-            "searchTerm": termos,
-            "resultsPerPage": min(limite, 50)  # Limita a 50 resultados por requisição
-        }
-        
-        # Adiciona filtro de autor
-        if autor:
-            params["author"] = autor
-        
-        # Adiciona filtro de data
-        if data_inicio and data_fim:
-            params["startDate"] = data_inicio
-            params["endDate"] = data_fim
-        
-        # Adiciona filtro de revistas
-        if revistas and len(revistas) > 0:
-            # Thieme Connect usa seu próprio sistema de IDs
-            # Aqui precisaríamos mapear os IDs internos para os IDs da Thieme
-            # Por enquanto, mantemos o ID padrão
-            pass
-        
-        # Realiza a requisição
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        
-        # Processa a resposta HTML
-        resultados = extrair_resultados_html(response.text, limite)
-        
-        logger.info(f"Busca no Thieme Connect concluída: {len(resultados)} resultados")
+        resultados, _ = buscar_pagina(termos, autor, data_inicio, data_fim, revistas, limite)
         return resultados
     
     except Exception as e:
         logger.error(f"Erro na busca do Thieme Connect: {str(e)}")
+        metricas.registrar_erro_api('thieme', e)
         return []
 
+def buscar_pagina(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, cursor=None):
+    """
+    Busca uma página de resultados na API Thieme Connect (paginação profunda).
+    
+    Args:
+        termos (str): Termos de busca
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        limite (int, opcional): Número máximo de resultados
+        cursor (str, opcional): Cursor devolvido pela página anterior
+    
+    Returns:
+        tuple: (lista de resultados normalizados, cursor da página seguinte
+            ou None se não houver mais resultados)
+    
+    Raises:
+        Exception: Se a requisição ou a leitura da resposta falhar
+    """
+    logger.info("Iniciando busca no Thieme Connect: %s", termos)
+    
+    # Prepara parâmetros da requisição
+    params = {
+        **API_PARAMS,
+        "searchTerm": termos,
+        "resultsPerPage": min(limite, 50)  # Limita a 50 resultados por requisição
+    }
+    
+    # Adiciona filtro de autor
+    if autor:
+        params["author"] = autor
+    
+    # Adiciona filtro de data
+    if data_inicio and data_fim:
+        params["startDate"] = data_inicio
+        params["endDate"] = data_fim
+    
+    # Adiciona filtro de revistas
+    if revistas and len(revistas) > 0:
+        # Thieme Connect usa seu próprio sistema de IDs
+        # Aqui precisaríamos mapear os IDs internos para os IDs da Thieme
+        # Por enquanto, mantemos o ID padrão
+        pass
+    
+    # A busca pagina por número de página (o cursor é a próxima página)
+    pagina = int(cursor) if cursor else 1
+    if pagina > 1:
+        params["page"] = pagina
+    
+    # Realiza a requisição
+    with rastreamento.span('thieme.http'):
+        response = conexoes.obter('thieme', BASE_URL, params=params)
+        response.raise_for_status()
+    
+    # Processa a resposta HTML
+    with rastreamento.span('thieme.processar') as etapa:
+        resultados = extrair_resultados_html(response.text, limite)
+        etapa.definir(resultados=len(resultados))
+    
+    logger.info("Busca no Thieme Connect concluída: %s resultados", len(resultados))
+    
+    # Uma página incompleta é a última
+    proximo = pagina + 1 if len(resultados) >= params["resultsPerPage"] else None
+    return resultados, proximo
+
 def extrair_resultados_html(html, limite):
     """
     Extrai resultados do HTML da página de busca do Thieme Connect.
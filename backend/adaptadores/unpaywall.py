@@ -3,10 +3,9 @@ Adaptador para a API Unpaywall.
 Realiza buscas de artigos científicos na base de dados Unpaywall para verificar acesso aberto.
 """
 import logging
-import requests
 from datetime import datetime
 
-from utils import normalizacao
+from utils import normalizacao, conexoes
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +17,10 @@ API_PARAMS = {
     "email": "contato@buscadorrevistas.com"  # Obrigatório para a API
 }
 
+# A API não busca por termos (buscar não faz requisições); a busca em lote
+# não agenda chamadas para ela (ver core.lote)
+BUSCA_POR_TERMOS = False
+
 def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
     """
     Realiza busca na API Unpaywall.
@@ -39,6 +42,15 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
     logger.info("Unpaywall não suporta busca direta por termos, apenas por DOI")
     return []
 
+def buscar_pagina(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, cursor=None):
+    """
+    Busca uma página de resultados (Unpaywall não suporta busca por termos).
+    
+    Returns:
+        tuple: Lista vazia e None (não há páginas seguintes)
+    """
+    return [], None
+
 def verificar_acesso_aberto(doi):
     """
     Verifica se um artigo está disponível em acesso aberto.
@@ -53,7 +65,7 @@ def verificar_acesso_aberto(doi):
         return None
     
     try:
-        logger.info(f"Verificando acesso aberto para DOI: {doi}")
+        logger.info("Verificando acesso aberto para DOI: %s", doi)
         
         # Normaliza o DOI
         doi = normalizacao.normalizar_doi(doi)
@@ -62,11 +74,11 @@ def verificar_acesso_aberto(doi):
         url = f"{BASE_URL}/{doi}"
         
         # Realiza a requisição
-        response = requests.get(url, params=API_PARAMS)
+        response = conexoes.obter('unpaywall', url, params=API_PARAMS)
         
         # Verifica se o artigo foi encontrado
         if response.status_code == 404:
-            logger.info(f"DOI não encontrado no Unpaywall: {doi}")
+            logger.info("DOI não encontrado no Unpaywall: %s", doi)
             return None
         
         # Verifica outros erros
@@ -79,7 +91,7 @@ def verificar_acesso_aberto(doi):
         is_oa = data.get("is_oa", False)
         
         if not is_oa:
-            logger.info(f"Artigo não está em acesso aberto: {doi}")
+            logger.info("Artigo não está em acesso aberto: %s", doi)
             return {
                 "is_oa": False,
                 "oa_url": None,
@@ -99,7 +111,7 @@ def verificar_acesso_aberto(doi):
         oa_url = best_oa_location.get("url") if best_oa_location else None
         oa_status = data.get("oa_status", "unknown")
         
-        logger.info(f"Artigo em acesso aberto: {doi}, status: {oa_status}")
+        logger.info("Artigo em acesso aberto: %s, status: %s", doi, oa_status)
         
         return {
             "is_oa": True,
@@ -4,20 +4,11 @@ Este arquivo contém as configurações e inicialização do servidor Flask.
 """
 import os
 import sys
-import json
 import logging
-from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, render_template, stream_with_context, abort
+from werkzeug.security import safe_join
 from flask_cors import CORS
 
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("buscador.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Inicialização da aplicação Flask
@@ -27,12 +18,41 @@ CORS(app)  # Habilita CORS para desenvolvimento local
 # Configurações da aplicação
 app.config.update(
     DEBUG=True,
-    SECRET_KEY=os.urandom(24),
+    SECRET_KEY=os.environ.get('BUSCADOR_SECRET_KEY') or os.urandom(24),  # Fixa entre reinícios via variável de ambiente
+    LOG_ARQUIVO='buscador.log',
+    LOG_FORMATO='texto',  # 'texto' ou 'json' (um objeto por linha)
+    LOG_MAX_BYTES=10 * 1024 * 1024,  # Tamanho do log que dispara a rotação
+    LOG_BACKUPS=5,  # Arquivos de log antigos mantidos
+    LOG_AMOSTRAGEM=1.0,  # Fração das requisições com as linhas INFO de APIs, busca e cache registradas
     CACHE_DIR=os.path.abspath('../dados/cache'),
     EXPORT_DIR=os.path.abspath('../dados/exportados'),
+    EXPORT_MAX_BYTES=500 * 1024 * 1024,  # Tamanho máximo do diretório de exportações
+    EXPORT_DOWNLOAD_MAX_AGE=86400,  # Segundos de cache dos downloads (arquivos identificados pelo conteúdo)
     REVISTAS_FILE=os.path.abspath('../dados/revistas.json'),
+    REVISTAS_MAX_AGE=86400,  # Segundos de cache da lista de revistas no navegador
     MAX_RESULTS_PER_API=100,
-    CACHE_TIMEOUT=3600  # 1 hora
+    APIS_LIMITES_TAXA={},  # Requisições por segundo por API (sobrescreve os padrões de utils.conexoes)
+    APIS_LIMITES_DIR=os.path.abspath('../dados/limites'),  # Orçamentos de requisições compartilhados entre os processos
+    APIS_TEMPO_LIMITE=(5, 30),  # Segundos para conectar e para receber a resposta das APIs
+    CACHE_TIMEOUT=3600,  # 1 hora
+    CACHE_AQUECIMENTO=True,  # Refaz em segundo plano as buscas populares antes de expirarem no cache
+    CACHE_AQUECIMENTO_MAX=20,  # Buscas populares mantidas aquecidas
+    CACHE_AQUECIMENTO_LISTA=None,  # Arquivo JSON com buscas sempre aquecidas (formato de /api/buscar/lote)
+    PROCESSAMENTO_PARALELO=False,  # Pool de processos para etapas pesadas
+    PROCESSOS_MAX=None,  # None usa o número de CPUs
+    PROCESSOS_LIMIAR=400,  # Resultados mínimos para usar o pool
+    EXPORTACAO_TRABALHADORES=2,  # Exportações renderizadas ao mesmo tempo
+    EXPORTACAO_MAX_PENDENTES=50,  # Tarefas de exportação aguardando ou em andamento
+    EXPORTACAO_RETENCAO=3600,  # Segundos em que tarefas finalizadas ficam consultáveis
+    EXPORTACAO_PROCESSOS=2,  # Processos que renderizam PDF e Excel (0 usa as threads da fila)
+    EXPORTACAO_LIMITE_MEMORIA_MB=2048,  # Limite de memória de cada processo de exportação
+    EXPORTACAO_TEMPO_LIMITE=300,  # Segundos para concluir uma exportação
+    RASTROS_ARQUIVO=None,  # Arquivo JSONL (OTLP/JSON) para gravar os rastros das buscas; None desativa
+    RESULTADOS_POR_PAGINA=50,  # Resultados por página em /api/buscar e /api/resultados
+    CONJUNTOS_MAX=64,  # Conjuntos de resultados mantidos em memória
+    PAGINACAO_MAX_SESSOES=128,  # Sessões de paginação profunda mantidas em memória
+    BUSCAS_SALVAS_FILE=os.path.abspath('../dados/buscas_salvas.json'),
+    BUSCAS_SALVAS_SOBREPOSICAO=7  # Dias consultados novamente a cada atualização de uma busca salva
 )
 
 # Garante que os diretórios necessários existam
@@ -42,8 +62,121 @@ for directory in [app.config['CACHE_DIR'], app.config['EXPORT_DIR']]:
 # Importa os módulos da aplicação
 # Nota: Importações aqui para evitar problemas de dependência circular
 from adaptadores import pubmed, crossref, semantic_scholar, openalex, unpaywall, thieme
-from core import motor_busca, processador, cache
-from utils import normalizacao, exportacao, validacao
+from core import motor_busca, lote, paginacao, buscas_salvas, aquecimento, processador, cache, paralelismo, fila_exportacao, processos_exportacao, conjuntos
+from utils import normalizacao, exportacao, validacao, revistas, respostas, metricas, rastreamento, registro, conexoes
+
+# Configuração de logging (gravação em segundo plano, com rotação)
+registro.configurar(
+    arquivo=app.config['LOG_ARQUIVO'],
+    formato=app.config['LOG_FORMATO'],
+    max_bytes=app.config['LOG_MAX_BYTES'],
+    backups=app.config['LOG_BACKUPS'],
+    amostragem=app.config['LOG_AMOSTRAGEM']
+)
+
+# Configura o processamento paralelo das etapas intensivas em CPU
+paralelismo.configurar(
+    habilitado=app.config['PROCESSAMENTO_PARALELO'],
+    limiar_itens=app.config['PROCESSOS_LIMIAR'],
+    max_processos=app.config['PROCESSOS_MAX']
+)
+
+# Configura a fila de exportações assíncronas
+fila_exportacao.configurar(
+    max_trabalhadores=app.config['EXPORTACAO_TRABALHADORES'],
+    max_pendentes=app.config['EXPORTACAO_MAX_PENDENTES'],
+    tempo_retencao=app.config['EXPORTACAO_RETENCAO'],
+    diretorio=app.config['EXPORT_DIR']
+)
+
+# Configura os processos que renderizam as exportações pesadas
+processos_exportacao.configurar(
+    max_processos=app.config['EXPORTACAO_PROCESSOS'],
+    limite_memoria_mb=app.config['EXPORTACAO_LIMITE_MEMORIA_MB'],
+    tempo_limite=app.config['EXPORTACAO_TEMPO_LIMITE']
+)
+
+# Limita o espaço ocupado pelas exportações em disco
+exportacao.TAMANHO_MAXIMO_EXPORTACOES = app.config['EXPORT_MAX_BYTES']
+
+# Configura as conexões e os limites de requisições às APIs
+conexoes.configurar(
+    limites=app.config['APIS_LIMITES_TAXA'],
+    tempo_limite=app.config['APIS_TEMPO_LIMITE'],
+    diretorio_limites=app.config['APIS_LIMITES_DIR']
+)
+
+# Configura a gravação dos rastros das buscas
+rastreamento.configurar(arquivo=app.config['RASTROS_ARQUIVO'])
+
+# Carrega o catálogo de revistas (antes da criação dos workers, em produção)
+revistas.configurar(arquivo=app.config['REVISTAS_FILE'])
+revistas.obter_catalogo()
+
+# Configura os conjuntos de resultados mantidos no servidor
+conjuntos.configurar(
+    max_conjuntos=app.config['CONJUNTOS_MAX'],
+    tempo_expiracao=app.config['CACHE_TIMEOUT'],
+    tamanho_pagina=app.config['RESULTADOS_POR_PAGINA']
+)
+
+# Configura as sessões de paginação profunda
+paginacao.configurar(
+    max_sessoes=app.config['PAGINACAO_MAX_SESSOES'],
+    tempo_expiracao=app.config['CACHE_TIMEOUT']
+)
+
+# Configura as buscas salvas
+buscas_salvas.configurar(
+    arquivo=app.config['BUSCAS_SALVAS_FILE'],
+    dias_sobreposicao=app.config['BUSCAS_SALVAS_SOBREPOSICAO']
+)
+
+# Configura o aquecimento do cache (a thread começa com o servidor, ver iniciar_servidor)
+aquecimento.configurar(
+    habilitado=app.config['CACHE_AQUECIMENTO'],
+    max_aquecidas=app.config['CACHE_AQUECIMENTO_MAX'],
+    arquivo_lista=app.config['CACHE_AQUECIMENTO_LISTA']
+)
+
+# Identificador de cada requisição, presente nos logs e devolvido ao cliente
+@app.before_request
+def iniciar_requisicao():
+    """Define o identificador da requisição (aceita X-Request-ID do cliente)."""
+    registro.definir_id_requisicao(request.headers.get('X-Request-ID'))
+
+@app.after_request
+def identificar_resposta(resposta):
+    """Devolve o identificador da requisição no cabeçalho X-Request-ID."""
+    id_requisicao = registro.obter_id_requisicao()
+    if id_requisicao:
+        resposta.headers['X-Request-ID'] = id_requisicao
+    return resposta
+
+@app.teardown_request
+def encerrar_requisicao(erro=None):
+    """Remove o identificador da requisição (as threads do servidor são reaproveitadas)."""
+    registro.limpar_id_requisicao()
+
+def responder_json(corpo, status=200):
+    """
+    Envia um corpo JSON já codificado, comprimido com brotli ou gzip quando
+    for grande o bastante e o cliente aceitar.
+    
+    Args:
+        corpo (respostas.CorpoJSON): Corpo codificado (as versões comprimidas
+            ficam guardadas nele para os próximos envios)
+        status (int, opcional): Código de status HTTP
+    
+    Returns:
+        Response: Resposta HTTP
+    """
+    codificacao = respostas.escolher_codificacao(request.accept_encodings, len(corpo.corpo))
+    resposta = Response(corpo.obter(codificacao), status=status, mimetype='application/json')
+    if codificacao:
+        resposta.content_encoding = codificacao
+    resposta.vary.add('Accept-Encoding')
+    return resposta
 
 # Rotas para servir o frontend
 @app.route('/')
@@ -61,14 +194,26 @@ def static_files(path):
 # API para obter a lista de revistas
 @app.route('/api/revistas', methods=['GET'])
 def get_revistas():
-    """API para obter a lista de revistas."""
-    try:
-        with open(app.config['REVISTAS_FILE'], 'r', encoding='utf-8') as f:
-            revistas = json.load(f)
-        return jsonify(revistas)
-    except Exception as e:
-        logger.error(f"Erro ao carregar revistas: {str(e)}")
-        return jsonify([])
+    """
+    API para obter a lista de revistas.
+    
+    A resposta vem pré-codificada do catálogo em memória (recarregado quando
+    o arquivo muda), com ETag forte: clientes com a versão atual recebem 304.
+    """
+    catalogo = revistas.obter_catalogo()
+    comprimir = request.accept_encodings['gzip'] > 0
+    
+    resposta = Response(
+        catalogo.corpo_gzip if comprimir else catalogo.corpo,
+        mimetype='application/json'
+    )
+    if comprimir:
+        resposta.content_encoding = 'gzip'
+    resposta.vary.add('Accept-Encoding')
+    resposta.set_etag(f"{catalogo.etag}-gzip" if comprimir else catalogo.etag)
+    resposta.cache_control.public = True
+    resposta.cache_control.max_age = app.config['REVISTAS_MAX_AGE']
+    return resposta.make_conditional(request)
 
 # API para realizar busca
 @app.route('/api/buscar', methods=['POST'])
@@ -76,7 +221,6 @@ def buscar():
     """API para realizar busca de artigos."""
     try:
         dados = request.json
-        logger.info(f"Recebida requisição de busca: {dados}")
         
         # Validação dos dados de entrada
         if not validacao.validar_parametros_busca(dados):
@@ -85,60 +229,354 @@ def buscar():
                 "msg": "Parâmetros de busca inválidos."
             }), 400
         
-        # Realiza a busca usando o motor de busca
-        resultados = motor_busca.buscar(
+        # Registra um resumo da busca, não o corpo inteiro da requisição
+        logger.info(
+            "Recebida requisição de busca: palavras=%.200r revistas=%s limite=%s",
+            dados.get('palavras'), len(dados.get('revistas') or []), dados.get('limite')
+        )
+        
+        # Com debug_timing=true (no corpo ou na URL), a resposta traz a
+        # cascata de tempos das etapas da busca
+        debug_timing = str(dados.get('debug_timing', request.args.get('debug_timing', ''))).lower() in ('1', 'true')
+        
+        # Realiza a busca usando o motor de busca; os resultados ficam no
+        # servidor e apenas a primeira página é enviada
+        consulta = {
+            'termos': dados.get('palavras', ''),
+            'autor': dados.get('autor', ''),
+            'data_inicio': dados.get('periodo_inicio'),
+            'data_fim': dados.get('periodo_fim'),
+            'revistas': dados.get('revistas', []),
+            'limite': dados.get('limite', 30),
+            'ordenar_por': dados.get('ordenar_por') or 'data'
+        }
+        raiz = rastreamento.iniciar_rastro('POST /api/buscar', ativo=debug_timing or rastreamento.gravando())
+        with raiz:
+            id_conjunto, resultados = motor_busca.buscar_conjunto(**consulta)
+        rastreamento.exportar(raiz.rastro)
+        
+        # Conta a busca para o aquecimento do cache
+        aquecimento.registrar(id_conjunto, consulta)
+        
+        tamanho = dados.get('tamanho_pagina')
+        
+        def gerar_resposta():
+            return {
+                "status": "ok",
+                "msg": f"Busca realizada com sucesso. {len(resultados)} resultados encontrados.",
+                "id": id_conjunto,
+                **conjuntos.paginar(resultados, tamanho=tamanho)
+            }
+        
+        if debug_timing:
+            corpo = respostas.CorpoJSON({**gerar_resposta(), "tempos": raiz.rastro.cascata()})
+        else:
+            # A primeira página é codificada uma vez e reenviada como está
+            # enquanto o conjunto estiver em memória
+            corpo = conjuntos.obter_corpo(id_conjunto, ('buscar', None, tamanho), gerar_resposta)
+        
+        return responder_json(corpo)
+    except Exception as e:
+        logger.error(f"Erro na busca: {str(e)}")
+        return jsonify({
+            "status": "erro",
+            "msg": f"Erro ao realizar a busca: {str(e)}"
+        }), 500
+
+# API para realizar várias buscas em uma requisição
+@app.route('/api/buscar/lote', methods=['POST'])
+def buscar_lote():
+    """
+    API para realizar várias buscas planejadas em conjunto (ver core.lote).
+    
+    O corpo traz 'consultas' (termos ou objetos com os campos de
+    /api/buscar) e, opcionalmente, os campos comuns a todas elas. A resposta
+    traz a primeira página de cada consulta e da união deduplicada; as
+    demais páginas são obtidas em /api/resultados com o id de cada uma.
+    """
+    try:
+        dados = request.json
+        
+        if not validacao.validar_parametros_lote(dados):
+            return jsonify({
+                "status": "erro",
+                "msg": f"Parâmetros da busca em lote inválidos (até {validacao.MAX_CONSULTAS_LOTE} consultas)."
+            }), 400
+        
+        consultas = validacao.expandir_consultas_lote(dados)
+        logger.info("Recebida requisição de busca em lote: consultas=%s", len(consultas))
+        
+        debug_timing = str(dados.get('debug_timing', request.args.get('debug_timing', ''))).lower() in ('1', 'true')
+        
+        raiz = rastreamento.iniciar_rastro('POST /api/buscar/lote', ativo=debug_timing or rastreamento.gravando())
+        with raiz:
+            resultado = lote.buscar_lote([
+                {
+                    'termos': consulta.get('palavras', ''),
+                    'autor': consulta.get('autor', ''),
+                    'data_inicio': consulta.get('periodo_inicio'),
+                    'data_fim': consulta.get('periodo_fim'),
+                    'revistas': consulta.get('revistas', []),
+                    'limite': consulta.get('limite', 30),
+                    'ordenar_por': consulta.get('ordenar_por') or 'data'
+                }
+                for consulta in consultas
+            ])
+        rastreamento.exportar(raiz.rastro)
+        
+        tamanho = dados.get('tamanho_pagina')
+        id_uniao, uniao = resultado['uniao']
+        resposta = {
+            "status": "ok",
+            "msg": f"Busca em lote realizada com sucesso. {len(uniao)} resultados distintos encontrados.",
+            "consultas": [
+                {"palavras": consulta.get('palavras'), "id": id_conjunto, **conjuntos.paginar(resultados, tamanho=tamanho)}
+                for consulta, (id_conjunto, resultados) in zip(consultas, resultado['consultas'])
+            ],
+            "uniao": {"id": id_uniao, **conjuntos.paginar(uniao, tamanho=tamanho)},
+            "chamadas": resultado['chamadas']
+        }
+        if debug_timing:
+            resposta["tempos"] = raiz.rastro.cascata()
+        
+        return responder_json(respostas.CorpoJSON(resposta))
+    except Exception as e:
+        logger.error(f"Erro na busca em lote: {str(e)}")
+        return jsonify({
+            "status": "erro",
+            "msg": f"Erro ao realizar a busca em lote: {str(e)}"
+        }), 500
+
+# API para paginar um conjunto de resultados
+@app.route('/api/resultados/<id_conjunto>', methods=['GET'])
+def obter_resultados(id_conjunto):
+    """API para obter uma página de um conjunto de resultados."""
+    resultados = conjuntos.obter(id_conjunto)
+    
+    if resultados is None:
+        return jsonify({
+            "status": "erro",
+            "msg": "Resultados não encontrados ou expirados. Refaça a busca."
+        }), 404
+    
+    cursor = request.args.get('cursor')
+    tamanho = request.args.get('tamanho')
+    try:
+        corpo = conjuntos.obter_corpo(id_conjunto, ('resultados', cursor, tamanho), lambda: {
+            "status": "ok",
+            "id": id_conjunto,
+            **conjuntos.paginar(resultados, cursor=cursor, tamanho=tamanho)
+        })
+    except ValueError:
+        return jsonify({
+            "status": "erro",
+            "msg": "Cursor ou tamanho de página inválido."
+        }), 400
+    
+    return responder_json(corpo)
+
+# API para paginar uma busca diretamente nas APIs
+@app.route('/api/paginacao', methods=['POST'])
+def iniciar_paginacao():
+    """
+    API para iniciar a paginação profunda de uma busca (ver core.paginacao).
+    
+    O corpo traz os campos de /api/buscar; cada página seguinte é pedida em
+    /api/paginacao/<token> com o token devolvido na página anterior.
+    """
+    try:
+        dados = request.json
+        
+        if not validacao.validar_parametros_busca(dados):
+            return jsonify({
+                "status": "erro",
+                "msg": "Parâmetros de busca inválidos."
+            }), 400
+        
+        logger.info("Recebida requisição de paginação: palavras=%.200r", dados.get('palavras'))
+        
+        pagina = paginacao.iniciar(
             termos=dados.get('palavras', ''),
             autor=dados.get('autor', ''),
             data_inicio=dados.get('periodo_inicio'),
             data_fim=dados.get('periodo_fim'),
             revistas=dados.get('revistas', []),
-            limite=dados.get('limite', 30)
+            ordenar_por=dados.get('ordenar_por') or 'data',
+            tamanho=dados.get('tamanho_pagina')
         )
+        return responder_json(respostas.CorpoJSON({"status": "ok", **pagina}))
+    except ValueError:
+        return jsonify({
+            "status": "erro",
+            "msg": "Tamanho de página inválido."
+        }), 400
+    except Exception as e:
+        logger.error(f"Erro na paginação: {str(e)}")
+        return jsonify({
+            "status": "erro",
+            "msg": f"Erro ao realizar a busca: {str(e)}"
+        }), 500
+
+# API para obter a página seguinte de uma paginação profunda
+@app.route('/api/paginacao/<token>', methods=['GET'])
+def continuar_paginacao(token):
+    """API para obter a página indicada por um token de continuação."""
+    try:
+        pagina = paginacao.continuar(token, tamanho=request.args.get('tamanho'))
+        return responder_json(respostas.CorpoJSON({"status": "ok", **pagina}))
+    except paginacao.TokenInvalidoError as e:
+        return jsonify({
+            "status": "erro",
+            "msg": str(e)
+        }), 410
+    except ValueError:
+        return jsonify({
+            "status": "erro",
+            "msg": "Tamanho de página inválido."
+        }), 400
+    except Exception as e:
+        logger.error(f"Erro na paginação: {str(e)}")
+        return jsonify({
+            "status": "erro",
+            "msg": f"Erro ao obter a página: {str(e)}"
+        }), 500
+
+# API para listar e criar buscas salvas
+@app.route('/api/buscas-salvas', methods=['GET', 'POST'])
+def buscas_salvas_api():
+    """
+    API para listar (GET) ou salvar (POST) buscas.
+    
+    O corpo do POST traz os campos de /api/buscar, um 'nome' e,
+    opcionalmente, 'apis' e 'frequencia_horas' (intervalo entre as
+    atualizações do comando atualizar-buscas).
+    """
+    if request.method == 'GET':
+        return jsonify({"status": "ok", "buscas": buscas_salvas.listar()})
+    
+    try:
+        dados = request.json
         
+        if not validacao.validar_parametros_busca(dados):
+            return jsonify({
+                "status": "erro",
+                "msg": "Parâmetros de busca inválidos."
+            }), 400
+        
+        busca = buscas_salvas.criar(
+            nome=dados.get('nome', ''),
+            termos=dados.get('palavras', ''),
+            autor=dados.get('autor', ''),
+            revistas=dados.get('revistas', []),
+            apis=dados.get('apis'),
+            data_inicio=dados.get('periodo_inicio'),
+            ordenar_por=dados.get('ordenar_por') or 'data',
+            frequencia_horas=dados.get('frequencia_horas')
+        )
+        return jsonify({"status": "ok", "busca": buscas_salvas.resumir(busca)}), 201
+    except Exception as e:
+        logger.error(f"Erro ao salvar busca: {str(e)}")
         return jsonify({
+            "status": "erro",
+            "msg": f"Erro ao salvar a busca: {str(e)}"
+        }), 500
+
+# API para remover uma busca salva
+@app.route('/api/buscas-salvas/<id_busca>', methods=['DELETE'])
+def remover_busca_salva(id_busca):
+    """API para remover uma busca salva."""
+    if not buscas_salvas.remover(id_busca):
+        return jsonify({
+            "status": "erro",
+            "msg": "Busca salva não encontrada."
+        }), 404
+    return jsonify({"status": "ok"})
+
+# API para atualizar uma busca salva
+@app.route('/api/buscas-salvas/<id_busca>/atualizar', methods=['POST'])
+def atualizar_busca_salva(id_busca):
+    """
+    API para atualizar uma busca salva: a resposta traz apenas os artigos
+    novos desde a última execução (as demais páginas em /api/resultados).
+    """
+    try:
+        resultado = buscas_salvas.atualizar(id_busca)
+        if resultado is None:
+            return jsonify({
+                "status": "erro",
+                "msg": "Busca salva não encontrada."
+            }), 404
+        
+        novos = resultado['novos']
+        return responder_json(respostas.CorpoJSON({
             "status": "ok",
-            "msg": f"Busca realizada com sucesso. {len(resultados)} resultados encontrados.",
-            "resultados": resultados
-        })
+            "msg": f"Busca atualizada. {len(novos)} artigos novos.",
+            "id": resultado['id'],
+            **conjuntos.paginar(novos, tamanho=request.args.get('tamanho')),
+            "apis": resultado['apis']
+        }))
     except Exception as e:
-        logger.error(f"Erro na busca: {str(e)}")
+        logger.error(f"Erro ao atualizar a busca salva {id_busca}: {str(e)}")
         return jsonify({
             "status": "erro",
-            "msg": f"Erro ao realizar a busca: {str(e)}"
+            "msg": f"Erro ao atualizar a busca: {str(e)}"
         }), 500
 
 # API para exportar resultados
 @app.route('/api/exportar', methods=['POST'])
 def exportar():
-    """API para exportar resultados em diferentes formatos."""
+    """API para submeter a exportação de resultados à fila de exportações."""
     try:
         dados = request.json
-        logger.info(f"Recebida requisição de exportação: {dados['formato']}")
+        logger.info("Recebida requisição de exportação: %s", dados.get('formato'))
         
-        formato = dados.get('formato')
-        resultados = dados.get('resultados', [])
+        formato = dados.get('formato') or ''
         busca = dados.get('busca', {})
         
+        # Os resultados podem vir do conjunto guardado no servidor
+        id_conjunto = dados.get('id_resultados')
+        if id_conjunto:
+            resultados = conjuntos.obter(id_conjunto)
+            if resultados is None:
+                return jsonify({
+                    "status": "erro",
+                    "msg": "Resultados não encontrados ou expirados. Refaça a busca."
+                }), 404
+        else:
+            resultados = dados.get('resultados', [])
+        
         if not resultados:
             return jsonify({
                 "status": "erro",
                 "msg": "Não há resultados para exportar."
             }), 400
         
-        # Realiza a exportação usando o módulo de exportação
-        arquivo = exportacao.exportar(
+        # Enfileira a exportação; o arquivo é gerado em segundo plano
+        tarefa = fila_exportacao.enviar(
             formato=formato,
             resultados=resultados,
             busca=busca,
-            diretorio=app.config['EXPORT_DIR']
+            diretorio=app.config['EXPORT_DIR'],
+            id_conjunto=id_conjunto
         )
         
-        # Retorna o caminho do arquivo para download
+        # Retorna a tarefa para acompanhamento em /api/exportar/<id>
         return jsonify({
             "status": "ok",
-            "msg": f"Exportação em {formato.upper()} realizada com sucesso!",
-            "arquivo": arquivo
-        })
+            "msg": f"Exportação em {formato.upper()} iniciada.",
+            "tarefa": tarefa.como_dict()
+        }), 202
+    except ValueError as e:
+        return jsonify({
+            "status": "erro",
+            "msg": str(e)
+        }), 400
+    except fila_exportacao.FilaCheiaError as e:
+        logger.error(f"Erro na exportação: {str(e)}")
+        return jsonify({
+            "status": "erro",
+            "msg": "Muitas exportações em andamento. Tente novamente em instantes."
+        }), 503
     except Exception as e:
         logger.error(f"Erro na exportação: {str(e)}")
         return jsonify({
@@ -146,22 +584,137 @@ def exportar():
             "msg": f"Erro ao exportar resultados: {str(e)}"
         }), 500
 
+# API para acompanhar uma exportação
+@app.route('/api/exportar/<id_tarefa>', methods=['GET'])
+def status_exportacao(id_tarefa):
+    """API para consultar o progresso de uma exportação."""
+    tarefa = fila_exportacao.obter(id_tarefa)
+    
+    if tarefa is None:
+        return jsonify({
+            "status": "erro",
+            "msg": "Exportação não encontrada ou expirada."
+        }), 404
+    
+    if tarefa.estado == fila_exportacao.ERRO:
+        msg = f"Erro ao exportar resultados: {tarefa.erro}"
+    elif tarefa.estado == fila_exportacao.CONCLUIDA:
+        msg = f"Exportação em {tarefa.formato.upper()} realizada com sucesso!"
+    else:
+        msg = f"Exportação em andamento ({tarefa.progresso}%)."
+    
+    return jsonify({
+        "status": "ok",
+        "msg": msg,
+        "tarefa": tarefa.como_dict()
+    })
+
+# Exportação em streaming (CSV, JSONL, RIS, BibTeX)
+@app.route('/api/resultados/<id_conjunto>/exportar/<formato>', methods=['GET'])
+def exportar_streaming(id_conjunto, formato):
+    """API para baixar um conjunto de resultados, gerado à medida que é enviado."""
+    if formato not in exportacao.FORMATOS_STREAMING:
+        return jsonify({
+            "status": "erro",
+            "msg": f"Formato de exportação inválido: {formato}"
+        }), 400
+    
+    resultados = conjuntos.obter(id_conjunto)
+    if resultados is None:
+        return jsonify({
+            "status": "erro",
+            "msg": "Resultados não encontrados ou expirados. Refaça a busca."
+        }), 404
+    
+    logger.info("Exportação em streaming: %s (%s resultados)", formato, len(resultados))
+    
+    # Resposta em blocos (chunked), sem arquivo intermediário
+    nome_arquivo = f"resultados_{id_conjunto[:16]}.{exportacao.EXTENSOES[formato]}"
+    return Response(
+        stream_with_context(exportacao.gerar_conteudo(formato, resultados, request.args.to_dict())),
+        mimetype=exportacao.TIPOS_CONTEUDO[formato],
+        headers={'Content-Disposition': f'attachment; filename="{nome_arquivo}"'}
+    )
+
 # Rota para download de arquivos exportados
 @app.route('/api/download/<path:filename>', methods=['GET'])
 def download_file(filename):
-    """Rota para download de arquivos exportados."""
-    return send_from_directory(
-        app.config['EXPORT_DIR'],
-        filename,
-        as_attachment=True
+    """
+    Rota para download de arquivos exportados.
+    
+    Suporta requisições parciais (Range, para retomar downloads), GET
+    condicional com ETag forte derivada do hash do conteúdo e compressão
+    gzip dos formatos de texto.
+    """
+    caminho = safe_join(app.config['EXPORT_DIR'], filename)
+    if caminho is None or not os.path.isfile(caminho):
+        abort(404)
+    
+    etag = exportacao.etag_exportacao(caminho) or True
+    comprimir = (
+        exportacao.comprimivel(filename)
+        and request.accept_encodings['gzip'] > 0
+    )
+    
+    # Os formatos de texto são enviados comprimidos quando o cliente aceita
+    if comprimir:
+        caminho = exportacao.obter_versao_gzip(caminho)
+        if etag is not True:
+            etag = f"{etag}-gzip"
+    
+    resposta = send_file(
+        caminho,
+        as_attachment=True,
+        download_name=os.path.basename(filename),
+        etag=etag,
+        max_age=app.config['EXPORT_DOWNLOAD_MAX_AGE']
     )
+    
+    if exportacao.comprimivel(filename):
+        resposta.vary.add('Accept-Encoding')
+    if comprimir:
+        resposta.content_encoding = 'gzip'
+    return resposta
+
+# Métricas no formato texto do Prometheus
+@app.route('/metrics', methods=['GET'])
+def obter_metricas():
+    """
+    Expõe as métricas deste processo (latência e falhas das APIs, caches,
+    etapas do processamento e exportações) para coleta pelo Prometheus.
+    """
+    return Response(metricas.gerar_texto(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # Função para iniciar o servidor
 def iniciar_servidor(host='0.0.0.0', port=5563):
     """Inicia o servidor Flask."""
     logger.info(f"Iniciando servidor em http://{host}:{port}")
+    
+    # No modo de depuração, o recarregador do Werkzeug executa o servidor em
+    # um processo filho (WERKZEUG_RUN_MAIN); o processo que só vigia os
+    # arquivos não aquece o cache
+    if not app.config['DEBUG'] or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        aquecimento.iniciar()
     app.run(host=host, port=port, debug=app.config['DEBUG'])
 
+# Configuração para o servidor de produção (python -m backend serve)
+def configurar_producao(workers=1):
+    """
+    Prepara a aplicação para o servidor de produção.
+    
+    Chamada antes da criação dos workers, que herdam a configuração. Com
+    mais de um processo, o estado das exportações passa a ser gravado em
+    disco, para que qualquer worker responda às consultas de progresso; o
+    cache de buscas (em disco) e os conjuntos de resultados (recuperados do
+    cache) já são compartilhados.
+    
+    Args:
+        workers (int): Número de processos que servirão a aplicação
+    """
+    app.config['DEBUG'] = False
+    fila_exportacao.configurar(compartilhar_tarefas=workers > 1)
+    logger.info(f"Aplicação configurada para produção com {workers} processos")
+
 # Execução direta do script
 if __name__ == '__main__':
     try:
@@ -0,0 +1,106 @@
+"""
+Benchmark da prioridade do aquecimento do cache.
+Mede a latência de buscas interativas executadas em sequência de três
+modos: sozinhas, com uma thread refazendo buscas continuamente com
+prioridade normal e com a mesma thread em segundo plano
+(utils.conexoes.segundo_plano, como o aquecimento do cache). As APIs são
+simuladas: cada chamada passa pelo limite de requisições de utils.conexoes
+e espera uma latência fixa, sem acessar a rede.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_aquecimento.py [buscas] [latência em ms]
+"""
+import os
+import sys
+import time
+import threading
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import motor_busca, conjuntos
+from utils import conexoes
+
+class SessaoSimulada:
+    """Substitui a sessão HTTP: cada requisição apenas espera a latência."""
+    
+    def __init__(self, latencia):
+        self.latencia = latencia
+    
+    def get(self, url, **kwargs):
+        time.sleep(self.latencia)
+
+def simular_apis():
+    """Substitui a busca de cada adaptador por uma chamada simulada."""
+    def criar(api):
+        def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
+            conexoes.obter(api, f"https://{api}.simulada/busca")
+            return [
+                {'titulo': f"{termos} {api} {i}", 'autores': "Silva, A", 'revista': "Journal",
+                 'data_publicacao': "2024-05-01", 'doi': f"10.5555/{api}.{termos}.{i}"}
+                for i in range(5)
+            ]
+        return buscar
+    
+    # O Unpaywall não busca por termos e mantém sua função original
+    for api, adaptador in motor_busca.ADAPTADORES.items():
+        if api != 'unpaywall':
+            adaptador.buscar = criar(api)
+
+def medir(buscas, concorrente=None):
+    """
+    Executa as buscas interativas em sequência, opcionalmente com uma thread
+    refazendo buscas ao mesmo tempo.
+    
+    Returns:
+        list: Latência de cada busca interativa, em segundos
+    """
+    conjuntos._conjuntos.clear()
+    conexoes._limitadores.clear()
+    parar = threading.Event()
+    
+    def refazer():
+        with concorrente():
+            n = 0
+            while not parar.is_set():
+                motor_busca.buscar_conjunto(f"aquecida {n % 5}", ignorar_cache=True)
+                n += 1
+    
+    thread = threading.Thread(target=refazer, daemon=True) if concorrente is not None else None
+    if thread:
+        thread.start()
+        time.sleep(1)
+    
+    latencias = []
+    for i in range(buscas):
+        inicio = time.perf_counter()
+        motor_busca.buscar_conjunto(f"interativa {i} {time.time()}")
+        latencias.append(time.perf_counter() - inicio)
+    
+    parar.set()
+    if thread:
+        thread.join()
+    return latencias
+
+def resumir(nome, latencias):
+    ordenadas = sorted(latencias)
+    p95 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))]
+    print(f"{nome:28s}: média {sum(latencias) / len(latencias) * 1000:7.0f} ms  p95 {p95 * 1000:7.0f} ms")
+
+def main():
+    buscas = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    latencia = (int(sys.argv[2]) if len(sys.argv) > 2 else 100) / 1000
+    
+    # Sem cache em disco: todas as buscas consultam as APIs simuladas
+    motor_busca.cache.obter_cache = lambda chave: None
+    motor_busca.cache.armazenar_cache = lambda chave, resultados: None
+    conexoes._sessao = SessaoSimulada(latencia)
+    simular_apis()
+    print(f"buscas: {buscas}  latência simulada: {latencia * 1000:.0f} ms  limites: {conexoes.LIMITES_TAXA}")
+    
+    resumir("sozinhas", medir(buscas))
+    resumir("com refazimento normal", medir(buscas, concorrente=contextlib.nullcontext))
+    resumir("com aquecimento (2º plano)", medir(buscas, concorrente=conexoes.segundo_plano))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Teste de carga do servidor.
+Inicia o servidor de desenvolvimento do Flask e o servidor de produção
+(python -m backend serve) em portas locais e, para cada um, dispara
+requisições concorrentes às rotas que não dependem das APIs externas
+(lista de revistas e página inicial), medindo requisições por segundo e
+latência p50/p99.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_carga.py [segundos] [clientes] [workers]
+"""
+import os
+import sys
+import time
+import signal
+import threading
+import subprocess
+import http.client
+
+DIRETORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROTAS = ('/api/revistas', '/')
+PORTA = 5591
+
+def percentil(valores, p):
+    """Retorna o percentil p (0 a 1) de uma lista de valores."""
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def aguardar_servidor(porta, tempo_limite=30):
+    """Aguarda o servidor responder na porta informada."""
+    prazo = time.time() + tempo_limite
+    while time.time() < prazo:
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=1)
+            conexao.request('GET', ROTAS[0])
+            conexao.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Servidor não respondeu na porta {porta}")
+
+def gerar_carga(porta, duracao, clientes):
+    """Dispara requisições com conexões persistentes e retorna as latências."""
+    parar = threading.Event()
+    latencias = []
+    erros = [0]
+    
+    def cliente(indice):
+        conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=10)
+        i = indice
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            try:
+                conexao.request('GET', ROTAS[i % len(ROTAS)])
+                resposta = conexao.getresponse()
+                resposta.read()
+                if resposta.status != 200:
+                    erros[0] += 1
+                latencias.append(time.perf_counter() - inicio)
+            except (OSError, http.client.HTTPException):
+                erros[0] += 1
+                conexao.close()
+                conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=10)
+            i += 1
+        conexao.close()
+    
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    return latencias, erros[0]
+
+def medir(nome, comando, cwd, duracao, clientes):
+    """Inicia um servidor, aplica a carga e o encerra."""
+    processo = subprocess.Popen(
+        comando, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    try:
+        aguardar_servidor(PORTA)
+        gerar_carga(PORTA, 1, clientes)  # aquecimento
+        latencias, erros = gerar_carga(PORTA, duracao, clientes)
+    finally:
+        # Encerra o grupo inteiro (reloader do Flask, workers do Gunicorn)
+        os.killpg(processo.pid, signal.SIGTERM)
+        processo.wait()
+    
+    print(
+        f"  {nome:28s} {len(latencias) / duracao:8.1f} req/s  "
+        f"p50 {percentil(latencias, 0.50) * 1000:6.1f} ms  "
+        f"p99 {percentil(latencias, 0.99) * 1000:6.1f} ms  "
+        f"erros {erros}"
+    )
+
+def main():
+    duracao = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    clientes = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1) * 2
+    print(f"CPUs: {os.cpu_count()}  clientes: {clientes}  duração: {duracao:.0f}s  rotas: {', '.join(ROTAS)}")
+    
+    medir("desenvolvimento (Flask)", [sys.executable, 'app.py', str(PORTA), '127.0.0.1'],
+          DIRETORIO_BACKEND, duracao, clientes)
+    medir(f"produção ({workers} workers)",
+          [sys.executable, '-m', 'backend', 'serve', '--host', '127.0.0.1',
+           '--port', str(PORTA), '--workers', str(workers)],
+          os.path.dirname(DIRETORIO_BACKEND), duracao, clientes)
+
+if __name__ == '__main__':
+    main()
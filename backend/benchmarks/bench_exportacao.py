@@ -0,0 +1,92 @@
+"""
+Benchmark da exportação de resultados.
+Mede tempo e pico de memória (tracemalloc) da exportação HTML e TXT em
+streaming, comparando com a concatenação de strings anterior, e dos
+formatos CSV, JSONL, RIS e BibTeX.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_exportacao.py [quantidades...]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import exportacao
+
+BUSCA = {'palavras': 'knee AND mri', 'periodo_inicio': '2020-01-01', 'periodo_fim': '2024-12-31'}
+
+def gerar_resultados(quantidade, semente=1):
+    """Gera resultados normalizados sintéticos."""
+    aleatorio = random.Random(semente)
+    palavras = "knee shoulder hip mri ct fracture tear ligament cartilage tendon bone".split()
+    return [
+        {
+            'titulo': ' '.join(aleatorio.choice(palavras) for _ in range(12)).capitalize(),
+            'autores': "Silva, Ana; Souza, João; Lima, Maria",
+            'revista': "Skeletal Radiology",
+            'data_publicacao': f"20{aleatorio.randint(10, 23)}-0{aleatorio.randint(1, 9)}-1{aleatorio.randint(0, 9)}",
+            'doi': f"10.1000/{i}" if aleatorio.random() > 0.3 else '',
+            'url': f"https://exemplo.org/{i}",
+            'resumo': ' '.join(aleatorio.choice(palavras) for _ in range(150)),
+            'fonte': aleatorio.choice(['pubmed', 'crossref', 'openalex'])
+        }
+        for i in range(quantidade)
+    ]
+
+def exportar_html_legado(resultados, busca, diretorio, nome_arquivo):
+    """Implementação anterior de exportar_html (concatenação), mantida para comparação."""
+    caminho = os.path.join(diretorio, f"{nome_arquivo}.html")
+    html = f"<html><head><title>Resultados da busca: {busca.get('palavras', '')}</title></head><body><table><tbody>"
+    for resultado in resultados:
+        doi_link = f'<a href="https://doi.org/{resultado.get("doi", "")}" target="_blank">{resultado.get("doi", "")}</a>' if resultado.get('doi') else ''
+        html += f"""
+            <tr>
+                <td><a href="{resultado.get('url', '#')}" target="_blank">{resultado.get('titulo', '')}</a></td>
+                <td>{resultado.get('autores', '')}</td>
+                <td>{resultado.get('revista', '')}</td>
+                <td>{exportacao.formatar_data(resultado.get('data_publicacao', ''))}</td>
+                <td>{doi_link}</td>
+                <td>{resultado.get('fonte', '')}</td>
+            </tr>
+        """
+    html += "</tbody></table></body></html>"
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return os.path.basename(caminho)
+
+def medir(funcao, resultados, diretorio):
+    """Retorna o tempo (s) e o pico de memória alocada (MB) de uma exportação."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao(resultados, BUSCA, diretorio, 'bench')
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tempo, pico / 1e6
+
+def main():
+    quantidades = [int(q) for q in sys.argv[1:]] or [1000, 10000]
+    exportadores = [
+        ("html anterior", exportar_html_legado),
+        ("html streaming", exportacao.exportar_html),
+        ("txt streaming", exportacao.exportar_txt),
+    ] + [
+        (f"{formato} streaming", exportacao.EXPORTADORES[formato])
+        for formato in exportacao.FORMATOS_STREAMING
+    ]
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        for quantidade in quantidades:
+            resultados = gerar_resultados(quantidade)
+            print(f"{quantidade} resultados")
+            for nome, funcao in exportadores:
+                tempo, pico = medir(funcao, resultados, diretorio)
+                print(f"  {nome:15s} {tempo * 1000:9.1f} ms  pico {pico:8.2f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de latência das buscas durante exportações pesadas.
+Enquanto uma thread exporta continuamente resultados em Excel e PDF,
+outras threads processam buscas pequenas; mede-se o p50/p99 das buscas
+com a renderização nas threads do servidor e no pool de processos de
+exportação.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_exportacao_concorrente.py [segundos] [resultados exportados]
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import processador, processos_exportacao
+from utils import exportacao
+from bench_exportacao import BUSCA, gerar_resultados as gerar_resultados_exportacao
+from bench_processamento_paralelo import PARAMETROS, gerar_resultados, percentil
+
+def executar(duracao, exportados, pequenos, exportar, diretorio):
+    """Executa a carga mista e retorna as latências das buscas e o número de exportações."""
+    parar = threading.Event()
+    latencias = []
+    exportacoes = [0]
+    
+    def carga_exportacao():
+        while not parar.is_set():
+            for formato in ('excel', 'pdf'):
+                # Busca diferente a cada vez, para não reaproveitar o arquivo
+                busca = dict(BUSCA, palavras=f"{BUSCA['palavras']} {exportacoes[0]}")
+                exportar(formato, exportados, busca, diretorio)
+                exportacoes[0] += 1
+    
+    def carga_busca():
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            processador.processar_resultados([dict(r) for r in pequenos], PARAMETROS)
+            latencias.append(time.perf_counter() - inicio)
+            time.sleep(0.01)
+    
+    threads = [threading.Thread(target=carga_exportacao)]
+    threads += [threading.Thread(target=carga_busca) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    return latencias, exportacoes[0]
+
+def main():
+    duracao = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    exportados = gerar_resultados_exportacao(quantidade)
+    pequenos = gerar_resultados(60, 2)
+    print(f"CPUs: {os.cpu_count()}  resultados exportados: {quantidade}  busca pequena: {len(pequenos)}")
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Referência: buscas sem exportações em andamento
+        latencias, _ = executar(duracao / 2, exportados, pequenos, lambda *args: time.sleep(0.1), diretorio)
+        print(
+            f"sem exportações       : {len(latencias):5d} buscas  "
+            f"p50 {percentil(latencias, 0.50) * 1000:7.1f} ms  "
+            f"p99 {percentil(latencias, 0.99) * 1000:7.1f} ms"
+        )
+        
+        for modo, exportar in (
+            ("exportação em threads", exportacao.exportar),
+            ("pool de processos    ", processos_exportacao.exportar),
+        ):
+            latencias, exportacoes = executar(duracao, exportados, pequenos, exportar, diretorio)
+            print(
+                f"{modo} : {len(latencias):5d} buscas  "
+                f"p50 {percentil(latencias, 0.50) * 1000:7.1f} ms  "
+                f"p99 {percentil(latencias, 0.99) * 1000:7.1f} ms  "
+                f"({exportacoes} exportações)"
+            )
+    
+    processos_exportacao.encerrar_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark da exportação para Excel.
+Compara o pico de memória (RSS) e o tempo da exportação em modo somente
+escrita com a implementação anterior (DataFrame do pandas). Cada medição
+roda em um processo separado, para que o pico de RSS de uma não contamine
+a outra.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_exportacao_excel.py [quantidades...]
+"""
+import os
+import sys
+import json
+import time
+import random
+import resource
+import tempfile
+import subprocess
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRETORIO))
+
+BUSCA = {'palavras': 'knee AND mri', 'periodo_inicio': '2020-01-01', 'periodo_fim': '2024-12-31'}
+
+def gerar_resultados(quantidade, semente=1):
+    """Gera resultados normalizados sintéticos, com resumo."""
+    aleatorio = random.Random(semente)
+    palavras = "knee shoulder hip mri ct fracture tear ligament cartilage tendon bone".split()
+    return [
+        {
+            'titulo': ' '.join(aleatorio.choice(palavras) for _ in range(12)).capitalize(),
+            'autores': "Silva, Ana; Souza, João; Lima, Maria",
+            'revista': "Skeletal Radiology",
+            'data_publicacao': f"20{aleatorio.randint(10, 23)}-0{aleatorio.randint(1, 9)}-1{aleatorio.randint(0, 9)}",
+            'doi': f"10.1000/{i}" if aleatorio.random() > 0.3 else '',
+            'url': f"https://exemplo.org/{i}",
+            'resumo': ' '.join(aleatorio.choice(palavras) for _ in range(150)),
+            'fonte': aleatorio.choice(['pubmed', 'crossref', 'openalex'])
+        }
+        for i in range(quantidade)
+    ]
+
+def exportar_excel_legado(resultados, busca, diretorio, nome_arquivo):
+    """Implementação anterior de exportar_excel (pandas), mantida para comparação."""
+    import pandas as pd
+    from datetime import datetime
+    
+    caminho = os.path.join(diretorio, f"{nome_arquivo}.xlsx")
+    df = pd.DataFrame(resultados)
+    colunas = {
+        'titulo': 'Título',
+        'autores': 'Autores',
+        'revista': 'Revista',
+        'data_publicacao': 'Data de Publicação',
+        'doi': 'DOI',
+        'url': 'URL',
+        'fonte': 'Fonte'
+    }
+    colunas_existentes = {k: v for k, v in colunas.items() if k in df.columns}
+    df = df[list(colunas_existentes.keys())].rename(columns=colunas_existentes)
+    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Resultados', index=False)
+        info_data = {
+            'Informação': ['Data da Exportação', 'Termos de Busca', 'Período', 'Total de Resultados'],
+            'Valor': [
+                datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+                busca.get('palavras', ''),
+                f"{busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}",
+                len(resultados)
+            ]
+        }
+        pd.DataFrame(info_data).to_excel(writer, sheet_name='Informações', index=False)
+    return os.path.basename(caminho)
+
+def medir(implementacao, quantidade):
+    """
+    Executa uma exportação neste processo e imprime, em JSON, o tempo e o
+    acréscimo de RSS em relação ao processo com os dados já carregados.
+    """
+    from utils import exportacao_excel
+    import pandas  # noqa: F401 (carregado nos dois casos, para comparar só a exportação)
+    
+    funcao = exportar_excel_legado if implementacao == 'anterior' else exportacao_excel.exportar_excel
+    resultados = gerar_resultados(quantidade)
+    rss_base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        inicio = time.perf_counter()
+        funcao(resultados, BUSCA, diretorio, 'bench')
+        tempo = time.perf_counter() - inicio
+    
+    rss_pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'tempo': tempo, 'rss_mb': (rss_pico - rss_base) / 1024}))
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--medir':
+        medir(sys.argv[2], int(sys.argv[3]))
+        return
+    
+    quantidades = [int(q) for q in sys.argv[1:]] or [1000, 10000, 50000]
+    for quantidade in quantidades:
+        print(f"{quantidade} resultados")
+        for implementacao in ('anterior', 'somente escrita'):
+            saida = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--medir', implementacao, str(quantidade)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            medicao = json.loads(saida.strip().splitlines()[-1])
+            print(f"  {implementacao:16s} {medicao['tempo'] * 1000:9.1f} ms  "
+                  f"RSS adicional {medicao['rss_mb']:8.1f} MB")
+
+if __name__ == '__main__':
+    main()
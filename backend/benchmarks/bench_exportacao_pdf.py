@@ -0,0 +1,56 @@
+"""
+Benchmark da exportação para PDF.
+Compara a latência por exportação do caminho anterior (HTML temporário em
+disco, relido pelo WeasyPrint com estilo e fontes processados a cada vez)
+com a renderização em memória e renderizador aquecido, e mostra o tempo do
+FPDF usado para tabelas grandes. Requer o WeasyPrint instalado.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_exportacao_pdf.py [quantidade] [repeticoes]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import weasyprint
+from utils import exportacao, exportacao_pdf
+from bench_exportacao import BUSCA, gerar_resultados
+
+def exportar_pdf_legado(resultados, busca, diretorio, nome_arquivo):
+    """Implementação anterior de exportar_pdf (sem fallback), mantida para comparação."""
+    caminho = os.path.join(diretorio, f"{nome_arquivo}.pdf")
+    html_temp = os.path.join(diretorio, f"{nome_arquivo}_temp.html")
+    exportacao.exportar_html(resultados, busca, diretorio, f"{nome_arquivo}_temp")
+    weasyprint.HTML(html_temp).write_pdf(caminho)
+    os.remove(html_temp)
+    return os.path.basename(caminho)
+
+def medir(funcao, resultados, diretorio, repeticoes):
+    """Retorna o tempo médio (ms) da primeira exportação e das seguintes."""
+    tempos = []
+    for i in range(repeticoes + 1):
+        inicio = time.perf_counter()
+        funcao(resultados, BUSCA, diretorio, f"bench_{i}")
+        tempos.append(time.perf_counter() - inicio)
+    return tempos[0] * 1000, sum(tempos[1:]) / repeticoes * 1000
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    resultados = gerar_resultados(quantidade)
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        print(f"{quantidade} resultados, {repeticoes} repetições")
+        for nome, funcao in (
+            ("anterior", exportar_pdf_legado),
+            ("em memória", exportacao_pdf.exportar_pdf),
+            ("fpdf", lambda r, b, d, n: exportacao_pdf.exportar_pdf_fpdf(r, b, os.path.join(d, f"{n}.pdf"))),
+        ):
+            primeira, seguintes = medir(funcao, resultados, diretorio, repeticoes)
+            print(f"  {nome:11s} primeira {primeira:8.1f} ms  seguintes {seguintes:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark da inicialização do servidor.
+Importa o app em um processo novo com `python -X importtime` e mostra o
+tempo total de importação, os pacotes mais caros e se as dependências
+pesadas da exportação (WeasyPrint, FPDF, openpyxl, pandas) foram
+carregadas na inicialização. Elas devem ser importadas apenas na primeira
+exportação do formato correspondente.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_inicializacao.py [repeticoes] [pacotes exibidos]
+"""
+import os
+import sys
+import time
+import subprocess
+
+DIRETORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Limite de tempo esperado para importar o app
+LIMITE_MS = 500.0
+
+# Dependências que não devem ser carregadas na inicialização
+DEPENDENCIAS_PESADAS = ('weasyprint', 'fpdf', 'openpyxl', 'pandas')
+
+def medir_importacao():
+    """
+    Importa o app em um processo novo e lê o relatório do -X importtime.
+    
+    Returns:
+        tuple: (tempo total em ms, {pacote: tempo acumulado em ms}, tempo de parede em ms)
+    """
+    inicio = time.perf_counter()
+    saida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=DIRETORIO_BACKEND, capture_output=True, text=True, check=True
+    ).stderr
+    parede = (time.perf_counter() - inicio) * 1000
+    
+    # Linhas no formato "import time: self [us] | cumulative | imported package"
+    pacotes = {}
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, acumulado, nome = linha[len('import time:'):].split('|')
+        nome = nome.strip()
+        
+        # Apenas pacotes (os submódulos entram no tempo acumulado deles)
+        if '.' not in nome:
+            pacotes[nome] = int(acumulado) / 1000
+    
+    return pacotes.get('app', 0.0), pacotes, parede
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    exibidos = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    
+    # A primeira execução aquece o cache de bytecode e é descartada
+    medir_importacao()
+    medicoes = [medir_importacao() for _ in range(repeticoes)]
+    
+    total = sorted(m[0] for m in medicoes)[len(medicoes) // 2]
+    parede = sorted(m[2] for m in medicoes)[len(medicoes) // 2]
+    pacotes = medicoes[-1][1]
+    
+    print(f"Importação do app (mediana de {repeticoes}): {total:8.1f} ms  "
+          f"processo completo {parede:8.1f} ms")
+    situacao = "ok" if total <= LIMITE_MS else f"acima de {LIMITE_MS} ms"
+    print(f"  situação: {situacao}")
+    
+    print("\nPacotes mais caros (tempo acumulado):")
+    for nome, tempo in sorted(pacotes.items(), key=lambda item: -item[1])[:exibidos]:
+        print(f"  {nome:25s} {tempo:8.1f} ms")
+    
+    carregadas = [nome for nome in DEPENDENCIAS_PESADAS if nome in pacotes]
+    print(f"\nDependências pesadas carregadas na inicialização: {', '.join(carregadas) or 'nenhuma'}")
+
+if __name__ == '__main__':
+    main()
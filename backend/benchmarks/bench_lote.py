@@ -0,0 +1,128 @@
+"""
+Benchmark da busca em lote.
+Executa N variações de termos sobre os mesmos filtros como N buscas
+independentes (motor_busca.buscar_conjunto) e como um lote
+(lote.buscar_lote), comparando o número de chamadas às APIs e o tempo
+total. As APIs são simuladas: cada chamada respeita o limite de taxa de
+utils.conexoes, espera uma latência fixa e devolve os artigos de um corpus
+sintético que satisfazem a consulta. No PubMed, o esearch e o efetch são
+simulados separadamente e contados como chamadas distintas.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_lote.py [consultas] [latência em ms]
+"""
+import os
+import sys
+import time
+import random
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import motor_busca, lote, ranqueamento, conjuntos
+from utils import conexoes
+from adaptadores import pubmed
+
+PALAVRAS = (
+    'knee', 'hip', 'mri', 'fracture', 'cartilage', 'meniscus', 'ankle', 'shoulder',
+    'tendon', 'ligament', 'spine', 'arthroplasty', 'osteoarthritis', 'rupture'
+)
+
+def gerar_corpus(quantidade, semente=42):
+    """Gera artigos sintéticos com títulos sorteados de PALAVRAS."""
+    aleatorio = random.Random(semente)
+    corpus = []
+    for i in range(quantidade):
+        titulo = ' '.join(aleatorio.sample(PALAVRAS, 4))
+        corpus.append({
+            'titulo': f"{titulo} study {i}", 'resumo': "Synthetic abstract.", 'autores': "Silva, A",
+            'revista': "Journal", 'data_publicacao': "2024-05-01", 'doi': f"10.5555/{i}"
+        })
+    return corpus
+
+def simular_apis(corpus, latencia, chamadas):
+    """Substitui a busca de cada adaptador por uma API simulada."""
+    indice = ranqueamento.IndiceBM25()
+    for posicao, artigo in enumerate(corpus):
+        indice.adicionar(posicao, artigo['titulo'], artigo['resumo'])
+    lock = threading.Lock()
+    
+    def chamar(api):
+        conexoes.obter_limitador(api).aguardar()
+        with lock:
+            chamadas[api] = chamadas.get(api, 0) + 1
+        time.sleep(latencia)
+    
+    def criar(api):
+        def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
+            chamar(api)
+            posicoes = indice.satisfazem(ranqueamento.analisar_consulta(termos))
+            return [dict(corpus[p]) for p in posicoes[:limite]]
+        return buscar
+    
+    # O PubMed mantém suas funções de busca; só as requisições são simuladas
+    # (a consulta simulada são os termos, sem os filtros)
+    def buscar_ids(query, limite, inicio=0):
+        chamar('pubmed')
+        posicoes = indice.satisfazem(ranqueamento.analisar_consulta(query))
+        return [str(p) for p in posicoes[inicio:inicio + limite]], len(posicoes)
+    
+    def obter_detalhes_artigos(ids):
+        chamar('pubmed')
+        return [{**corpus[int(pmid)], 'id': f"pubmed-{pmid}"} for pmid in ids]
+    
+    pubmed.construir_query = lambda termos, *filtros: termos
+    pubmed.buscar_ids = buscar_ids
+    pubmed.obter_detalhes_artigos = obter_detalhes_artigos
+    
+    # O Unpaywall não busca por termos e mantém sua função original
+    for api, adaptador in motor_busca.ADAPTADORES.items():
+        if api not in ('unpaywall', 'pubmed'):
+            adaptador.buscar = criar(api)
+
+def limpar():
+    """Descarta os conjuntos em memória e os limitadores (cada rodada começa do zero)."""
+    conjuntos._conjuntos.clear()
+    conexoes._limitadores.clear()
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latencia = (int(sys.argv[2]) if len(sys.argv) > 2 else 200) / 1000
+    
+    # O cache em disco fica desativado para que as duas rodadas consultem as APIs
+    motor_busca.cache.obter_cache = lambda chave: None
+    motor_busca.cache.armazenar_cache = lote.cache.armazenar_cache = lambda chave, resultados: None
+    
+    aleatorio = random.Random(7)
+    consultas = [
+        {'termos': ' '.join(aleatorio.sample(PALAVRAS, 2)), 'data_inicio': '2020-01-01',
+         'data_fim': '2025-12-31', 'limite': 30}
+        for _ in range(quantidade)
+    ]
+    
+    chamadas = {}
+    simular_apis(gerar_corpus(3000), latencia, chamadas)
+    print(f"consultas: {quantidade}  latência simulada: {latencia * 1000:.0f} ms  APIs: {len(motor_busca.ADAPTADORES)}")
+    
+    limpar()
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        motor_busca.buscar_conjunto(**consulta)
+    t_independentes = time.perf_counter() - inicio
+    n_independentes = sum(chamadas.values())
+    print(f"buscas independentes: {n_independentes:4d} chamadas  {t_independentes:7.2f} s")
+    print(f"por API             : {dict(sorted(chamadas.items()))}")
+    
+    limpar()
+    chamadas.clear()
+    inicio = time.perf_counter()
+    resultado = lote.buscar_lote(consultas)
+    t_lote = time.perf_counter() - inicio
+    n_lote = sum(chamadas.values())
+    print(f"busca em lote       : {n_lote:4d} chamadas  {t_lote:7.2f} s  {resultado['chamadas']}")
+    print(f"por API             : {dict(sorted(chamadas.items()))}")
+    print(f"união deduplicada   : {len(resultado['uniao'][1])} resultados")
+    print(f"redução de chamadas : {n_independentes / max(n_lote, 1):.1f}x")
+
+if __name__ == '__main__':
+    main()
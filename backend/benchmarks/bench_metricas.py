@@ -0,0 +1,74 @@
+"""
+Benchmark do custo de registro das métricas.
+Mede o tempo por chamada de Contador.incrementar e Histograma.observar com
+uma e com várias threads, comparando com um contador protegido por lock, e
+o tempo de uma coleta completa (/metrics).
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_metricas.py [chamadas por thread] [threads]
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import metricas
+
+# Custo máximo aceitável por registro
+LIMITE_NS = 2000
+
+class ContadorComLock:
+    """Contador com lock, para comparação."""
+    
+    def __init__(self):
+        self.valores = {}
+        self.lock = threading.Lock()
+    
+    def incrementar(self, *rotulos, valor=1):
+        with self.lock:
+            self.valores[rotulos] = self.valores.get(rotulos, 0) + valor
+
+def medir(funcao, chamadas, threads):
+    """Executa a função em paralelo e retorna o tempo médio por chamada (ns)."""
+    def trabalho():
+        for _ in range(chamadas):
+            funcao()
+    
+    executores = [threading.Thread(target=trabalho) for _ in range(threads)]
+    inicio = time.perf_counter()
+    for executor in executores:
+        executor.start()
+    for executor in executores:
+        executor.join()
+    return (time.perf_counter() - inicio) / (chamadas * threads) * 1e9
+
+def main():
+    chamadas = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    
+    contador = metricas.Contador('bench_contador_total', "Contador do benchmark", ('api',))
+    histograma = metricas.Histograma('bench_latencia_segundos', "Histograma do benchmark", ('api',))
+    com_lock = ContadorComLock()
+    
+    casos = (
+        ("contador com lock", lambda: com_lock.incrementar('pubmed')),
+        ("Contador.incrementar", lambda: contador.incrementar('pubmed')),
+        ("Histograma.observar", lambda: histograma.observar(0.42, 'pubmed')),
+    )
+    for quantidade in (1, threads):
+        for nome, funcao in casos:
+            ns = medir(funcao, chamadas // quantidade, quantidade)
+            print(f"{nome:20s} {quantidade:2d} threads: {ns:7.0f} ns/chamada")
+    
+    inicio = time.perf_counter()
+    texto = metricas.gerar_texto()
+    print(f"coleta completa: {(time.perf_counter() - inicio) * 1000:.2f} ms ({len(texto.splitlines())} linhas)")
+    
+    ns = medir(lambda: histograma.observar(0.42, 'pubmed'), chamadas, 1)
+    situacao = "ok" if ns <= LIMITE_NS else f"acima de {LIMITE_NS} ns"
+    print(f"observar: {ns:.0f} ns ({situacao})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Microbenchmark da normalização de datas.
+Compara normalizar_data com a implementação anterior (strptime em cascata).
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_normalizar_data.py
+"""
+import os
+import re
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import normalizacao
+
+# Amostra com a distribuição típica das fontes: a maioria ISO, alguns anos
+# isolados (Semantic Scholar), datas textuais (Thieme) e valores inválidos
+AMOSTRA = (
+    ["2023-01-15", "2022-11-03", "2021-07-30", "2024-02-29"] * 40
+    + ["2023", "2021", "2019"] * 15
+    + ["2023-05", "2022-12"] * 10
+    + ["January 15, 2023", "15 March 2022", "15/01/2023"] * 5
+    + ["sem data", "n.d."] * 3
+)
+
+def normalizar_data_legado(data_str):
+    """Implementação anterior de normalizar_data, mantida para comparação."""
+    if not data_str:
+        return ""
+    formatos = [
+        "%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y",
+        "%d.%m.%Y", "%B %d, %Y", "%d %B %Y", "%Y-%m", "%Y"
+    ]
+    for formato in formatos:
+        try:
+            return datetime.strptime(data_str, formato).strftime("%Y-%m-%d")
+        except:
+            continue
+    match = re.search(r'\b(19|20)\d{2}\b', data_str)
+    if match:
+        return f"{match.group(0)}-01-01"
+    return ""
+
+def medir(funcao, repeticoes=20):
+    """Retorna o melhor tempo (em microssegundos) por data normalizada."""
+    tempos = timeit.repeat(lambda: [funcao(d) for d in AMOSTRA], number=1, repeat=repeticoes)
+    return min(tempos) / len(AMOSTRA) * 1e6
+
+def main():
+    # Garante que as duas implementações concordam nos formatos comuns
+    for data in AMOSTRA:
+        if data in ("sem data", "n.d."):
+            continue
+        assert normalizacao.normalizar_data(data) == normalizar_data_legado(data), data
+
+    legado = medir(normalizar_data_legado)
+
+    normalizacao._normalizar_data_cache.cache_clear()
+    frio = min(
+        timeit.repeat(
+            lambda: (normalizacao._normalizar_data_cache.cache_clear(),
+                     [normalizacao.normalizar_data(d) for d in AMOSTRA]),
+            number=1, repeat=20
+        )
+    ) / len(AMOSTRA) * 1e6
+    quente = medir(normalizacao.normalizar_data)
+
+    print(f"Amostra: {len(AMOSTRA)} datas")
+    print(f"Implementação anterior:     {legado:8.2f} us/data")
+    print(f"Nova (cache vazio):         {frio:8.2f} us/data  ({legado / frio:.1f}x)")
+    print(f"Nova (cache aquecido):      {quente:8.2f} us/data  ({legado / quente:.1f}x)")
+
+if __name__ == '__main__':
+    main()
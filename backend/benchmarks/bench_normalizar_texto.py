@@ -0,0 +1,90 @@
+"""
+Benchmark de vazão (MB/s) da normalização de textos.
+Compara normalizar_texto, normalizar_lote e normalizar_autores com as
+implementações anteriores, usando resumos no formato JATS do Crossref.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_normalizar_texto.py
+"""
+import os
+import re
+import sys
+import json
+import timeit
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRETORIO))
+
+from utils import normalizacao
+
+# Resumos de exemplo, multiplicados para aproximar o volume de uma busca grande
+with open(os.path.join(DIRETORIO, 'dados', 'resumos_crossref.json'), encoding='utf-8') as f:
+    RESUMOS = json.load(f) * 100
+
+AUTORES = [
+    "Smith, John; Doe, Jane and Roe, Richard",
+    "Maria  Silva, João Souza & Ana Lima",
+    "Müller, Hans; Schmidt, Anna; et al.",
+    "Alice Brown and Bob White",
+] * 500
+
+def normalizar_texto_legado(texto):
+    """Implementação anterior de normalizar_texto, mantida para comparação."""
+    if not texto:
+        return ""
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    texto = re.sub(r'<[^>]+>', '', texto)
+    return texto
+
+def normalizar_autores_legado(autores_str):
+    """Implementação anterior de normalizar_autores, mantida para comparação."""
+    if not autores_str:
+        return ""
+    autores_str = re.sub(r'\s+', ' ', autores_str).strip()
+    for sep in [', and ', ' and ', ', & ', ' & ', '; ']:
+        autores_str = autores_str.replace(sep, '; ')
+    autores = []
+    for autor in autores_str.split(';'):
+        autor = autor.strip()
+        if autor:
+            if ',' in autor:
+                partes = autor.split(',', 1)
+                sobrenome = partes[0].strip()
+                nome = partes[1].strip() if len(partes) > 1 else ""
+                autores.append(f"{sobrenome}, {nome}" if nome else sobrenome)
+            else:
+                partes = autor.split()
+                if len(partes) > 1:
+                    autores.append(f"{partes[-1]}, {' '.join(partes[:-1])}")
+                else:
+                    autores.append(autor)
+    return '; '.join(autores)
+
+def vazao(funcao, textos, repeticoes=10):
+    """Retorna a vazão em MB/s de funcao aplicada a cada texto."""
+    total_bytes = sum(len(t.encode('utf-8')) for t in textos)
+    tempo = min(timeit.repeat(lambda: funcao(textos), number=1, repeat=repeticoes))
+    return total_bytes / tempo / 1e6
+
+def main():
+    total_mb = sum(len(t.encode('utf-8')) for t in RESUMOS) / 1e6
+    print(f"Resumos: {len(RESUMOS)} ({total_mb:.2f} MB)")
+    print("Exemplo normalizado:")
+    print(f"  {normalizacao.normalizar_texto(RESUMOS[0])[:160]}...")
+    print()
+
+    legado = vazao(lambda ts: [normalizar_texto_legado(t) for t in ts], RESUMOS)
+    novo = vazao(lambda ts: [normalizacao.normalizar_texto(t) for t in ts], RESUMOS)
+    lote = vazao(normalizacao.normalizar_lote, RESUMOS)
+    print(f"normalizar_texto anterior:  {legado:8.1f} MB/s (sem decodificar entidades)")
+    print(f"normalizar_texto:           {novo:8.1f} MB/s ({novo / legado:.2f}x)")
+    print(f"normalizar_lote:            {lote:8.1f} MB/s ({lote / legado:.2f}x)")
+    print()
+
+    legado = vazao(lambda ts: [normalizar_autores_legado(t) for t in ts], AUTORES)
+    novo = vazao(lambda ts: [normalizacao.normalizar_autores(t) for t in ts], AUTORES)
+    print(f"normalizar_autores anterior: {legado:7.1f} MB/s")
+    print(f"normalizar_autores:          {novo:7.1f} MB/s ({novo / legado:.2f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark da paginação profunda.
+Percorre as N primeiras páginas de uma busca de dois modos: refazendo a
+busca com um limite maior a cada página (o único modo de aprofundar uma
+busca sem cursores, ao custo de receber de novo tudo o que já foi
+entregue) e com core.paginacao, que continua cada API do cursor em que
+parou. As APIs são simuladas: cada chamada espera uma latência fixa e
+devolve uma fatia de um corpus sintético próprio, com parte dos artigos
+repetida entre as APIs.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_paginacao.py [páginas] [tamanho da página] [latência em ms]
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import motor_busca, paginacao, conjuntos
+from utils import conexoes
+
+# Artigos de cada API simulada e fração compartilhada com as demais
+ARTIGOS_POR_API = 2000
+FRACAO_COMPARTILHADA = 0.3
+
+def gerar_corpus(api, quantidade):
+    """Gera os artigos de uma API, intercalando os comuns a todas."""
+    corpus = []
+    for i in range(quantidade):
+        chave = f"comum{i}" if i % 10 < FRACAO_COMPARTILHADA * 10 else f"{api}{i}"
+        corpus.append({
+            'titulo': f"Synthetic knee study {chave}", 'resumo': "Synthetic abstract.", 'autores': "Silva, A",
+            'revista': "Journal", 'data_publicacao': f"2024-{i % 12 + 1:02d}-01", 'doi': f"10.5555/{chave}"
+        })
+    return corpus
+
+def simular_apis(latencia, chamadas, recebidos):
+    """Substitui a busca de cada adaptador por uma API simulada paginada."""
+    lock = threading.Lock()
+    
+    def criar(api):
+        corpus = gerar_corpus(api, ARTIGOS_POR_API)
+        
+        def buscar_pagina(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, cursor=None):
+            inicio = int(cursor or 0)
+            with lock:
+                chamadas[api] = chamadas.get(api, 0) + 1
+                recebidos[api] = recebidos.get(api, 0) + len(corpus[inicio:inicio + limite])
+            time.sleep(latencia)
+            fim = inicio + limite
+            return [dict(artigo) for artigo in corpus[inicio:fim]], (str(fim) if fim < len(corpus) else None)
+        
+        def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
+            return buscar_pagina(termos, autor, data_inicio, data_fim, revistas, limite)[0]
+        
+        return buscar, buscar_pagina
+    
+    # O Unpaywall não busca por termos e mantém suas funções originais
+    for api, adaptador in motor_busca.ADAPTADORES.items():
+        if api != 'unpaywall':
+            adaptador.buscar, adaptador.buscar_pagina = criar(api)
+
+def main():
+    paginas = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    tamanho = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    latencia = (int(sys.argv[3]) if len(sys.argv) > 3 else 200) / 1000
+    
+    # Sem cache em disco e sem limite de taxa: só as chamadas são comparadas
+    motor_busca.cache.obter_cache = paginacao.cache.obter_cache = lambda chave: None
+    motor_busca.cache.armazenar_cache = paginacao.cache.armazenar_cache = lambda chave, resultados: None
+    conexoes.LIMITES_TAXA.clear()
+    
+    chamadas, recebidos = {}, {}
+    simular_apis(latencia, chamadas, recebidos)
+    filtros = {'termos': 'knee', 'data_inicio': '2020-01-01', 'data_fim': '2025-12-31'}
+    print(f"páginas: {paginas}  tamanho: {tamanho}  latência simulada: {latencia * 1000:.0f} ms")
+    
+    # Sem cursores: cada página refaz a busca pedindo o suficiente para alcançá-la
+    inicio = time.perf_counter()
+    for numero in range(1, paginas + 1):
+        conjuntos._conjuntos.clear()
+        _, resultados = motor_busca.buscar_conjunto(**filtros, limite=numero * tamanho)
+        pagina = resultados[(numero - 1) * tamanho:numero * tamanho]
+    t_refazendo = time.perf_counter() - inicio
+    print(f"refazendo a busca   : {sum(chamadas.values()):4d} chamadas  {sum(recebidos.values()):6d} recebidos  "
+          f"{t_refazendo:7.2f} s  (última página: {len(pagina)})")
+    
+    chamadas.clear()
+    recebidos.clear()
+    inicio = time.perf_counter()
+    pagina = paginacao.iniciar(**filtros, tamanho=tamanho)
+    entregues = {r['doi'] for r in pagina['resultados']}
+    for _ in range(paginas - 1):
+        pagina = paginacao.continuar(pagina['token'], tamanho=tamanho)
+        entregues.update(r['doi'] for r in pagina['resultados'])
+    t_cursores = time.perf_counter() - inicio
+    print(f"paginação profunda  : {sum(chamadas.values()):4d} chamadas  {sum(recebidos.values()):6d} recebidos  "
+          f"{t_cursores:7.2f} s  (entregues: {pagina['entregues']}, distintos: {len(entregues)})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark de latência sob carga mista do processamento de resultados.
+Enquanto uma thread processa buscas grandes continuamente, outras threads
+processam buscas pequenas; mede-se o p50/p99 das buscas pequenas com e sem
+o pool de processos.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_processamento_paralelo.py [segundos]
+"""
+import os
+import sys
+import time
+import random
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import paralelismo, processador
+
+PALAVRAS = (
+    "knee shoulder hip spine mri ct ultrasound fracture tear ligament cartilage "
+    "tendon bone marrow edema lesion tumour arthroplasty imaging radiography "
+    "musculoskeletal osteoarthritis rotator cuff meniscus labrum stress injury"
+).split()
+
+# Vocabulário amplo de pseudo-palavras, próximo da diversidade de títulos reais
+SILABAS = "ra di o lo gia ar tro plas ti ca os te mu cu lo ske le tal ten di no se".split()
+VOCABULARIO = PALAVRAS + [
+    ''.join(random.Random(i).choice(SILABAS) for _ in range(3 + i % 3)) for i in range(3000)
+]
+
+PARAMETROS = {'data_inicio': '2000-01-01', 'data_fim': '2030-12-31', 'revistas': []}
+
+def gerar_resultados(quantidade, semente):
+    """Gera resultados brutos sintéticos, com ~30% sem DOI e duplicatas."""
+    aleatorio = random.Random(semente)
+    resultados = []
+    for i in range(quantidade):
+        titulo = ' '.join(aleatorio.choice(VOCABULARIO) for _ in range(aleatorio.randint(6, 14)))
+        resumo = ' '.join(aleatorio.choice(PALAVRAS) for _ in range(200))
+        resultados.append({
+            'id': '',
+            'titulo': f"<i>{titulo.capitalize()}</i>",
+            'autores': "Silva, Ana; Souza, João and Lima, Maria",
+            'revista': "Skeletal  Radiology",
+            'data_publicacao': f"20{aleatorio.randint(10, 23)}-0{aleatorio.randint(1, 9)}-1{aleatorio.randint(0, 9)}",
+            'doi': f"10.1000/{i}" if aleatorio.random() > 0.3 else '',
+            'url': f"https://exemplo.org/{i}",
+            'resumo': f"<jats:p>{resumo}</jats:p>",
+            'fonte': aleatorio.choice(['pubmed', 'crossref', 'openalex'])
+        })
+    return resultados
+
+def percentil(valores, p):
+    """Retorna o percentil p (0 a 1) de uma lista de valores."""
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def executar(duracao, grandes, pequenos):
+    """Executa a carga mista e retorna as latências das buscas pequenas."""
+    parar = threading.Event()
+    latencias = []
+    
+    def carga_grande():
+        while not parar.is_set():
+            processador.processar_resultados([dict(r) for r in grandes], PARAMETROS)
+    
+    def carga_pequena():
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            processador.processar_resultados([dict(r) for r in pequenos], PARAMETROS)
+            latencias.append(time.perf_counter() - inicio)
+            time.sleep(0.01)
+    
+    threads = [threading.Thread(target=carga_grande)]
+    threads += [threading.Thread(target=carga_pequena) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    return latencias
+
+def main():
+    duracao = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    grandes = gerar_resultados(3000, 1)
+    pequenos = gerar_resultados(60, 2)
+    print(f"CPUs: {os.cpu_count()}  busca grande: {len(grandes)}  busca pequena: {len(pequenos)}")
+    
+    for habilitado in (False, True):
+        paralelismo.configurar(habilitado=habilitado)
+        if habilitado:
+            # Aquece o pool para não medir a criação dos processos
+            processador.processar_resultados([dict(r) for r in grandes], PARAMETROS)
+        latencias = executar(duracao, grandes, pequenos)
+        modo = "pool de processos" if habilitado else "somente threads  "
+        print(
+            f"{modo}: {len(latencias):5d} buscas pequenas  "
+            f"p50 {percentil(latencias, 0.50) * 1000:7.1f} ms  "
+            f"p99 {percentil(latencias, 0.99) * 1000:7.1f} ms"
+        )
+    
+    paralelismo.encerrar_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark do ranqueamento local por relevância (BM25 + posição nas fontes).
+Mede, para 500 resultados com resumo, o custo de indexação (feito pelo
+mesclador à medida que as fontes respondem) e o tempo do ranqueamento.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_ranqueamento.py
+"""
+import os
+import sys
+import json
+import random
+import timeit
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRETORIO))
+
+from core import processador, ranqueamento
+from utils import normalizacao
+
+# Limite de tempo esperado para 500 resultados
+LIMITE_MS = 5.0
+
+CONSULTAS = [
+    "knee MRI",
+    "(rotator cuff OR shoulder) AND ultrasound",
+    "fracture AND (MRI OR CT) NOT pediatric",
+    '"stress fracture" athletes',
+]
+
+def gerar_resultados(quantidade, semente=1):
+    """Gera resultados normalizados a partir dos resumos de exemplo."""
+    with open(os.path.join(DIRETORIO, 'dados', 'resumos_crossref.json'), encoding='utf-8') as f:
+        resumos = [normalizacao.normalizar_texto(r) for r in json.load(f)]
+    
+    aleatorio = random.Random(semente)
+    resultados = []
+    for i in range(quantidade):
+        resumo = aleatorio.choice(resumos)
+        palavras = resumo.split()
+        inicio = aleatorio.randrange(len(palavras) - 12)
+        resultados.append({
+            'id': f"r{i}",
+            'titulo': ' '.join(palavras[inicio:inicio + 12]),
+            'resumo': resumo if aleatorio.random() > 0.2 else '',
+            'data_publicacao': f"20{aleatorio.randint(10, 23)}-01-01",
+        })
+    posicoes = [[aleatorio.randrange(100)] for _ in range(quantidade)]
+    return resultados, posicoes
+
+def main():
+    resultados, posicoes = gerar_resultados(500)
+    chaves = list(range(len(resultados)))
+    print(f"Resultados: {len(resultados)}")
+    
+    def indexar():
+        indice = ranqueamento.IndiceBM25()
+        for chave, resultado in zip(chaves, resultados):
+            indice.adicionar(chave, resultado['titulo'], resultado['resumo'])
+        return indice
+    
+    tempo = min(timeit.repeat(indexar, number=1, repeat=10)) * 1000
+    print(f"Indexação (na chegada dos resultados): {tempo:6.2f} ms")
+    indice = indexar()
+    
+    for consulta in CONSULTAS:
+        termos = normalizacao.normalizar_termos_busca(consulta)
+        tempo = min(timeit.repeat(
+            lambda: processador.ranquear_resultados(resultados, termos, posicoes, indice, chaves),
+            number=1, repeat=50
+        )) * 1000
+        situacao = "ok" if tempo <= LIMITE_MS else f"acima de {LIMITE_MS} ms"
+        print(f"{consulta:45s} {tempo:6.2f} ms  {situacao}")
+
+if __name__ == '__main__':
+    main()
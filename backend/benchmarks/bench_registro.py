@@ -0,0 +1,113 @@
+"""
+Benchmark do custo dos logs por requisição de busca.
+Reproduz as linhas registradas em uma busca (requisição, motor de busca,
+seis APIs, processamento e cache) e mede o tempo gasto na thread da
+requisição com a configuração anterior (FileHandler síncrono, f-strings e o
+corpo inteiro da requisição no log) e com utils.registro (fila, formatação
+na thread de gravação), com e sem amostragem.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_registro.py [requisições]
+"""
+import os
+import sys
+import time
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import registro
+
+APIS = ('pubmed', 'crossref', 'semantic_scholar', 'openalex', 'unpaywall', 'thieme')
+
+DADOS = {
+    'palavras': 'knee AND (mri OR "magnetic resonance") AND cartilage',
+    'autor': '',
+    'periodo_inicio': '2020-01-01',
+    'periodo_fim': '2024-12-31',
+    'revistas': ['ajr', 'radiology', 'skeletal_radiology', 'european_radiology'] * 10,
+    'limite': 100
+}
+
+def requisicao_anterior(loggers):
+    """Linhas de uma busca como eram registradas antes (f-strings, corpo inteiro)."""
+    app, motor, adaptadores, processador, cache = loggers
+    app.info(f"Recebida requisição de busca: {DADOS}")
+    motor.info(f"Iniciando busca: termos='{DADOS['palavras']}', autor='', período=2020-01-01 a 2024-12-31, revistas={DADOS['revistas']}")
+    for api in APIS:
+        motor.info(f"Iniciando busca na API: {api}")
+        adaptadores.info(f"Iniciando busca no {api}: {DADOS['palavras']}")
+        adaptadores.info(f"Busca no {api} concluída: {100} resultados")
+        motor.info(f"API {api}: {100} resultados encontrados")
+        processador.info(f"Processando {100} resultados brutos")
+    processador.info(f"Processamento concluído: {480} resultados finais")
+    motor.info(f"Busca concluída em {1.2345:.2f}s. Total de resultados: {480}")
+    cache.info(f"Cache armazenado para chave: {'0' * 32}")
+
+def requisicao_atual(loggers):
+    """Linhas de uma busca com formatação adiada e resumo da requisição."""
+    app, motor, adaptadores, processador, cache = loggers
+    app.info("Recebida requisição de busca: palavras=%.200r revistas=%s limite=%s",
+             DADOS['palavras'], len(DADOS['revistas']), DADOS['limite'])
+    motor.info("Iniciando busca: termos='%s', autor='%s', período=%s a %s, revistas=%s",
+               DADOS['palavras'], '', '2020-01-01', '2024-12-31', DADOS['revistas'])
+    for api in APIS:
+        motor.info("Iniciando busca na API: %s", api)
+        adaptadores.info("Iniciando busca no %s: %s", api, DADOS['palavras'])
+        adaptadores.info("Busca no %s concluída: %s resultados", api, 100)
+        motor.info("API %s: %s resultados encontrados", api, 100)
+        processador.info("Processando %s resultados brutos", 100)
+    processador.info("Processamento concluído: %s resultados finais", 480)
+    motor.info("Busca concluída em %.2fs. Total de resultados: %s", 1.2345, 480)
+    cache.info("Cache armazenado para chave: %s", '0' * 32)
+
+def medir(requisicao, quantidade):
+    """
+    Retorna o tempo de CPU médio (µs) gasto na thread da requisição (a
+    gravação em segundo plano não entra na conta, mesmo com uma só CPU).
+    """
+    loggers = [logging.getLogger(nome) for nome in (
+        'app', 'core.motor_busca', 'adaptadores.pubmed', 'core.processador', 'core.cache'
+    )]
+    inicio = time.thread_time()
+    for i in range(quantidade):
+        registro.definir_id_requisicao(f"{i * 2654435761 % 0xFFFFFFFF:08x}")
+        requisicao(loggers)
+    return (time.thread_time() - inicio) / quantidade * 1e6
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    # A saída no terminal vai para /dev/null para não dominar a medição
+    sys.stderr = open(os.devnull, 'w')
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = os.path.join(diretorio, 'buscador.log')
+        
+        # Configuração anterior: logging.basicConfig com FileHandler síncrono
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[logging.FileHandler(arquivo), logging.StreamHandler()]
+        )
+        antes = medir(requisicao_anterior, quantidade)
+        
+        registro.configurar(arquivo=arquivo)
+        depois = medir(requisicao_atual, quantidade)
+        
+        registro.configurar(amostragem=0.1)
+        amostrado = medir(requisicao_atual, quantidade)
+        
+        registro.configurar(formato='json', amostragem=1.0)
+        json_ = medir(requisicao_atual, quantidade)
+        registro.encerrar()
+    
+    print(f"linhas por requisição: {5 + 5 * len(APIS)}  requisições: {quantidade}", file=sys.__stdout__)
+    print(f"anterior (FileHandler, f-strings) : {antes:8.1f} µs/requisição", file=sys.__stdout__)
+    print(f"fila, formatação adiada           : {depois:8.1f} µs/requisição ({antes / depois:.1f}x)", file=sys.__stdout__)
+    print(f"fila, JSON                        : {json_:8.1f} µs/requisição", file=sys.__stdout__)
+    print(f"fila, amostragem 10%              : {amostrado:8.1f} µs/requisição ({antes / amostrado:.1f}x)", file=sys.__stdout__)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark das respostas JSON de /api/buscar.
+Compara, para uma página de resultados, o tempo da codificação com o
+jsonify do Flask e com utils.respostas (orjson), o tamanho enviado sem
+compressão, com gzip e com brotli, e o tempo de uma resposta reaproveitada
+do conjunto em memória.
+
+Uso (a partir do diretório backend):
+    python benchmarks/bench_respostas.py [resultados por página] [repetições]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+
+from utils import respostas
+from bench_exportacao import gerar_resultados
+
+def medir(funcao, repeticoes):
+    """Retorna o tempo médio (ms) de uma chamada."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    pagina = {"status": "ok", "id": "0" * 32, "resultados": gerar_resultados(quantidade), "cursor": None, "total": quantidade}
+    print(f"resultados: {quantidade}  orjson: {'sim' if respostas.orjson else 'não'}  brotli: {'sim' if respostas.brotli else 'não'}")
+    
+    app = Flask(__name__)
+    with app.app_context():
+        t_jsonify = medir(lambda: jsonify(pagina).get_data(), repeticoes)
+    t_codificar = medir(lambda: respostas.codificar(pagina), repeticoes)
+    print(f"jsonify             : {t_jsonify:8.2f} ms")
+    print(f"respostas.codificar : {t_codificar:8.2f} ms  ({t_jsonify / t_codificar:.1f}x)")
+    
+    corpo = respostas.CorpoJSON(pagina)
+    print(f"sem compressão      : {len(corpo.corpo) / 1024:8.1f} KiB")
+    for codificacao in ('gzip', 'br'):
+        if codificacao == 'br' and respostas.brotli is None:
+            continue
+        t_comprimir = medir(lambda: respostas.comprimir(corpo.corpo, codificacao), max(1, repeticoes // 5))
+        print(f"{codificacao:20s}: {len(corpo.obter(codificacao)) / 1024:8.1f} KiB  ({t_comprimir:.2f} ms)")
+    
+    # Resposta reaproveitada: bytes já codificados e comprimidos
+    t_reaproveitada = medir(lambda: corpo.obter('gzip'), repeticoes * 100)
+    print(f"reaproveitada       : {t_reaproveitada:8.4f} ms")
+
+if __name__ == '__main__':
+    main()
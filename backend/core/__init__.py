@@ -5,6 +5,15 @@ Arquivo de inicialização para o pacote core.
 from . import motor_busca
 from . import processador
 from . import cache
+from . import paralelismo
+from . import ranqueamento
+from . import conjuntos
+from . import lote
+from . import paginacao
+from . import buscas_salvas
+from . import aquecimento
+from . import processos_exportacao
+from . import fila_exportacao
 
 # Versão do pacote
 __version__ = '0.1.0'
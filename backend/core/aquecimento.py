@@ -0,0 +1,289 @@
+"""
+Aquecimento do cache de buscas.
+Registra a popularidade das buscas feitas em /api/buscar (uma contagem
+que perde metade do valor a cada MEIA_VIDA) e, em uma thread de segundo
+plano, refaz as mais populares e as da lista de aquecimento pouco antes de
+expirarem no cache, para que o primeiro usuário depois da expiração (ou de
+um reinício) não espere a consulta a todas as APIs.
+
+As requisições do aquecimento são de segundo plano (ver
+utils.conexoes.segundo_plano): só usam uma API quando nenhuma busca
+interativa do processo está em andamento e o limite de requisições dela,
+compartilhado por todos os processos, não foi usado recentemente por
+nenhum deles. Cada processo conta a popularidade das suas próprias
+requisições; um arquivo de marcação no diretório do cache impede que dois
+workers refaçam a mesma busca ao mesmo tempo, e a idade do cache em disco
+evita que a refaçam em seguida.
+"""
+import os
+import json
+import time
+import logging
+import threading
+
+from core import motor_busca, cache
+from utils import conexoes, validacao, metricas
+
+logger = logging.getLogger(__name__)
+
+# Liga ou desliga o registro de popularidade e o aquecimento
+HABILITADO = True
+
+# Buscas populares mantidas aquecidas (além das da lista de aquecimento)
+MAX_AQUECIDAS = 20
+
+# Popularidade mínima para uma busca ser aquecida (1.5: ao menos duas buscas recentes)
+POPULARIDADE_MINIMA = 1.5
+
+# Tempo (em segundos) para a popularidade de uma busca cair pela metade
+MEIA_VIDA = 6 * 3600
+
+# Buscas cuja popularidade é registrada (as menos populares saem primeiro)
+MAX_REGISTRADAS = 1000
+
+# Antecedência (em segundos) em relação à expiração do cache para refazer a busca
+ANTECEDENCIA = 300
+
+# Intervalo (em segundos) entre as verificações da thread de aquecimento
+INTERVALO = 30
+
+# Tempo (em segundos) após o qual a marcação de uma busca em aquecimento é
+# considerada abandonada (ex.: o worker que a criou foi encerrado)
+TEMPO_MARCACAO = 600
+
+# Buscas registradas: chave de cache -> dados da busca
+_registradas = {}
+_lock = threading.Lock()
+
+_trabalhador = None
+_pid = None
+_parar = threading.Event()
+
+def configurar(habilitado=None, max_aquecidas=None, antecedencia=None, arquivo_lista=None):
+    """
+    Ajusta o aquecimento do cache.
+    
+    Args:
+        habilitado (bool, opcional): Liga ou desliga o aquecimento
+        max_aquecidas (int, opcional): Buscas populares mantidas aquecidas
+        antecedencia (int, opcional): Segundos antes da expiração para refazer a busca
+        arquivo_lista (str, opcional): Lista de aquecimento (ver carregar_lista)
+    """
+    global HABILITADO, MAX_AQUECIDAS, ANTECEDENCIA
+    
+    if habilitado is not None:
+        HABILITADO = bool(habilitado)
+    if max_aquecidas is not None:
+        MAX_AQUECIDAS = max(0, int(max_aquecidas))
+    if antecedencia is not None:
+        ANTECEDENCIA = int(antecedencia)
+    if arquivo_lista:
+        carregar_lista(arquivo_lista)
+
+def carregar_lista(arquivo):
+    """
+    Carrega a lista de aquecimento: buscas mantidas aquecidas
+    independentemente da popularidade.
+    
+    O arquivo JSON tem o formato do corpo de /api/buscar/lote ('consultas'
+    e os campos comuns) ou é apenas a lista de consultas.
+    
+    Args:
+        arquivo (str): Caminho do arquivo
+    
+    Returns:
+        int: Número de buscas carregadas
+    """
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Erro ao carregar a lista de aquecimento {arquivo}: {str(e)}")
+        return 0
+    
+    if isinstance(dados, list):
+        dados = {'consultas': dados}
+    
+    carregadas = 0
+    for consulta in validacao.expandir_consultas_lote(dados):
+        if not validacao.validar_parametros_busca(consulta):
+            logger.warning("Consulta ignorada na lista de aquecimento: %.200r", consulta)
+            continue
+        consulta = _converter(consulta)
+        chave_cache, _, _ = motor_busca.preparar_parametros(**consulta)
+        with _lock:
+            _registradas[chave_cache] = {'consulta': consulta, 'popularidade': 0.0, 'atualizada_em': time.time(),
+                                         'fixa': True}
+        carregadas += 1
+    
+    logger.info("Lista de aquecimento carregada: %s buscas", carregadas)
+    return carregadas
+
+def registrar(chave_cache, consulta):
+    """
+    Registra uma busca interativa (chamada por /api/buscar).
+    
+    Args:
+        chave_cache (str): Chave de cache da busca
+        consulta (dict): Argumentos de motor_busca.buscar_conjunto
+    """
+    if not HABILITADO:
+        return
+    
+    agora = time.time()
+    with _lock:
+        registro = _registradas.get(chave_cache)
+        if registro is None:
+            registro = _registradas[chave_cache] = {
+                'consulta': consulta, 'popularidade': 0.0, 'atualizada_em': agora, 'fixa': False
+            }
+        registro['popularidade'] = popularidade(registro, agora) + 1
+        registro['atualizada_em'] = agora
+        
+        if len(_registradas) > MAX_REGISTRADAS:
+            # Descarta a busca menos popular (as da lista de aquecimento ficam)
+            menos_popular = min(
+                (chave for chave, item in _registradas.items() if not item['fixa']),
+                key=lambda chave: popularidade(_registradas[chave], agora), default=None
+            )
+            if menos_popular is not None:
+                del _registradas[menos_popular]
+
+def popularidade(registro, agora):
+    """Popularidade de uma busca registrada no momento informado."""
+    return registro['popularidade'] * 0.5 ** ((agora - registro['atualizada_em']) / MEIA_VIDA)
+
+def selecionar(agora=None):
+    """
+    Seleciona as buscas a manter aquecidas.
+    
+    Args:
+        agora (float, opcional): Momento da seleção (padrão: agora)
+    
+    Returns:
+        list: Argumentos de motor_busca.buscar_conjunto de cada busca: as da
+            lista de aquecimento seguidas das MAX_AQUECIDAS mais populares
+    """
+    agora = agora or time.time()
+    with _lock:
+        fixas = [item['consulta'] for item in _registradas.values() if item['fixa']]
+        populares = sorted(
+            (item for item in _registradas.values()
+             if not item['fixa'] and popularidade(item, agora) >= POPULARIDADE_MINIMA),
+            key=lambda item: popularidade(item, agora), reverse=True
+        )
+    return fixas + [item['consulta'] for item in populares[:MAX_AQUECIDAS]]
+
+def aquecer():
+    """
+    Refaz as buscas selecionadas que não estão em cache ou que expiram em
+    menos de ANTECEDENCIA segundos.
+    
+    Returns:
+        int: Número de buscas refeitas
+    """
+    refeitas = 0
+    for consulta in selecionar():
+        if _parar.is_set():
+            break
+        
+        # A chave é recalculada: sem período informado, ela muda com a data
+        chave_cache, _, _ = motor_busca.preparar_parametros(**consulta)
+        idade = cache.idade_cache(chave_cache)
+        if idade is not None and idade < cache.CACHE_TIMEOUT - ANTECEDENCIA:
+            continue
+        if not _marcar(chave_cache):
+            continue
+        
+        try:
+            with conexoes.segundo_plano():
+                motor_busca.buscar_conjunto(**consulta, ignorar_cache=True)
+            metricas.AQUECIMENTOS_CACHE.incrementar('atualizada')
+            refeitas += 1
+        except Exception as e:
+            logger.error(f"Erro ao aquecer o cache da busca {chave_cache}: {str(e)}")
+            metricas.AQUECIMENTOS_CACHE.incrementar('erro')
+        finally:
+            _desmarcar(chave_cache)
+    
+    if refeitas:
+        logger.info("Aquecimento do cache: %s buscas refeitas", refeitas)
+    return refeitas
+
+def iniciar():
+    """
+    Inicia a thread de aquecimento deste processo (chamada pelo servidor em
+    cada processo que atende requisições; as chamadas repetidas são ignoradas).
+    """
+    global _trabalhador, _pid
+    
+    if not HABILITADO:
+        return
+    
+    with _lock:
+        if _trabalhador is not None and _pid == os.getpid() and _trabalhador.is_alive():
+            return
+        _parar.clear()
+        _trabalhador = threading.Thread(target=_executar, name='aquecimento-cache', daemon=True)
+        _pid = os.getpid()
+        _trabalhador.start()
+
+def parar():
+    """Encerra a thread de aquecimento após a busca em andamento."""
+    _parar.set()
+
+def _executar():
+    """Laço da thread de aquecimento (a lista de aquecimento é refeita logo ao iniciar)."""
+    while not _parar.is_set():
+        try:
+            aquecer()
+        except Exception as e:
+            logger.error(f"Erro no aquecimento do cache: {str(e)}")
+        _parar.wait(INTERVALO)
+
+def _caminho_marcacao(chave_cache):
+    """Arquivo que marca uma busca em aquecimento."""
+    return os.path.join(cache.CACHE_DIR, f"{chave_cache}.aquecendo")
+
+def _marcar(chave_cache):
+    """
+    Marca uma busca como em aquecimento por este processo.
+    
+    Returns:
+        bool: False se outro processo já está aquecendo a busca
+    """
+    caminho = _caminho_marcacao(chave_cache)
+    try:
+        if time.time() - os.path.getmtime(caminho) > TEMPO_MARCACAO:
+            os.remove(caminho)
+    except OSError:
+        pass
+    
+    try:
+        os.makedirs(cache.CACHE_DIR, exist_ok=True)
+        os.close(os.open(caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        return False
+    except OSError as e:
+        logger.error(f"Erro ao marcar a busca {chave_cache} para aquecimento: {str(e)}")
+        return False
+
+def _desmarcar(chave_cache):
+    """Remove a marcação de uma busca em aquecimento."""
+    try:
+        os.remove(_caminho_marcacao(chave_cache))
+    except OSError:
+        pass
+
+def _converter(dados):
+    """Converte os campos de /api/buscar nos argumentos de motor_busca.buscar_conjunto."""
+    return {
+        'termos': dados.get('palavras', ''),
+        'autor': dados.get('autor', ''),
+        'data_inicio': dados.get('periodo_inicio'),
+        'data_fim': dados.get('periodo_fim'),
+        'revistas': dados.get('revistas', []),
+        'limite': int(dados.get('limite', 30)),
+        'ordenar_por': dados.get('ordenar_por') or 'data'
+    }
@@ -0,0 +1,446 @@
+"""
+Buscas salvas com atualização incremental.
+Cada busca salva guarda, para cada API, a marca até onde já foi consultada
+(a data final da última consulta bem-sucedida e a publicação mais recente
+recebida) e os identificadores (DOI ou título) dos artigos já vistos. Uma
+atualização consulta cada API apenas a partir da sua marca, com alguns dias
+de sobreposição, e devolve só os artigos ainda não vistos. Depois da
+primeira execução, o período é filtrado pela data de indexação nas APIs que
+permitem (Crossref, PubMed e OpenAlex), para que artigos publicados antes
+da marca, mas indexados depois dela, não se percam; nas demais, pela data
+de publicação.
+
+As buscas ficam em um arquivo JSON, relido e regravado a cada alteração
+(por substituição atômica) com um arquivo de trava (fcntl.flock) do início
+da leitura ao fim da gravação, de modo que os workers do servidor e o
+comando de atualização em lote (python -m backend atualizar-buscas)
+compartilham o mesmo estado sem perder alterações.
+"""
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+import contextlib
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from core import motor_busca, processador, cache, conjuntos
+from utils import normalizacao, rastreamento
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: a trava vale apenas entre as threads do processo
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Arquivo com as buscas salvas
+ARQUIVO_BUSCAS = os.path.abspath('../dados/buscas_salvas.json')
+
+# Dias antes da marca de cada API consultados novamente a cada atualização
+DIAS_SOBREPOSICAO = 7
+
+# Intervalo padrão (em horas) entre as atualizações de uma busca salva
+FREQUENCIA_PADRAO = 168
+
+# Resultados pedidos a cada API por página e páginas no máximo por atualização
+RESULTADOS_POR_PAGINA = 100
+MAX_PAGINAS_ATUALIZACAO = 5
+
+# Identificadores de artigos vistos guardados por busca (os mais antigos saem primeiro)
+MAX_VISTOS = 20000
+
+# Buscas atualizadas ao mesmo tempo na atualização em lote (os limites de
+# requisições de cada API valem para todas; ver utils.conexoes)
+MAX_ATUALIZACOES_SIMULTANEAS = 2
+
+_lock_arquivo = threading.Lock()
+
+# Uma atualização por vez de cada busca (apenas das buscas existentes)
+_locks_buscas = {}
+
+def configurar(arquivo=None, dias_sobreposicao=None):
+    """
+    Ajusta a configuração das buscas salvas.
+    
+    Args:
+        arquivo (str, opcional): Arquivo JSON com as buscas salvas
+        dias_sobreposicao (int, opcional): Dias consultados novamente antes da marca
+    """
+    global ARQUIVO_BUSCAS, DIAS_SOBREPOSICAO
+    
+    if arquivo is not None:
+        ARQUIVO_BUSCAS = arquivo
+    if dias_sobreposicao is not None:
+        DIAS_SOBREPOSICAO = max(0, int(dias_sobreposicao))
+
+def criar(nome, termos, autor='', revistas=None, apis=None, data_inicio=None, ordenar_por='data',
+          frequencia_horas=None):
+    """
+    Salva uma busca (ainda sem execuções).
+    
+    Args:
+        nome (str): Nome da busca
+        termos (str): Termos de busca (suporta operadores booleanos)
+        autor (str, opcional): Nome do autor para filtrar
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        apis (list, opcional): APIs consultadas (se None, usa todas)
+        data_inicio (str, opcional): Início do período da primeira execução
+            (padrão: um ano atrás)
+        ordenar_por (str, opcional): 'data' ou 'relevancia'
+        frequencia_horas (int, opcional): Horas entre as atualizações em lote
+    
+    Returns:
+        dict: Busca salva
+    """
+    busca = {
+        'id': uuid.uuid4().hex,
+        'nome': nome or termos,
+        'termos': termos,
+        'autor': autor or '',
+        'revistas': revistas or [],
+        'apis': apis or [api for api in motor_busca.ADAPTADORES if busca_por_termos(api)],
+        'data_inicio': data_inicio,
+        'ordenar_por': ordenar_por or 'data',
+        'frequencia_horas': int(frequencia_horas or FREQUENCIA_PADRAO),
+        'criada_em': datetime.now().isoformat(timespec='seconds'),
+        'ultima_execucao': None,
+        'ultimos_novos': None,
+        'marcas': {},
+        'vistos': []
+    }
+    
+    with _travar_arquivo():
+        buscas = _ler()
+        buscas[busca['id']] = busca
+        _gravar(buscas)
+    
+    logger.info("Busca salva criada: %s (%s)", busca['id'], busca['nome'])
+    return busca
+
+def listar():
+    """
+    Lista as buscas salvas.
+    
+    Returns:
+        list: Resumo de cada busca (sem os identificadores vistos)
+    """
+    with _travar_arquivo():
+        buscas = _ler()
+    return [resumir(busca) for busca in buscas.values()]
+
+def obter(id_busca):
+    """
+    Recupera uma busca salva.
+    
+    Args:
+        id_busca (str): Identificador da busca
+    
+    Returns:
+        dict: Busca salva ou None se não existir
+    """
+    with _travar_arquivo():
+        return _ler().get(id_busca)
+
+def remover(id_busca):
+    """
+    Remove uma busca salva.
+    
+    Args:
+        id_busca (str): Identificador da busca
+    
+    Returns:
+        bool: True se a busca existia
+    """
+    with _travar_arquivo():
+        buscas = _ler()
+        if buscas.pop(id_busca, None) is None:
+            return False
+        _gravar(buscas)
+    _locks_buscas.pop(id_busca, None)
+    return True
+
+def resumir(busca):
+    """Retorna a busca sem a lista de identificadores vistos."""
+    resumo = {chave: valor for chave, valor in busca.items() if chave != 'vistos'}
+    resumo['vistos'] = len(busca['vistos'])
+    return resumo
+
+def atualizar(id_busca, hoje=None):
+    """
+    Atualiza uma busca salva, trazendo só os artigos novos desde a última execução.
+    
+    Cada API é consultada do dia da sua marca (menos DIAS_SOBREPOSICAO) até
+    hoje, em até MAX_PAGINAS_ATUALIZACAO páginas. A marca de uma API só
+    avança quando o período foi consultado por inteiro. Se restarem páginas,
+    o período e o cursor ficam guardados na marca ('em_andamento') e a
+    próxima atualização continua dele; as APIs que falharem repetem o mesmo
+    período.
+    
+    Args:
+        id_busca (str): Identificador da busca
+        hoje (str, opcional): Data final no formato YYYY-MM-DD (padrão: hoje)
+    
+    Returns:
+        dict: 'id' (identificador do conjunto com os novos resultados, ver
+            core.conjuntos), 'novos' (resultados ainda não vistos, ordenados)
+            e 'apis' (período consultado, data filtrada e contagens de cada
+            API); None se a busca não existir
+    """
+    hoje = hoje or datetime.now().strftime('%Y-%m-%d')
+    
+    # O identificador vem da URL: só as buscas existentes ganham um lock
+    if obter(id_busca) is None:
+        return None
+    
+    with _locks_buscas.setdefault(id_busca, threading.Lock()):
+        busca = obter(id_busca)
+        if busca is None:
+            return None
+        
+        logger.info("Atualizando busca salva %s (%s)", id_busca, busca['nome'])
+        periodos = {api: periodo(busca, api, hoje) for api in busca['apis'] if busca_por_termos(api)}
+        if not periodos:
+            return {'id': None, 'novos': [], 'apis': {}}
+        
+        _, parametros, _ = motor_busca.preparar_parametros(
+            busca['termos'], busca['autor'], min(inicio for inicio, _, _, _ in periodos.values()), hoje,
+            busca['revistas'], RESULTADOS_POR_PAGINA, list(periodos), busca['ordenar_por']
+        )
+        
+        # Pela data de indexação chegam também artigos publicados antes do
+        # período: o filtro de publicação do mesclador vale desde o início da busca
+        filtro = dict(parametros)
+        if any(indexacao for _, _, _, indexacao in periodos.values()):
+            filtro['data_inicio'] = busca.get('data_inicio') or '1900-01-01'
+        mesclador = processador.MescladorIncremental(filtro)
+        
+        with rastreamento.span('buscas_salvas.atualizacao', apis=','.join(periodos)), \
+                ThreadPoolExecutor(max_workers=len(periodos)) as executor:
+            # Cada API roda no rastro da requisição (ver utils.rastreamento)
+            futures = {
+                api: executor.submit(
+                    rastreamento.propagar(consultar_periodo), api,
+                    {**parametros, 'data_inicio': inicio, 'data_fim': fim, 'data_indexacao': indexacao}, cursor
+                )
+                for api, (inicio, fim, cursor, indexacao) in periodos.items()
+            }
+            relatorio = {}
+            for api, future in futures.items():
+                resultados, relatorio[api] = future.result()
+                mesclador.adicionar(resultados)
+        
+        # Separa os resultados ainda não vistos
+        vistos = set(busca['vistos'])
+        novos = []
+        for resultado in mesclador.resultados():
+            identificador = identificar(resultado)
+            if identificador not in vistos:
+                vistos.add(identificador)
+                novos.append(resultado)
+        
+        # Grava as novas marcas e os identificadores sobre a versão atual do
+        # arquivo (outra alteração pode ter ocorrido durante a consulta)
+        with _travar_arquivo():
+            buscas = _ler()
+            busca = buscas.get(id_busca)
+            if busca is None:
+                return None
+            
+            for api, dados in relatorio.items():
+                inicio, fim, cursor, indexacao = periodos[api]
+                dados['desde'], dados['ate'] = inicio, fim
+                dados['filtro'] = 'indexacao' if indexacao else 'publicacao'
+                marca = busca['marcas'].setdefault(api, {})
+                if dados.get('erro'):
+                    # Um cursor pode ter expirado: o período pendente recomeça do início
+                    if marca.get('em_andamento'):
+                        marca['em_andamento']['cursor'] = None
+                    continue
+                
+                if dados['incompleto']:
+                    marca['em_andamento'] = {
+                        'desde': inicio, 'ate': fim, 'cursor': dados.pop('cursor'), 'indexacao': indexacao
+                    }
+                else:
+                    marca.pop('em_andamento', None)
+                    marca['ate'] = fim
+                if dados['ultima_publicacao'] and dados['ultima_publicacao'] > marca.get('ultima_publicacao', ''):
+                    marca['ultima_publicacao'] = dados['ultima_publicacao']
+            
+            busca['vistos'] = (busca['vistos'] + [identificar(resultado) for resultado in novos])[-MAX_VISTOS:]
+            busca['ultima_execucao'] = datetime.now().isoformat(timespec='seconds')
+            busca['ultimos_novos'] = len(novos)
+            _gravar(buscas)
+    
+    # Os novos resultados ficam disponíveis como um conjunto paginável
+    id_conjunto = hashlib.md5(f"salva|{id_busca}|{busca['ultima_execucao']}".encode('utf-8')).hexdigest()
+    cache.armazenar_cache(id_conjunto, novos)
+    conjuntos.armazenar(id_conjunto, novos)
+    
+    logger.info("Busca salva %s atualizada: %s artigos novos", id_busca, len(novos))
+    return {'id': id_conjunto, 'novos': novos, 'apis': relatorio}
+
+def atualizar_todas(somente_pendentes=True, ids=None):
+    """
+    Atualiza as buscas salvas em lote (usado pelo comando atualizar-buscas).
+    
+    Até MAX_ATUALIZACOES_SIMULTANEAS buscas são atualizadas ao mesmo tempo;
+    todas respeitam os mesmos limites de requisições das APIs.
+    
+    Args:
+        somente_pendentes (bool, opcional): Atualiza apenas as buscas cuja
+            última execução tem mais de frequencia_horas
+        ids (list, opcional): Atualiza apenas estas buscas
+    
+    Returns:
+        list: Para cada busca atualizada, (busca, resultado de atualizar ou
+            a exceção que interrompeu a atualização)
+    """
+    agora = datetime.now()
+    with _travar_arquivo():
+        buscas = list(_ler().values())
+    
+    selecionadas = [
+        busca for busca in buscas
+        if (ids is None or busca['id'] in ids) and (not somente_pendentes or pendente(busca, agora))
+    ]
+    if not selecionadas:
+        return []
+    
+    def executar(busca):
+        try:
+            return busca, atualizar(busca['id'])
+        except Exception as e:
+            logger.error(f"Erro ao atualizar a busca salva {busca['id']}: {str(e)}")
+            return busca, e
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_ATUALIZACOES_SIMULTANEAS, len(selecionadas))) as executor:
+        return list(executor.map(executar, selecionadas))
+
+def consultar_periodo(api, parametros, cursor=None):
+    """
+    Consulta uma API no período dos parâmetros, página a página.
+    
+    Args:
+        api (str): Nome da API
+        parametros (dict): Parâmetros de busca com o período da API
+        cursor (str, opcional): Cursor em que uma atualização anterior parou
+    
+    Returns:
+        tuple: (resultados brutos, relatório com 'recebidos', a
+            'ultima_publicacao' recebida, 'incompleto' e o 'cursor' da
+            página seguinte se restaram páginas e 'erro' se alguma página falhou)
+    """
+    resultados = []
+    relatorio = {'recebidos': 0, 'ultima_publicacao': None, 'incompleto': False}
+    for _ in range(MAX_PAGINAS_ATUALIZACAO):
+        pagina, cursor = motor_busca.executar_pagina_api(api, parametros, cursor)
+        if pagina is None:
+            relatorio['erro'] = True
+            break
+        
+        resultados.extend(pagina)
+        if cursor is None:
+            break
+    else:
+        relatorio['incompleto'] = True
+        relatorio['cursor'] = cursor
+    
+    relatorio['recebidos'] = len(resultados)
+    datas = [normalizacao.normalizar_data(resultado.get('data_publicacao', '')) for resultado in resultados]
+    relatorio['ultima_publicacao'] = max((data for data in datas if data), default=None)
+    return resultados, relatorio
+
+def periodo(busca, api, hoje):
+    """
+    Calcula o período a consultar em uma API.
+    
+    Args:
+        busca (dict): Busca salva
+        api (str): Nome da API
+        hoje (str): Data final no formato YYYY-MM-DD
+    
+    Returns:
+        tuple: (início, fim, cursor, indexação): o período interrompido em
+            uma atualização anterior e o cursor em que ela parou ou, sem ele,
+            o período a partir da marca da API (menos DIAS_SOBREPOSICAO) ou,
+            na primeira execução, do início da busca, até hoje; indexação é
+            True se o período vale para a data de indexação (a partir da
+            segunda execução, nas APIs que a filtram)
+    """
+    em_andamento = busca['marcas'].get(api, {}).get('em_andamento')
+    if em_andamento:
+        return (em_andamento['desde'], em_andamento['ate'], em_andamento['cursor'],
+                em_andamento.get('indexacao', False))
+    
+    marca = busca['marcas'].get(api, {}).get('ate')
+    indexacao = bool(marca) and getattr(motor_busca.ADAPTADORES[api], 'FILTRA_DATA_INDEXACAO', False)
+    if marca:
+        inicio = (datetime.strptime(marca, '%Y-%m-%d') - timedelta(days=DIAS_SOBREPOSICAO)).strftime('%Y-%m-%d')
+    elif busca.get('data_inicio'):
+        inicio = busca['data_inicio']
+    else:
+        inicio = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+    return inicio, hoje, None, indexacao
+
+def pendente(busca, agora):
+    """Retorna True se a busca deve ser atualizada (nunca executada, vencida ou interrompida)."""
+    if not busca.get('ultima_execucao'):
+        return True
+    if any(marca.get('em_andamento') for marca in busca['marcas'].values()):
+        return True
+    ultima = datetime.fromisoformat(busca['ultima_execucao'])
+    return agora - ultima >= timedelta(hours=busca.get('frequencia_horas', FREQUENCIA_PADRAO))
+
+def identificar(resultado):
+    """
+    Identifica um artigo entre execuções: pelo DOI ou, sem ele, pelo título.
+    
+    Args:
+        resultado (dict): Resultado processado
+    
+    Returns:
+        str: Identificador do artigo
+    """
+    if resultado.get('doi'):
+        return resultado['doi'].lower()
+    return 'titulo:' + ' '.join(resultado.get('titulo', '').lower().split())
+
+def busca_por_termos(api):
+    """Retorna True se a API busca por termos e permite paginar (ver core.paginacao)."""
+    adaptador = motor_busca.ADAPTADORES.get(api)
+    return (adaptador is not None and getattr(adaptador, 'BUSCA_POR_TERMOS', True)
+            and hasattr(adaptador, 'buscar_pagina'))
+
+@contextlib.contextmanager
+def _travar_arquivo():
+    """
+    Dá acesso exclusivo ao arquivo das buscas, entre as threads e (com
+    fcntl) entre os processos, da leitura à gravação.
+    """
+    with _lock_arquivo, contextlib.ExitStack() as pilha:
+        if fcntl is not None:
+            os.makedirs(os.path.dirname(ARQUIVO_BUSCAS), exist_ok=True)
+            trava = pilha.enter_context(open(f"{ARQUIVO_BUSCAS}.lock", 'a', encoding='utf-8'))
+            fcntl.flock(trava, fcntl.LOCK_EX)
+        yield
+
+def _ler():
+    """Lê as buscas salvas (dicionário vazio se o arquivo não existir)."""
+    try:
+        with open(ARQUIVO_BUSCAS, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _gravar(buscas):
+    """Grava as buscas salvas por substituição atômica do arquivo."""
+    os.makedirs(os.path.dirname(ARQUIVO_BUSCAS), exist_ok=True)
+    temporario = f"{ARQUIVO_BUSCAS}.{uuid.uuid4().hex}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(buscas, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, ARQUIVO_BUSCAS)
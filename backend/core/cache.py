@@ -9,6 +9,8 @@ import hashlib
 import logging
 from datetime import datetime
 
+from utils import respostas, metricas
+
 logger = logging.getLogger(__name__)
 
 # Diretório de cache padrão
@@ -17,7 +19,7 @@ CACHE_DIR = os.path.abspath('../dados/cache')
 # Tempo de expiração padrão (1 hora)
 CACHE_TIMEOUT = 3600
 
-def gerar_chave_cache(termos, autor, data_inicio, data_fim, revistas, apis):
+def gerar_chave_cache(termos, autor, data_inicio, data_fim, revistas, apis, ordenar_por='data'):
     """
     Gera uma chave única para o cache baseada nos parâmetros de busca.
     
@@ -28,6 +30,7 @@ def gerar_chave_cache(termos, autor, data_inicio, data_fim, revistas, apis):
         data_fim (str): Data final
         revistas (list): Lista de IDs de revistas
         apis (list): Lista de APIs consultadas
+        ordenar_por (str, opcional): Critério de ordenação dos resultados
     
     Returns:
         str: Chave de cache
@@ -41,6 +44,10 @@ def gerar_chave_cache(termos, autor, data_inicio, data_fim, revistas, apis):
     # Cria string para hash
     params_str = f"{termos_norm}|{autor_norm}|{data_inicio}|{data_fim}|{','.join(revistas_norm)}|{','.join(apis_norm)}"
     
+    # A ordenação padrão não entra na chave, preservando as chaves existentes
+    if ordenar_por and ordenar_por != 'data':
+        params_str += f"|{ordenar_por}"
+    
     # Gera hash MD5
     hash_obj = hashlib.md5(params_str.encode('utf-8'))
     return hash_obj.hexdigest()
@@ -75,27 +82,45 @@ def obter_cache(chave):
     
     # Verifica se o arquivo existe
     if not os.path.exists(caminho):
+        metricas.CONSULTAS_CACHE.incrementar('disco', 'falta')
         return None
     
     try:
         # Lê o arquivo de cache
-        with open(caminho, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
+        with open(caminho, 'rb') as f:
+            cache_data = respostas.decodificar(f.read())
         
         # Verifica se o cache expirou
         timestamp = cache_data.get('timestamp', 0)
         if time.time() - timestamp > CACHE_TIMEOUT:
-            logger.info(f"Cache expirado para chave: {chave}")
+            logger.info("Cache expirado para chave: %s", chave)
+            metricas.CONSULTAS_CACHE.incrementar('disco', 'expirado')
             return None
         
         # Retorna os resultados
-        logger.info(f"Cache encontrado para chave: {chave}")
+        logger.info("Cache encontrado para chave: %s", chave)
+        metricas.CONSULTAS_CACHE.incrementar('disco', 'acerto')
         return cache_data.get('resultados', [])
     
     except Exception as e:
         logger.error(f"Erro ao ler cache: {str(e)}")
         return None
 
+def idade_cache(chave):
+    """
+    Retorna há quanto tempo os resultados de uma chave foram armazenados.
+    
+    Args:
+        chave (str): Chave de cache
+    
+    Returns:
+        float: Idade em segundos ou None se a chave não estiver em cache
+    """
+    try:
+        return time.time() - os.path.getmtime(obter_caminho_cache(chave))
+    except OSError:
+        return None
+
 def armazenar_cache(chave, resultados):
     """
     Armazena resultados em cache.
@@ -121,7 +146,7 @@ def armazenar_cache(chave, resultados):
         with open(caminho, 'w', encoding='utf-8') as f:
             json.dump(cache_data, f, ensure_ascii=False, indent=2)
         
-        logger.info(f"Cache armazenado para chave: {chave}")
+        logger.info("Cache armazenado para chave: %s", chave)
         return True
     
     except Exception as e:
@@ -162,5 +187,5 @@ def limpar_cache_expirado():
         except Exception as e:
             logger.error(f"Erro ao verificar cache expirado: {str(e)}")
     
-    logger.info(f"Limpeza de cache: {removidos} arquivos removidos")
+    logger.info("Limpeza de cache: %s arquivos removidos", removidos)
     return removidos
@@ -0,0 +1,168 @@
+"""
+Conjuntos de resultados mantidos no servidor.
+Cada busca processada fica guardada sob um identificador (a própria chave de
+cache da busca), para que o frontend receba os resultados em páginas e
+possa exportá-los sem reenviar a lista inteira. As páginas já enviadas
+ficam guardadas codificadas junto ao conjunto e são reenviadas sem nova
+codificação.
+"""
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from core import cache
+from utils import respostas, metricas
+
+logger = logging.getLogger(__name__)
+
+# Número máximo de conjuntos mantidos em memória (os menos usados saem primeiro)
+MAX_CONJUNTOS = 64
+
+# Tempo (em segundos) em que um conjunto permanece disponível
+TEMPO_EXPIRACAO = 3600
+
+# Resultados por página (padrão e máximo)
+TAMANHO_PAGINA = 50
+MAX_TAMANHO_PAGINA = 500
+
+# Respostas codificadas guardadas por conjunto
+MAX_CORPOS_CONJUNTO = 16
+
+_conjuntos = OrderedDict()
+_lock = threading.Lock()
+
+def configurar(max_conjuntos=None, tempo_expiracao=None, tamanho_pagina=None):
+    """
+    Ajusta a configuração dos conjuntos de resultados.
+    
+    Args:
+        max_conjuntos (int, opcional): Conjuntos mantidos em memória
+        tempo_expiracao (int, opcional): Segundos em que um conjunto fica disponível
+        tamanho_pagina (int, opcional): Resultados por página padrão
+    """
+    global MAX_CONJUNTOS, TEMPO_EXPIRACAO, TAMANHO_PAGINA
+    
+    if max_conjuntos is not None:
+        MAX_CONJUNTOS = max(1, int(max_conjuntos))
+    if tempo_expiracao is not None:
+        TEMPO_EXPIRACAO = int(tempo_expiracao)
+    if tamanho_pagina is not None:
+        TAMANHO_PAGINA = max(1, int(tamanho_pagina))
+
+def armazenar(id_conjunto, resultados, idade=0):
+    """
+    Guarda um conjunto de resultados.
+    
+    Args:
+        id_conjunto (str): Identificador do conjunto (chave de cache da busca)
+        resultados (list): Resultados processados
+        idade (float, opcional): Idade dos resultados em segundos (quando
+            recuperados do cache em disco), descontada da validade
+    """
+    with _lock:
+        _conjuntos[id_conjunto] = (resultados, time.time() - idade, {})
+        _conjuntos.move_to_end(id_conjunto)
+        
+        while len(_conjuntos) > MAX_CONJUNTOS:
+            _conjuntos.popitem(last=False)
+
+def obter(id_conjunto):
+    """
+    Recupera um conjunto de resultados.
+    
+    Conjuntos que saíram da memória são recuperados do cache em disco
+    enquanto ele não expirar.
+    
+    Args:
+        id_conjunto (str): Identificador do conjunto
+    
+    Returns:
+        list: Resultados ou None se o conjunto não existir ou tiver expirado
+    """
+    with _lock:
+        item = _conjuntos.get(id_conjunto)
+        if item is not None:
+            resultados, criado_em, _ = item
+            if time.time() - criado_em <= TEMPO_EXPIRACAO:
+                _conjuntos.move_to_end(id_conjunto)
+                metricas.CONSULTAS_CACHE.incrementar('memoria', 'acerto')
+                return resultados
+            del _conjuntos[id_conjunto]
+            metricas.CONSULTAS_CACHE.incrementar('memoria', 'expirado')
+        else:
+            metricas.CONSULTAS_CACHE.incrementar('memoria', 'falta')
+    
+    # O identificador é a chave de cache: tenta o cache em disco
+    if not id_conjunto.isalnum():
+        return None
+    idade = cache.idade_cache(id_conjunto)
+    resultados = cache.obter_cache(id_conjunto)
+    if resultados is None:
+        return None
+    
+    # O conjunto recuperado mantém a idade do cache, sem ganhar nova validade
+    armazenar(id_conjunto, resultados, idade=idade or 0)
+    return resultados
+
+def obter_corpo(id_conjunto, chave, gerar):
+    """
+    Retorna uma resposta do conjunto já codificada em JSON.
+    
+    A resposta é gerada e codificada uma única vez enquanto o conjunto
+    estiver em memória; os pedidos seguintes reaproveitam os mesmos bytes
+    (e suas versões comprimidas).
+    
+    Args:
+        id_conjunto (str): Identificador do conjunto
+        chave (tuple): Identifica a resposta dentro do conjunto (rota, cursor, tamanho)
+        gerar (callable): Gera o objeto da resposta quando ela não está guardada
+    
+    Returns:
+        respostas.CorpoJSON: Corpo codificado
+    """
+    with _lock:
+        item = _conjuntos.get(id_conjunto)
+        corpos = item[2] if item is not None else None
+        corpo = corpos.get(chave) if corpos is not None else None
+    if corpo is not None:
+        return corpo
+    
+    corpo = respostas.CorpoJSON(gerar())
+    if corpos is not None:
+        with _lock:
+            if len(corpos) >= MAX_CORPOS_CONJUNTO:
+                corpos.pop(next(iter(corpos)))
+            corpos[chave] = corpo
+    return corpo
+
+def paginar(resultados, cursor=None, tamanho=None):
+    """
+    Extrai uma página de um conjunto de resultados.
+    
+    O cursor é a posição do primeiro resultado da página, em texto; a
+    resposta traz o cursor da página seguinte (ou None na última página).
+    
+    Args:
+        resultados (list): Resultados do conjunto
+        cursor (str, opcional): Cursor recebido da página anterior
+        tamanho (int, opcional): Resultados por página (padrão: TAMANHO_PAGINA)
+    
+    Returns:
+        dict: Resultados da página, cursor seguinte e total
+    
+    Raises:
+        ValueError: Se o cursor ou o tamanho forem inválidos
+    """
+    inicio = int(cursor) if cursor else 0
+    tamanho = int(tamanho) if tamanho else TAMANHO_PAGINA
+    if inicio < 0 or tamanho < 1:
+        raise ValueError("Cursor ou tamanho de página inválido")
+    tamanho = min(tamanho, MAX_TAMANHO_PAGINA)
+    
+    fim = inicio + tamanho
+    return {
+        'resultados': resultados[inicio:fim],
+        'cursor': str(fim) if fim < len(resultados) else None,
+        'total': len(resultados)
+    }
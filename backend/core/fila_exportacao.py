@@ -0,0 +1,434 @@
+"""
+Fila de exportações assíncronas.
+As exportações são renderizadas por um conjunto limitado de trabalhadores,
+fora da thread da requisição. Cada exportação vira uma tarefa com
+identificador próprio, cujo estado e progresso podem ser consultados até o
+arquivo ficar pronto. Exportações idênticas são atendidas pela mesma tarefa.
+Com vários processos servindo a aplicação, o estado das tarefas também é
+gravado em disco, para que qualquer processo responda às consultas.
+"""
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core import processos_exportacao
+from utils import exportacao, metricas
+
+logger = logging.getLogger(__name__)
+
+# Número de exportações renderizadas ao mesmo tempo
+MAX_TRABALHADORES = 2
+
+# Número máximo de tarefas aguardando ou em andamento
+MAX_PENDENTES = 50
+
+# Tempo (em segundos) em que tarefas finalizadas continuam consultáveis
+TEMPO_RETENCAO = 3600
+
+# Diretório padrão das exportações
+EXPORT_DIR = os.path.abspath('../dados/exportados')
+
+# Grava o estado das tarefas em disco (servidor com vários processos)
+COMPARTILHAR_TAREFAS = False
+
+# Intervalo (em segundos) entre remoções das tarefas expiradas em disco
+INTERVALO_LIMPEZA_DISCO = 60
+
+# Tempo (em segundos) sem atualização após o qual uma tarefa não finalizada
+# em disco é considerada abandonada (o processo que a executava foi encerrado)
+TEMPO_ABANDONO = 24 * 3600
+
+# Estados de uma tarefa
+PENDENTE = 'pendente'
+PROCESSANDO = 'processando'
+CONCLUIDA = 'concluida'
+ERRO = 'erro'
+
+_tarefas = {}
+_tarefas_por_chave = {}
+_lock = threading.Lock()
+_executor = None
+_ultima_limpeza_disco = 0
+
+class FilaCheiaError(RuntimeError):
+    """Lançada quando a fila de exportações atingiu MAX_PENDENTES."""
+
+class TarefaExportacao:
+    """
+    Estado de uma exportação submetida à fila.
+    """
+    
+    def __init__(self, chave, formato, total):
+        """
+        Inicializa a tarefa.
+        
+        Args:
+            chave (str): Chave de deduplicação (ver gerar_chave_tarefa)
+            formato (str): Formato de exportação
+            total (int): Número de resultados exportados
+        """
+        self.id = uuid.uuid4().hex
+        self.chave = chave
+        self.formato = formato
+        self.total = total
+        self.estado = PENDENTE
+        self.progresso = 0
+        self.arquivo = None
+        self.erro = None
+        self.criada_em = time.time()
+        self.finalizada_em = None
+    
+    @property
+    def finalizada(self):
+        """Indica se a tarefa terminou (com sucesso ou erro)."""
+        return self.estado in (CONCLUIDA, ERRO)
+    
+    def atualizar_progresso(self, fracao):
+        """
+        Atualiza o progresso (nunca regride; 100% só ao concluir).
+        
+        Args:
+            fracao (float): Fração dos resultados já processada (0 a 1)
+        """
+        progresso = max(self.progresso, min(99, int(fracao * 100)))
+        if progresso != self.progresso:
+            self.progresso = progresso
+            self.salvar()
+    
+    def salvar(self):
+        """Grava o estado da tarefa em disco, se COMPARTILHAR_TAREFAS estiver ativo."""
+        if not COMPARTILHAR_TAREFAS:
+            return
+        
+        dados = dict(self.como_dict(), chave=self.chave, criada_em=self.criada_em, finalizada_em=self.finalizada_em)
+        caminho = caminho_tarefa(self.id)
+        temporario = f"{caminho}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(dados, f)
+            os.replace(temporario, caminho)
+        except OSError as e:
+            logger.error(f"Erro ao gravar a tarefa {self.id}: {str(e)}")
+    
+    @classmethod
+    def carregar(cls, id_tarefa):
+        """
+        Lê de disco uma tarefa gravada por outro processo.
+        
+        Args:
+            id_tarefa (str): Identificador da tarefa
+        
+        Returns:
+            TarefaExportacao: Tarefa ou None se não existir
+        """
+        if not id_tarefa.isalnum():
+            return None
+        try:
+            with open(caminho_tarefa(id_tarefa), encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        tarefa = cls(dados['chave'], dados['formato'], dados['total'])
+        for campo in ('id', 'estado', 'progresso', 'arquivo', 'erro', 'criada_em', 'finalizada_em'):
+            setattr(tarefa, campo, dados[campo])
+        return tarefa
+    
+    def como_dict(self):
+        """
+        Representação da tarefa para a API.
+        
+        Returns:
+            dict: Identificador, estado, progresso e arquivo (quando pronto)
+        """
+        dados = {
+            'id': self.id,
+            'formato': self.formato,
+            'total': self.total,
+            'estado': self.estado,
+            'progresso': self.progresso,
+            'arquivo': self.arquivo,
+            'erro': self.erro
+        }
+        if self.arquivo:
+            dados['url'] = f"/api/download/{self.arquivo}"
+        return dados
+
+def configurar(max_trabalhadores=None, max_pendentes=None, tempo_retencao=None, diretorio=None,
+               compartilhar_tarefas=None):
+    """
+    Ajusta a configuração da fila de exportações.
+    
+    Args:
+        max_trabalhadores (int, opcional): Exportações simultâneas
+        max_pendentes (int, opcional): Limite de tarefas aguardando ou em andamento
+        tempo_retencao (int, opcional): Segundos em que tarefas finalizadas ficam disponíveis
+        diretorio (str, opcional): Diretório das exportações
+        compartilhar_tarefas (bool, opcional): Grava o estado das tarefas em
+            disco, para consulta por outros processos do servidor
+    """
+    global MAX_TRABALHADORES, MAX_PENDENTES, TEMPO_RETENCAO, EXPORT_DIR, COMPARTILHAR_TAREFAS, _executor
+    
+    if compartilhar_tarefas is not None:
+        COMPARTILHAR_TAREFAS = bool(compartilhar_tarefas)
+    if max_pendentes is not None:
+        MAX_PENDENTES = int(max_pendentes)
+    if tempo_retencao is not None:
+        TEMPO_RETENCAO = int(tempo_retencao)
+    if diretorio is not None:
+        EXPORT_DIR = diretorio
+    if max_trabalhadores is not None:
+        MAX_TRABALHADORES = max(1, int(max_trabalhadores))
+        with _lock:
+            executor, _executor = _executor, None
+        # As tarefas já submetidas terminam no executor anterior
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+def caminho_tarefa(id_tarefa):
+    """
+    Retorna o arquivo onde o estado de uma tarefa é gravado.
+    
+    Args:
+        id_tarefa (str): Identificador da tarefa
+    
+    Returns:
+        str: Caminho do arquivo JSON da tarefa
+    """
+    return os.path.join(EXPORT_DIR, 'tarefas', f"{id_tarefa}.json")
+
+def obter_executor():
+    """
+    Retorna o executor das exportações, criando-o na primeira chamada.
+    Deve ser chamada com _lock adquirido.
+    
+    Returns:
+        ThreadPoolExecutor: Executor compartilhado
+    """
+    global _executor
+    
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_TRABALHADORES, thread_name_prefix='exportacao')
+    return _executor
+
+def gerar_chave_tarefa(formato, resultados, busca, id_conjunto=None):
+    """
+    Gera a chave que identifica exportações idênticas.
+    
+    Args:
+        formato (str): Formato de exportação
+        resultados (list): Resultados a exportar
+        busca (dict): Parâmetros da busca
+        id_conjunto (str, opcional): Conjunto de resultados no servidor; quando
+            informado, o conjunto e os identificadores dos resultados (que
+            mudam quando a busca é refeita com o mesmo identificador)
+            substituem os resultados completos no cálculo da chave
+    
+    Returns:
+        str: Hash do formato, da busca e dos resultados
+    """
+    if id_conjunto:
+        conteudo = [id_conjunto] + [
+            resultado.get('id') or resultado.get('doi') or resultado.get('titulo') for resultado in resultados
+        ]
+    else:
+        conteudo = resultados
+    conteudo = json.dumps([formato, busca, conteudo], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+def enviar(formato, resultados, busca, diretorio=None, id_conjunto=None):
+    """
+    Submete uma exportação à fila.
+    
+    Se uma exportação idêntica estiver aguardando, em andamento ou concluída
+    (com o arquivo ainda disponível), a tarefa existente é retornada.
+    
+    Args:
+        formato (str): Formato de exportação ('html', 'pdf', 'excel', 'txt')
+        resultados (list): Resultados a exportar
+        busca (dict): Parâmetros da busca
+        diretorio (str, opcional): Diretório das exportações (padrão: EXPORT_DIR)
+        id_conjunto (str, opcional): Conjunto de onde vieram os resultados
+    
+    Returns:
+        TarefaExportacao: Tarefa nova ou existente
+    
+    Raises:
+        ValueError: Se o formato não for suportado
+        FilaCheiaError: Se a fila estiver cheia
+    """
+    formato = (formato or '').lower()
+    if formato not in exportacao.FORMATOS:
+        raise ValueError(f"Formato de exportação não suportado: {formato}")
+    
+    diretorio = diretorio or EXPORT_DIR
+    chave = gerar_chave_tarefa(formato, resultados, busca, id_conjunto)
+    
+    with _lock:
+        remover_expiradas()
+        
+        # Deduplicação de exportações idênticas
+        existente = _tarefas.get(_tarefas_por_chave.get(chave))
+        if existente is not None:
+            if existente.estado != CONCLUIDA or os.path.exists(os.path.join(diretorio, existente.arquivo)):
+                logger.info(f"Exportação idêntica reaproveitada: {existente.id}")
+                return existente
+        
+        pendentes = sum(1 for tarefa in _tarefas.values() if not tarefa.finalizada)
+        if pendentes >= MAX_PENDENTES:
+            raise FilaCheiaError(f"Fila de exportações cheia ({pendentes} tarefas)")
+        
+        tarefa = TarefaExportacao(chave, formato, len(resultados))
+        _tarefas[tarefa.id] = tarefa
+        _tarefas_por_chave[chave] = tarefa.id
+        tarefa.salvar()
+        obter_executor().submit(executar_tarefa, tarefa, resultados, busca, diretorio)
+    
+    logger.info(f"Exportação {tarefa.id} enfileirada: {formato}, {tarefa.total} resultados")
+    return tarefa
+
+def executar_tarefa(tarefa, resultados, busca, diretorio):
+    """
+    Renderiza a exportação de uma tarefa (executada pelos trabalhadores).
+    
+    Args:
+        tarefa (TarefaExportacao): Tarefa a executar
+        resultados (list): Resultados a exportar
+        busca (dict): Parâmetros da busca
+        diretorio (str): Diretório das exportações
+    """
+    tarefa.estado = PROCESSANDO
+    tarefa.salvar()
+    inicio = time.time()
+    
+    # PDF e Excel são renderizados no pool de processos, fora do GIL do servidor
+    if processos_exportacao.usar_processo(tarefa.formato):
+        exportar = processos_exportacao.exportar
+    else:
+        exportar = exportacao.exportar
+    
+    try:
+        tarefa.arquivo = exportar(
+            formato=tarefa.formato,
+            resultados=resultados,
+            busca=busca,
+            diretorio=diretorio,
+            ao_progredir=tarefa.atualizar_progresso
+        )
+        tarefa.progresso = 100
+        tarefa.finalizada_em = time.time()
+        tarefa.estado = CONCLUIDA
+        tarefa.salvar()
+        logger.info(f"Exportação {tarefa.id} concluída em {time.time() - inicio:.2f}s: {tarefa.arquivo}")
+        metricas.DURACAO_EXPORTACAO.observar(time.time() - inicio, tarefa.formato, CONCLUIDA)
+    except Exception as e:
+        logger.error(f"Erro na exportação {tarefa.id}: {str(e)}")
+        tarefa.erro = str(e)
+        tarefa.finalizada_em = time.time()
+        tarefa.estado = ERRO
+        tarefa.salvar()
+        metricas.DURACAO_EXPORTACAO.observar(time.time() - inicio, tarefa.formato, ERRO)
+        
+        # Permite que uma nova tentativa idêntica seja enfileirada
+        with _lock:
+            if _tarefas_por_chave.get(tarefa.chave) == tarefa.id:
+                del _tarefas_por_chave[tarefa.chave]
+
+def obter(id_tarefa):
+    """
+    Recupera uma tarefa pelo identificador.
+    
+    Args:
+        id_tarefa (str): Identificador da tarefa
+    
+    Returns:
+        TarefaExportacao: Tarefa ou None se não existir (ou tiver expirado)
+    """
+    with _lock:
+        remover_expiradas()
+        tarefa = _tarefas.get(id_tarefa)
+    
+    # Tarefa enviada a outro processo do servidor
+    if tarefa is None and COMPARTILHAR_TAREFAS:
+        tarefa = TarefaExportacao.carregar(id_tarefa)
+        if tarefa is not None and tarefa.finalizada and tarefa.finalizada_em < time.time() - TEMPO_RETENCAO:
+            return None
+    return tarefa
+
+def remover_expiradas():
+    """
+    Remove tarefas finalizadas há mais de TEMPO_RETENCAO segundos.
+    Deve ser chamada com _lock adquirido.
+    """
+    limite = time.time() - TEMPO_RETENCAO
+    expiradas = [
+        tarefa for tarefa in _tarefas.values()
+        if tarefa.finalizada and tarefa.finalizada_em < limite
+    ]
+    for tarefa in expiradas:
+        del _tarefas[tarefa.id]
+        if _tarefas_por_chave.get(tarefa.chave) == tarefa.id:
+            del _tarefas_por_chave[tarefa.chave]
+    
+    if COMPARTILHAR_TAREFAS:
+        remover_expiradas_disco(limite)
+
+def remover_expiradas_disco(limite):
+    """
+    Remove os arquivos das tarefas finalizadas antes do limite informado,
+    no máximo uma vez a cada INTERVALO_LIMPEZA_DISCO segundos.
+    Deve ser chamada com _lock adquirido.
+    
+    Tarefas pendentes ou em andamento podem ficar muito tempo sem gravar
+    progresso (na fila ou em uma renderização longa) e continuam
+    consultáveis pelos outros processos; só são removidas depois de
+    TEMPO_ABANDONO sem atualização.
+    
+    Args:
+        limite (float): Instante (timestamp) antes do qual a tarefa expirou
+    """
+    global _ultima_limpeza_disco
+    
+    agora = time.time()
+    if agora - _ultima_limpeza_disco < INTERVALO_LIMPEZA_DISCO:
+        return
+    _ultima_limpeza_disco = agora
+    
+    try:
+        with os.scandir(os.path.dirname(caminho_tarefa('_'))) as entradas:
+            for entrada in entradas:
+                try:
+                    modificada_em = entrada.stat().st_mtime
+                    if modificada_em >= limite:
+                        continue
+                    if modificada_em >= agora - TEMPO_ABANDONO and entrada.name.endswith('.json'):
+                        tarefa = TarefaExportacao.carregar(entrada.name[:-len('.json')])
+                        if tarefa is not None and not tarefa.finalizada:
+                            continue
+                    os.remove(entrada.path)
+                except FileNotFoundError:
+                    pass
+    except FileNotFoundError:
+        pass
+
+def contar_tarefas():
+    """
+    Conta as tarefas deste processo por estado.
+    
+    Returns:
+        dict: Número de tarefas por estado, no formato do medidor de métricas
+    """
+    contagem = {(estado,): 0 for estado in (PENDENTE, PROCESSANDO, CONCLUIDA, ERRO)}
+    with _lock:
+        for tarefa in _tarefas.values():
+            contagem[(tarefa.estado,)] += 1
+    return contagem
+
+# Profundidade da fila, lida apenas quando /metrics é consultado
+metricas.TAREFAS_EXPORTACAO.definir_coleta(contar_tarefas)
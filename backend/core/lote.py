@@ -0,0 +1,369 @@
+"""
+Busca em lote do Buscador de Revistas Científicas.
+Planeja várias consultas em conjunto: consultas com os mesmos filtros
+(autor, período e revistas) são combinadas com OR em uma única chamada às
+APIs que aceitam expressões booleanas, e os resultados de cada chamada
+combinada são separados de volta avaliando a expressão de cada consulta
+sobre título e resumo (com singular e plural equivalentes, ver
+core.ranqueamento). APIs cujo adaptador tem buscar_lote (o PubMed: um
+esearch por consulta e um só efetch) resolvem as consultas combinadas
+elas mesmas, sem separação local. As demais APIs recebem uma chamada por
+consulta distinta. Todas as chamadas do lote compartilham o mesmo pool de threads e,
+como qualquer busca, as conexões e o limite de taxa de cada API (ver
+utils.conexoes).
+"""
+import time
+import hashlib
+import logging
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from core import motor_busca, processador, ranqueamento, cache, conjuntos
+from utils import normalizacao, rastreamento
+
+logger = logging.getLogger(__name__)
+
+# Consultas combinadas em uma mesma chamada
+MAX_CONSULTAS_COMBINADAS = 8
+
+# Tamanho máximo dos termos combinados (as APIs recebem a consulta na URL)
+MAX_TAMANHO_COMBINADO = 1500
+
+# Chamadas simultâneas às APIs durante um lote
+MAX_CHAMADAS_SIMULTANEAS = 8
+
+def buscar_lote(consultas, apis=None):
+    """
+    Realiza várias buscas planejadas em conjunto.
+    
+    Cada consulta é reaproveitada do cache quando possível. As demais são
+    agrupadas pelos filtros; nas APIs que aceitam OR, as consultas distintas
+    de um grupo são combinadas em chamadas de até MAX_CONSULTAS_COMBINADAS
+    consultas, cujo limite é a soma dos limites (até o máximo da API).
+    Quando uma chamada combinada devolve o limite inteiro, as consultas que
+    receberam menos resultados que o seu limite são completadas com uma
+    chamada própria.
+    
+    Resultados que a API associou à consulta por campos que ela não devolve
+    (ex.: conceitos no OpenAlex) não satisfazem nenhuma expressão localmente
+    e são descartados da separação; no PubMed, que resolve cada consulta
+    do bloco com o seu próprio esearch, não há separação.
+    
+    Args:
+        consultas (list): Dicionários com os argumentos de
+            motor_busca.buscar_conjunto (termos, autor, data_inicio,
+            data_fim, revistas, limite, ordenar_por)
+        apis (list, opcional): APIs consultadas (se None, usa todas)
+    
+    Returns:
+        dict: 'consultas' (lista de (identificador do conjunto, resultados),
+            na ordem recebida), 'uniao' ((identificador, resultados
+            deduplicados de todas as consultas)) e 'chamadas' (contagem das
+            chamadas às APIs)
+    """
+    inicio = time.time()
+    if apis is None:
+        apis = list(motor_busca.ADAPTADORES.keys())
+    
+    with rastreamento.span('lote.planejamento', consultas=len(consultas)) as etapa:
+        preparadas = []
+        for consulta in consultas:
+            chave_cache, parametros, _ = motor_busca.preparar_parametros(
+                consulta['termos'], consulta.get('autor', ''), consulta.get('data_inicio'),
+                consulta.get('data_fim'), consulta.get('revistas'), int(consulta.get('limite') or 30),
+                apis, consulta.get('ordenar_por') or 'data'
+            )
+            preparadas.append((chave_cache, gerar_chave_lote(chave_cache), parametros))
+        
+        # Consultas já em cache, pela busca comum ou por um lote anterior
+        resultados = [
+            conjuntos.obter(chave_cache) or conjuntos.obter(chave_lote)
+            for chave_cache, chave_lote, _ in preparadas
+        ]
+        pendentes = {i for i, encontrados in enumerate(resultados) if not encontrados}
+        
+        grupos = agrupar([preparadas[i][2] for i in sorted(pendentes)])
+        tarefas = planejar(grupos, apis)
+        etapa.definir(em_cache=len(consultas) - len(pendentes), chamadas=len(tarefas))
+    
+    # Resultados brutos de cada API por (grupo, termos)
+    recebidos = {}
+    chamadas = executar_tarefas(tarefas, recebidos)
+    chamadas['independentes'] = len(pendentes) * len(apis_com_busca(apis))
+    
+    with rastreamento.span('lote.processamento', consultas=len(pendentes)):
+        for i in sorted(pendentes):
+            chave_cache, chave_lote, parametros = preparadas[i]
+            mesclador = processador.MescladorIncremental(parametros)
+            for lote_api in recebidos.get((chave_grupo(parametros), parametros['termos']), []):
+                mesclador.adicionar(lote_api)
+            processados = mesclador.resultados()[:parametros['limite']]
+            
+            cache.armazenar_cache(chave_lote, processados)
+            conjuntos.armazenar(chave_lote, processados)
+            resultados[i] = processados
+        
+        ids = [
+            chave_lote if i in pendentes else chave_cache
+            for i, (chave_cache, chave_lote, _) in enumerate(preparadas)
+        ]
+        id_uniao, uniao = unir(ids, resultados)
+    
+    logger.info(
+        "Lote concluído em %.2fs: %s consultas, %s em cache, %s chamadas às APIs (%s sem combinar)",
+        time.time() - inicio, len(consultas), len(consultas) - len(pendentes),
+        chamadas['realizadas'], chamadas['independentes']
+    )
+    
+    return {
+        'consultas': list(zip(ids, resultados)),
+        'uniao': (id_uniao, uniao),
+        'chamadas': {**chamadas, 'em_cache': len(consultas) - len(pendentes)}
+    }
+
+def gerar_chave_lote(chave_cache):
+    """
+    Gera o identificador do conjunto de uma consulta resolvida em lote.
+    
+    Os resultados separados de uma chamada combinada podem diferir dos de
+    uma busca isolada, por isso ficam em uma chave própria.
+    
+    Args:
+        chave_cache (str): Chave de cache da busca isolada
+    
+    Returns:
+        str: Identificador do conjunto
+    """
+    return hashlib.md5(f"lote|{chave_cache}".encode('utf-8')).hexdigest()
+
+def chave_grupo(parametros):
+    """
+    Retorna os filtros que uma consulta precisa compartilhar com outra para
+    que as duas sejam combinadas em uma chamada.
+    
+    Args:
+        parametros (dict): Parâmetros normalizados da consulta
+    
+    Returns:
+        tuple: Autor, período e revistas
+    """
+    return (
+        parametros['autor'], parametros['data_inicio'], parametros['data_fim'],
+        tuple(sorted(parametros['revistas']))
+    )
+
+def agrupar(parametros_consultas):
+    """
+    Agrupa as consultas pelos filtros, unindo consultas com os mesmos termos.
+    
+    Args:
+        parametros_consultas (list): Parâmetros normalizados de cada consulta
+    
+    Returns:
+        dict: Chave do grupo -> {termos: maior limite entre as consultas}
+    """
+    grupos = {}
+    for parametros in parametros_consultas:
+        termos = grupos.setdefault(chave_grupo(parametros), {})
+        termos[parametros['termos']] = max(termos.get(parametros['termos'], 0), parametros['limite'])
+    return grupos
+
+def planejar(grupos, apis):
+    """
+    Planeja as chamadas às APIs.
+    
+    Args:
+        grupos (dict): Saída de agrupar
+        apis (list): APIs consultadas
+    
+    Returns:
+        list: Tarefas (dicionários com api, grupo, parâmetros da chamada e
+            limite de cada termos atendido por ela)
+    """
+    # As tarefas de cada API são intercaladas com as das demais, para que
+    # as threads não fiquem todas aguardando o limite de taxa de uma só API
+    filas = {}
+    for grupo, termos in grupos.items():
+        autor, data_inicio, data_fim, revistas = grupo
+        base = {'autor': autor, 'data_inicio': data_inicio, 'data_fim': data_fim, 'revistas': list(revistas)}
+        
+        for api in apis_com_busca(apis):
+            adaptador = motor_busca.ADAPTADORES[api]
+            if getattr(adaptador, 'SUPORTA_OR', False):
+                blocos = combinar(termos, getattr(adaptador, 'MAX_RESULTADOS', 50))
+            else:
+                blocos = [{t: limite} for t, limite in termos.items()]
+            
+            for bloco in blocos:
+                if len(bloco) == 1:
+                    termos_chamada = next(iter(bloco))
+                else:
+                    termos_chamada = ' OR '.join(f"({t})" for t in bloco)
+                filas.setdefault(api, []).append({
+                    'api': api,
+                    'grupo': grupo,
+                    'parametros': {**base, 'termos': termos_chamada, 'limite': sum(bloco.values())},
+                    'termos': bloco
+                })
+    
+    tarefas = []
+    for rodada in itertools.zip_longest(*filas.values()):
+        tarefas.extend(tarefa for tarefa in rodada if tarefa is not None)
+    return tarefas
+
+def apis_com_busca(apis):
+    """
+    Filtra as APIs conhecidas que buscam por termos.
+    
+    Args:
+        apis (list): APIs solicitadas
+    
+    Returns:
+        list: APIs que recebem chamadas no lote
+    """
+    return [
+        api for api in apis
+        if api in motor_busca.ADAPTADORES and getattr(motor_busca.ADAPTADORES[api], 'BUSCA_POR_TERMOS', True)
+    ]
+
+def combinar(termos, max_resultados):
+    """
+    Divide as consultas distintas de um grupo em blocos combináveis.
+    
+    Args:
+        termos (dict): Termos -> limite
+        max_resultados (int): Resultados por chamada aceitos pela API
+    
+    Returns:
+        list: Blocos ({termos: limite}); blocos de um item não são combinados
+    """
+    blocos = []
+    bloco, soma, tamanho = {}, 0, 0
+    for t, limite in termos.items():
+        limite = min(limite, max_resultados)
+        cabe = (
+            len(bloco) < MAX_CONSULTAS_COMBINADAS
+            and soma + limite <= max_resultados
+            and tamanho + len(t) + 6 <= MAX_TAMANHO_COMBINADO
+        )
+        if bloco and not cabe:
+            blocos.append(bloco)
+            bloco, soma, tamanho = {}, 0, 0
+        bloco[t] = limite
+        soma += limite
+        tamanho += len(t) + 6
+    if bloco:
+        blocos.append(bloco)
+    return blocos
+
+def executar_tarefas(tarefas, recebidos):
+    """
+    Executa as chamadas planejadas, separando os resultados por consulta.
+    
+    Args:
+        tarefas (list): Saída de planejar
+        recebidos (dict): Preenchido com (grupo, termos) -> lista com os
+            resultados brutos de cada chamada
+    
+    Returns:
+        dict: Número de chamadas realizadas, combinadas e complementares
+    """
+    contagem = {'realizadas': 0, 'combinadas': 0, 'complementares': 0}
+    if not tarefas:
+        return contagem
+    
+    with rastreamento.span('lote.chamadas', tarefas=len(tarefas)), \
+            ThreadPoolExecutor(max_workers=min(MAX_CHAMADAS_SIMULTANEAS, len(tarefas))) as executor:
+        # Cada chamada roda no rastro da requisição (ver utils.rastreamento)
+        def submeter(tarefa):
+            contagem['realizadas'] += 1
+            if len(tarefa['termos']) > 1 and hasattr(motor_busca.ADAPTADORES[tarefa['api']], 'buscar_lote'):
+                executar = rastreamento.propagar(motor_busca.executar_lote_api)
+                return executor.submit(executar, tarefa['api'], tarefa['parametros'], tarefa['termos'])
+            executar = rastreamento.propagar(motor_busca.executar_busca_api)
+            return executor.submit(executar, tarefa['api'], tarefa['parametros'])
+        
+        futures = {submeter(tarefa): tarefa for tarefa in tarefas}
+        while futures:
+            concluidos, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in concluidos:
+                tarefa = futures.pop(future)
+                try:
+                    resultados = future.result()
+                except Exception as e:
+                    logger.error(f"Erro na busca em lote na API {tarefa['api']}: {str(e)}")
+                    continue
+                
+                if len(tarefa['termos']) == 1:
+                    termos = next(iter(tarefa['termos']))
+                    recebidos.setdefault((tarefa['grupo'], termos), []).append(resultados)
+                    continue
+                
+                contagem['combinadas'] += 1
+                if isinstance(resultados, dict):
+                    # A API já separou os resultados de cada consulta
+                    for termos, lista in resultados.items():
+                        recebidos.setdefault((tarefa['grupo'], termos), []).append(lista)
+                    continue
+                
+                for tarefa_complementar in separar(tarefa, resultados, recebidos):
+                    contagem['complementares'] += 1
+                    futures[submeter(tarefa_complementar)] = tarefa_complementar
+    
+    return contagem
+
+def separar(tarefa, resultados, recebidos):
+    """
+    Separa os resultados de uma chamada combinada entre as suas consultas.
+    
+    Args:
+        tarefa (dict): Tarefa combinada
+        resultados (list): Resultados brutos da chamada
+        recebidos (dict): Resultados por (grupo, termos), atualizado
+    
+    Returns:
+        list: Tarefas complementares para as consultas que podem ter ficado
+            incompletas porque a chamada atingiu o seu limite
+    """
+    with rastreamento.span('lote.separacao', api=tarefa['api'], resultados=len(resultados)):
+        indice = ranqueamento.IndiceBM25()
+        for posicao, resultado in enumerate(resultados):
+            resumo = resultado.get('resumo') or ''
+            if not resumo and resultado.get('resumo_indice'):
+                resumo = normalizacao.reconstruir_resumo(resultado['resumo_indice'])
+            indice.adicionar(posicao, normalizacao.normalizar_texto(resultado.get('titulo', '')), resumo)
+        
+        saturada = len(resultados) >= tarefa['parametros']['limite']
+        complementares = []
+        for termos, limite in tarefa['termos'].items():
+            posicoes = indice.satisfazem(ranqueamento.analisar_consulta(termos), list(range(len(resultados))))
+            recebidos.setdefault((tarefa['grupo'], termos), []).append([resultados[p] for p in posicoes])
+            
+            if saturada and len(posicoes) < limite:
+                complementares.append({
+                    **tarefa,
+                    'parametros': {**tarefa['parametros'], 'termos': termos, 'limite': limite},
+                    'termos': {termos: limite}
+                })
+    return complementares
+
+def unir(ids, resultados):
+    """
+    Deduplica os resultados de todas as consultas do lote.
+    
+    Args:
+        ids (list): Identificador do conjunto de cada consulta
+        resultados (list): Resultados processados de cada consulta
+    
+    Returns:
+        tuple: (identificador do conjunto da união, resultados por data)
+    """
+    id_uniao = hashlib.md5(f"uniao|{'|'.join(ids)}".encode('utf-8')).hexdigest()
+    
+    mesclador = processador.MescladorIncremental({'ordenar_por': 'data'})
+    mesclador.mesclar([resultado for lista in resultados for resultado in lista])
+    uniao = mesclador.resultados()
+    
+    cache.armazenar_cache(id_uniao, uniao)
+    conjuntos.armazenar(id_uniao, uniao)
+    return id_uniao, uniao
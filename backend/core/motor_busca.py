@@ -5,13 +5,13 @@ Coordena as buscas em múltiplas APIs e processa os resultados.
 import asyncio
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # Importa os adaptadores de APIs
 from adaptadores import pubmed, crossref, semantic_scholar, openalex, unpaywall, thieme
-from core import processador, cache
-from utils import normalizacao
+from core import processador, cache, conjuntos
+from utils import normalizacao, metricas, rastreamento
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,14 @@ ADAPTADORES = {
     'thieme': thieme
 }
 
-def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, apis=None):
+# Expõe as métricas de todas as APIs desde o início, mesmo sem buscas
+for _api in ADAPTADORES:
+    for _metrica in (metricas.LATENCIA_API, metricas.RESULTADOS_API, metricas.ERROS_API, metricas.TEMPO_ESGOTADO_API,
+                     metricas.ESPERA_LIMITE_API):
+        _metrica.iniciar(_api)
+
+def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, apis=None,
+           ordenar_por='data'):
     """
     Realiza busca em múltiplas APIs científicas e retorna resultados processados.
     
@@ -37,12 +44,106 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         revistas (list, opcional): Lista de IDs de revistas para filtrar
         limite (int, opcional): Número máximo de resultados por API
         apis (list, opcional): Lista de APIs a serem consultadas (se None, usa todas)
+        ordenar_por (str, opcional): 'data' (mais recentes primeiro) ou
+            'relevancia' (BM25 local combinado com a posição nas fontes)
     
     Returns:
         list: Lista de resultados processados e normalizados
     """
-    logger.info(f"Iniciando busca: termos='{termos}', autor='{autor}', período={data_inicio} a {data_fim}, revistas={revistas}")
+    _, resultados = buscar_conjunto(
+        termos, autor=autor, data_inicio=data_inicio, data_fim=data_fim, revistas=revistas,
+        limite=limite, apis=apis, ordenar_por=ordenar_por
+    )
+    return resultados
+
+@rastreamento.rastreado('motor_busca.buscar_conjunto')
+def buscar_conjunto(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, apis=None,
+                    ordenar_por='data', ignorar_cache=False):
+    """
+    Realiza a busca e guarda os resultados como um conjunto no servidor
+    (ver core.conjuntos), identificado pela chave de cache da busca.
+    
+    Args:
+        termos (str): Termos de busca (suporta operadores booleanos)
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        limite (int, opcional): Número máximo de resultados por API
+        apis (list, opcional): Lista de APIs a serem consultadas (se None, usa todas)
+        ordenar_por (str, opcional): 'data' (mais recentes primeiro) ou
+            'relevancia' (BM25 local combinado com a posição nas fontes)
+        ignorar_cache (bool, opcional): Consulta as APIs mesmo que a busca
+            esteja em cache (usado pelo aquecimento do cache)
+    
+    Returns:
+        tuple: (identificador do conjunto, lista de resultados processados)
+    """
+    logger.info("Iniciando busca: termos='%s', autor='%s', período=%s a %s, revistas=%s", termos, autor, data_inicio, data_fim, revistas)
+    
+    chave_cache, parametros, apis = preparar_parametros(
+        termos, autor, data_inicio, data_fim, revistas, limite, apis, ordenar_por
+    )
+    
+    # Verifica se há resultados em cache (o conjunto em memória, com as
+    # respostas já codificadas, ou o cache em disco)
+    resultados_cache = None
+    if not ignorar_cache:
+        with rastreamento.span('cache.obter') as etapa:
+            resultados_cache = conjuntos.obter(chave_cache)
+            etapa.definir(acerto=bool(resultados_cache))
+    
+    if resultados_cache:
+        logger.info("Resultados encontrados em cache para: %s", chave_cache)
+        return chave_cache, resultados_cache
+    
+    # Inicia o tempo de execução
+    tempo_inicio = time.time()
+    
+    # Executa buscas em paralelo, mesclando os resultados de cada API
+    # assim que chegam
+    mesclador = processador.MescladorIncremental(parametros)
+    with rastreamento.span('motor_busca.buscas_paralelas', apis=','.join(apis)):
+        executar_buscas_paralelas(parametros, apis, ao_receber=mesclador.adicionar)
+    
+    # Obtém os resultados processados e ordenados
+    resultados_processados = mesclador.resultados()
+    
+    # Limita ao número máximo de resultados
+    if len(resultados_processados) > limite:
+        resultados_processados = resultados_processados[:limite]
+    
+    # Registra tempo total de execução
+    tempo_total = time.time() - tempo_inicio
+    metricas.DURACAO_BUSCA.observar(tempo_total)
+    logger.info("Busca concluída em %.2fs. Total de resultados: %s", tempo_total, len(resultados_processados))
+    
+    # Armazena em cache
+    with rastreamento.span('cache.armazenar', resultados=len(resultados_processados)):
+        cache.armazenar_cache(chave_cache, resultados_processados)
+        conjuntos.armazenar(chave_cache, resultados_processados)
+    
+    return chave_cache, resultados_processados
+
+def preparar_parametros(termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30, apis=None,
+                        ordenar_por='data'):
+    """
+    Completa os parâmetros de uma busca com os valores padrão e gera sua
+    chave de cache.
     
+    Args:
+        termos (str): Termos de busca
+        autor (str, opcional): Nome do autor
+        data_inicio (str, opcional): Data inicial (padrão: um ano atrás)
+        data_fim (str, opcional): Data final (padrão: hoje)
+        revistas (list, opcional): Lista de IDs de revistas
+        limite (int, opcional): Número máximo de resultados
+        apis (list, opcional): APIs a consultar (padrão: todas)
+        ordenar_por (str, opcional): Critério de ordenação
+    
+    Returns:
+        tuple: (chave de cache, parâmetros normalizados para os adaptadores, APIs)
+    """
     # Normaliza datas
     if not data_inicio:
         data_inicio = (datetime.now().replace(year=datetime.now().year - 1)).strftime('%Y-%m-%d')
@@ -57,13 +158,7 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
     if apis is None:
         apis = list(ADAPTADORES.keys())
     
-    # Verifica se há resultados em cache
-    chave_cache = cache.gerar_chave_cache(termos, autor, data_inicio, data_fim, revistas, apis)
-    resultados_cache = cache.obter_cache(chave_cache)
-    
-    if resultados_cache:
-        logger.info(f"Resultados encontrados em cache para: {chave_cache}")
-        return resultados_cache
+    chave_cache = cache.gerar_chave_cache(termos, autor, data_inicio, data_fim, revistas, apis, ordenar_por)
     
     # Prepara parâmetros de busca normalizados
     parametros = {
@@ -72,38 +167,21 @@ def buscar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, lim
         'data_inicio': data_inicio,
         'data_fim': data_fim,
         'revistas': revistas,
-        'limite': limite
+        'limite': limite,
+        'ordenar_por': ordenar_por
     }
     
-    # Inicia o tempo de execução
-    tempo_inicio = time.time()
-    
-    # Executa buscas em paralelo
-    resultados = executar_buscas_paralelas(parametros, apis)
-    
-    # Processa e normaliza resultados
-    resultados_processados = processador.processar_resultados(resultados, parametros)
-    
-    # Limita ao número máximo de resultados
-    if len(resultados_processados) > limite:
-        resultados_processados = resultados_processados[:limite]
-    
-    # Registra tempo total de execução
-    tempo_total = time.time() - tempo_inicio
-    logger.info(f"Busca concluída em {tempo_total:.2f}s. Total de resultados: {len(resultados_processados)}")
-    
-    # Armazena em cache
-    cache.armazenar_cache(chave_cache, resultados_processados)
-    
-    return resultados_processados
+    return chave_cache, parametros, apis
 
-def executar_buscas_paralelas(parametros, apis):
+def executar_buscas_paralelas(parametros, apis, ao_receber=None):
     """
     Executa buscas em múltiplas APIs em paralelo.
     
     Args:
         parametros (dict): Parâmetros de busca
         apis (list): Lista de APIs a serem consultadas
+        ao_receber (callable, opcional): Função chamada com os resultados de
+            cada API assim que ela responde (na ordem de conclusão)
     
     Returns:
         list: Lista de resultados de todas as APIs
@@ -116,19 +194,28 @@ def executar_buscas_paralelas(parametros, apis):
         if api in ADAPTADORES:
             tarefas.append((api, parametros))
     
+    if not tarefas:
+        return resultados
+    
     # Executa tarefas em paralelo usando ThreadPoolExecutor
     with ThreadPoolExecutor(max_workers=len(tarefas)) as executor:
-        futures = {executor.submit(executar_busca_api, api, params): api 
+        # Cada API roda no rastro da requisição (ver utils.rastreamento)
+        futures = {executor.submit(rastreamento.propagar(executar_busca_api), api, params): api 
                   for api, params in tarefas}
         
-        for future in futures:
+        for future in as_completed(futures):
+            api = futures[future]
             try:
                 api_resultados = future.result()
-                if api_resultados:
-                    resultados.extend(api_resultados)
             except Exception as e:
-                api = futures[future]
                 logger.error(f"Erro na busca da API {api}: {str(e)}")
+                continue
+            
+            # Um erro ao mesclar não é falha da API: é propagado
+            if api_resultados:
+                resultados.extend(api_resultados)
+                if ao_receber:
+                    ao_receber(api_resultados)
     
     return resultados
 
@@ -143,27 +230,129 @@ def executar_busca_api(api, parametros):
     Returns:
         list: Lista de resultados da API
     """
-    try:
-        logger.info(f"Iniciando busca na API: {api}")
-        adaptador = ADAPTADORES[api]
-        
-        # Executa a busca no adaptador
-        resultados = adaptador.buscar(
-            termos=parametros['termos'],
-            autor=parametros['autor'],
-            data_inicio=parametros['data_inicio'],
-            data_fim=parametros['data_fim'],
-            revistas=parametros['revistas'],
-            limite=parametros['limite']
-        )
-        
-        logger.info(f"API {api}: {len(resultados)} resultados encontrados")
-        
-        # Adiciona a fonte aos resultados
-        for resultado in resultados:
-            resultado['fonte'] = api
-        
-        return resultados
-    except Exception as e:
-        logger.error(f"Erro ao buscar na API {api}: {str(e)}")
-        return []
+    inicio = time.perf_counter()
+    with rastreamento.span(f"api.{api}", api=api) as etapa:
+        try:
+            logger.info("Iniciando busca na API: %s", api)
+            adaptador = ADAPTADORES[api]
+            
+            # Executa a busca no adaptador
+            resultados = adaptador.buscar(
+                termos=parametros['termos'],
+                autor=parametros['autor'],
+                data_inicio=parametros['data_inicio'],
+                data_fim=parametros['data_fim'],
+                revistas=parametros['revistas'],
+                limite=parametros['limite']
+            )
+            
+            logger.info("API %s: %s resultados encontrados", api, len(resultados))
+            metricas.RESULTADOS_API.incrementar(api, valor=len(resultados))
+            etapa.definir(resultados=len(resultados))
+            
+            # Adiciona a fonte aos resultados
+            for resultado in resultados:
+                resultado['fonte'] = api
+            
+            return resultados
+        except Exception as e:
+            logger.error(f"Erro ao buscar na API {api}: {str(e)}")
+            metricas.registrar_erro_api(api, e)
+            etapa.registrar_erro(e)
+            return []
+        finally:
+            metricas.LATENCIA_API.observar(time.perf_counter() - inicio, api)
+
+def executar_lote_api(api, parametros, consultas):
+    """
+    Executa várias buscas com os mesmos filtros em uma API que as resolve em
+    conjunto (função buscar_lote do adaptador, usada por core.lote).
+    
+    Args:
+        api (str): Nome da API
+        parametros (dict): Parâmetros de busca comuns (autor, período e revistas)
+        consultas (dict): Termos -> número máximo de resultados
+    
+    Returns:
+        dict: Termos -> lista de resultados da API (listas vazias se a API falhar)
+    """
+    inicio = time.perf_counter()
+    with rastreamento.span(f"api.{api}", api=api, consultas=len(consultas)) as etapa:
+        try:
+            logger.info("Iniciando busca em lote na API: %s", api)
+            resultados = ADAPTADORES[api].buscar_lote(
+                consultas,
+                autor=parametros['autor'],
+                data_inicio=parametros['data_inicio'],
+                data_fim=parametros['data_fim'],
+                revistas=parametros['revistas']
+            )
+            
+            total = sum(len(lista) for lista in resultados.values())
+            metricas.RESULTADOS_API.incrementar(api, valor=total)
+            etapa.definir(resultados=total)
+            
+            # Adiciona a fonte aos resultados
+            for lista in resultados.values():
+                for resultado in lista:
+                    resultado['fonte'] = api
+            
+            return resultados
+        except Exception as e:
+            logger.error(f"Erro na busca em lote na API {api}: {str(e)}")
+            metricas.registrar_erro_api(api, e)
+            etapa.registrar_erro(e)
+            return {termos: [] for termos in consultas}
+        finally:
+            metricas.LATENCIA_API.observar(time.perf_counter() - inicio, api)
+
+def executar_pagina_api(api, parametros, cursor=None):
+    """
+    Busca uma página de resultados em uma API específica (paginação
+    profunda, ver core.paginacao).
+    
+    Args:
+        api (str): Nome da API
+        parametros (dict): Parâmetros de busca ('data_indexacao' filtra o
+            período pela data de indexação nas APIs que permitem)
+        cursor (str, opcional): Cursor da página na API (None na primeira)
+    
+    Returns:
+        tuple: (lista de resultados da API, cursor da página seguinte ou
+            None se a API não tem mais resultados); em caso de falha, a
+            lista é None e o cursor recebido é devolvido, para nova tentativa
+    """
+    inicio = time.perf_counter()
+    with rastreamento.span(f"api.{api}", api=api, cursor=str(cursor)) as etapa:
+        try:
+            logger.info("Buscando página da API %s (cursor %s)", api, cursor)
+            adaptador = ADAPTADORES[api]
+            opcionais = {}
+            if parametros.get('data_indexacao') and getattr(adaptador, 'FILTRA_DATA_INDEXACAO', False):
+                opcionais['data_indexacao'] = True
+            resultados, proximo = adaptador.buscar_pagina(
+                termos=parametros['termos'],
+                autor=parametros['autor'],
+                data_inicio=parametros['data_inicio'],
+                data_fim=parametros['data_fim'],
+                revistas=parametros['revistas'],
+                limite=parametros['limite'],
+                cursor=cursor,
+                **opcionais
+            )
+            
+            metricas.RESULTADOS_API.incrementar(api, valor=len(resultados))
+            etapa.definir(resultados=len(resultados))
+            
+            # Adiciona a fonte aos resultados
+            for resultado in resultados:
+                resultado['fonte'] = api
+            
+            return resultados, proximo
+        except Exception as e:
+            logger.error(f"Erro ao buscar página na API {api}: {str(e)}")
+            metricas.registrar_erro_api(api, e)
+            etapa.registrar_erro(e)
+            return None, cursor
+        finally:
+            metricas.LATENCIA_API.observar(time.perf_counter() - inicio, api)
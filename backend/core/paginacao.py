@@ -0,0 +1,428 @@
+"""
+Paginação profunda das buscas.
+Uma sessão de paginação guarda, para cada API, o cursor da sua próxima
+página (retstart do PubMed, cursor do Crossref e do OpenAlex, deslocamento
+do Semantic Scholar, número da página do Thieme). Cada página pedida pelo
+cliente só consulta as APIs quando os resultados já recebidos e ainda não
+entregues não bastam para completá-la; os novos resultados são mesclados
+aos anteriores, de modo que nada já entregue se repete, e a resposta traz
+um token de continuação opaco.
+
+A ordenação vale para os resultados recebidos até cada página: uma página
+posterior pode trazer resultados que teriam vindo antes, se já tivessem
+sido recebidos. O estado da sessão fica em memória e é gravado no cache em
+disco a cada página, com o número da página na chave, para que a
+continuação funcione em qualquer worker: uma cópia em memória mais antiga
+que a gravada por outro worker é substituída pela do disco.
+"""
+import os
+import time
+import base64
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from core import motor_busca, processador, cache, conjuntos
+from utils import rastreamento
+
+logger = logging.getLogger(__name__)
+
+# Sessões mantidas em memória (as menos usadas saem primeiro)
+MAX_SESSOES = 128
+
+# Tempo (em segundos) sem uso após o qual uma sessão não pode ser continuada
+TEMPO_EXPIRACAO = 3600
+
+# Resultados pedidos a cada API por consulta (no mínimo o tamanho da página)
+RESULTADOS_POR_API = 50
+
+# Consultas às APIs no máximo para completar uma página
+MAX_RODADAS_PAGINA = 5
+
+_sessoes = OrderedDict()
+_lock = threading.Lock()
+
+class TokenInvalidoError(ValueError):
+    """Lançada para tokens de continuação inválidos, expirados ou já usados."""
+
+class SessaoPaginacao:
+    """
+    Estado da paginação de uma busca.
+    """
+    
+    def __init__(self, id_sessao, parametros, cursores):
+        """
+        Cria a sessão sem resultados.
+        
+        Args:
+            id_sessao (str): Identificador da sessão
+            parametros (dict): Parâmetros normalizados da busca
+            cursores (dict): API -> cursor da próxima página (None na primeira);
+                APIs sem mais resultados saem do dicionário
+        """
+        self.id = id_sessao
+        self.parametros = parametros
+        self.cursores = cursores
+        self.mesclador = processador.MescladorIncremental(parametros)
+        
+        # Posições (em mesclador.unicos) já entregues e as da última página
+        self.entregues = set()
+        self.ultima = []
+        self.pagina = 0
+        
+        self.usado_em = time.time()
+        self.lock = threading.Lock()
+    
+    def proxima_pagina(self, tamanho):
+        """
+        Monta a próxima página, consultando as APIs apenas se faltarem
+        resultados recebidos e ainda não entregues.
+        
+        Args:
+            tamanho (int): Resultados por página
+        
+        Returns:
+            list: Resultados da página
+        """
+        falhas = set()
+        pendentes = self._pendentes()
+        rodadas = 0
+        while len(pendentes) < tamanho and set(self.cursores) - falhas and rodadas < MAX_RODADAS_PAGINA:
+            self._consultar_apis(max(tamanho, RESULTADOS_POR_API), falhas)
+            pendentes = self._pendentes()
+            rodadas += 1
+        
+        pagina = pendentes[:tamanho]
+        self.ultima = [posicao for posicao, _ in pagina]
+        self.entregues.update(self.ultima)
+        self.pagina += 1
+        return [resultado for _, resultado in pagina]
+    
+    def repetir_pagina(self):
+        """
+        Retorna novamente a última página (o cliente repetiu o token).
+        
+        Returns:
+            list: Resultados da última página
+        """
+        return [self.mesclador.unicos[posicao] for posicao in self.ultima]
+    
+    def tem_mais(self):
+        """Retorna True se ainda há resultados a entregar ou APIs a consultar."""
+        return bool(self.cursores) or bool(self._pendentes())
+    
+    def _pendentes(self):
+        """Resultados recebidos e ainda não entregues, na ordem da busca."""
+        unicos = self.mesclador.unicos
+        ordenados = self.mesclador.resultados()
+        posicoes = {id(resultado): posicao for posicao, resultado in enumerate(unicos)}
+        return [
+            (posicoes[id(resultado)], resultado) for resultado in ordenados
+            if posicoes[id(resultado)] not in self.entregues
+        ]
+    
+    def _consultar_apis(self, limite, falhas):
+        """
+        Busca a próxima página de cada API ainda com resultados, em paralelo.
+        
+        Args:
+            limite (int): Resultados pedidos a cada API
+            falhas (set): APIs que falharam durante a montagem desta página
+                (atualizado; não são consultadas de novo até a próxima)
+        """
+        apis = [api for api in self.cursores if api not in falhas]
+        parametros = {**self.parametros, 'limite': limite}
+        
+        with rastreamento.span('paginacao.consulta', apis=','.join(apis)), \
+                ThreadPoolExecutor(max_workers=len(apis)) as executor:
+            # Cada API roda no rastro da requisição (ver utils.rastreamento)
+            futures = {
+                api: executor.submit(
+                    rastreamento.propagar(motor_busca.executar_pagina_api), api, parametros, self.cursores[api]
+                )
+                for api in apis
+            }
+            
+            for api, future in futures.items():
+                resultados, proximo = future.result()
+                if resultados is None:
+                    falhas.add(api)
+                    continue
+                
+                self.mesclador.adicionar(resultados)
+                if proximo is None:
+                    del self.cursores[api]
+                else:
+                    self.cursores[api] = proximo
+    
+    def como_dict(self):
+        """
+        Converte o estado da sessão para gravação.
+        
+        Returns:
+            dict: Estado serializável em JSON
+        """
+        return {
+            'id': self.id,
+            'parametros': self.parametros,
+            'cursores': self.cursores,
+            'unicos': self.mesclador.unicos,
+            'entregues': sorted(self.entregues),
+            'ultima': self.ultima,
+            'pagina': self.pagina
+        }
+    
+    @classmethod
+    def de_dict(cls, estado):
+        """
+        Reconstrói uma sessão gravada (em outro worker, por exemplo).
+        
+        Args:
+            estado (dict): Saída de como_dict
+        
+        Returns:
+            SessaoPaginacao: Sessão restaurada
+        """
+        sessao = cls(estado['id'], estado['parametros'], estado['cursores'])
+        
+        # Os resultados únicos são mesclados um a um, na ordem em que foram
+        # recebidos, e mantêm as posições
+        for resultado in estado['unicos']:
+            sessao.mesclador.mesclar([resultado])
+        sessao.entregues = set(estado['entregues'])
+        sessao.ultima = estado['ultima']
+        sessao.pagina = estado['pagina']
+        return sessao
+
+def configurar(max_sessoes=None, tempo_expiracao=None):
+    """
+    Ajusta a configuração das sessões de paginação.
+    
+    Args:
+        max_sessoes (int, opcional): Sessões mantidas em memória
+        tempo_expiracao (int, opcional): Segundos sem uso até a sessão expirar
+    """
+    global MAX_SESSOES, TEMPO_EXPIRACAO
+    
+    if max_sessoes is not None:
+        MAX_SESSOES = max(1, int(max_sessoes))
+    if tempo_expiracao is not None:
+        TEMPO_EXPIRACAO = int(tempo_expiracao)
+
+def iniciar(termos, autor='', data_inicio=None, data_fim=None, revistas=None, apis=None, ordenar_por='data',
+            tamanho=None):
+    """
+    Inicia a paginação de uma busca e retorna a primeira página.
+    
+    Args:
+        termos (str): Termos de busca (suporta operadores booleanos)
+        autor (str, opcional): Nome do autor para filtrar
+        data_inicio (str, opcional): Data inicial no formato YYYY-MM-DD
+        data_fim (str, opcional): Data final no formato YYYY-MM-DD
+        revistas (list, opcional): Lista de IDs de revistas para filtrar
+        apis (list, opcional): APIs consultadas (se None, usa todas)
+        ordenar_por (str, opcional): 'data' ou 'relevancia'
+        tamanho (int, opcional): Resultados por página
+    
+    Returns:
+        dict: Página (ver montar_pagina)
+    
+    Raises:
+        ValueError: Se o tamanho de página for inválido
+    """
+    tamanho = validar_tamanho(tamanho)
+    _, parametros, apis = motor_busca.preparar_parametros(
+        termos, autor, data_inicio, data_fim, revistas, apis=apis, ordenar_por=ordenar_por
+    )
+    
+    cursores = {
+        api: None for api in apis
+        if api in motor_busca.ADAPTADORES and getattr(motor_busca.ADAPTADORES[api], 'BUSCA_POR_TERMOS', True)
+    }
+    sessao = SessaoPaginacao(os.urandom(16).hex(), parametros, cursores)
+    logger.info("Paginação iniciada: sessão %s, termos='%s'", sessao.id, termos)
+    
+    with sessao.lock:
+        resultados = sessao.proxima_pagina(tamanho)
+        pagina = montar_pagina(sessao, resultados)
+        _guardar(sessao)
+    return pagina
+
+def continuar(token, tamanho=None):
+    """
+    Retorna a página indicada por um token de continuação.
+    
+    Repetir o token da última página entregue devolve a mesma página (por
+    exemplo, quando a resposta anterior se perdeu).
+    
+    Args:
+        token (str): Token recebido na página anterior
+        tamanho (int, opcional): Resultados por página
+    
+    Returns:
+        dict: Página (ver montar_pagina)
+    
+    Raises:
+        TokenInvalidoError: Se o token for inválido, expirado ou já usado
+        ValueError: Se o tamanho de página for inválido
+    """
+    tamanho = validar_tamanho(tamanho)
+    id_sessao, numero = ler_token(token)
+    
+    sessao = _obter(id_sessao, numero)
+    if sessao is None:
+        raise TokenInvalidoError("Paginação não encontrada ou expirada. Refaça a busca.")
+    
+    with sessao.lock:
+        if numero == sessao.pagina:
+            return montar_pagina(sessao, sessao.repetir_pagina())
+        if numero != sessao.pagina + 1:
+            raise TokenInvalidoError("Token de continuação já utilizado.")
+        
+        resultados = sessao.proxima_pagina(tamanho)
+        pagina = montar_pagina(sessao, resultados)
+        _guardar(sessao)
+    return pagina
+
+def montar_pagina(sessao, resultados):
+    """
+    Monta a resposta de uma página.
+    
+    Args:
+        sessao (SessaoPaginacao): Sessão da paginação
+        resultados (list): Resultados da página
+    
+    Returns:
+        dict: Resultados, token da próxima página (None na última), número da
+            página, total entregue até ela e APIs que ainda têm resultados
+    """
+    return {
+        "resultados": resultados,
+        "token": gerar_token(sessao.id, sessao.pagina + 1) if sessao.tem_mais() else None,
+        "pagina": sessao.pagina,
+        "entregues": len(sessao.entregues),
+        "apis_restantes": sorted(sessao.cursores)
+    }
+
+def validar_tamanho(tamanho):
+    """
+    Valida o tamanho de página (padrão e máximo os dos conjuntos de resultados).
+    
+    Args:
+        tamanho (int ou str, opcional): Resultados por página
+    
+    Returns:
+        int: Tamanho de página
+    
+    Raises:
+        ValueError: Se o tamanho não for um inteiro positivo
+    """
+    tamanho = int(tamanho) if tamanho else conjuntos.TAMANHO_PAGINA
+    if tamanho < 1:
+        raise ValueError("Tamanho de página inválido")
+    return min(tamanho, conjuntos.MAX_TAMANHO_PAGINA)
+
+def gerar_token(id_sessao, numero):
+    """
+    Gera o token de continuação de uma página.
+    
+    Args:
+        id_sessao (str): Identificador da sessão
+        numero (int): Número da página
+    
+    Returns:
+        str: Token opaco (base64 sem preenchimento, seguro em URLs)
+    """
+    return base64.urlsafe_b64encode(f"{id_sessao}:{numero}".encode('ascii')).decode('ascii').rstrip('=')
+
+def ler_token(token):
+    """
+    Lê um token de continuação.
+    
+    Args:
+        token (str): Token gerado por gerar_token
+    
+    Returns:
+        tuple: (identificador da sessão, número da página)
+    
+    Raises:
+        TokenInvalidoError: Se o token for inválido
+    """
+    try:
+        texto = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('ascii')
+        id_sessao, numero = texto.split(':')
+        if len(id_sessao) != 32 or not id_sessao.isalnum():
+            raise ValueError(id_sessao)
+        return id_sessao, int(numero)
+    except ValueError:
+        raise TokenInvalidoError("Token de continuação inválido.")
+
+def _chave_cache(id_sessao, pagina):
+    """Chave do estado da sessão após uma página no cache em disco."""
+    return f"paginacao_{id_sessao}_{pagina}"
+
+def _guardar(sessao):
+    """
+    Guarda a sessão em memória e grava seu estado no cache em disco (o
+    estado da página anterior deixa de ser necessário e é removido).
+    """
+    sessao.usado_em = time.time()
+    with _lock:
+        _sessoes[sessao.id] = sessao
+        _sessoes.move_to_end(sessao.id)
+        while len(_sessoes) > MAX_SESSOES:
+            _sessoes.popitem(last=False)
+    cache.armazenar_cache(_chave_cache(sessao.id, sessao.pagina), sessao.como_dict())
+    
+    try:
+        os.remove(cache.obter_caminho_cache(_chave_cache(sessao.id, sessao.pagina - 1)))
+    except OSError:
+        pass
+
+def _obter(id_sessao, numero):
+    """
+    Recupera uma sessão para a página pedida, da memória ou do cache em disco.
+    
+    A cópia em memória só é usada se nenhum worker gravou um estado mais
+    recente: se a página pedida (ou a anterior a ela) já foi gravada e a
+    cópia em memória ainda não chegou a ela, o estado é lido do disco.
+    
+    Args:
+        id_sessao (str): Identificador da sessão
+        numero (int): Número da página pedida
+    
+    Returns:
+        SessaoPaginacao: Sessão ou None se não existir ou tiver expirado
+    """
+    with _lock:
+        sessao = _sessoes.get(id_sessao)
+        if sessao is not None and time.time() - sessao.usado_em > TEMPO_EXPIRACAO:
+            del _sessoes[id_sessao]
+            return None
+        if sessao is not None and sessao.pagina >= numero:
+            _sessoes.move_to_end(id_sessao)
+            return sessao
+    
+    # A página pedida já entregue (repetição) ou a anterior a ela
+    atual = sessao.pagina if sessao is not None else 0
+    for pagina in (numero, numero - 1):
+        if pagina <= atual:
+            break
+        if cache.idade_cache(_chave_cache(id_sessao, pagina)) is None:
+            continue
+        estado = cache.obter_cache(_chave_cache(id_sessao, pagina))
+        if estado:
+            restaurada = SessaoPaginacao.de_dict(estado)
+            with _lock:
+                # Outra requisição pode ter restaurado a mesma sessão ao mesmo tempo
+                sessao = _sessoes.get(id_sessao)
+                if sessao is None or sessao.pagina < restaurada.pagina:
+                    sessao = _sessoes[id_sessao] = restaurada
+                _sessoes.move_to_end(id_sessao)
+            return sessao
+    
+    if sessao is not None:
+        with _lock:
+            _sessoes.move_to_end(id_sessao)
+    return sessao
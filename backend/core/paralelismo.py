@@ -0,0 +1,154 @@
+"""
+Execução paralela das etapas de processamento intensivas em CPU.
+Distribui lotes de itens entre processos para que o processamento de buscas
+grandes não segure o GIL da thread que atende outras requisições.
+"""
+import os
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Ativa o pool de processos (desativado por padrão; ver configurar)
+HABILITADO = False
+
+# Número mínimo de itens para que valha a pena cruzar processos
+LIMIAR_ITENS = 400
+
+# Quantidade de itens por lote enviado a um processo
+TAMANHO_LOTE = 100
+
+# Número de processos do pool (None usa os.cpu_count())
+MAX_PROCESSOS = None
+
+_pool = None
+_lock_pool = threading.Lock()
+
+def configurar(habilitado=None, limiar_itens=None, tamanho_lote=None, max_processos=None):
+    """
+    Ajusta a configuração do processamento paralelo.
+    
+    Args:
+        habilitado (bool, opcional): Ativa ou desativa o pool de processos
+        limiar_itens (int, opcional): Tamanho mínimo de entrada para usar o pool
+        tamanho_lote (int, opcional): Itens por lote enviado aos processos
+        max_processos (int, opcional): Número de processos do pool
+    """
+    global HABILITADO, LIMIAR_ITENS, TAMANHO_LOTE, MAX_PROCESSOS
+    
+    if habilitado is not None:
+        HABILITADO = bool(habilitado)
+    if limiar_itens is not None:
+        LIMIAR_ITENS = int(limiar_itens)
+    if tamanho_lote is not None:
+        TAMANHO_LOTE = max(1, int(tamanho_lote))
+    if max_processos is not None:
+        MAX_PROCESSOS = int(max_processos) or None
+        # Recria o pool na próxima utilização com o novo tamanho
+        encerrar_pool()
+    
+    if not HABILITADO:
+        encerrar_pool()
+
+def usar_pool(quantidade):
+    """
+    Indica se uma entrada com a quantidade de itens informada deve ir ao pool.
+    
+    Args:
+        quantidade (int): Número de itens a processar
+    
+    Returns:
+        bool: True se o pool deve ser utilizado
+    """
+    return HABILITADO and quantidade >= LIMIAR_ITENS and (MAX_PROCESSOS or os.cpu_count() or 1) > 1
+
+def obter_pool():
+    """
+    Retorna o pool de processos compartilhado, criando-o na primeira chamada.
+    
+    Returns:
+        ProcessPoolExecutor: Pool de processos
+    """
+    global _pool
+    
+    with _lock_pool:
+        if _pool is None:
+            processos = MAX_PROCESSOS or os.cpu_count() or 1
+            _pool = ProcessPoolExecutor(max_workers=processos)
+            logger.info(f"Pool de processos iniciado com {processos} processos")
+        return _pool
+
+def encerrar_pool():
+    """Encerra o pool de processos, se existir."""
+    global _pool
+    
+    with _lock_pool:
+        pool, _pool = _pool, None
+    
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def dividir_em_lotes(itens, tamanho_lote=None):
+    """
+    Divide uma lista em lotes consecutivos.
+    
+    Args:
+        itens (list): Itens a dividir
+        tamanho_lote (int, opcional): Itens por lote (padrão: TAMANHO_LOTE)
+    
+    Returns:
+        list: Lista de lotes (listas)
+    """
+    tamanho_lote = tamanho_lote or TAMANHO_LOTE
+    return [itens[i:i + tamanho_lote] for i in range(0, len(itens), tamanho_lote)]
+
+def mapear(funcao, lotes):
+    """
+    Aplica uma função a cada lote no pool de processos.
+    
+    A função deve ser definida no nível de módulo (para poder ser
+    serializada). Se o pool estiver indisponível, os lotes são processados
+    localmente.
+    
+    Args:
+        funcao (callable): Função que processa um lote
+        lotes (list): Lotes a processar
+    
+    Returns:
+        list: Resultado de cada lote, na ordem dos lotes
+    """
+    try:
+        return list(obter_pool().map(funcao, lotes))
+    except BrokenProcessPool as e:
+        logger.error(f"Pool de processos indisponível, processando localmente: {str(e)}")
+        encerrar_pool()
+        return [funcao(lote) for lote in lotes]
+
+def mapear_em_lotes(funcao, itens, tamanho_lote=None):
+    """
+    Aplica uma função de lote a uma lista de itens, usando o pool de
+    processos quando a entrada for grande o bastante.
+    
+    A função deve receber uma lista de itens e devolver uma lista de
+    resultados do mesmo tamanho. A ordem dos itens é preservada.
+    
+    Args:
+        funcao (callable): Função que processa um lote
+        itens (list): Itens a processar
+        tamanho_lote (int, opcional): Itens por lote (padrão: TAMANHO_LOTE)
+    
+    Returns:
+        list: Resultados concatenados, na ordem dos itens
+    """
+    if not usar_pool(len(itens)):
+        return funcao(itens)
+    
+    resultados = []
+    for resultado_lote in mapear(funcao, dividir_em_lotes(itens, tamanho_lote)):
+        resultados.extend(resultado_lote)
+    return resultados
+
+atexit.register(encerrar_pool)
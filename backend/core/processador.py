@@ -2,14 +2,37 @@
 Processador de resultados do Buscador de Revistas Científicas.
 Responsável por normalizar, enriquecer e deduplica resultados.
 """
+import re
+import time
 import logging
+import threading
+from collections import defaultdict
 from datetime import datetime
 from difflib import SequenceMatcher
 
-from utils import normalizacao
+from core import paralelismo, ranqueamento
+from utils import normalizacao, metricas, rastreamento
 
 logger = logging.getLogger(__name__)
 
+# Similaridade mínima de título para considerar dois resultados duplicados
+LIMIAR_SIMILARIDADE = 0.85
+
+# Palavras usadas no bloqueio da deduplicação por similaridade
+_RE_PALAVRA_TITULO = re.compile(r'\w{3,}')
+
+# Campos brutos enviados aos processos, em ordem fixa (lotes compactos)
+CAMPOS_BRUTOS = (
+    'id', 'titulo', 'autores', 'revista', 'data_publicacao',
+    'doi', 'url', 'resumo', 'fonte', 'resumo_indice'
+)
+
+# Campos de um resultado normalizado, em ordem fixa
+CAMPOS_NORMALIZADOS = (
+    'id', 'titulo', 'autores', 'revista', 'data_publicacao',
+    'doi', 'url', 'resumo', 'fonte'
+)
+
 def processar_resultados(resultados, parametros):
     """
     Processa os resultados de múltiplas APIs, normalizando, enriquecendo e deduplicando.
@@ -21,26 +44,47 @@ def processar_resultados(resultados, parametros):
     Returns:
         list: Lista de resultados processados
     """
-    logger.info(f"Processando {len(resultados)} resultados brutos")
+    mesclador = MescladorIncremental(parametros)
+    mesclador.adicionar(resultados)
+    return mesclador.resultados()
+
+def normalizar_resultados(resultados):
+    """
+    Normaliza uma lista de resultados, usando o pool de processos quando
+    a lista for grande o bastante.
     
-    # Normaliza os resultados
-    resultados_normalizados = [normalizar_resultado(r) for r in resultados]
+    Os resultados cruzam a fronteira entre processos como tuplas de campos
+    em ordem fixa, o que reduz o custo de serialização.
     
-    # Remove resultados inválidos
-    resultados_validos = [r for r in resultados_normalizados if validar_resultado(r)]
+    Args:
+        resultados (list): Lista de resultados brutos
     
-    # Deduplica resultados
-    resultados_unicos = deduplica_resultados(resultados_validos)
+    Returns:
+        list: Lista de resultados normalizados
+    """
+    if not paralelismo.usar_pool(len(resultados)):
+        return [normalizar_resultado(r) for r in resultados]
     
-    # Filtra por critérios adicionais
-    resultados_filtrados = filtrar_resultados(resultados_unicos, parametros)
+    compactos = [tuple(r.get(campo, '') for campo in CAMPOS_BRUTOS) for r in resultados]
+    normalizados = paralelismo.mapear_em_lotes(normalizar_lote_compacto, compactos)
     
-    # Ordena resultados (padrão: por data, mais recentes primeiro)
-    resultados_ordenados = ordenar_resultados(resultados_filtrados)
+    return [dict(zip(CAMPOS_NORMALIZADOS, valores)) for valores in normalizados]
+
+def normalizar_lote_compacto(lote):
+    """
+    Normaliza um lote de resultados compactos (executado nos processos).
     
-    logger.info(f"Processamento concluído: {len(resultados_ordenados)} resultados finais")
+    Args:
+        lote (list): Tuplas com os valores de CAMPOS_BRUTOS
     
-    return resultados_ordenados
+    Returns:
+        list: Tuplas com os valores de CAMPOS_NORMALIZADOS
+    """
+    normalizados = []
+    for valores in lote:
+        normalizado = normalizar_resultado(dict(zip(CAMPOS_BRUTOS, valores)))
+        normalizados.append(tuple(normalizado[campo] for campo in CAMPOS_NORMALIZADOS))
+    return normalizados
 
 def normalizar_resultado(resultado):
     """
@@ -65,6 +109,10 @@ def normalizar_resultado(resultado):
         'fonte': resultado.get('fonte', '')
     }
     
+    # Reconstrói o resumo a partir do índice invertido (OpenAlex)
+    if not normalizado['resumo'] and resultado.get('resumo_indice'):
+        normalizado['resumo'] = normalizacao.reconstruir_resumo(resultado['resumo_indice'])
+    
     # Gera URL a partir do DOI se não existir
     if not normalizado['url'] and normalizado['doi']:
         normalizado['url'] = f"https://doi.org/{normalizado['doi']}"
@@ -108,42 +156,468 @@ def deduplica_resultados(resultados):
     Returns:
         list: Lista de resultados sem duplicatas
     """
-    # Primeiro agrupa por DOI
-    resultados_por_doi = {}
-    resultados_sem_doi = []
+    mesclador = MescladorIncremental()
+    mesclador.mesclar(resultados)
+    return list(mesclador.unicos)
+
+class MescladorIncremental:
+    """
+    Mescla resultados de várias APIs à medida que chegam.
+    
+    Cada lote é normalizado, validado e deduplicado contra os lotes
+    anteriores: o mapa de DOIs e o índice de similaridade de títulos são
+    mantidos entre os lotes, de modo que o trabalho de mesclagem acontece
+    enquanto as demais APIs ainda respondem. A visão filtrada e ordenada
+    pode ser obtida a qualquer momento com resultados().
+    """
+    
+    def __init__(self, parametros=None):
+        """
+        Inicializa o mesclador vazio.
+        
+        Args:
+            parametros (dict, opcional): Parâmetros de busca usados nos filtros
+        """
+        self.parametros = parametros or {}
+        self.unicos = []
+        self.total_recebido = 0
+        
+        # DOI -> posição em self.unicos
+        self._posicao_doi = {}
+        
+        # Títulos indexados e a posição em self.unicos de cada um
+        self._indice = IndiceSimilaridade()
+        self._posicao_titulo = []
+        
+        # Posições em self.unicos de resultados ainda sem DOI
+        self._sem_doi = set()
+        
+        # Posições que cada resultado único ocupava nas fontes (para a
+        # fusão com a relevância local) e quantos resultados cada fonte enviou
+        self._posicoes_fonte = []
+        self._recebidos_fonte = {}
+        
+        # Índice BM25 por posição em self.unicos e posições ainda não indexadas
+        self._indice_bm25 = ranqueamento.IndiceBM25()
+        self._pendentes_bm25 = set()
+        
+        self._lock = threading.Lock()
     
-    for resultado in resultados:
-        doi = resultado.get('doi')
-        if doi:
-            if doi not in resultados_por_doi:
-                resultados_por_doi[doi] = resultado
+    def __len__(self):
+        return len(self.unicos)
+    
+    def adicionar(self, resultados):
+        """
+        Normaliza, valida e mescla um lote de resultados brutos.
+        
+        Args:
+            resultados (list): Resultados brutos de uma API
+        
+        Returns:
+            int: Número de resultados únicos após a mesclagem
+        """
+        if not resultados:
+            return len(self.unicos)
+        
+        logger.info("Processando %s resultados brutos", len(resultados))
+        
+        # Normaliza e remove resultados inválidos fora do lock
+        inicio = time.perf_counter()
+        with rastreamento.span('processador.normalizacao', resultados=len(resultados)):
+            resultados_normalizados = normalizar_resultados(resultados)
+        metricas.ETAPAS_PROCESSAMENTO.observar(time.perf_counter() - inicio, 'normalizacao')
+        
+        with self._lock:
+            self.total_recebido += len(resultados)
+            
+            # Posição de cada resultado na resposta da sua fonte
+            validos = []
+            posicoes = []
+            for resultado in resultados_normalizados:
+                fonte = resultado.get('fonte', '')
+                posicao = self._recebidos_fonte.get(fonte, 0)
+                self._recebidos_fonte[fonte] = posicao + 1
+                if validar_resultado(resultado):
+                    validos.append(resultado)
+                    posicoes.append(posicao)
+            
+            inicio = time.perf_counter()
+            unicos_antes = len(self.unicos)
+            with rastreamento.span('processador.deduplicacao', resultados=len(validos)):
+                self.mesclar(validos, posicoes)
+            metricas.ETAPAS_PROCESSAMENTO.observar(time.perf_counter() - inicio, 'deduplicacao')
+            metricas.DUPLICATAS.incrementar(valor=len(validos) - (len(self.unicos) - unicos_antes))
+            metricas.DESCARTADOS.incrementar(valor=len(resultados_normalizados) - len(validos))
+            
+            # Indexa já na chegada quando a busca é ordenada por relevância
+            if self.parametros.get('ordenar_por') == 'relevancia':
+                inicio = time.perf_counter()
+                with rastreamento.span('processador.indexacao'):
+                    self._indexar_pendentes()
+                metricas.ETAPAS_PROCESSAMENTO.observar(time.perf_counter() - inicio, 'indexacao')
+            
+            return len(self.unicos)
+    
+    def mesclar(self, resultados, posicoes=None):
+        """
+        Deduplica resultados já normalizados contra os resultados anteriores.
+        
+        Resultados com DOI são agrupados pelo DOI; os sem DOI são comparados
+        pelo título com todos os títulos já vistos. Um DOI inédito também é
+        comparado pelo título com os resultados anteriores sem DOI, de modo
+        que o resultado não dependa da ordem de chegada das APIs.
+        
+        Args:
+            resultados (list): Resultados normalizados e válidos
+            posicoes (list, opcional): Posição de cada resultado na sua fonte
+        """
+        if posicoes is None:
+            posicoes = [None] * len(resultados)
+        
+        sem_doi = []
+        
+        for resultado, posicao_fonte in zip(resultados, posicoes):
+            doi = resultado.get('doi')
+            if not doi:
+                sem_doi.append((resultado, posicao_fonte))
+                continue
+            
+            posicao = self._posicao_doi.get(doi)
+            if posicao is None:
+                posicao = self._buscar_sem_doi(resultado.get('titulo', '').lower())
+                if posicao is None:
+                    self._posicao_doi[doi] = self._novo_unico(resultado, posicao_fonte)
+                else:
+                    # Mesmo artigo recebido antes sem DOI: o resultado mantido recebe o DOI
+                    self._posicao_doi[doi] = posicao
+                    self._mesclar_em(posicao, resultado, posicao_fonte)
+                    self.unicos[posicao]['doi'] = doi
+                    self._sem_doi.discard(posicao)
             else:
                 # Se já existe, mantém o mais completo
-                resultados_por_doi[doi] = escolher_resultado_mais_completo(
-                    resultados_por_doi[doi], resultado
-                )
-        else:
-            resultados_sem_doi.append(resultado)
+                self._mesclar_em(posicao, resultado, posicao_fonte)
+        
+        if not sem_doi:
+            return
+        
+        titulos = [r.get('titulo', '').lower() for r, _ in sem_doi]
+        anteriores = self._buscar_similares(titulos)
+        
+        for (resultado, posicao_fonte), anterior in zip(sem_doi, anteriores):
+            if anterior is None:
+                self._sem_doi.add(self._novo_unico(resultado, posicao_fonte, indexado=True))
+            else:
+                # Encontrou duplicata, mantém o mais completo
+                posicao = self._posicao_titulo[anterior]
+                self._posicao_titulo.append(posicao)
+                self._mesclar_em(posicao, resultado, posicao_fonte)
+    
+    def _buscar_sem_doi(self, titulo):
+        """
+        Procura um resultado único sem DOI com título similar e registra o
+        título no índice quando o encontra.
+        
+        Args:
+            titulo (str): Título em minúsculas
+        
+        Returns:
+            int: Posição em self.unicos do resultado similar ou None
+        """
+        if not self._sem_doi:
+            return None
+        
+        anterior = self._indice.buscar(titulo, aceitar=lambda p: self._posicao_titulo[p] in self._sem_doi)
+        if anterior is None:
+            return None
+        
+        posicao = self._posicao_titulo[anterior]
+        self._indice.adicionar(titulo)
+        self._posicao_titulo.append(posicao)
+        return posicao
+    
+    def _novo_unico(self, resultado, posicao_fonte=None, indexado=False):
+        """
+        Acrescenta um resultado inédito e registra seu título no índice.
+        
+        Args:
+            resultado (dict): Resultado normalizado
+            posicao_fonte (int, opcional): Posição do resultado na sua fonte
+            indexado (bool): True se o título já foi adicionado ao índice
+        
+        Returns:
+            int: Posição do resultado em self.unicos
+        """
+        posicao = len(self.unicos)
+        self.unicos.append(resultado)
+        self._pendentes_bm25.add(posicao)
+        self._posicoes_fonte.append([] if posicao_fonte is None else [posicao_fonte])
+        if not indexado:
+            self._indice.adicionar(resultado.get('titulo', '').lower())
+        self._posicao_titulo.append(posicao)
+        return posicao
+    
+    def _mesclar_em(self, posicao, resultado, posicao_fonte=None):
+        """
+        Mescla um resultado duplicado no resultado único da posição informada.
+        
+        Args:
+            posicao (int): Posição em self.unicos
+            resultado (dict): Resultado duplicado
+            posicao_fonte (int, opcional): Posição do duplicado na sua fonte
+        """
+        self.unicos[posicao] = escolher_resultado_mais_completo(
+            self.unicos[posicao], resultado
+        )
+        if self.unicos[posicao].get('doi'):
+            self._sem_doi.discard(posicao)
+        self._pendentes_bm25.add(posicao)
+        if posicao_fonte is not None:
+            self._posicoes_fonte[posicao].append(posicao_fonte)
+    
+    def _buscar_similares(self, titulos):
+        """
+        Procura, para cada título novo, o primeiro título já visto similar.
+        Todos os títulos novos são adicionados ao índice.
+        
+        Args:
+            titulos (list): Títulos em minúsculas
+        
+        Returns:
+            list: Posição no índice do título similar (ou None) para cada título
+        """
+        return self._indice.buscar_todos(titulos)
+    
+    def _indexar_pendentes(self):
+        """Indexa no BM25 os resultados novos ou alterados desde a última chamada."""
+        for posicao in self._pendentes_bm25:
+            resultado = self.unicos[posicao]
+            self._indice_bm25.adicionar(
+                posicao, resultado.get('titulo', ''), resultado.get('resumo', '')
+            )
+        self._pendentes_bm25.clear()
+    
+    @rastreamento.rastreado('processador.filtragem_ordenacao')
+    def resultados(self, ordenar_por=None):
+        """
+        Retorna a visão atual: resultados únicos filtrados e ordenados.
+        
+        Args:
+            ordenar_por (str, opcional): 'data' ou 'relevancia' (padrão: o
+                valor de parametros['ordenar_por'] ou 'data')
+        
+        Returns:
+            list: Lista de resultados processados
+        """
+        ordenar_por = ordenar_por or self.parametros.get('ordenar_por', 'data')
+        
+        # O índice BM25 é lido durante a ordenação, por isso tudo ocorre no lock
+        inicio = time.perf_counter()
+        with self._lock:
+            if ordenar_por == 'relevancia':
+                self._indexar_pendentes()
+            
+            # Filtra por critérios adicionais
+            chaves = {id(resultado): posicao for posicao, resultado in enumerate(self.unicos)}
+            resultados_filtrados = filtrar_resultados(list(self.unicos), self.parametros)
+            chaves_filtradas = [chaves[id(r)] for r in resultados_filtrados]
+            
+            # Ordena resultados (padrão: por data, mais recentes primeiro)
+            resultados_ordenados = ordenar_resultados(
+                resultados_filtrados,
+                ordenar_por=ordenar_por,
+                termos=self.parametros.get('termos', ''),
+                posicoes_fonte=[self._posicoes_fonte[chave] for chave in chaves_filtradas],
+                indice=self._indice_bm25,
+                chaves=chaves_filtradas
+            )
+        
+        metricas.ETAPAS_PROCESSAMENTO.observar(time.perf_counter() - inicio, 'ordenacao')
+        logger.info("Processamento concluído: %s resultados finais", len(resultados_ordenados))
+        
+        return resultados_ordenados
+
+class IndiceSimilaridade:
+    """
+    Índice de bloqueio para a deduplicação por similaridade de título.
+    
+    Em vez de comparar cada título com todos os anteriores, apenas os
+    candidatos que compartilham ao menos metade das palavras do título e têm
+    tamanho compatível com o limiar (2 * min / (a + b) > limiar) passam pelo
+    SequenceMatcher. Os limites superiores baratos (real_quick_ratio e
+    quick_ratio) descartam o restante antes do cálculo completo.
+    
+    O limite de tamanho é exato, mas o de palavras é uma aproximação: a
+    comparação de todos os pares (o comportamento anterior) também une
+    títulos que passam do limiar tendo menos da metade das palavras em
+    comum, como os que mudam a grafia de várias palavras ("tumour of the
+    humerus" e "tumor of the humerus" se unem; "paediatric oesophageal
+    tumour" e "pediatric esophageal tumor" não). Esses casos deixam de ser
+    unidos em troca de não comparar cada título com todos os anteriores.
+    """
+    
+    def __init__(self, limiar=LIMIAR_SIMILARIDADE):
+        """
+        Inicializa o índice vazio.
+        
+        Args:
+            limiar (float, opcional): Similaridade mínima para duplicata
+        """
+        self.limiar = limiar
+        self.titulos = []
+        self.por_palavra = defaultdict(list)
+        self.sem_palavras = []
+        
+        # Faixa de tamanhos compatíveis com o limiar
+        self._fator_min = limiar / (2 - limiar)
+        self._fator_max = (2 - limiar) / limiar
     
-    # Resultados com DOI já estão deduplicados
-    resultados_deduplicados = list(resultados_por_doi.values())
+    def __len__(self):
+        return len(self.titulos)
     
-    # Para resultados sem DOI, verifica similaridade de título
-    for resultado in resultados_sem_doi:
-        duplicado = False
-        for idx, res_existente in enumerate(resultados_deduplicados):
-            if similaridade_titulo(resultado, res_existente) > 0.85:
-                # Encontrou duplicata, mantém o mais completo
-                resultados_deduplicados[idx] = escolher_resultado_mais_completo(
-                    res_existente, resultado
-                )
-                duplicado = True
-                break
+    def adicionar(self, titulo):
+        """
+        Adiciona um título (já em minúsculas) ao índice.
+        
+        Args:
+            titulo (str): Título
+        
+        Returns:
+            int: Posição do título no índice
+        """
+        posicao = len(self.titulos)
+        self.titulos.append(titulo)
+        
+        palavras = set(_RE_PALAVRA_TITULO.findall(titulo))
+        for palavra in palavras:
+            self.por_palavra[palavra].append(posicao)
+        if not palavras:
+            self.sem_palavras.append(posicao)
+        
+        return posicao
+    
+    def candidatos(self, titulo):
+        """
+        Retorna as posições dos títulos que podem ser similares ao informado.
+        
+        Args:
+            titulo (str): Título (já em minúsculas)
+        
+        Returns:
+            list: Posições candidatas, em ordem crescente
+        """
+        tamanho = len(titulo)
+        tamanho_min = tamanho * self._fator_min
+        tamanho_max = tamanho * self._fator_max
+        
+        palavras = set(_RE_PALAVRA_TITULO.findall(titulo))
+        if palavras:
+            contagem = defaultdict(int)
+            for palavra in palavras:
+                for posicao in self.por_palavra.get(palavra, ()):
+                    contagem[posicao] += 1
+            minimo = (len(palavras) + 1) // 2
+            posicoes = [p for p, total in contagem.items() if total >= minimo]
+        else:
+            posicoes = self.sem_palavras
+        
+        titulos = self.titulos
+        return sorted(
+            p for p in posicoes
+            if tamanho_min <= len(titulos[p]) <= tamanho_max
+        )
+    
+    def buscar(self, titulo, aceitar=None):
+        """
+        Procura o primeiro título indexado similar ao título informado.
+        
+        Args:
+            titulo (str): Título (já em minúsculas)
+            aceitar (callable, opcional): Filtro das posições candidatas
+        
+        Returns:
+            int: Posição do primeiro título similar ou None
+        """
+        candidatos = self.candidatos(titulo)
+        if aceitar is not None:
+            candidatos = [posicao for posicao in candidatos if aceitar(posicao)]
+        
+        encontrado = primeiro_similar(titulo, [self.titulos[p] for p in candidatos], self.limiar)
+        return None if encontrado is None else candidatos[encontrado]
+    
+    def buscar_todos(self, titulos):
+        """
+        Procura o primeiro título similar de cada título novo, adicionando
+        cada um ao índice em seguida (os novos também são comparados entre
+        si, na ordem da lista).
+        
+        Os candidatos são escolhidos aqui; em listas grandes, a comparação
+        com o SequenceMatcher é distribuída pelo pool de processos, e cada
+        lote leva apenas os títulos candidatos dos seus títulos.
+        
+        Args:
+            titulos (list): Títulos em minúsculas
+        
+        Returns:
+            list: Posição no índice do título similar (ou None) para cada título
+        """
+        tarefas = []
+        posicoes_candidatas = []
+        for titulo in titulos:
+            candidatos = self.candidatos(titulo)
+            posicoes_candidatas.append(candidatos)
+            tarefas.append((titulo, [self.titulos[p] for p in candidatos]))
+            self.adicionar(titulo)
+        
+        if paralelismo.usar_pool(len(tarefas)):
+            encontrados = []
+            lotes = [(lote, self.limiar) for lote in paralelismo.dividir_em_lotes(tarefas)]
+            for resultado in paralelismo.mapear(comparar_candidatos, lotes):
+                encontrados.extend(resultado)
+        else:
+            encontrados = comparar_candidatos((tarefas, self.limiar))
         
-        if not duplicado:
-            resultados_deduplicados.append(resultado)
+        return [
+            None if encontrado is None else candidatos[encontrado]
+            for encontrado, candidatos in zip(encontrados, posicoes_candidatas)
+        ]
+
+def primeiro_similar(titulo, candidatos, limiar=LIMIAR_SIMILARIDADE):
+    """
+    Procura o primeiro título candidato similar ao informado.
     
-    return resultados_deduplicados
+    Args:
+        titulo (str): Título (já em minúsculas)
+        candidatos (list): Títulos candidatos, na ordem de preferência
+        limiar (float, opcional): Similaridade mínima para duplicata
+    
+    Returns:
+        int: Posição do primeiro candidato similar ou None
+    """
+    if not candidatos:
+        return None
+    
+    matcher = SequenceMatcher(None, titulo)
+    for posicao, candidato in enumerate(candidatos):
+        matcher.set_seq2(candidato)
+        if (matcher.real_quick_ratio() > limiar
+                and matcher.quick_ratio() > limiar
+                and matcher.ratio() > limiar):
+            return posicao
+    
+    return None
+
+def comparar_candidatos(tarefa):
+    """
+    Compara um lote de títulos com os seus candidatos (executado nos processos).
+    
+    Args:
+        tarefa (tuple): Par (lote, limiar); o lote traz pares (titulo, candidatos)
+    
+    Returns:
+        list: Para cada título, a posição do primeiro candidato similar ou None
+    """
+    lote, limiar = tarefa
+    return [primeiro_similar(titulo, candidatos, limiar) for titulo, candidatos in lote]
 
 def similaridade_titulo(resultado1, resultado2):
     """
@@ -237,28 +711,62 @@ def data_esta_no_intervalo(data_str, data_inicio, data_fim):
     Returns:
         bool: True se a data está no intervalo, False caso contrário
     """
-    try:
-        data = datetime.strptime(data_str, '%Y-%m-%d')
-        return data_inicio <= data <= data_fim
-    except:
+    data = normalizacao.converter_data_iso(data_str)
+    if data is None:
         return False
+    return data_inicio <= data <= data_fim
 
-def ordenar_resultados(resultados):
+def ordenar_resultados(resultados, ordenar_por='data', termos='', posicoes_fonte=None,
+                       indice=None, chaves=None):
     """
-    Ordena resultados por data de publicação (mais recentes primeiro).
+    Ordena resultados por data de publicação (mais recentes primeiro) ou por
+    relevância em relação aos termos de busca.
     
     Args:
         resultados (list): Lista de resultados
+        ordenar_por (str, opcional): 'data' ou 'relevancia'
+        termos (str, opcional): Termos de busca normalizados (para 'relevancia')
+        posicoes_fonte (list, opcional): Posições de cada resultado nas fontes
+        indice (IndiceBM25, opcional): Índice BM25 já construído
+        chaves (list, opcional): Chave de cada resultado no índice
     
     Returns:
         list: Lista de resultados ordenados
     """
+    if ordenar_por == 'relevancia':
+        return ranquear_resultados(resultados, termos, posicoes_fonte, indice, chaves)
+    
     return sorted(
         resultados,
         key=lambda r: r.get('data_publicacao', '1900-01-01'),
         reverse=True
     )
 
+def ranquear_resultados(resultados, termos, posicoes_fonte=None, indice=None, chaves=None):
+    """
+    Ordena resultados pela relevância local (BM25 sobre título e resumo)
+    combinada com a posição de cada resultado nas fontes. Empates são
+    desfeitos pela data de publicação.
+    
+    Args:
+        resultados (list): Lista de resultados
+        termos (str): Termos de busca normalizados
+        posicoes_fonte (list, opcional): Posições de cada resultado nas fontes
+        indice (IndiceBM25, opcional): Índice BM25 já construído (se omitido,
+            é criado a partir dos resultados)
+        chaves (list, opcional): Chave de cada resultado no índice
+    
+    Returns:
+        list: Lista de resultados ordenados
+    """
+    pontuacoes = ranqueamento.pontuar(resultados, termos, posicoes_fonte, indice, chaves)
+    ordem = sorted(
+        range(len(resultados)),
+        key=lambda i: (pontuacoes[i], resultados[i].get('data_publicacao', '')),
+        reverse=True
+    )
+    return [resultados[i] for i in ordem]
+
 def gerar_id_resultado(resultado):
     """
     Gera um ID único para um resultado.
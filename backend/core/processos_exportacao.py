@@ -0,0 +1,346 @@
+"""
+Renderização de exportações pesadas em processos separados.
+PDF (WeasyPrint/FPDF) e Excel (openpyxl) são intensivos em CPU e seguram o
+GIL; renderizados em um pool de processos dedicado, não atrasam as buscas
+atendidas pelo servidor. Entre os processos trafegam apenas caminhos de
+arquivos: os resultados vão em um arquivo JSON temporário e o processo
+devolve o nome do arquivo exportado. Cada processo tem limite de memória e
+cada exportação, um tempo limite (contado a partir do momento em que um
+processo fica livre para ela, sem o tempo na fila). Um processo que não respeita o tempo
+limite não derruba as demais exportações: as novas vão a outro pool, e o
+pool antigo só é encerrado quando as que estavam nele terminam.
+"""
+import os
+import json
+import time
+import atexit
+import signal
+import logging
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from utils import exportacao
+
+try:
+    import resource
+except ImportError:
+    # Windows: sem limite de memória por processo
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Formatos renderizados no pool de processos
+FORMATOS = ('pdf', 'excel')
+
+# Número de processos do pool (0 renderiza nas threads da fila de exportações)
+MAX_PROCESSOS = 2
+
+# Limite de memória (espaço de endereçamento) de cada processo, em MB (0 desativa)
+LIMITE_MEMORIA_MB = 2048
+
+# Tempo limite (em segundos) de cada exportação
+TEMPO_LIMITE = 300
+
+# Tolerância (em segundos) antes de encerrar à força um processo que não
+# respeitou o tempo limite
+MARGEM_TEMPO_LIMITE = 10
+
+# Intervalo (em segundos) entre leituras do progresso informado pelo processo
+INTERVALO_PROGRESSO = 0.5
+
+_pool = None
+_lock_pool = threading.Lock()
+
+# Vagas de renderização: uma exportação só é enviada ao pool quando há um
+# processo livre, para que o tempo na fila não conte no seu prazo
+_vagas = threading.BoundedSemaphore(MAX_PROCESSOS or 1)
+
+# Exportações em andamento em cada pool e pools aguardando para ser encerrados
+_em_andamento = {}
+_reciclando = set()
+
+class TempoExcedidoError(RuntimeError):
+    """Lançada quando uma exportação ultrapassa TEMPO_LIMITE."""
+
+def configurar(max_processos=None, limite_memoria_mb=None, tempo_limite=None):
+    """
+    Ajusta a configuração do pool de processos de exportação.
+    
+    Args:
+        max_processos (int, opcional): Número de processos (0 desativa o pool)
+        limite_memoria_mb (int, opcional): Limite de memória por processo, em MB
+        tempo_limite (int, opcional): Tempo limite de cada exportação, em segundos
+    """
+    global MAX_PROCESSOS, LIMITE_MEMORIA_MB, TEMPO_LIMITE, _vagas
+    
+    if max_processos is not None:
+        MAX_PROCESSOS = max(0, int(max_processos))
+        _vagas = threading.BoundedSemaphore(MAX_PROCESSOS or 1)
+    if limite_memoria_mb is not None:
+        LIMITE_MEMORIA_MB = max(0, int(limite_memoria_mb))
+    if tempo_limite is not None:
+        TEMPO_LIMITE = max(1, int(tempo_limite))
+    
+    # Recria o pool na próxima utilização com a nova configuração
+    encerrar_pool()
+
+def usar_processo(formato):
+    """
+    Indica se um formato deve ser renderizado no pool de processos.
+    
+    Args:
+        formato (str): Formato de exportação
+    
+    Returns:
+        bool: True se a exportação deve ir ao pool
+    """
+    return MAX_PROCESSOS > 0 and formato in FORMATOS
+
+def obter_pool():
+    """
+    Retorna o pool de processos de exportação, criando-o na primeira chamada.
+    
+    Returns:
+        ProcessPoolExecutor: Pool de processos
+    """
+    global _pool
+    
+    with _lock_pool:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_PROCESSOS,
+                initializer=inicializar_processo,
+                initargs=(LIMITE_MEMORIA_MB,)
+            )
+            logger.info(
+                f"Pool de exportação iniciado com {MAX_PROCESSOS} processos "
+                f"(limite de memória: {LIMITE_MEMORIA_MB or 'sem limite'} MB, "
+                f"tempo limite: {TEMPO_LIMITE}s)"
+            )
+        return _pool
+
+def encerrar_pool(forcar=False):
+    """
+    Encerra o pool de processos, se existir.
+    
+    Args:
+        forcar (bool, opcional): Mata os processos em vez de aguardar as
+            exportações em andamento
+    """
+    global _pool
+    
+    with _lock_pool:
+        pool, _pool = _pool, None
+    
+    if pool is None:
+        return
+    
+    _finalizar(pool, forcar)
+
+def _retirar(pool):
+    """Deixa de usar um pool para as novas exportações (se ainda é o atual)."""
+    global _pool
+    
+    with _lock_pool:
+        if _pool is pool:
+            _pool = None
+
+def _finalizar(pool, forcar=False):
+    """Encerra um pool já retirado de uso."""
+    # Sem forçar, as exportações em andamento terminam (limitadas por TEMPO_LIMITE)
+    if forcar:
+        for processo in list((pool._processes or {}).values()):
+            processo.kill()
+    pool.shutdown(wait=not forcar, cancel_futures=True)
+    with _lock_pool:
+        _em_andamento.pop(pool, None)
+        _reciclando.discard(pool)
+
+def reciclar_pool(pool):
+    """
+    Retira de uso um pool com um processo travado (que não respeitou o tempo
+    limite), sem interromper as outras exportações em andamento nele.
+    
+    As novas exportações passam a usar um pool novo. Quando as exportações
+    do pool antigo terminam ou desistem (cada uma limitada pelo próprio
+    prazo), os processos dele, inclusive o travado, são encerrados.
+    
+    Args:
+        pool (ProcessPoolExecutor): Pool a reciclar
+    """
+    _retirar(pool)
+    with _lock_pool:
+        if pool in _reciclando:
+            return
+        _reciclando.add(pool)
+    
+    def aguardar_e_encerrar():
+        while True:
+            with _lock_pool:
+                if not _em_andamento.get(pool):
+                    break
+            time.sleep(INTERVALO_PROGRESSO)
+        logger.info("Pool de exportação reciclado: encerrando os processos do pool antigo")
+        _finalizar(pool, forcar=True)
+    
+    threading.Thread(target=aguardar_e_encerrar, name='reciclagem-exportacao', daemon=True).start()
+
+def exportar(formato, resultados, busca, diretorio, ao_progredir=None):
+    """
+    Exporta resultados em um processo do pool (mesma interface de
+    exportacao.exportar).
+    
+    Args:
+        formato (str): Formato de exportação (ver FORMATOS)
+        resultados (list): Lista de resultados a serem exportados
+        busca (dict): Parâmetros da busca
+        diretorio (str): Diretório para salvar o arquivo
+        ao_progredir (callable, opcional): Recebe a fração dos resultados já
+            exportada (0 a 1)
+    
+    Returns:
+        str: Nome do arquivo exportado
+    
+    Raises:
+        TempoExcedidoError: Se a exportação ultrapassar TEMPO_LIMITE
+        RuntimeError: Se o processo for encerrado (por exemplo, por falta de memória)
+    """
+    # Exportação idêntica já existente: não há o que renderizar
+    existente = exportacao.reaproveitar_exportacao(
+        exportacao.caminho_exportacao(formato, resultados, busca, diretorio)
+    )
+    if existente:
+        return existente
+    
+    # Os resultados vão ao processo em um arquivo temporário
+    descritor, caminho_entrada = tempfile.mkstemp(prefix='buscador_exportacao_', suffix='.json')
+    caminho_progresso = f"{caminho_entrada}.progresso"
+    try:
+        with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+            json.dump({'resultados': list(resultados), 'busca': busca}, f, ensure_ascii=False, default=str)
+        
+        # Aguarda um processo livre; o prazo começa ao enviar a exportação
+        vagas = _vagas
+        vagas.acquire()
+        try:
+            pool = obter_pool()
+            futuro = pool.submit(
+                renderizar_em_processo, formato, caminho_entrada, diretorio,
+                caminho_progresso if ao_progredir else None, TEMPO_LIMITE
+            )
+        except BaseException:
+            vagas.release()
+            raise
+        with _lock_pool:
+            _em_andamento.setdefault(pool, set()).add(futuro)
+        
+        try:
+            # Aguarda o processo, repassando o progresso informado por ele
+            prazo = time.monotonic() + TEMPO_LIMITE + MARGEM_TEMPO_LIMITE
+            while not wait([futuro], timeout=INTERVALO_PROGRESSO).done:
+                if ao_progredir:
+                    ao_progredir(ler_progresso(caminho_progresso))
+                if time.monotonic() > prazo:
+                    logger.error(f"Exportação {formato} não respondeu ao tempo limite; reciclando o pool")
+                    reciclar_pool(pool)
+                    raise TempoExcedidoError(f"Exportação excedeu o tempo limite de {TEMPO_LIMITE}s")
+            
+            return futuro.result()
+        finally:
+            vagas.release()
+            with _lock_pool:
+                _em_andamento.get(pool, set()).discard(futuro)
+    
+    except BrokenProcessPool as e:
+        # Um processo morto (por falta de memória, por exemplo) inutiliza o
+        # pool inteiro; só ele é descartado, não um pool já recriado
+        logger.error(f"Processo de exportação encerrado: {str(e)}")
+        _retirar(pool)
+        _finalizar(pool)
+        raise RuntimeError("Processo de exportação encerrado inesperadamente (limite de memória?)")
+    
+    finally:
+        for caminho in (caminho_entrada, caminho_progresso):
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+
+def ler_progresso(caminho_progresso):
+    """
+    Lê o progresso gravado pelo processo de exportação.
+    
+    Args:
+        caminho_progresso (str): Arquivo de progresso
+    
+    Returns:
+        float: Fração exportada (0 a 1)
+    """
+    try:
+        with open(caminho_progresso, encoding='utf-8') as f:
+            return float(f.read() or 0)
+    except (OSError, ValueError):
+        return 0.0
+
+def inicializar_processo(limite_memoria_mb):
+    """
+    Prepara um processo do pool: aplica o limite de memória.
+    
+    Args:
+        limite_memoria_mb (int): Limite do espaço de endereçamento, em MB (0 desativa)
+    """
+    global LIMITE_MEMORIA_MB
+    LIMITE_MEMORIA_MB = limite_memoria_mb
+    
+    if resource is not None and limite_memoria_mb:
+        limite = limite_memoria_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limite, limite))
+
+def renderizar_em_processo(formato, caminho_entrada, diretorio, caminho_progresso, tempo_limite):
+    """
+    Renderiza uma exportação (executada nos processos do pool).
+    
+    Args:
+        formato (str): Formato de exportação
+        caminho_entrada (str): Arquivo JSON com os resultados e a busca
+        diretorio (str): Diretório das exportações
+        caminho_progresso (str): Arquivo onde o progresso é gravado (ou None)
+        tempo_limite (int): Tempo limite, em segundos
+    
+    Returns:
+        str: Nome do arquivo exportado
+    """
+    with open(caminho_entrada, encoding='utf-8') as f:
+        entrada = json.load(f)
+    
+    def ao_progredir(fracao):
+        with open(caminho_progresso, 'w', encoding='utf-8') as f:
+            f.write(f"{fracao:.4f}")
+    
+    def tempo_excedido(numero_sinal, quadro):
+        raise TempoExcedidoError(f"Exportação excedeu o tempo limite de {tempo_limite}s")
+    
+    # Tempo limite via SIGALRM (indisponível no Windows; lá vale apenas o
+    # encerramento do pool pelo processo principal)
+    alarme = hasattr(signal, 'SIGALRM')
+    if alarme:
+        signal.signal(signal.SIGALRM, tempo_excedido)
+        signal.alarm(tempo_limite)
+    
+    try:
+        return exportacao.exportar(
+            formato=formato,
+            resultados=entrada['resultados'],
+            busca=entrada['busca'],
+            diretorio=diretorio,
+            ao_progredir=ao_progredir if caminho_progresso else None
+        )
+    except MemoryError:
+        raise RuntimeError(f"Exportação excedeu o limite de memória de {LIMITE_MEMORIA_MB} MB")
+    finally:
+        if alarme:
+            signal.alarm(0)
+
+atexit.register(encerrar_pool)
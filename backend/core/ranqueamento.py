@@ -0,0 +1,451 @@
+"""
+Ranqueamento local por relevância dos resultados mesclados.
+Pontua cada resultado com BM25 sobre título e resumo, respeitando a expressão
+booleana da busca (AND/OR/NOT), e combina a pontuação com a posição que o
+resultado ocupava na resposta de cada fonte.
+"""
+import re
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Peso do título em relação ao resumo (cada ocorrência no título conta N vezes)
+PESO_TITULO = 2
+
+# Constante da fusão por posição recíproca (Reciprocal Rank Fusion)
+RRF_K = 60
+
+# Peso da posição nas fontes na pontuação final (a relevância local pesa 1)
+PESO_FONTE = 0.3
+
+# Fator aplicado a resultados que não satisfazem a expressão booleana
+FATOR_NAO_SATISFAZ = 0.5
+
+# Termos com pelo menos este tamanho casam também como prefixo (fracture -> fractures)
+TAMANHO_MINIMO_PREFIXO = 4
+
+# Terminações de plural que não são removidas pelo radical (virus, stress, analysis)
+_SINGULARES_EM_S = ('us', 'ss', 'is')
+
+OPERADORES = ('AND', 'OR', 'NOT')
+
+# Parênteses, trechos entre aspas ou palavras da consulta
+_RE_TOKEN_CONSULTA = re.compile(r'[()]|"[^"]*"|[^\s()"]+')
+
+# Palavras de um token da consulta ou de um documento
+_RE_PALAVRA = re.compile(r'\w+')
+
+# Qualificadores de campo no fim de um termo (knee[Title])
+_RE_QUALIFICADOR = re.compile(r'\[[^\]]*\]$')
+
+def radical(palavra):
+    """
+    Reduz uma palavra em inglês à forma singular (S-stemmer de Harman), para
+    que termos no plural casem com o singular e vice-versa.
+    
+    Args:
+        palavra (str): Palavra em minúsculas
+    
+    Returns:
+        str: Radical da palavra (studies -> study, fractures -> fracture)
+    """
+    if len(palavra) <= 3 or not palavra.endswith('s') or palavra.endswith(_SINGULARES_EM_S):
+        return palavra
+    if palavra.endswith('ies') and not palavra.endswith(('eies', 'aies')):
+        return palavra[:-3] + 'y'
+    if palavra.endswith('es') and not palavra.endswith(('aes', 'ees', 'oes')):
+        return palavra[:-1]
+    return palavra[:-1]
+
+def analisar_consulta(termos):
+    """
+    Converte os termos de busca normalizados em uma expressão booleana.
+    
+    A expressão é uma árvore de tuplas: ('TERMO', palavra), ('AND', [...]),
+    ('OR', [...]) e ('NOT', expressao). Termos adjacentes sem operador são
+    combinados com AND, como no PubMed.
+    
+    Args:
+        termos (str): Termos de busca (saída de normalizar_termos_busca)
+    
+    Returns:
+        tuple: Expressão booleana ou None se não houver termos
+    """
+    tokens = _RE_TOKEN_CONSULTA.findall(termos or '')
+    posicao = 0
+    
+    def atual():
+        return tokens[posicao] if posicao < len(tokens) else None
+    
+    def avancar():
+        nonlocal posicao
+        posicao += 1
+    
+    def combinar(operador, itens):
+        itens = [item for item in itens if item is not None]
+        if not itens:
+            return None
+        return itens[0] if len(itens) == 1 else (operador, itens)
+    
+    def expressao_or():
+        itens = [expressao_and()]
+        while atual() == 'OR':
+            avancar()
+            itens.append(expressao_and())
+        return combinar('OR', itens)
+    
+    def expressao_and():
+        itens = [expressao_not()]
+        while atual() not in (None, ')', 'OR'):
+            if atual() == 'AND':
+                avancar()
+            itens.append(expressao_not())
+        return combinar('AND', itens)
+    
+    def expressao_not():
+        if atual() == 'NOT':
+            avancar()
+            negada = expressao_not()
+            return ('NOT', negada) if negada is not None else None
+        return primaria()
+    
+    def primaria():
+        token = atual()
+        if token is None:
+            return None
+        avancar()
+        
+        if token == '(':
+            expressao = expressao_or()
+            if atual() == ')':
+                avancar()
+            return expressao
+        
+        if token == ')' or token in OPERADORES:
+            # Operador ou parêntese fora de lugar: ignora
+            return None
+        
+        palavras = _RE_PALAVRA.findall(_RE_QUALIFICADOR.sub('', token).lower())
+        return combinar('AND', [('TERMO', palavra) for palavra in palavras])
+    
+    expressao = expressao_or()
+    
+    # Tokens restantes (por exemplo, parênteses desbalanceados) entram com AND
+    while posicao < len(tokens):
+        if atual() == ')':
+            avancar()
+            continue
+        expressao = combinar('AND', [expressao, expressao_or()])
+    
+    return expressao
+
+def termos_positivos(expressao, negado=False):
+    """
+    Lista os termos que contribuem positivamente para a relevância
+    (os que não estão sob um NOT).
+    
+    Args:
+        expressao (tuple): Expressão booleana
+        negado (bool): Se a expressão está sob um número ímpar de NOTs
+    
+    Returns:
+        list: Termos, sem repetição, na ordem em que aparecem
+    """
+    if expressao is None:
+        return []
+    
+    tipo = expressao[0]
+    if tipo == 'TERMO':
+        return [] if negado else [expressao[1]]
+    if tipo == 'NOT':
+        return termos_positivos(expressao[1], not negado)
+    
+    termos = []
+    for item in expressao[1]:
+        for termo in termos_positivos(item, negado):
+            if termo not in termos:
+                termos.append(termo)
+    return termos
+
+def todos_termos(expressao):
+    """
+    Lista todos os termos de uma expressão booleana, inclusive os negados.
+    
+    Args:
+        expressao (tuple): Expressão booleana
+    
+    Returns:
+        list: Termos, sem repetição
+    """
+    if expressao is None:
+        return []
+    if expressao[0] == 'TERMO':
+        return [expressao[1]]
+    if expressao[0] == 'NOT':
+        return todos_termos(expressao[1])
+    
+    termos = []
+    for item in expressao[1]:
+        for termo in todos_termos(item):
+            if termo not in termos:
+                termos.append(termo)
+    return termos
+
+def avaliar(expressao, presentes):
+    """
+    Avalia a expressão booleana dado o conjunto de termos presentes.
+    
+    Args:
+        expressao (tuple): Expressão booleana
+        presentes (set): Termos encontrados no resultado
+    
+    Returns:
+        bool: True se o resultado satisfaz a expressão
+    """
+    if expressao is None:
+        return True
+    
+    tipo = expressao[0]
+    if tipo == 'TERMO':
+        return expressao[1] in presentes
+    if tipo == 'NOT':
+        return not avaliar(expressao[1], presentes)
+    if tipo == 'AND':
+        return all(avaliar(item, presentes) for item in expressao[1])
+    return any(avaliar(item, presentes) for item in expressao[1])
+
+class IndiceBM25:
+    """
+    Índice invertido em memória sobre título e resumo para o BM25.
+    
+    Cada documento é identificado por uma chave (por exemplo, a posição do
+    resultado no mesclador). Documentos podem ser reindexados quando o
+    resultado muda após uma mesclagem de duplicatas.
+    """
+    
+    def __init__(self):
+        """Inicializa o índice vazio."""
+        # termo -> {chave: frequência ponderada}
+        self.postagens = {}
+        # radical -> palavras do vocabulário com esse radical
+        self.radicais = {}
+        # chave -> (frequências do documento, tamanho ponderado)
+        self.documentos = {}
+        self.tamanho_total = 0
+    
+    def __len__(self):
+        return len(self.documentos)
+    
+    def __contains__(self, chave):
+        return chave in self.documentos
+    
+    def adicionar(self, chave, titulo, resumo):
+        """
+        Indexa (ou reindexa) um documento.
+        
+        Args:
+            chave: Identificador do documento
+            titulo (str): Título
+            resumo (str): Resumo
+        """
+        if chave in self.documentos:
+            self.remover(chave)
+        
+        frequencias = {}
+        palavras_titulo = _RE_PALAVRA.findall(titulo.lower()) if titulo else []
+        for palavra in palavras_titulo:
+            frequencias[palavra] = frequencias.get(palavra, 0) + PESO_TITULO
+        palavras_resumo = _RE_PALAVRA.findall(resumo.lower()) if resumo else []
+        for palavra in palavras_resumo:
+            frequencias[palavra] = frequencias.get(palavra, 0) + 1
+        
+        tamanho = PESO_TITULO * len(palavras_titulo) + len(palavras_resumo)
+        self.documentos[chave] = (frequencias, tamanho)
+        self.tamanho_total += tamanho
+        
+        postagens = self.postagens
+        for palavra, frequencia in frequencias.items():
+            documentos = postagens.get(palavra)
+            if documentos is None:
+                postagens[palavra] = {chave: frequencia}
+                self.radicais.setdefault(radical(palavra), set()).add(palavra)
+            else:
+                documentos[chave] = frequencia
+    
+    def remover(self, chave):
+        """
+        Remove um documento do índice.
+        
+        Args:
+            chave: Identificador do documento
+        """
+        frequencias, tamanho = self.documentos.pop(chave)
+        self.tamanho_total -= tamanho
+        for palavra in frequencias:
+            documentos = self.postagens[palavra]
+            del documentos[chave]
+            if not documentos:
+                del self.postagens[palavra]
+                mesmo_radical = self.radicais[radical(palavra)]
+                mesmo_radical.discard(palavra)
+                if not mesmo_radical:
+                    del self.radicais[radical(palavra)]
+    
+    def expandir(self, termo):
+        """
+        Retorna as palavras do vocabulário que correspondem a um termo: as
+        de mesmo radical (singular e plural) e, para termos longos, as que
+        começam pelo radical do termo.
+        
+        Args:
+            termo (str): Termo em minúsculas
+        
+        Returns:
+            list: Palavras do vocabulário
+        """
+        raiz = radical(termo)
+        palavras = set(self.radicais.get(raiz, ()))
+        if len(termo) >= TAMANHO_MINIMO_PREFIXO:
+            palavras.update(palavra for palavra in self.postagens if palavra.startswith(raiz))
+        return list(palavras)
+    
+    def frequencias_termo(self, termo):
+        """
+        Soma as frequências de um termo (e suas expansões) por documento.
+        
+        Args:
+            termo (str): Termo em minúsculas
+        
+        Returns:
+            dict: Chave -> frequência
+        """
+        palavras = self.expandir(termo)
+        if len(palavras) == 1:
+            return self.postagens[palavras[0]]
+        
+        frequencias = {}
+        for palavra in palavras:
+            for chave, frequencia in self.postagens[palavra].items():
+                frequencias[chave] = frequencias.get(chave, 0) + frequencia
+        return frequencias
+    
+    def satisfazem(self, expressao, chaves=None):
+        """
+        Seleciona os documentos que satisfazem a expressão booleana (termos
+        casam também no singular ou plural e, se longos, como prefixo).
+        
+        Args:
+            expressao (tuple): Expressão booleana de analisar_consulta
+            chaves (list, opcional): Documentos avaliados (padrão: todos)
+        
+        Returns:
+            list: Chaves dos documentos que satisfazem a expressão, na ordem recebida
+        """
+        if chaves is None:
+            chaves = list(self.documentos)
+        
+        presentes = {chave: set() for chave in chaves}
+        for termo in todos_termos(expressao):
+            for chave in self.frequencias_termo(termo):
+                if chave in presentes:
+                    presentes[chave].add(termo)
+        
+        return [chave for chave in chaves if avaliar(expressao, presentes[chave])]
+    
+    def pontuar(self, expressao, chaves):
+        """
+        Calcula o BM25 dos termos positivos da expressão para os documentos
+        informados, reduzindo a pontuação de quem não satisfaz a expressão.
+        
+        Args:
+            expressao (tuple): Expressão booleana de analisar_consulta
+            chaves (list): Documentos a pontuar
+        
+        Returns:
+            list: Relevância de cada documento, na ordem das chaves
+        """
+        total = len(self.documentos)
+        if not total or expressao is None:
+            return [0.0] * len(chaves)
+        
+        tamanho_medio = (self.tamanho_total / total) or 1.0
+        positivos = set(termos_positivos(expressao))
+        
+        relevancias = dict.fromkeys(chaves, 0.0)
+        presentes = {chave: set() for chave in chaves}
+        
+        for termo in todos_termos(expressao):
+            frequencias = self.frequencias_termo(termo)
+            if not frequencias:
+                continue
+            
+            df = len(frequencias)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            
+            for chave, tf in frequencias.items():
+                if chave not in relevancias:
+                    continue
+                presentes[chave].add(termo)
+                if termo in positivos:
+                    tamanho = self.documentos[chave][1]
+                    normalizacao_tamanho = BM25_K1 * (1 - BM25_B + BM25_B * tamanho / tamanho_medio)
+                    relevancias[chave] += idf * tf * (BM25_K1 + 1) / (tf + normalizacao_tamanho)
+        
+        pontuacoes = []
+        for chave in chaves:
+            relevancia = relevancias[chave]
+            if relevancia and not avaliar(expressao, presentes[chave]):
+                relevancia *= FATOR_NAO_SATISFAZ
+            pontuacoes.append(relevancia)
+        return pontuacoes
+
+def pontuar(resultados, termos, posicoes_fonte=None, indice=None, chaves=None):
+    """
+    Calcula a pontuação de relevância de cada resultado.
+    
+    A relevância local é o BM25 dos termos positivos sobre título e resumo,
+    reduzida para quem não satisfaz a expressão booleana. Ela é normalizada
+    e somada à fusão por posição recíproca das posições nas fontes.
+    
+    Args:
+        resultados (list): Resultados normalizados
+        termos (str): Termos de busca normalizados
+        posicoes_fonte (list, opcional): Para cada resultado, a lista de
+            posições (a partir de 0) que ele ocupava nas fontes
+        indice (IndiceBM25, opcional): Índice já construído; se omitido, um
+            índice temporário é criado com os resultados
+        chaves (list, opcional): Chave de cada resultado no índice
+    
+    Returns:
+        list: Pontuação de cada resultado, na ordem recebida
+    """
+    total = len(resultados)
+    if not total:
+        return []
+    
+    if indice is None or chaves is None:
+        indice = IndiceBM25()
+        chaves = list(range(total))
+        for chave, resultado in zip(chaves, resultados):
+            indice.adicionar(chave, resultado.get('titulo', ''), resultado.get('resumo', ''))
+    
+    relevancias = indice.pontuar(analisar_consulta(termos), chaves)
+    
+    # Fusão por posição recíproca das posições nas fontes
+    fusoes = [0.0] * total
+    if posicoes_fonte:
+        for i, posicoes in enumerate(posicoes_fonte):
+            fusoes[i] = sum(1.0 / (RRF_K + posicao + 1) for posicao in posicoes or ())
+    
+    maior_relevancia = max(relevancias) or 1.0
+    maior_fusao = max(fusoes) or 1.0
+    
+    return [
+        relevancia / maior_relevancia + PESO_FONTE * fusao / maior_fusao
+        for relevancia, fusao in zip(relevancias, fusoes)
+    ]
@@ -0,0 +1,108 @@
+"""
+Configuração dos testes do backend.
+Os testes não acessam a rede: as APIs são substituídas por adaptadores
+simulados (AdaptadorSimulado), e o cache em disco e o arquivo das buscas
+salvas ficam em um diretório temporário.
+"""
+import re
+
+import pytest
+
+from core import cache, conjuntos, paginacao, motor_busca, ranqueamento, buscas_salvas
+
+# Palavras de um título ou de uma consulta simulada
+_RE_PALAVRA = re.compile(r'\w+')
+
+class AdaptadorSimulado:
+    """
+    Adaptador de API simulado: devolve, na ordem do corpus, os artigos cujo
+    título contém todas as palavras de alguma das partes da consulta
+    (partes separadas por OR, como nas chamadas combinadas de core.lote),
+    com singular e plural equivalentes, e cuja data de publicação (ou de
+    indexação, campo 'indexado_em') está no período.
+    """
+    
+    def __init__(self, artigos, suporta_or=False, max_resultados=50, filtra_data_indexacao=False):
+        """
+        Inicializa o adaptador.
+        
+        Args:
+            artigos (list): Corpus da API (dicionários de resultados brutos)
+            suporta_or (bool, opcional): Aceita consultas combinadas com OR
+            max_resultados (int, opcional): Resultados por chamada
+            filtra_data_indexacao (bool, opcional): Aceita data_indexacao em buscar_pagina
+        """
+        self.artigos = artigos
+        self.SUPORTA_OR = suporta_or
+        self.MAX_RESULTADOS = max_resultados
+        self.FILTRA_DATA_INDEXACAO = filtra_data_indexacao
+        self.chamadas = []
+        self.falhar = False
+    
+    def encontrar(self, termos, data_inicio=None, data_fim=None, data_indexacao=False):
+        """Artigos do corpus que satisfazem a consulta no período."""
+        partes = [radicais(parte) for parte in termos.split(' OR ')]
+        encontrados = []
+        for artigo in self.artigos:
+            data = artigo.get('indexado_em', artigo['data_publicacao']) if data_indexacao else artigo['data_publicacao']
+            if (data_inicio or '') <= data <= (data_fim or '9999') and any(
+                    parte <= radicais(artigo['titulo']) for parte in partes):
+                encontrados.append(dict(artigo))
+        return encontrados
+    
+    def buscar(self, termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30):
+        self.chamadas.append((termos, limite))
+        return self.encontrar(termos, data_inicio, data_fim)[:limite]
+    
+    def buscar_pagina(self, termos, autor='', data_inicio=None, data_fim=None, revistas=None, limite=30,
+                      cursor=None, data_indexacao=False):
+        self.chamadas.append({
+            'termos': termos, 'data_inicio': data_inicio, 'data_fim': data_fim, 'limite': limite,
+            'cursor': cursor, 'data_indexacao': data_indexacao
+        })
+        if self.falhar:
+            raise ConnectionError("API simulada indisponível")
+        
+        inicio = int(cursor or 0)
+        encontrados = self.encontrar(termos, data_inicio, data_fim, data_indexacao)
+        fim = inicio + limite
+        return encontrados[inicio:fim], (str(fim) if fim < len(encontrados) else None)
+
+def radicais(texto):
+    """Radicais das palavras de um texto (ver ranqueamento.radical)."""
+    return {ranqueamento.radical(palavra) for palavra in _RE_PALAVRA.findall(texto.lower())}
+
+def artigo(titulo, doi, data='2024-05-01', **campos):
+    """Resultado bruto mínimo aceito pelo processador."""
+    return dict({
+        'titulo': titulo, 'autores': "Silva, A", 'revista': "Journal", 'data_publicacao': data,
+        'doi': doi, 'url': f"https://doi.org/{doi}", 'resumo': ''
+    }, **campos)
+
+@pytest.fixture(autouse=True)
+def isolar_armazenamento(tmp_path, monkeypatch):
+    """
+    Cache em disco e buscas salvas em um diretório temporário e memória dos
+    conjuntos e sessões vazia.
+    """
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(buscas_salvas, 'ARQUIVO_BUSCAS', str(tmp_path / 'buscas_salvas.json'))
+    monkeypatch.setattr(buscas_salvas, '_locks_buscas', {})
+    conjuntos._conjuntos.clear()
+    paginacao._sessoes.clear()
+    yield
+    conjuntos._conjuntos.clear()
+    paginacao._sessoes.clear()
+
+@pytest.fixture
+def simular_apis(monkeypatch):
+    """
+    Substitui os adaptadores do motor de busca.
+    
+    Returns:
+        callable: Recebe nome -> AdaptadorSimulado e instala os adaptadores
+    """
+    def instalar(adaptadores):
+        monkeypatch.setattr(motor_busca, 'ADAPTADORES', adaptadores)
+        return adaptadores
+    return instalar
@@ -0,0 +1,106 @@
+"""
+Testes das buscas salvas (core.buscas_salvas): período consultado em cada
+API e avanço das marcas entre as atualizações.
+"""
+from datetime import datetime
+
+import pytest
+
+from core import buscas_salvas
+from tests.conftest import AdaptadorSimulado, artigo
+
+@pytest.fixture
+def api(simular_apis):
+    """Uma API simulada que filtra pela data de indexação, com 2 artigos de joelho."""
+    corpus = [
+        artigo("Knee study 0", '10.1/k0', data='2024-03-01'),
+        artigo("Knee study 1", '10.1/k1', data='2024-02-01')
+    ]
+    return simular_apis({'crossref': AdaptadorSimulado(corpus, filtra_data_indexacao=True)})['crossref']
+
+@pytest.fixture
+def busca(api):
+    return buscas_salvas.criar("Joelho", 'knee', apis=['crossref'], data_inicio='2024-01-01')
+
+def dois_novos(resposta):
+    return sorted(resultado['doi'] for resultado in resposta['novos'])
+
+def test_periodo_da_primeira_execucao(busca):
+    assert buscas_salvas.periodo(busca, 'crossref', '2024-06-01') == ('2024-01-01', '2024-06-01', None, False)
+
+def test_periodo_a_partir_da_marca(busca, api):
+    busca['marcas']['crossref'] = {'ate': '2024-06-01'}
+    
+    assert buscas_salvas.periodo(busca, 'crossref', '2024-07-01') == ('2024-05-25', '2024-07-01', None, True)
+    
+    # Nas APIs sem filtro de indexação, o período vale para a publicação
+    api.FILTRA_DATA_INDEXACAO = False
+    assert buscas_salvas.periodo(busca, 'crossref', '2024-07-01')[3] is False
+
+def test_periodo_retoma_o_que_ficou_em_andamento(busca):
+    busca['marcas']['crossref'] = {
+        'ate': '2024-06-01',
+        'em_andamento': {'desde': '2024-05-25', 'ate': '2024-07-01', 'cursor': '200', 'indexacao': True}
+    }
+    
+    assert buscas_salvas.periodo(busca, 'crossref', '2024-08-01') == ('2024-05-25', '2024-07-01', '200', True)
+
+def test_atualizar_avanca_a_marca_e_devolve_so_os_novos(busca, api):
+    primeira = buscas_salvas.atualizar(busca['id'], hoje='2024-06-01')
+    assert dois_novos(primeira) == ['10.1/k0', '10.1/k1']
+    assert buscas_salvas.obter(busca['id'])['marcas']['crossref']['ate'] == '2024-06-01'
+    
+    # Um artigo publicado antes da marca, mas indexado depois dela
+    api.artigos.append(artigo("Knee study 2", '10.1/k2', data='2024-04-01', indexado_em='2024-06-20'))
+    segunda = buscas_salvas.atualizar(busca['id'], hoje='2024-07-01')
+    
+    assert dois_novos(segunda) == ['10.1/k2']
+    assert api.chamadas[-1]['data_inicio'] == '2024-05-25'
+    assert api.chamadas[-1]['data_indexacao'] is True
+    marca = buscas_salvas.obter(busca['id'])['marcas']['crossref']
+    assert marca['ate'] == '2024-07-01'
+    assert marca['ultima_publicacao'] == '2024-04-01'
+
+def test_atualizar_descarta_publicados_antes_do_inicio(busca, api):
+    buscas_salvas.atualizar(busca['id'], hoje='2024-06-01')
+    api.artigos.append(artigo("Knee study 3", '10.1/k3', data='2023-11-01', indexado_em='2024-06-20'))
+    
+    assert buscas_salvas.atualizar(busca['id'], hoje='2024-07-01')['novos'] == []
+
+def test_atualizacao_incompleta_continua_do_cursor(busca, api, monkeypatch):
+    monkeypatch.setattr(buscas_salvas, 'RESULTADOS_POR_PAGINA', 1)
+    monkeypatch.setattr(buscas_salvas, 'MAX_PAGINAS_ATUALIZACAO', 1)
+    
+    primeira = buscas_salvas.atualizar(busca['id'], hoje='2024-06-01')
+    salva = buscas_salvas.obter(busca['id'])
+    assert dois_novos(primeira) == ['10.1/k0']
+    assert 'ate' not in salva['marcas']['crossref']
+    assert salva['marcas']['crossref']['em_andamento']['cursor'] == '1'
+    assert buscas_salvas.pendente(salva, datetime.now())
+    
+    # O período interrompido é retomado mesmo em uma data posterior
+    segunda = buscas_salvas.atualizar(busca['id'], hoje='2024-07-01')
+    salva = buscas_salvas.obter(busca['id'])
+    assert dois_novos(segunda) == ['10.1/k1']
+    assert api.chamadas[-1]['cursor'] == '1'
+    assert salva['marcas']['crossref'] == {'ate': '2024-06-01', 'ultima_publicacao': '2024-03-01'}
+    assert not buscas_salvas.pendente(salva, datetime.now())
+
+def test_erro_na_api_mantem_a_marca(busca, api):
+    buscas_salvas.atualizar(busca['id'], hoje='2024-06-01')
+    api.falhar = True
+    
+    resposta = buscas_salvas.atualizar(busca['id'], hoje='2024-07-01')
+    
+    assert resposta['apis']['crossref']['erro']
+    assert buscas_salvas.obter(busca['id'])['marcas']['crossref']['ate'] == '2024-06-01'
+    
+    # A próxima atualização repete o mesmo período
+    api.falhar = False
+    buscas_salvas.atualizar(busca['id'], hoje='2024-07-01')
+    assert api.chamadas[-1]['data_inicio'] == '2024-05-25'
+    assert buscas_salvas.obter(busca['id'])['marcas']['crossref']['ate'] == '2024-07-01'
+
+def test_atualizar_busca_inexistente_nao_cria_lock(api):
+    assert buscas_salvas.atualizar('f' * 32) is None
+    assert buscas_salvas._locks_buscas == {}
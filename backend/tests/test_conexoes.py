@@ -0,0 +1,82 @@
+"""
+Testes do limite de requisições das APIs (utils.conexoes): balde de fichas
+do processo e orçamento compartilhado entre processos em arquivo.
+"""
+import time
+
+import pytest
+
+from utils import conexoes
+
+class Relogio:
+    """Relógio controlado pelo teste."""
+    
+    def __init__(self, agora=1_000_000.0):
+        self.agora = agora
+    
+    def __call__(self):
+        return self.agora
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(conexoes.LimitadorTaxa, 'relogio', staticmethod(relogio))
+    monkeypatch.setattr(conexoes.LimitadorCompartilhado, 'relogio', staticmethod(relogio))
+    return relogio
+
+def test_limitador_permite_rajada_e_espaca_as_seguintes(relogio):
+    limitador = conexoes.LimitadorTaxa(2)
+    
+    assert [limitador.reservar() for _ in range(2)] == [0.0, 0.0]
+    assert limitador.reservar() == pytest.approx(0.5)
+    assert limitador.reservar() == pytest.approx(1.0)
+    
+    # As fichas reservadas antes de existir são descontadas da reposição
+    relogio.agora += 1.0
+    assert limitador.reservar() == pytest.approx(0.5)
+
+def test_reservar_se_cheio_so_usa_api_ociosa(relogio):
+    limitador = conexoes.LimitadorTaxa(2)
+    
+    assert limitador.reservar_se_cheio()
+    assert not limitador.reservar_se_cheio()
+    
+    relogio.agora += 0.5
+    assert limitador.reservar_se_cheio()
+
+def test_limitador_compartilhado_divide_o_orcamento_entre_processos(relogio, tmp_path):
+    caminho = str(tmp_path / 'crossref.taxa')
+    processo_a = conexoes.LimitadorCompartilhado(1, caminho)
+    processo_b = conexoes.LimitadorCompartilhado(1, caminho)
+    
+    assert processo_a.reservar() == 0.0
+    assert processo_b.reservar() == pytest.approx(1.0)
+    assert not processo_a.reservar_se_cheio()
+    
+    relogio.agora += 3
+    assert processo_b.reservar_se_cheio()
+
+def test_limitador_compartilhado_recomeca_cheio_com_data_no_futuro(relogio, tmp_path):
+    # Estado gravado com um relógio adiantado (ou monotônico de outra sessão)
+    caminho = tmp_path / 'pubmed.taxa'
+    caminho.write_text(f"{-7.8e6!r} {relogio.agora + 2.6e6!r}", encoding='ascii')
+    limitador = conexoes.LimitadorCompartilhado(3, str(caminho))
+    
+    assert limitador.reservar() == 0.0
+    fichas, atualizado = (float(valor) for valor in caminho.read_text(encoding='ascii').split())
+    assert fichas == 2.0
+    assert atualizado == relogio.agora
+
+def test_limitador_compartilhado_usa_o_relogio_do_sistema():
+    # O arquivo sobrevive a reinícios, e o relógio monotônico recomeça neles
+    assert conexoes.LimitadorCompartilhado.relogio is time.time
+
+def test_obter_limitador_compartilhado(tmp_path, monkeypatch):
+    monkeypatch.setattr(conexoes, '_limitadores', {})
+    monkeypatch.setattr(conexoes, 'DIRETORIO_LIMITES', str(tmp_path))
+    
+    limitador = conexoes.obter_limitador('crossref')
+    
+    assert isinstance(limitador, conexoes.LimitadorCompartilhado)
+    assert limitador.caminho == str(tmp_path / 'crossref.taxa')
+    assert conexoes.obter_limitador('crossref') is limitador
@@ -0,0 +1,110 @@
+"""
+Testes da busca em lote (core.lote): combinação das consultas com OR,
+separação dos resultados combinados e chamadas complementares.
+"""
+from core import lote, ranqueamento
+from tests.conftest import AdaptadorSimulado, artigo
+
+# Período das consultas (as datas do corpus simulado estão dentro dele)
+PERIODO = {'data_inicio': '2020-01-01', 'data_fim': '2030-12-31'}
+
+def titulos(resultados):
+    return sorted(resultado['titulo'] for resultado in resultados)
+
+def test_combinar_respeita_limite_da_api():
+    blocos = lote.combinar({'knee': 30, 'hip': 30, 'spine': 10}, 50)
+    assert blocos == [{'knee': 30}, {'hip': 30, 'spine': 10}]
+
+def test_combinar_limita_consultas_por_chamada():
+    termos = {f"termo{i}": 1 for i in range(lote.MAX_CONSULTAS_COMBINADAS + 2)}
+    blocos = lote.combinar(termos, 200)
+    assert [len(bloco) for bloco in blocos] == [lote.MAX_CONSULTAS_COMBINADAS, 2]
+
+def test_combinar_reduz_limite_ao_maximo_da_api():
+    assert lote.combinar({'knee': 500}, 200) == [{'knee': 200}]
+
+def test_satisfazem_considera_singular_e_plural():
+    indice = ranqueamento.IndiceBM25()
+    indice.adicionar(0, "Stress fractures of the tibia", "")
+    indice.adicionar(1, "Knee fracture in athletes", "")
+    indice.adicionar(2, "Shoulder instability", "")
+    
+    expressao = ranqueamento.analisar_consulta('fracture')
+    assert indice.satisfazem(expressao) == [0, 1]
+    
+    expressao = ranqueamento.analisar_consulta('knee AND fractures')
+    assert indice.satisfazem(expressao, [0, 1, 2]) == [1]
+
+def test_lote_combina_consultas_e_separa_resultados(simular_apis):
+    corpus = [
+        artigo("Knee fracture imaging", '10.1/a'),
+        artigo("Shoulder instability MRI", '10.1/b'),
+        artigo("Knee fractures in children", '10.1/c'),
+        artigo("Hip arthroplasty outcomes", '10.1/d')
+    ]
+    apis = simular_apis({
+        'openalex': AdaptadorSimulado(corpus, suporta_or=True, max_resultados=200),
+        'crossref': AdaptadorSimulado(corpus)
+    })
+    
+    resposta = lote.buscar_lote([
+        {'termos': 'knee fracture', 'limite': 10, **PERIODO},
+        {'termos': 'shoulder', 'limite': 10, **PERIODO}
+    ])
+    
+    # Uma chamada combinada no OpenAlex e uma chamada por consulta no Crossref
+    assert len(apis['openalex'].chamadas) == 1
+    assert ' OR ' in apis['openalex'].chamadas[0][0]
+    assert len(apis['crossref'].chamadas) == 2
+    assert resposta['chamadas']['combinadas'] == 1
+    
+    (_, joelho), (_, ombro) = resposta['consultas']
+    assert titulos(joelho) == ["Knee fracture imaging", "Knee fractures in children"]
+    assert titulos(ombro) == ["Shoulder instability MRI"]
+    assert len(resposta['uniao'][1]) == 3
+
+def test_lote_completa_consulta_quando_chamada_combinada_satura(simular_apis):
+    # A chamada combinada pede 4 resultados e recebe só artigos de joelho
+    corpus = [artigo(f"Knee study {i}", f"10.1/k{i}") for i in range(6)]
+    corpus += [artigo(f"Shoulder study {i}", f"10.1/s{i}") for i in range(2)]
+    apis = simular_apis({'openalex': AdaptadorSimulado(corpus, suporta_or=True, max_resultados=200)})
+    
+    resposta = lote.buscar_lote([
+        {'termos': 'knee', 'limite': 2, **PERIODO},
+        {'termos': 'shoulder', 'limite': 2, **PERIODO}
+    ])
+    
+    assert resposta['chamadas']['complementares'] == 1
+    assert apis['openalex'].chamadas[1] == ('shoulder', 2)
+    (_, joelho), (_, ombro) = resposta['consultas']
+    assert len(joelho) == 2
+    assert titulos(ombro) == ["Shoulder study 0", "Shoulder study 1"]
+
+def test_lote_usa_buscar_lote_do_adaptador(simular_apis):
+    corpus = [artigo("Knee MRI", '10.1/a'), artigo("Hip MRI", '10.1/b')]
+    adaptador = AdaptadorSimulado(corpus, suporta_or=True, max_resultados=200)
+    consultas_recebidas = []
+    
+    def buscar_lote(consultas, autor='', data_inicio=None, data_fim=None, revistas=None):
+        consultas_recebidas.append(dict(consultas))
+        return {termos: adaptador.encontrar(termos)[:limite] for termos, limite in consultas.items()}
+    
+    adaptador.buscar_lote = buscar_lote
+    simular_apis({'pubmed': adaptador})
+    
+    resposta = lote.buscar_lote([{'termos': 'knee', 'limite': 5, **PERIODO}, {'termos': 'hip', 'limite': 5, **PERIODO}])
+    
+    assert consultas_recebidas == [{'knee': 5, 'hip': 5}]
+    assert adaptador.chamadas == []
+    (_, joelho), (_, quadril) = resposta['consultas']
+    assert titulos(joelho) == ["Knee MRI"]
+    assert titulos(quadril) == ["Hip MRI"]
+
+def test_lote_reaproveita_consultas_em_cache(simular_apis):
+    apis = simular_apis({'crossref': AdaptadorSimulado([artigo("Knee MRI", '10.1/a')])})
+    
+    lote.buscar_lote([{'termos': 'knee', 'limite': 5, **PERIODO}])
+    resposta = lote.buscar_lote([{'termos': 'knee', 'limite': 5, **PERIODO}])
+    
+    assert len(apis['crossref'].chamadas) == 1
+    assert resposta['chamadas']['em_cache'] == 1
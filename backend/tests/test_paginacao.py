@@ -0,0 +1,81 @@
+"""
+Testes da paginação profunda (core.paginacao): tokens de continuação e
+restauração das sessões gravadas no cache em disco.
+"""
+import pytest
+
+from core import paginacao
+from tests.conftest import AdaptadorSimulado, artigo
+
+# Filtros das buscas (as datas do corpus simulado estão no período)
+FILTROS = {'termos': 'knee', 'data_inicio': '2020-01-01', 'data_fim': '2030-12-31'}
+
+@pytest.fixture
+def api(simular_apis):
+    """Uma API simulada com 7 artigos, do mais recente ao mais antigo."""
+    corpus = [artigo(f"Knee study {i}", f"10.1/k{i}", data=f"2024-{12 - i:02d}-01") for i in range(7)]
+    return simular_apis({'crossref': AdaptadorSimulado(corpus)})['crossref']
+
+def dois_da_pagina(pagina):
+    return [resultado['doi'] for resultado in pagina['resultados']]
+
+def test_token_de_continuacao():
+    id_sessao = 'a' * 32
+    assert paginacao.ler_token(paginacao.gerar_token(id_sessao, 3)) == (id_sessao, 3)
+
+@pytest.mark.parametrize('token', ['', 'abc', paginacao.gerar_token('curto', 2), paginacao.gerar_token('a' * 32, 'x')])
+def test_token_invalido(token):
+    with pytest.raises(paginacao.TokenInvalidoError):
+        paginacao.ler_token(token)
+
+def test_paginas_sem_repeticao(api):
+    paginas = [paginacao.iniciar(**FILTROS, tamanho=3)]
+    while paginas[-1]['token']:
+        paginas.append(paginacao.continuar(paginas[-1]['token'], tamanho=3))
+    
+    entregues = [doi for pagina in paginas for doi in dois_da_pagina(pagina)]
+    assert entregues == [f"10.1/k{i}" for i in range(7)]
+    assert [pagina['pagina'] for pagina in paginas] == [1, 2, 3]
+
+def test_token_repetido_devolve_a_mesma_pagina(api):
+    primeira = paginacao.iniciar(**FILTROS, tamanho=3)
+    segunda = paginacao.continuar(primeira['token'], tamanho=3)
+    
+    assert dois_da_pagina(paginacao.continuar(primeira['token'], tamanho=3)) == dois_da_pagina(segunda)
+    
+    terceira = paginacao.continuar(segunda['token'], tamanho=3)
+    assert terceira['pagina'] == 3
+    with pytest.raises(paginacao.TokenInvalidoError):
+        paginacao.continuar(primeira['token'], tamanho=3)
+
+def test_continuacao_em_outro_worker(api):
+    primeira = paginacao.iniciar(**FILTROS, tamanho=3)
+    
+    # Outro worker não tem a sessão em memória: ela vem do cache em disco
+    paginacao._sessoes.clear()
+    segunda = paginacao.continuar(primeira['token'], tamanho=3)
+    
+    assert segunda['pagina'] == 2
+    assert set(dois_da_pagina(segunda)).isdisjoint(dois_da_pagina(primeira))
+
+def test_copia_em_memoria_antiga_e_substituida_pela_do_disco(api):
+    primeira = paginacao.iniciar(**FILTROS, tamanho=3)
+    id_sessao, _ = paginacao.ler_token(primeira['token'])
+    antiga = paginacao.SessaoPaginacao.de_dict(paginacao._sessoes[id_sessao].como_dict())
+    
+    # Outro worker entrega a segunda página; este ficou com a cópia da primeira
+    segunda = paginacao.continuar(primeira['token'], tamanho=3)
+    paginacao._sessoes[id_sessao] = antiga
+    
+    terceira = paginacao.continuar(segunda['token'], tamanho=3)
+    assert terceira['pagina'] == 3
+    assert dois_da_pagina(terceira) == ["10.1/k6"]
+
+def test_de_dict_restaura_o_estado(api):
+    paginacao.iniciar(**FILTROS, tamanho=3)
+    sessao = next(iter(paginacao._sessoes.values()))
+    
+    restaurada = paginacao.SessaoPaginacao.de_dict(sessao.como_dict())
+    
+    assert restaurada.como_dict() == sessao.como_dict()
+    assert restaurada.repetir_pagina() == sessao.repetir_pagina()
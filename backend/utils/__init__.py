@@ -2,9 +2,15 @@
 Arquivo de inicialização para o pacote utils.
 """
 # Importa os módulos de utilidades
+from . import registro
+from . import metricas
+from . import conexoes
 from . import normalizacao
 from . import exportacao
 from . import validacao
+from . import revistas
+from . import respostas
+from . import rastreamento
 
 # Versão do pacote
 __version__ = '0.1.0'
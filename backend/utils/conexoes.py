@@ -0,0 +1,328 @@
+"""
+Conexões HTTP com as APIs externas.
+Todas as buscas do processo usam a mesma sessão do requests, que mantém as
+conexões abertas (keep-alive) entre as chamadas, e um orçamento de
+requisições por segundo para cada API, compartilhado entre as threads, de
+modo que várias buscas simultâneas (ou uma busca em lote) não ultrapassem
+os limites de uso das APIs. Com um diretório de limites configurado (ver
+configurar), o orçamento fica em um arquivo por API, travado a cada
+reserva, e é compartilhado por todos os processos: os workers do servidor,
+o comando atualizar-buscas e o aquecimento do cache de cada um. Sem ele
+(ou onde não há fcntl, como no Windows), o orçamento é de cada processo.
+
+Requisições feitas dentro de segundo_plano() (ex.: o aquecimento do cache)
+nunca disputam o limite com as buscas dos usuários: só são enviadas quando
+nenhuma requisição interativa do processo está em andamento e o orçamento
+da API está cheio, e não reservam fichas futuras. Com o orçamento
+compartilhado, o balde só está cheio se nenhum processo usou a API
+recentemente, de modo que o aquecimento de um worker também cede às buscas
+atendidas pelos outros.
+"""
+import os
+import time
+import threading
+import contextlib
+import contextvars
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import metricas
+
+# Tempo máximo (em segundos) para conectar e para aguardar a resposta
+TEMPO_LIMITE = (5, 30)
+
+# Conexões mantidas abertas por host
+CONEXOES_POR_HOST = 16
+
+# Requisições por segundo permitidas em cada API (limites públicos sem chave)
+LIMITES_TAXA = {
+    'pubmed': 3,
+    'crossref': 10,
+    'semantic_scholar': 1,
+    'openalex': 10,
+    'unpaywall': 10,
+    'thieme': 2
+}
+
+# Intervalo (em segundos) entre as verificações de uma requisição em segundo plano
+INTERVALO_SEGUNDO_PLANO = 0.1
+
+# Diretório dos orçamentos compartilhados entre os processos (None: orçamento por processo)
+DIRETORIO_LIMITES = None
+
+_sessao = None
+_limitadores = {}
+_lock = threading.Lock()
+
+# Requisições interativas em andamento (incluindo a espera pelo limite)
+_interativas = 0
+_segundo_plano = contextvars.ContextVar('segundo_plano', default=False)
+
+class LimitadorTaxa:
+    """
+    Balde de fichas: permite até `taxa` requisições por segundo, com
+    rajadas de até `rajada` requisições.
+    """
+    
+    # Relógio do balde (o compartilhado usa o relógio do sistema, que
+    # continua valendo depois de um reinício)
+    relogio = staticmethod(time.monotonic)
+    
+    def __init__(self, taxa, rajada=None):
+        """
+        Inicializa o balde cheio.
+        
+        Args:
+            taxa (float): Requisições por segundo
+            rajada (int, opcional): Capacidade do balde (padrão: a taxa, no mínimo 1)
+        """
+        self.taxa = float(taxa)
+        self.rajada = float(rajada or max(1, taxa))
+        self._fichas = self.rajada
+        self._atualizado = self.relogio()
+        self._lock = threading.Lock()
+    
+    @contextlib.contextmanager
+    def _travado(self):
+        """Dá acesso exclusivo ao estado do balde."""
+        with self._lock:
+            yield
+    
+    def _repor(self):
+        """Repõe as fichas acumuladas desde a última atualização."""
+        agora = self.relogio()
+        if agora < self._atualizado:
+            # Atualização no futuro (relógio ajustado para trás): o balde recomeça cheio
+            self._fichas = self.rajada
+        else:
+            self._fichas = min(self.rajada, self._fichas + (agora - self._atualizado) * self.taxa)
+        self._atualizado = agora
+    
+    def reservar(self):
+        """
+        Reserva uma ficha.
+        
+        Returns:
+            float: Tempo (em segundos) a aguardar antes de usar a ficha
+        """
+        with self._travado():
+            self._repor()
+            
+            # A ficha é reservada mesmo que ainda não exista; quem chega
+            # depois espera pela seguinte
+            self._fichas -= 1
+            return -self._fichas / self.taxa if self._fichas < 0 else 0.0
+    
+    def reservar_se_cheio(self):
+        """
+        Reserva uma ficha apenas se o balde estiver cheio, isto é, se a API
+        não foi usada recentemente (não cria espera para quem chega depois).
+        
+        Returns:
+            bool: True se a ficha foi reservada
+        """
+        with self._travado():
+            self._repor()
+            
+            if self._fichas < self.rajada:
+                return False
+            self._fichas -= 1
+            return True
+    
+    def aguardar(self):
+        """
+        Aguarda uma ficha (a espera ocorre fora do lock).
+        
+        Returns:
+            float: Tempo aguardado, em segundos
+        """
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+class LimitadorCompartilhado(LimitadorTaxa):
+    """
+    Balde de fichas gravado em um arquivo, compartilhado por todos os
+    processos que o usam. O arquivo fica travado (fcntl.flock) enquanto o
+    estado é lido e atualizado.
+    """
+    
+    relogio = staticmethod(time.time)
+    
+    def __init__(self, taxa, caminho, rajada=None):
+        """
+        Inicializa o balde (cheio, se o arquivo ainda não existe).
+        
+        Args:
+            taxa (float): Requisições por segundo
+            caminho (str): Arquivo do estado do balde
+            rajada (int, opcional): Capacidade do balde (padrão: a taxa, no mínimo 1)
+        """
+        super().__init__(taxa, rajada)
+        self.caminho = caminho
+    
+    @contextlib.contextmanager
+    def _travado(self):
+        """Carrega o estado do arquivo travado e o grava ao final."""
+        with self._lock, open(self.caminho, 'a+', encoding='ascii') as arquivo:
+            fcntl.flock(arquivo, fcntl.LOCK_EX)
+            arquivo.seek(0)
+            try:
+                self._fichas, self._atualizado = (float(valor) for valor in arquivo.read().split())
+            except ValueError:
+                # Arquivo novo ou corrompido: o balde recomeça cheio
+                self._fichas, self._atualizado = self.rajada, self.relogio()
+            
+            yield
+            
+            arquivo.seek(0)
+            arquivo.truncate()
+            arquivo.write(f"{self._fichas!r} {self._atualizado!r}")
+
+def configurar(limites=None, tempo_limite=None, diretorio_limites=None):
+    """
+    Ajusta os limites de uso das APIs e o tempo máximo das requisições.
+    
+    Args:
+        limites (dict, opcional): Requisições por segundo por API
+        tempo_limite (float ou tuple, opcional): Tempo máximo das requisições
+        diretorio_limites (str, opcional): Diretório dos orçamentos
+            compartilhados entre os processos
+    """
+    global TEMPO_LIMITE, DIRETORIO_LIMITES
+    
+    if diretorio_limites is not None and fcntl is not None:
+        os.makedirs(diretorio_limites, exist_ok=True)
+        with _lock:
+            DIRETORIO_LIMITES = diretorio_limites
+            _limitadores.clear()
+    if limites:
+        with _lock:
+            LIMITES_TAXA.update(limites)
+            for api in limites:
+                _limitadores.pop(api, None)
+    if tempo_limite is not None:
+        TEMPO_LIMITE = tempo_limite
+
+def obter_sessao():
+    """
+    Retorna a sessão HTTP compartilhada pelo processo.
+    
+    Returns:
+        requests.Session: Sessão com o pool de conexões
+    """
+    global _sessao
+    
+    if _sessao is None:
+        with _lock:
+            if _sessao is None:
+                sessao = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=len(LIMITES_TAXA), pool_maxsize=CONEXOES_POR_HOST)
+                sessao.mount('https://', adaptador)
+                sessao.mount('http://', adaptador)
+                _sessao = sessao
+    return _sessao
+
+def obter_limitador(api):
+    """
+    Retorna o limitador de taxa de uma API (None se a API não tem limite).
+    
+    Args:
+        api (str): Nome da API
+    
+    Returns:
+        LimitadorTaxa: Limitador compartilhado pelas threads do processo (e
+            pelos demais processos, se há um diretório de limites)
+    """
+    limitador = _limitadores.get(api)
+    if limitador is None and LIMITES_TAXA.get(api):
+        with _lock:
+            limitador = _limitadores.get(api)
+            if limitador is None:
+                if DIRETORIO_LIMITES:
+                    caminho = os.path.join(DIRETORIO_LIMITES, f"{api}.taxa")
+                    limitador = LimitadorCompartilhado(LIMITES_TAXA[api], caminho)
+                else:
+                    limitador = LimitadorTaxa(LIMITES_TAXA[api])
+                _limitadores[api] = limitador
+    return limitador
+
+@contextlib.contextmanager
+def segundo_plano():
+    """
+    Marca como de segundo plano as requisições feitas dentro do bloco,
+    inclusive nas threads que herdam o contexto (ver
+    utils.rastreamento.propagar).
+    """
+    token = _segundo_plano.set(True)
+    try:
+        yield
+    finally:
+        _segundo_plano.reset(token)
+
+def obter(api, url, **kwargs):
+    """
+    Faz uma requisição GET a uma API, respeitando seu limite de taxa.
+    
+    Args:
+        api (str): Nome da API (define o limite de taxa)
+        url (str): URL da requisição
+        **kwargs: Argumentos de requests.get (params, headers...)
+    
+    Returns:
+        requests.Response: Resposta da API
+    """
+    global _interativas
+    
+    kwargs.setdefault('timeout', TEMPO_LIMITE)
+    limitador = obter_limitador(api)
+    
+    if _segundo_plano.get():
+        aguardar_ociosidade(limitador)
+        return obter_sessao().get(url, **kwargs)
+    
+    with _lock:
+        _interativas += 1
+    try:
+        if limitador is not None:
+            espera = limitador.aguardar()
+            if espera > 0:
+                metricas.ESPERA_LIMITE_API.incrementar(api, valor=espera)
+        
+        return obter_sessao().get(url, **kwargs)
+    finally:
+        with _lock:
+            _interativas -= 1
+
+def aguardar_ociosidade(limitador):
+    """
+    Aguarda até que nenhuma requisição interativa do processo esteja em
+    andamento e o orçamento da API esteja cheio (sem uso recente por nenhum
+    processo, se compartilhado), e então reserva uma ficha.
+    
+    Args:
+        limitador (LimitadorTaxa): Limitador da API (None se não tem limite)
+    """
+    while True:
+        if _interativas == 0 and (limitador is None or limitador.reservar_se_cheio()):
+            return
+        time.sleep(INTERVALO_SEGUNDO_PLANO)
+
+def _reiniciar_no_filho():
+    """
+    Descarta a sessão herdada em um processo criado por fork: as conexões
+    abertas pelo processo original não podem ser compartilhadas.
+    """
+    global _sessao
+    
+    _sessao = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_no_filho)
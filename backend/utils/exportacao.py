@@ -1,317 +1,492 @@
 """
 Módulo de exportação de resultados.
-Responsável por exportar resultados em diferentes formatos (HTML, PDF, Excel, TXT).
+Responsável por exportar resultados em diferentes formatos (HTML, PDF, Excel, TXT,
+CSV, JSON Lines, RIS e BibTeX). PDF e Excel ficam em módulos próprios
+(exportacao_pdf e exportacao_excel), importados apenas quando usados.
 """
+import io
 import os
+import re
+import csv
+import gzip
 import json
+import time
+import uuid
+import shutil
+import hashlib
+import importlib
 import logging
+from collections.abc import Sequence
 from datetime import datetime
-import pandas as pd
-import weasyprint
-from fpdf import FPDF
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from utils import metricas
 
 logger = logging.getLogger(__name__)
 
-def exportar(formato, resultados, busca, diretorio):
+# Diretório dos templates de exportação
+DIRETORIO_TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Ambiente Jinja2 compartilhado: os templates são compilados uma única vez
+_ambiente_templates = Environment(
+    loader=FileSystemLoader(DIRETORIO_TEMPLATES),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False
+)
+
+# Formatos de exportação suportados e extensão de cada arquivo
+FORMATOS_STREAMING = ('csv', 'jsonl', 'ris', 'bibtex')
+FORMATOS = ('html', 'pdf', 'excel', 'txt') + FORMATOS_STREAMING
+EXTENSOES = {
+    'html': 'html',
+    'pdf': 'pdf',
+    'excel': 'xlsx',
+    'txt': 'txt',
+    'csv': 'csv',
+    'jsonl': 'jsonl',
+    'ris': 'ris',
+    'bibtex': 'bib'
+}
+
+# Tipo de conteúdo das respostas HTTP dos formatos em streaming
+TIPOS_CONTEUDO = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'ris': 'application/x-research-info-systems; charset=utf-8',
+    'bibtex': 'application/x-bibtex; charset=utf-8'
+}
+
+# Colunas (campo, título) do CSV
+COLUNAS_CSV = (
+    ('titulo', 'Título'),
+    ('autores', 'Autores'),
+    ('revista', 'Revista'),
+    ('data_publicacao', 'Data de Publicação'),
+    ('doi', 'DOI'),
+    ('url', 'URL'),
+    ('fonte', 'Fonte'),
+    ('resumo', 'Resumo')
+)
+
+# Inícios de célula que planilhas interpretam como fórmula (injeção de
+# fórmulas ao abrir o CSV); essas células recebem um apóstrofo na frente
+PREFIXOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+# Tamanho (em caracteres) dos blocos enviados nas respostas em streaming
+TAMANHO_BLOCO_STREAMING = 64 * 1024
+
+# Extensões de texto baixadas com compressão gzip (PDF e XLSX já são comprimidos)
+EXTENSOES_COMPRIMIVEIS = ('html', 'txt', 'csv', 'jsonl', 'ris', 'bib')
+
+# Nível de compressão das versões gzip dos downloads
+NIVEL_GZIP = 6
+
+# Hash do conteúdo no nome dos arquivos exportados (ver caminho_exportacao)
+_RE_HASH_ARQUIVO = re.compile(r'_([0-9a-f]{16})\.[a-z]+$')
+
+# Caracteres especiais do LaTeX e seus escapes no BibTeX
+_ESCAPES_BIBTEX = {
+    '\\': r'\textbackslash{}',
+    '{': r'\{',
+    '}': r'\}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}'
+}
+_RE_ESPECIAIS_BIBTEX = re.compile('|'.join(re.escape(c) for c in _ESCAPES_BIBTEX))
+
+# Palavras usadas nas chaves de citação do BibTeX
+_RE_PALAVRA_CHAVE = re.compile(r'[^\W\d_]+')
+
+# Campos dos resultados que entram no hash de conteúdo das exportações
+CAMPOS_HASH = ('id', 'titulo', 'autores', 'revista', 'data_publicacao', 'doi', 'url', 'resumo', 'fonte')
+
+# Tamanho máximo do diretório de exportações (os menos usados saem primeiro)
+TAMANHO_MAXIMO_EXPORTACOES = 500 * 1024 * 1024
+
+# Marca os arquivos ainda em geração; abandonados são removidos após 1 hora
+SUFIXO_TEMPORARIO = '.tmp-'
+IDADE_MAXIMA_TEMPORARIO = 3600
+
+# Intervalo (em resultados) entre atualizações do progresso
+INTERVALO_PROGRESSO = 50
+
+# Caracteres que não entram no nome dos arquivos
+_RE_CARACTERES_NOME = re.compile(r'[^\w-]+')
+
+# Número de trechos do template agrupados em cada escrita
+TAMANHO_BUFFER_TEMPLATE = 256
+
+def exportar(formato, resultados, busca, diretorio, ao_progredir=None):
     """
     Exporta resultados no formato especificado.
     
+    O nome do arquivo inclui um hash do conteúdo exportado (ver
+    gerar_hash_exportacao): se o mesmo conteúdo já foi exportado no mesmo
+    formato, o arquivo existente é devolvido sem ser gerado novamente.
+    
     Args:
         formato (str): Formato de exportação ('html', 'pdf', 'excel', 'txt')
         resultados (list): Lista de resultados a serem exportados
         busca (dict): Parâmetros da busca
         diretorio (str): Diretório para salvar o arquivo
+        ao_progredir (callable, opcional): Recebe a fração dos resultados já
+            exportada (0 a 1)
     
     Returns:
         str: Caminho do arquivo exportado
     """
+    formato = formato.lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação não suportado: {formato}")
+    
     # Garante que o diretório existe
     os.makedirs(diretorio, exist_ok=True)
     
-    # Gera nome de arquivo baseado nos termos de busca
-    termos = busca.get('palavras', 'busca')
-    termos_formatados = termos.replace(' ', '_')[:30]
-    data_atual = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    nome_arquivo = f"resultados_{termos_formatados}_{data_atual}"
-    
-    # Exporta no formato especificado
-    if formato.lower() == 'html':
-        return exportar_html(resultados, busca, diretorio, nome_arquivo)
-    elif formato.lower() == 'pdf':
-        return exportar_pdf(resultados, busca, diretorio, nome_arquivo)
-    elif formato.lower() == 'excel':
-        return exportar_excel(resultados, busca, diretorio, nome_arquivo)
-    elif formato.lower() == 'txt':
-        return exportar_txt(resultados, busca, diretorio, nome_arquivo)
-    else:
-        raise ValueError(f"Formato de exportação não suportado: {formato}")
+    # Exportação idêntica já existente
+    caminho = caminho_exportacao(formato, resultados, busca, diretorio)
+    existente = reaproveitar_exportacao(caminho)
+    if existente:
+        return existente
+    
+    nome_arquivo = os.path.splitext(os.path.basename(caminho))[0]
+    if ao_progredir:
+        resultados = ResultadosComProgresso(resultados, ao_progredir)
+    
+    # Gera em um nome temporário e renomeia ao final, para que um arquivo
+    # incompleto nunca seja encontrado pelo cache
+    exportador = obter_exportador(formato)
+    nome_temporario = f"{nome_arquivo}{SUFIXO_TEMPORARIO}{uuid.uuid4().hex}"
+    try:
+        temporario = exportador(resultados, busca, diretorio, nome_temporario)
+        os.replace(os.path.join(diretorio, temporario), caminho)
+    except Exception:
+        # O arquivo incompleto é removido já, sem esperar a limpeza dos abandonados
+        for entrada in os.scandir(diretorio):
+            if entrada.name.startswith(nome_temporario):
+                _remover_exportacao(entrada.path)
+        raise
+    
+    # Uma versão gzip anterior corresponde a outro conteúdo (ver obter_versao_gzip)
+    _remover_exportacao(f"{caminho}.gz")
+    
+    # Mantém o diretório de exportações dentro do tamanho máximo
+    limpar_exportacoes(diretorio, preservar=caminho)
+    
+    return os.path.basename(caminho)
 
-def exportar_html(resultados, busca, diretorio, nome_arquivo):
+def caminho_exportacao(formato, resultados, busca, diretorio):
     """
-    Exporta resultados em formato HTML.
+    Monta o caminho do arquivo de uma exportação: termos da busca e hash do
+    conteúdo exportado (ver gerar_hash_exportacao).
     
     Args:
+        formato (str): Formato de exportação
         resultados (list): Lista de resultados
         busca (dict): Parâmetros da busca
-        diretorio (str): Diretório para salvar o arquivo
-        nome_arquivo (str): Nome base do arquivo
+        diretorio (str): Diretório das exportações
     
     Returns:
-        str: Caminho do arquivo exportado
+        str: Caminho completo do arquivo
     """
-    # Caminho completo do arquivo
-    caminho = os.path.join(diretorio, f"{nome_arquivo}.html")
+    termos = busca.get('palavras') or 'busca'
+    termos_formatados = _RE_CARACTERES_NOME.sub('_', termos).strip('_')[:30]
+    hash_conteudo = gerar_hash_exportacao(formato, resultados, busca)
+    return os.path.join(diretorio, f"resultados_{termos_formatados}_{hash_conteudo[:16]}.{EXTENSOES[formato]}")
+
+def reaproveitar_exportacao(caminho):
+    """
+    Reaproveita um arquivo já exportado, se existir.
     
-    # Informações da busca
-    titulo = f"Resultados da busca: {busca.get('palavras', '')}"
-    data_exportacao = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-    periodo = f"{busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}"
-    
-    # Cria o conteúdo HTML
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="pt-BR">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{titulo}</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 1200px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-            h1 {{
-                color: #3a6ea8;
-                border-bottom: 2px solid #3a6ea8;
-                padding-bottom: 10px;
-            }}
-            .info {{
-                background: #f5f5f5;
-                padding: 15px;
-                border-radius: 5px;
-                margin-bottom: 20px;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 20px;
-            }}
-            th, td {{
-                padding: 12px 15px;
-                border: 1px solid #ddd;
-                text-align: left;
-            }}
-            th {{
-                background-color: #3a6ea8;
-                color: white;
-                font-weight: bold;
-            }}
-            tr:nth-child(even) {{
-                background-color: #f2f2f2;
-            }}
-            tr:hover {{
-                background-color: #e9f0f7;
-            }}
-            a {{
-                color: #3a6ea8;
-                text-decoration: none;
-            }}
-            a:hover {{
-                text-decoration: underline;
-            }}
-            .footer {{
-                margin-top: 30px;
-                text-align: center;
-                font-size: 0.9em;
-                color: #666;
-            }}
-        </style>
-    </head>
-    <body>
-        <h1>{titulo}</h1>
-        
-        <div class="info">
-            <p><strong>Data da exportação:</strong> {data_exportacao}</p>
-            <p><strong>Termos de busca:</strong> {busca.get('palavras', '')}</p>
-            <p><strong>Período:</strong> {periodo}</p>
-            <p><strong>Total de resultados:</strong> {len(resultados)}</p>
-        </div>
-        
-        <table>
-            <thead>
-                <tr>
-                    <th>Título</th>
-                    <th>Autores</th>
-                    <th>Revista</th>
-                    <th>Data</th>
-                    <th>DOI</th>
-                    <th>Fonte</th>
-                </tr>
-            </thead>
-            <tbody>
-    """
-    
-    # Adiciona cada resultado à tabela
-    for resultado in resultados:
-        data_formatada = formatar_data(resultado.get('data_publicacao', ''))
-        html += f"""
-                <tr>
-                    <td><a href="{resultado.get('url', '#')}" target="_blank">{resultado.get('titulo', '')}</a></td>
-                    <td>{resultado.get('autores', '')}</td>
-                    <td>{resultado.get('revista', '')}</td>
-                    <td>{data_formatada}</td>
-                    <td><a href="https://doi.org/{resultado.get('doi', '')}" target="_blank">{resultado.get('doi', '')}</a></td>
-                    <td>{resultado.get('fonte', '')}</td>
-                </tr>
-        """
+    Args:
+        caminho (str): Caminho do arquivo (ver caminho_exportacao)
     
-    # Finaliza o HTML
-    html += """
-            </tbody>
-        </table>
-        
-        <div class="footer">
-            <p>Exportado pelo Buscador de Revistas Científicas</p>
-        </div>
-    </body>
-    </html>
+    Returns:
+        str: Nome do arquivo ou None se ele não existir
     """
+    try:
+        _registrar_uso(caminho)
+    except FileNotFoundError:
+        metricas.CONSULTAS_CACHE.incrementar('exportacao', 'falta')
+        return None
     
-    # Escreve o arquivo
-    with open(caminho, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    logger.info(f"Arquivo HTML exportado: {caminho}")
+    logger.info(f"Exportação reaproveitada do cache: {caminho}")
+    metricas.CONSULTAS_CACHE.incrementar('exportacao', 'acerto')
     return os.path.basename(caminho)
 
-def exportar_pdf(resultados, busca, diretorio, nome_arquivo):
+def obter_exportador(formato):
     """
-    Exporta resultados em formato PDF.
+    Retorna a função exportadora de um formato, importando o módulo
+    correspondente no primeiro uso.
     
     Args:
+        formato (str): Formato de exportação
+    
+    Returns:
+        callable: Exportador (resultados, busca, diretorio, nome_arquivo)
+    """
+    exportador = EXPORTADORES[formato]
+    if isinstance(exportador, tuple):
+        modulo, funcao = exportador
+        exportador = getattr(importlib.import_module(modulo), funcao)
+        EXPORTADORES[formato] = exportador
+        logger.info(f"Exportador {formato.upper()} carregado de {modulo}")
+    return exportador
+
+def gerar_hash_exportacao(formato, resultados, busca):
+    """
+    Calcula o hash do conteúdo de uma exportação: formato, parâmetros da
+    busca exibidos no arquivo e os campos exportados de cada resultado.
+    
+    Args:
+        formato (str): Formato de exportação
         resultados (list): Lista de resultados
         busca (dict): Parâmetros da busca
-        diretorio (str): Diretório para salvar o arquivo
-        nome_arquivo (str): Nome base do arquivo
     
     Returns:
-        str: Caminho do arquivo exportado
+        str: Hash SHA-256 em hexadecimal
     """
-    # Caminho completo do arquivo
-    caminho = os.path.join(diretorio, f"{nome_arquivo}.pdf")
+    hash_conteudo = hashlib.sha256()
+    cabecalho = [formato] + [busca.get(campo, '') for campo in ('palavras', 'periodo_inicio', 'periodo_fim')]
+    hash_conteudo.update(json.dumps(cabecalho, ensure_ascii=False, default=str).encode('utf-8'))
+    
+    for resultado in resultados:
+        linha = [resultado.get(campo, '') for campo in CAMPOS_HASH]
+        hash_conteudo.update(b'\n')
+        hash_conteudo.update(json.dumps(linha, ensure_ascii=False, default=str).encode('utf-8'))
+    
+    return hash_conteudo.hexdigest()
+
+def limpar_exportacoes(diretorio, tamanho_maximo=None, preservar=None):
+    """
+    Remove as exportações menos recentemente usadas até que o diretório
+    caiba no tamanho máximo. Arquivos temporários abandonados (de
+    exportações interrompidas) também são removidos.
+    
+    Args:
+        diretorio (str): Diretório das exportações
+        tamanho_maximo (int, opcional): Tamanho máximo em bytes
+            (padrão: TAMANHO_MAXIMO_EXPORTACOES)
+        preservar (str, opcional): Caminho que nunca deve ser removido
+    
+    Returns:
+        int: Número de arquivos removidos
+    """
+    tamanho_maximo = TAMANHO_MAXIMO_EXPORTACOES if tamanho_maximo is None else tamanho_maximo
+    agora = time.time()
+    arquivos = []
+    removidos = 0
+    
+    with os.scandir(diretorio) as entradas:
+        for entrada in entradas:
+            if not entrada.name.startswith('resultados_') or not entrada.is_file():
+                continue
+            try:
+                info = entrada.stat()
+            except FileNotFoundError:
+                continue
+            
+            if SUFIXO_TEMPORARIO in entrada.name:
+                # Temporários em uso são recentes; os antigos foram abandonados
+                if agora - info.st_mtime > IDADE_MAXIMA_TEMPORARIO:
+                    removidos += _remover_exportacao(entrada.path)
+                continue
+            
+            # O último uso fica na data de acesso (ver _registrar_uso)
+            arquivos.append((max(info.st_atime, info.st_mtime), info.st_size, entrada.path))
+    
+    total = sum(tamanho for _, tamanho, _ in arquivos)
+    for _, tamanho, caminho in sorted(arquivos):
+        if total <= tamanho_maximo:
+            break
+        if caminho == preservar:
+            continue
+        if _remover_exportacao(caminho):
+            total -= tamanho
+            removidos += 1
+    
+    if removidos:
+        logger.info(f"Limpeza de exportações: {removidos} arquivos removidos")
+    return removidos
+
+def etag_exportacao(caminho):
+    """
+    Gera a ETag forte de um arquivo exportado.
+    
+    Combina o hash do conteúdo presente no nome do arquivo com a data de
+    modificação (em nanossegundos) e o tamanho: o arquivo reaproveitado
+    mantém a ETag, mas um arquivo gerado novamente (por exemplo, após ser
+    removido pela limpeza) recebe outra, já que a data da exportação
+    impressa nele muda. O inode não serve, pois é reutilizado após a remoção.
     
-    # Primeiro gera um HTML temporário
-    html_temp = os.path.join(diretorio, f"{nome_arquivo}_temp.html")
-    exportar_html(resultados, busca, diretorio, f"{nome_arquivo}_temp")
+    Args:
+        caminho (str): Caminho do arquivo exportado
     
+    Returns:
+        str: ETag ou None se o nome não tiver o hash do conteúdo
+    """
+    correspondencia = _RE_HASH_ARQUIVO.search(os.path.basename(caminho))
+    if not correspondencia:
+        return None
+    info = os.stat(caminho)
+    return f"{correspondencia.group(1)}-{info.st_mtime_ns:x}-{info.st_size:x}"
+
+def comprimivel(nome_arquivo):
+    """
+    Indica se um arquivo exportado deve ser baixado com compressão gzip.
+    
+    Args:
+        nome_arquivo (str): Nome do arquivo
+    
+    Returns:
+        bool: True para os formatos de texto
+    """
+    return nome_arquivo.rsplit('.', 1)[-1].lower() in EXTENSOES_COMPRIMIVEIS
+
+def obter_versao_gzip(caminho):
+    """
+    Retorna a versão comprimida (gzip) de um arquivo exportado, gerando-a
+    no primeiro download. Como os arquivos são identificados pelo conteúdo,
+    a versão comprimida nunca fica desatualizada e é reaproveitada nos
+    downloads seguintes.
+    
+    Args:
+        caminho (str): Caminho do arquivo exportado
+    
+    Returns:
+        str: Caminho do arquivo .gz
+    """
+    caminho_gzip = f"{caminho}.gz"
+    
+    # Versão já comprimida (removida por exportar quando o arquivo é gerado novamente)
     try:
-        # Converte HTML para PDF usando WeasyPrint
-        html = weasyprint.HTML(html_temp)
-        html.write_pdf(caminho)
-        
-        # Remove o arquivo HTML temporário
-        os.remove(html_temp)
-        
-        logger.info(f"Arquivo PDF exportado: {caminho}")
-        return os.path.basename(caminho)
+        _registrar_uso(caminho_gzip)
+        return caminho_gzip
+    except FileNotFoundError:
+        pass
+    
+    # Comprime em um nome temporário e renomeia ao final
+    temporario = f"{caminho_gzip}{SUFIXO_TEMPORARIO}{uuid.uuid4().hex}"
+    try:
+        with open(caminho, 'rb') as origem, gzip.open(temporario, 'wb', compresslevel=NIVEL_GZIP) as destino:
+            shutil.copyfileobj(origem, destino, 1024 * 1024)
+        os.replace(temporario, caminho_gzip)
+    except Exception:
+        _remover_exportacao(temporario)
+        raise
+    
+    logger.info(f"Versão gzip gerada: {caminho_gzip}")
+    return caminho_gzip
+
+def _registrar_uso(caminho):
+    """
+    Registra o uso de um arquivo exportado na data de acesso, usada na
+    remoção dos menos recentes. A data de modificação é mantida: ela
+    identifica a versão do arquivo (Last-Modified e ETag).
+    """
+    info = os.stat(caminho)
+    os.utime(caminho, ns=(time.time_ns(), info.st_mtime_ns))
+
+def _remover_exportacao(caminho):
+    """Remove um arquivo de exportação, ignorando se já tiver sido removido."""
+    try:
+        os.remove(caminho)
+        return 1
+    except FileNotFoundError:
+        return 0
+
+class ResultadosComProgresso(Sequence):
+    """
+    Sequência de resultados que informa o progresso à medida que é
+    percorrida pelos exportadores.
+    """
     
-    except Exception as e:
-        logger.error(f"Erro ao exportar PDF: {str(e)}")
+    def __init__(self, resultados, ao_progredir):
+        """
+        Inicializa a sequência.
         
-        # Fallback para FPDF se WeasyPrint falhar
-        try:
-            exportar_pdf_fpdf(resultados, busca, caminho)
-            return os.path.basename(caminho)
-        except Exception as e2:
-            logger.error(f"Erro no fallback para FPDF: {str(e2)}")
-            raise
+        Args:
+            resultados (list): Resultados a exportar
+            ao_progredir (callable): Recebe a fração já percorrida (0 a 1)
+        """
+        self.resultados = resultados
+        self.ao_progredir = ao_progredir
+    
+    def __len__(self):
+        return len(self.resultados)
+    
+    def __getitem__(self, indice):
+        return self.resultados[indice]
+    
+    def __iter__(self):
+        total = len(self.resultados) or 1
+        for i, resultado in enumerate(self.resultados):
+            if i % INTERVALO_PROGRESSO == 0:
+                self.ao_progredir(i / total)
+            yield resultado
+        self.ao_progredir(1.0)
 
-def exportar_pdf_fpdf(resultados, busca, caminho):
+def contexto_exportacao(resultados, busca):
     """
-    Exporta resultados em formato PDF usando FPDF (fallback).
+    Monta as informações de cabeçalho comuns a todos os formatos.
     
     Args:
         resultados (list): Lista de resultados
         busca (dict): Parâmetros da busca
+    
+    Returns:
+        dict: Título, data da exportação, termos, período e total
+    """
+    return {
+        'titulo': f"Resultados da busca: {busca.get('palavras', '')}",
+        'data_exportacao': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+        'termos': busca.get('palavras', ''),
+        'periodo': f"{busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}",
+        'total': len(resultados)
+    }
+
+def escrever_em_arquivo(caminho, partes):
+    """
+    Escreve em um arquivo, de forma incremental, os trechos de texto
+    produzidos por um gerador.
+    
+    Args:
         caminho (str): Caminho completo do arquivo
+        partes (iterable): Trechos de texto a serem escritos
     """
-    # Cria um novo PDF
-    pdf = FPDF()
-    pdf.add_page()
-    
-    # Adiciona fonte para suporte a caracteres especiais
-    pdf.add_font('DejaVu', '', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', uni=True)
-    pdf.set_font('DejaVu', '', 10)
-    
-    # Título
-    pdf.set_font('DejaVu', '', 16)
-    pdf.cell(0, 10, f"Resultados da busca: {busca.get('palavras', '')}", 0, 1, 'C')
-    pdf.ln(5)
-    
-    # Informações da busca
-    pdf.set_font('DejaVu', '', 10)
-    pdf.cell(0, 8, f"Data da exportação: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", 0, 1)
-    pdf.cell(0, 8, f"Termos de busca: {busca.get('palavras', '')}", 0, 1)
-    pdf.cell(0, 8, f"Período: {busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}", 0, 1)
-    pdf.cell(0, 8, f"Total de resultados: {len(resultados)}", 0, 1)
-    pdf.ln(5)
-    
-    # Cabeçalho da tabela
-    pdf.set_fill_color(58, 110, 168)
-    pdf.set_text_color(255, 255, 255)
-    pdf.cell(80, 10, "Título", 1, 0, 'C', True)
-    pdf.cell(40, 10, "Autores", 1, 0, 'C', True)
-    pdf.cell(30, 10, "Revista", 1, 0, 'C', True)
-    pdf.cell(20, 10, "Data", 1, 0, 'C', True)
-    pdf.cell(20, 10, "Fonte", 1, 1, 'C', True)
-    
-    # Conteúdo da tabela
-    pdf.set_text_color(0, 0, 0)
-    for resultado in resultados:
-        # Ajusta o título para caber na célula
-        titulo = resultado.get('titulo', '')
-        if len(titulo) > 60:
-            titulo = titulo[:57] + "..."
-        
-        # Ajusta autores
-        autores = resultado.get('autores', '')
-        if len(autores) > 30:
-            autores = autores[:27] + "..."
-        
-        # Ajusta revista
-        revista = resultado.get('revista', '')
-        if len(revista) > 20:
-            revista = revista[:17] + "..."
-        
-        # Data formatada
-        data = formatar_data(resultado.get('data_publicacao', ''))
-        
-        # Fonte
-        fonte = resultado.get('fonte', '')
-        
-        # Adiciona linha à tabela
-        pdf.cell(80, 10, titulo, 1, 0)
-        pdf.cell(40, 10, autores, 1, 0)
-        pdf.cell(30, 10, revista, 1, 0)
-        pdf.cell(20, 10, data, 1, 0)
-        pdf.cell(20, 10, fonte, 1, 1)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        for parte in partes:
+            f.write(parte)
+
+def gerar_html(resultados, busca, pdf=False):
+    """
+    Gera o documento HTML dos resultados em trechos, a partir do template
+    compilado (o documento completo nunca fica em memória).
     
-    # Rodapé
-    pdf.ln(10)
-    pdf.cell(0, 10, "Exportado pelo Buscador de Revistas Científicas", 0, 1, 'C')
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca
+        pdf (bool, opcional): Omite o estilo embutido, que no PDF é
+            substituído pela folha de estilo pré-carregada
     
-    # Salva o PDF
-    pdf.output(caminho)
+    Returns:
+        iterator: Trechos do documento HTML
+    """
+    template = _ambiente_templates.get_template('resultados.html')
+    partes = template.stream(resultados=resultados, pdf=pdf, **contexto_exportacao(resultados, busca))
     
-    logger.info(f"Arquivo PDF exportado via FPDF: {caminho}")
+    # Agrupa os trechos pequenos do template antes de escrevê-los
+    partes.enable_buffering(TAMANHO_BUFFER_TEMPLATE)
+    return partes
 
-def exportar_excel(resultados, busca, diretorio, nome_arquivo):
+def exportar_html(resultados, busca, diretorio, nome_arquivo):
     """
-    Exporta resultados em formato Excel.
+    Exporta resultados em formato HTML.
     
     Args:
         resultados (list): Lista de resultados
@@ -323,57 +498,56 @@ def exportar_excel(resultados, busca, diretorio, nome_arquivo):
         str: Caminho do arquivo exportado
     """
     # Caminho completo do arquivo
-    caminho = os.path.join(diretorio, f"{nome_arquivo}.xlsx")
-    
-    # Cria um DataFrame com os resultados
-    df = pd.DataFrame(resultados)
-    
-    # Seleciona e renomeia colunas
-    colunas = {
-        'titulo': 'Título',
-        'autores': 'Autores',
-        'revista': 'Revista',
-        'data_publicacao': 'Data de Publicação',
-        'doi': 'DOI',
-        'url': 'URL',
-        'fonte': 'Fonte'
-    }
-    
-    # Filtra colunas existentes
-    colunas_existentes = {k: v for k, v in colunas.items() if k in df.columns}
+    caminho = os.path.join(diretorio, f"{nome_arquivo}.html")
     
-    # Se não houver colunas, cria um DataFrame vazio com as colunas padrão
-    if not colunas_existentes:
-        df = pd.DataFrame(columns=list(colunas.values()))
-    else:
-        # Seleciona e renomeia colunas
-        df = df[list(colunas_existentes.keys())].rename(columns=colunas_existentes)
+    # Escreve o arquivo à medida que o template é renderizado
+    escrever_em_arquivo(caminho, gerar_html(resultados, busca))
     
-    # Adiciona informações da busca em uma nova planilha
-    with pd.ExcelWriter(caminho, engine='openpyxl') as writer:
-        # Planilha de resultados
-        df.to_excel(writer, sheet_name='Resultados', index=False)
-        
-        # Planilha de informações
-        info_data = {
-            'Informação': [
-                'Data da Exportação',
-                'Termos de Busca',
-                'Período',
-                'Total de Resultados'
-            ],
-            'Valor': [
-                datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
-                busca.get('palavras', ''),
-                f"{busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}",
-                len(resultados)
-            ]
-        }
-        pd.DataFrame(info_data).to_excel(writer, sheet_name='Informações', index=False)
-    
-    logger.info(f"Arquivo Excel exportado: {caminho}")
+    logger.info(f"Arquivo HTML exportado: {caminho}")
     return os.path.basename(caminho)
 
+def gerar_txt(resultados, busca):
+    """
+    Gera o conteúdo de texto dos resultados, um resultado por vez.
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca
+    
+    Yields:
+        str: Trechos do conteúdo de texto
+    """
+    contexto = contexto_exportacao(resultados, busca)
+    titulo = contexto['titulo']
+    
+    # Cabeçalho
+    yield (
+        f"{titulo}\n"
+        f"{'=' * len(titulo)}\n\n"
+        f"Data da exportação: {contexto['data_exportacao']}\n"
+        f"Termos de busca: {contexto['termos']}\n"
+        f"Período: {contexto['periodo']}\n"
+        f"Total de resultados: {contexto['total']}\n\n"
+        f"{'=' * 80}\n\n"
+    )
+    
+    # Cada resultado
+    separador = f"\n{'-' * 80}\n\n"
+    for i, resultado in enumerate(resultados, 1):
+        yield (
+            f"[{i}] {resultado.get('titulo', '')}\n"
+            f"Autores: {resultado.get('autores', '')}\n"
+            f"Revista: {resultado.get('revista', '')}\n"
+            f"Data: {formatar_data(resultado.get('data_publicacao', ''))}\n"
+            f"DOI: {resultado.get('doi', '')}\n"
+            f"URL: {resultado.get('url', '')}\n"
+            f"Fonte: {resultado.get('fonte', '')}\n"
+            f"{separador}"
+        )
+    
+    # Rodapé
+    yield "\nExportado pelo Buscador de Revistas Científicas\n"
+
 def exportar_txt(resultados, busca, diretorio, nome_arquivo):
     """
     Exporta resultados em formato TXT.
@@ -390,41 +564,256 @@ def exportar_txt(resultados, busca, diretorio, nome_arquivo):
     # Caminho completo do arquivo
     caminho = os.path.join(diretorio, f"{nome_arquivo}.txt")
     
-    # Informações da busca
-    titulo = f"Resultados da busca: {busca.get('palavras', '')}"
-    data_exportacao = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-    periodo = f"{busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}"
-    
-    # Cria o conteúdo de texto
-    texto = f"{titulo}\n"
-    texto += "=" * len(titulo) + "\n\n"
-    texto += f"Data da exportação: {data_exportacao}\n"
-    texto += f"Termos de busca: {busca.get('palavras', '')}\n"
-    texto += f"Período: {periodo}\n"
-    texto += f"Total de resultados: {len(resultados)}\n\n"
-    texto += "=" * 80 + "\n\n"
-    
-    # Adiciona cada resultado
-    for i, resultado in enumerate(resultados, 1):
-        texto += f"[{i}] {resultado.get('titulo', '')}\n"
-        texto += f"Autores: {resultado.get('autores', '')}\n"
-        texto += f"Revista: {resultado.get('revista', '')}\n"
-        texto += f"Data: {formatar_data(resultado.get('data_publicacao', ''))}\n"
-        texto += f"DOI: {resultado.get('doi', '')}\n"
-        texto += f"URL: {resultado.get('url', '')}\n"
-        texto += f"Fonte: {resultado.get('fonte', '')}\n"
-        texto += f"\n{'-' * 80}\n\n"
-    
-    # Adiciona rodapé
-    texto += "\nExportado pelo Buscador de Revistas Científicas\n"
-    
-    # Escreve o arquivo
-    with open(caminho, 'w', encoding='utf-8') as f:
-        f.write(texto)
+    # Escreve o arquivo resultado a resultado
+    escrever_em_arquivo(caminho, gerar_txt(resultados, busca))
     
     logger.info(f"Arquivo TXT exportado: {caminho}")
     return os.path.basename(caminho)
 
+def agrupar_trechos(partes, tamanho_minimo=None):
+    """
+    Agrupa trechos pequenos de texto em blocos maiores, reduzindo o número
+    de escritas em arquivo ou na resposta HTTP.
+    
+    Args:
+        partes (iterable): Trechos de texto
+        tamanho_minimo (int, opcional): Caracteres por bloco
+            (padrão: TAMANHO_BLOCO_STREAMING)
+    
+    Yields:
+        str: Blocos de texto
+    """
+    tamanho_minimo = tamanho_minimo or TAMANHO_BLOCO_STREAMING
+    bloco = []
+    tamanho = 0
+    
+    for parte in partes:
+        bloco.append(parte)
+        tamanho += len(parte)
+        if tamanho >= tamanho_minimo:
+            yield ''.join(bloco)
+            bloco = []
+            tamanho = 0
+    
+    if bloco:
+        yield ''.join(bloco)
+
+def gerar_csv(resultados, busca):
+    """
+    Gera os resultados em CSV (UTF-8 com BOM, para abrir corretamente no
+    Excel), uma linha por resultado. Células que seriam interpretadas como
+    fórmula recebem um apóstrofo na frente (ver texto_csv).
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca (não usados no CSV)
+    
+    Yields:
+        str: Linhas do CSV
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    
+    def linha(valores):
+        escritor.writerow(valores)
+        texto = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return texto
+    
+    yield '\ufeff' + linha([titulo for _, titulo in COLUNAS_CSV])
+    for resultado in resultados:
+        yield linha([texto_csv(resultado.get(campo)) for campo, _ in COLUNAS_CSV])
+
+def texto_csv(valor):
+    """
+    Prepara um valor para uma célula do CSV, neutralizando fórmulas.
+    
+    Args:
+        valor: Valor original
+    
+    Returns:
+        str: Texto da célula
+    """
+    texto = str(valor or '')
+    if texto.startswith(PREFIXOS_FORMULA):
+        texto = "'" + texto
+    return texto
+
+def gerar_jsonl(resultados, busca):
+    """
+    Gera os resultados em JSON Lines, um objeto por linha.
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca (não usados no JSONL)
+    
+    Yields:
+        str: Linhas JSON
+    """
+    for resultado in resultados:
+        registro = {campo: resultado.get(campo, '') for campo in CAMPOS_HASH}
+        yield json.dumps(registro, ensure_ascii=False, default=str) + '\n'
+
+def separar_autores(autores):
+    """
+    Separa a lista de autores normalizada ("Sobrenome, Nome; ...").
+    
+    Args:
+        autores (str): Autores normalizados
+    
+    Returns:
+        list: Autores individuais
+    """
+    return [autor.strip() for autor in (autores or '').split(';') if autor.strip()]
+
+def gerar_ris(resultados, busca):
+    """
+    Gera os resultados no formato RIS, aceito pelos gerenciadores de
+    referências (Zotero, Mendeley, EndNote).
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca (não usados no RIS)
+    
+    Yields:
+        str: Um registro RIS por resultado
+    """
+    for resultado in resultados:
+        linhas = ["TY  - JOUR"]
+        
+        def campo(etiqueta, valor):
+            valor = ' '.join(str(valor or '').split())
+            if valor:
+                linhas.append(f"{etiqueta}  - {valor}")
+        
+        campo('TI', resultado.get('titulo'))
+        for autor in separar_autores(resultado.get('autores')):
+            if not autor.lower().startswith('et al'):
+                campo('AU', autor)
+        campo('JO', resultado.get('revista'))
+        
+        data = resultado.get('data_publicacao') or ''
+        campo('PY', data[:4])
+        campo('DA', data.replace('-', '/'))
+        
+        campo('DO', resultado.get('doi'))
+        campo('UR', resultado.get('url'))
+        campo('AB', resultado.get('resumo'))
+        campo('DB', resultado.get('fonte'))
+        linhas.append("ER  - ")
+        
+        yield '\n'.join(linhas) + '\n\n'
+
+def escapar_bibtex(texto):
+    """
+    Escapa os caracteres especiais do LaTeX em um valor do BibTeX.
+    
+    Args:
+        texto (str): Texto original
+    
+    Returns:
+        str: Texto escapado, em uma única linha
+    """
+    texto = ' '.join(str(texto or '').split())
+    return _RE_ESPECIAIS_BIBTEX.sub(lambda m: _ESCAPES_BIBTEX[m.group(0)], texto)
+
+def literal_bibtex(texto):
+    """
+    Prepara um valor dos campos literais do BibTeX (doi e url), que o
+    biblatex lê sem interpretar o LaTeX: nada é escapado, e as chaves, que
+    encerrariam o campo, são removidas.
+    
+    Args:
+        texto (str): Texto original
+    
+    Returns:
+        str: Texto sem chaves, em uma única linha
+    """
+    return ' '.join(str(texto or '').split()).replace('{', '').replace('}', '')
+
+def gerar_bibtex(resultados, busca):
+    """
+    Gera os resultados no formato BibTeX (@article), com chaves de citação
+    únicas no formato sobrenome + ano + primeira palavra do título.
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca (não usados no BibTeX)
+    
+    Yields:
+        str: Uma entrada BibTeX por resultado
+    """
+    chaves_usadas = set()
+    
+    for resultado in resultados:
+        autores = separar_autores(resultado.get('autores'))
+        data = resultado.get('data_publicacao') or ''
+        ano = data[:4]
+        
+        # Chave de citação: sobrenome do primeiro autor, ano e primeira palavra do título
+        sobrenome = autores[0].split(',')[0] if autores else 'anonimo'
+        palavras_titulo = _RE_PALAVRA_CHAVE.findall(resultado.get('titulo') or '')
+        base = ''.join(_RE_PALAVRA_CHAVE.findall(sobrenome)).lower() + ano
+        base += palavras_titulo[0].lower() if palavras_titulo else ''
+        chave = base or 'ref'
+        sufixo = 0
+        while chave in chaves_usadas:
+            sufixo += 1
+            chave = f"{base}{sufixo}"
+        chaves_usadas.add(chave)
+        
+        nomes = [
+            'others' if autor.lower().startswith('et al') else escapar_bibtex(autor)
+            for autor in autores
+        ]
+        campos = [
+            ('title', escapar_bibtex(resultado.get('titulo'))),
+            ('author', ' and '.join(nomes)),
+            ('journal', escapar_bibtex(resultado.get('revista'))),
+            ('year', ano),
+            ('doi', literal_bibtex(resultado.get('doi'))),
+            ('url', literal_bibtex(resultado.get('url'))),
+            ('abstract', escapar_bibtex(resultado.get('resumo')))
+        ]
+        linhas = [f"  {nome} = {{{valor}}}" for nome, valor in campos if valor]
+        
+        yield f"@article{{{chave},\n" + ',\n'.join(linhas) + "\n}\n\n"
+
+def gerar_conteudo(formato, resultados, busca):
+    """
+    Gera o conteúdo de um formato em streaming (ver FORMATOS_STREAMING),
+    em blocos prontos para serem enviados em uma resposta HTTP.
+    
+    Args:
+        formato (str): Formato em streaming
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca
+    
+    Returns:
+        iterator: Blocos de texto
+    """
+    return agrupar_trechos(GERADORES_STREAMING[formato](resultados, busca))
+
+def exportar_streaming(formato):
+    """
+    Cria o exportador em arquivo de um formato em streaming.
+    
+    Args:
+        formato (str): Formato em streaming
+    
+    Returns:
+        callable: Exportador com a mesma assinatura dos demais
+    """
+    def exportador(resultados, busca, diretorio, nome_arquivo):
+        caminho = os.path.join(diretorio, f"{nome_arquivo}.{EXTENSOES[formato]}")
+        escrever_em_arquivo(caminho, gerar_conteudo(formato, resultados, busca))
+        logger.info(f"Arquivo {formato.upper()} exportado: {caminho}")
+        return os.path.basename(caminho)
+    
+    return exportador
+
+@lru_cache(maxsize=4096)
 def formatar_data(data_str):
     """
     Formata uma data para exibição.
@@ -443,3 +832,28 @@ def formatar_data(data_str):
         return data.strftime('%d/%m/%Y')
     except:
         return data_str
+
+# Filtro usado pelos templates
+_ambiente_templates.filters['formatar_data'] = formatar_data
+
+# Geradores dos formatos em streaming (sem dependências pesadas)
+GERADORES_STREAMING = {
+    'csv': gerar_csv,
+    'jsonl': gerar_jsonl,
+    'ris': gerar_ris,
+    'bibtex': gerar_bibtex
+}
+
+# Exportador de cada formato. Os formatos com dependências pesadas (WeasyPrint,
+# FPDF, openpyxl) são registrados como (módulo, função) e só importados na
+# primeira exportação (ver obter_exportador)
+EXPORTADORES = {
+    'html': exportar_html,
+    'pdf': ('utils.exportacao_pdf', 'exportar_pdf'),
+    'excel': ('utils.exportacao_excel', 'exportar_excel'),
+    'txt': exportar_txt,
+    'csv': exportar_streaming('csv'),
+    'jsonl': exportar_streaming('jsonl'),
+    'ris': exportar_streaming('ris'),
+    'bibtex': exportar_streaming('bibtex')
+}
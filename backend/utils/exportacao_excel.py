@@ -0,0 +1,157 @@
+"""
+Exportação de resultados em Excel (openpyxl em modo somente escrita).
+Carregado apenas na primeira exportação em Excel (ver
+exportacao.EXPORTADORES).
+"""
+import os
+import logging
+from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger(__name__)
+
+# Colunas (título, largura) das planilhas do Excel
+COLUNAS_EXCEL = (
+    ('Título', 60),
+    ('Autores', 40),
+    ('Revista', 30),
+    ('Data de Publicação', 18),
+    ('DOI', 30),
+    ('URL', 40),
+    ('Fonte', 15)
+)
+COLUNAS_RESUMOS_EXCEL = (('Título', 60), ('DOI', 30), ('Resumo', 120))
+
+# Limites do Excel: caracteres por célula e por endereço em HYPERLINK
+TAMANHO_MAXIMO_CELULA = 32767
+TAMANHO_MAXIMO_LINK = 255
+
+def texto_excel(valor):
+    """
+    Prepara um valor para uma célula do Excel, removendo caracteres de
+    controle não aceitos e respeitando o tamanho máximo da célula.
+    
+    Args:
+        valor: Valor original
+    
+    Returns:
+        str: Texto aceito pelo Excel
+    """
+    texto = ILLEGAL_CHARACTERS_RE.sub('', str(valor or ''))[:TAMANHO_MAXIMO_CELULA]
+    
+    # Evita que textos iniciados por "=" sejam interpretados como fórmulas
+    if texto.startswith('='):
+        texto = ' ' + texto[:TAMANHO_MAXIMO_CELULA - 1]
+    return texto
+
+def celula_excel(planilha, valor, link=None, estilo=None):
+    """
+    Cria uma célula para planilhas em modo somente escrita.
+    
+    Links viram fórmulas HYPERLINK: não ocupam memória por célula e não
+    esbarram no limite de hyperlinks por planilha do Excel.
+    
+    Args:
+        planilha: Planilha em modo somente escrita
+        valor (str): Texto da célula
+        link (str, opcional): Endereço do link
+        estilo (str, opcional): Estilo nomeado do openpyxl
+    
+    Returns:
+        WriteOnlyCell: Célula pronta para ser acrescentada à linha
+    """
+    valor = texto_excel(valor)
+    
+    # O endereço escapado precisa caber inteiro na fórmula; o texto é cortado
+    # antes do escape, para não separar as aspas duplicadas
+    link = texto_excel(link).replace('"', '""') if link else ''
+    if link and len(link) <= TAMANHO_MAXIMO_LINK:
+        texto = valor[:TAMANHO_MAXIMO_LINK]
+        excesso = len(texto) + texto.count('"') - TAMANHO_MAXIMO_LINK
+        while excesso > 0:
+            excesso -= 2 if texto[-1] == '"' else 1
+            texto = texto[:-1]
+        texto = texto.replace('"', '""')
+        celula = WriteOnlyCell(planilha, value=f'=HYPERLINK("{link}","{texto}")')
+        celula.style = 'Hyperlink'
+        return celula
+    
+    celula = WriteOnlyCell(planilha, value=valor)
+    if estilo:
+        celula.style = estilo
+    return celula
+
+def exportar_excel(resultados, busca, diretorio, nome_arquivo):
+    """
+    Exporta resultados em formato Excel.
+    
+    As linhas são gravadas à medida que os resultados são percorridos
+    (openpyxl em modo somente escrita), de modo que a memória usada não
+    cresce com o número de resultados. DOI e URL viram links, e os resumos
+    ficam em uma planilha própria.
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca
+        diretorio (str): Diretório para salvar o arquivo
+        nome_arquivo (str): Nome base do arquivo
+    
+    Returns:
+        str: Caminho do arquivo exportado
+    """
+    # Caminho completo do arquivo
+    caminho = os.path.join(diretorio, f"{nome_arquivo}.xlsx")
+    
+    livro = Workbook(write_only=True)
+    planilha_resultados = livro.create_sheet('Resultados')
+    planilha_resumos = livro.create_sheet('Resumos')
+    planilha_info = livro.create_sheet('Informações')
+    
+    # Larguras e cabeçalhos (definidos antes da primeira linha)
+    for planilha, colunas in (
+        (planilha_resultados, COLUNAS_EXCEL),
+        (planilha_resumos, COLUNAS_RESUMOS_EXCEL),
+        (planilha_info, (('Informação', 25), ('Valor', 60)))
+    ):
+        for indice, (titulo, largura) in enumerate(colunas, 1):
+            planilha.column_dimensions[get_column_letter(indice)].width = largura
+        planilha.freeze_panes = 'A2'
+        planilha.append([celula_excel(planilha, titulo, estilo='Headline 4') for titulo, _ in colunas])
+    
+    # Resultados e resumos, em uma única passada
+    for resultado in resultados:
+        doi = resultado.get('doi', '')
+        link_doi = f"https://doi.org/{doi}" if doi else None
+        url = resultado.get('url', '')
+        
+        planilha_resultados.append([
+            texto_excel(resultado.get('titulo', '')),
+            texto_excel(resultado.get('autores', '')),
+            texto_excel(resultado.get('revista', '')),
+            texto_excel(resultado.get('data_publicacao', '')),
+            celula_excel(planilha_resultados, doi, link_doi),
+            celula_excel(planilha_resultados, url, url or None),
+            texto_excel(resultado.get('fonte', ''))
+        ])
+        
+        resumo = resultado.get('resumo', '')
+        if resumo:
+            planilha_resumos.append([
+                texto_excel(resultado.get('titulo', '')),
+                celula_excel(planilha_resumos, doi, link_doi),
+                texto_excel(resumo)
+            ])
+    
+    # Planilha de informações
+    planilha_info.append(['Data da Exportação', datetime.now().strftime('%d/%m/%Y %H:%M:%S')])
+    planilha_info.append(['Termos de Busca', busca.get('palavras', '')])
+    planilha_info.append(['Período', f"{busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}"])
+    planilha_info.append(['Total de Resultados', len(resultados)])
+    
+    livro.save(caminho)
+    
+    logger.info(f"Arquivo Excel exportado: {caminho}")
+    return os.path.basename(caminho)
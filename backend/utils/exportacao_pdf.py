@@ -0,0 +1,224 @@
+"""
+Exportação de resultados em PDF.
+Usa o WeasyPrint (a partir do template HTML) e o FPDF para tabelas grandes
+ou quando o WeasyPrint não está disponível. Carregado apenas na primeira
+exportação em PDF (ver exportacao.EXPORTADORES).
+"""
+import os
+import logging
+import tempfile
+import threading
+from datetime import datetime
+import fpdf
+from fpdf import FPDF
+
+from utils import exportacao
+
+logger = logging.getLogger(__name__)
+
+# O WeasyPrint depende de bibliotecas nativas (Pango); sem elas, os PDFs
+# são gerados apenas com o FPDF
+try:
+    import weasyprint
+except (ImportError, OSError) as e:
+    weasyprint = None
+    logger.warning(f"WeasyPrint indisponível, PDFs serão gerados com o FPDF: {str(e)}")
+
+# Folha de estilo do PDF (carregada uma vez por thread; ver obter_renderizador_pdf)
+ARQUIVO_ESTILO_PDF = os.path.join(exportacao.DIRETORIO_TEMPLATES, 'resultados_pdf.css')
+
+# Acima deste número de resultados o PDF é gerado com o FPDF
+LIMIAR_PDF_SIMPLES = 1000
+
+# Fonte Unicode do FPDF
+FONTE_PDF = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+
+# Métricas das fontes do FPDF ficam em cache entre exportações (ver preparar_fpdf)
+DIRETORIO_CACHE_FONTES = os.path.join(tempfile.gettempdir(), 'buscador_fontes_fpdf')
+
+_renderizadores_pdf = threading.local()
+
+def obter_renderizador_pdf():
+    """
+    Retorna a folha de estilo e a configuração de fontes do WeasyPrint.
+    
+    Ambas são carregadas uma única vez por thread e reaproveitadas nas
+    exportações seguintes, evitando reprocessar o CSS e a descoberta de
+    fontes a cada PDF.
+    
+    Returns:
+        tuple: (weasyprint.CSS, FontConfiguration)
+    """
+    renderizador = getattr(_renderizadores_pdf, 'renderizador', None)
+    if renderizador is None:
+        from weasyprint.text.fonts import FontConfiguration
+        
+        configuracao_fontes = FontConfiguration()
+        estilo = weasyprint.CSS(filename=ARQUIVO_ESTILO_PDF, font_config=configuracao_fontes)
+        renderizador = _renderizadores_pdf.renderizador = (estilo, configuracao_fontes)
+    return renderizador
+
+def preparar_fpdf():
+    """
+    Ativa o cache das métricas de fontes do FPDF na primeira exportação com
+    o FPDF de cada thread (e não ao importar o módulo, já que a configuração
+    do FPDF é global).
+    """
+    if getattr(_renderizadores_pdf, 'fpdf', False):
+        return
+    
+    os.makedirs(DIRETORIO_CACHE_FONTES, exist_ok=True)
+    fpdf.set_global('FPDF_CACHE_MODE', 2)
+    fpdf.set_global('FPDF_CACHE_DIR', DIRETORIO_CACHE_FONTES)
+    _renderizadores_pdf.fpdf = True
+
+def exportar_pdf(resultados, busca, diretorio, nome_arquivo):
+    """
+    Exporta resultados em formato PDF.
+    
+    O HTML é renderizado em memória e entregue diretamente ao WeasyPrint,
+    sem arquivo temporário. Buscas com mais de LIMIAR_PDF_SIMPLES resultados
+    usam o FPDF, bem mais rápido para tabelas longas, assim como todas as
+    exportações quando o WeasyPrint não pôde ser carregado.
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca
+        diretorio (str): Diretório para salvar o arquivo
+        nome_arquivo (str): Nome base do arquivo
+    
+    Returns:
+        str: Caminho do arquivo exportado
+    """
+    # Caminho completo do arquivo
+    caminho = os.path.join(diretorio, f"{nome_arquivo}.pdf")
+    
+    # Tabelas grandes (ou WeasyPrint indisponível) vão direto para o FPDF
+    if weasyprint is None or len(resultados) > LIMIAR_PDF_SIMPLES:
+        exportar_pdf_fpdf(resultados, busca, caminho)
+        return os.path.basename(caminho)
+    
+    try:
+        # Converte o HTML para PDF usando WeasyPrint
+        estilo, configuracao_fontes = obter_renderizador_pdf()
+        html = weasyprint.HTML(
+            string=''.join(exportacao.gerar_html(resultados, busca, pdf=True)),
+            base_url=exportacao.DIRETORIO_TEMPLATES
+        )
+        html.write_pdf(caminho, stylesheets=[estilo], font_config=configuracao_fontes)
+        
+        logger.info(f"Arquivo PDF exportado: {caminho}")
+        return os.path.basename(caminho)
+    
+    except Exception as e:
+        logger.error(f"Erro ao exportar PDF: {str(e)}")
+        
+        # Fallback para FPDF se WeasyPrint falhar
+        try:
+            exportar_pdf_fpdf(resultados, busca, caminho)
+            return os.path.basename(caminho)
+        except Exception as e2:
+            logger.error(f"Erro no fallback para FPDF: {str(e2)}")
+            raise
+
+class PDFResultados(FPDF):
+    """
+    Documento FPDF que repete o cabeçalho da tabela a cada nova página.
+    """
+    
+    # Colunas da tabela: (título, largura em mm)
+    COLUNAS = (('Título', 80), ('Autores', 40), ('Revista', 30), ('Data', 20), ('Fonte', 20))
+    
+    def __init__(self):
+        """Inicializa o documento."""
+        super().__init__()
+        self.tabela_iniciada = False
+    
+    def cabecalho_tabela(self):
+        """Desenha o cabeçalho da tabela na posição atual."""
+        self.set_fill_color(58, 110, 168)
+        self.set_text_color(255, 255, 255)
+        for indice, (titulo, largura) in enumerate(self.COLUNAS):
+            self.cell(largura, 10, titulo, 1, 1 if indice == len(self.COLUNAS) - 1 else 0, 'C', True)
+        self.set_text_color(0, 0, 0)
+        self.tabela_iniciada = True
+    
+    def header(self):
+        """Chamado pelo FPDF no início de cada página."""
+        if self.tabela_iniciada:
+            self.cabecalho_tabela()
+
+def exportar_pdf_fpdf(resultados, busca, caminho):
+    """
+    Exporta resultados em formato PDF usando FPDF (fallback e motor para
+    tabelas grandes).
+    
+    Args:
+        resultados (list): Lista de resultados
+        busca (dict): Parâmetros da busca
+        caminho (str): Caminho completo do arquivo
+    """
+    # Cria um novo PDF
+    preparar_fpdf()
+    pdf = PDFResultados()
+    pdf.add_page()
+    
+    # Adiciona fonte para suporte a caracteres especiais (métricas em cache)
+    pdf.add_font('DejaVu', '', FONTE_PDF, uni=True)
+    pdf.set_font('DejaVu', '', 10)
+    
+    # Título
+    pdf.set_font('DejaVu', '', 16)
+    pdf.cell(0, 10, f"Resultados da busca: {busca.get('palavras', '')}", 0, 1, 'C')
+    pdf.ln(5)
+    
+    # Informações da busca
+    pdf.set_font('DejaVu', '', 10)
+    pdf.cell(0, 8, f"Data da exportação: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", 0, 1)
+    pdf.cell(0, 8, f"Termos de busca: {busca.get('palavras', '')}", 0, 1)
+    pdf.cell(0, 8, f"Período: {busca.get('periodo_inicio', '')} a {busca.get('periodo_fim', '')}", 0, 1)
+    pdf.cell(0, 8, f"Total de resultados: {len(resultados)}", 0, 1)
+    pdf.ln(5)
+    
+    # Cabeçalho da tabela (repetido nas páginas seguintes)
+    pdf.cabecalho_tabela()
+    
+    # Conteúdo da tabela
+    for resultado in resultados:
+        # Ajusta o título para caber na célula
+        titulo = resultado.get('titulo', '')
+        if len(titulo) > 60:
+            titulo = titulo[:57] + "..."
+        
+        # Ajusta autores
+        autores = resultado.get('autores', '')
+        if len(autores) > 30:
+            autores = autores[:27] + "..."
+        
+        # Ajusta revista
+        revista = resultado.get('revista', '')
+        if len(revista) > 20:
+            revista = revista[:17] + "..."
+        
+        # Data formatada
+        data = exportacao.formatar_data(resultado.get('data_publicacao', ''))
+        
+        # Fonte
+        fonte = resultado.get('fonte', '')
+        
+        # Adiciona linha à tabela
+        pdf.cell(80, 10, titulo, 1, 0)
+        pdf.cell(40, 10, autores, 1, 0)
+        pdf.cell(30, 10, revista, 1, 0)
+        pdf.cell(20, 10, data, 1, 0)
+        pdf.cell(20, 10, fonte, 1, 1)
+    
+    # Rodapé
+    pdf.tabela_iniciada = False
+    pdf.ln(10)
+    pdf.cell(0, 10, "Exportado pelo Buscador de Revistas Científicas", 0, 1, 'C')
+    
+    # Salva o PDF
+    pdf.output(caminho)
+    
+    logger.info(f"Arquivo PDF exportado via FPDF: {caminho}")
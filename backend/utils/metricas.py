@@ -0,0 +1,340 @@
+"""
+Métricas de funcionamento do Buscador de Revistas Científicas.
+Contadores, histogramas e medidores expostos em /metrics no formato texto do
+Prometheus, sem dependências nem coletor externo.
+
+As métricas são registradas na importação deste módulo. Cada thread
+acumula seus valores em um fragmento próprio, de modo que registrar um
+valor não disputa lock com as demais threads (o lock só é usado no primeiro
+registro de cada thread); os fragmentos são somados apenas na coleta. Os
+fragmentos de threads encerradas são incorporados a um acumulado na coleta
+e, se a lista de fragmentos crescer além de MAX_FRAGMENTOS (threads de
+curta duração sem coletas), no registro de uma nova thread. Os valores são
+de cada processo: com vários workers, cada um expõe os seus.
+"""
+import time
+import bisect
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Limites (em segundos) dos histogramas de latência
+LIMITES_LATENCIA = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LIMITES_ETAPAS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+LIMITES_EXPORTACAO = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Fragmentos por métrica a partir dos quais os de threads encerradas são
+# incorporados já no registro de uma nova thread
+MAX_FRAGMENTOS = 64
+
+_metricas = []
+
+class Metrica:
+    """
+    Base das métricas com valores acumulados por thread.
+    """
+    
+    tipo = None
+    
+    def __init__(self, nome, ajuda, rotulos=()):
+        """
+        Registra a métrica.
+        
+        Args:
+            nome (str): Nome exposto
+            ajuda (str): Descrição exposta em # HELP
+            rotulos (tuple, opcional): Nomes dos rótulos
+        """
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._local = threading.local()
+        self._fragmentos = []
+        self._limite_fragmentos = MAX_FRAGMENTOS
+        self._acumulado = {}
+        self._lock = threading.Lock()
+        _metricas.append(self)
+    
+    def _vazio(self):
+        """Valores iniciais de uma combinação de rótulos."""
+        return [0]
+    
+    def iniciar(self, *rotulos):
+        """
+        Expõe uma combinação de rótulos desde já, mesmo sem registros
+        (ex.: as APIs conhecidas, com valor zero).
+        
+        Args:
+            *rotulos: Valores dos rótulos, na ordem declarada
+        """
+        with self._lock:
+            self._acumulado.setdefault(rotulos, self._vazio())
+    
+    def _valores(self, chave):
+        """Retorna os valores da thread atual para uma combinação de rótulos."""
+        try:
+            fragmento = self._local.fragmento
+        except AttributeError:
+            fragmento = self._local.fragmento = {}
+            with self._lock:
+                if len(self._fragmentos) >= self._limite_fragmentos:
+                    self._incorporar_encerradas()
+                    # Com muitas threads vivas, a próxima verificação espera a lista dobrar
+                    self._limite_fragmentos = max(MAX_FRAGMENTOS, 2 * len(self._fragmentos))
+                self._fragmentos.append((threading.current_thread(), fragmento))
+        
+        valores = fragmento.get(chave)
+        if valores is None:
+            valores = fragmento[chave] = self._vazio()
+        return valores
+    
+    def coletar(self):
+        """
+        Soma os fragmentos de todas as threads.
+        
+        Returns:
+            dict: Valores por combinação de rótulos
+        """
+        with self._lock:
+            self._incorporar_encerradas()
+            total = {chave: list(valores) for chave, valores in self._acumulado.items()}
+            for _, fragmento in self._fragmentos:
+                _somar(total, fragmento.copy())
+        return total
+    
+    def _incorporar_encerradas(self):
+        """
+        Incorpora ao acumulado os fragmentos de threads encerradas (que não
+        mudam mais). Deve ser chamada com _lock adquirido.
+        """
+        vivos = []
+        for thread, fragmento in self._fragmentos:
+            if thread.is_alive():
+                vivos.append((thread, fragmento))
+            else:
+                _somar(self._acumulado, fragmento)
+        self._fragmentos = vivos
+    
+    def exportar(self):
+        """
+        Gera as linhas da métrica no formato texto do Prometheus.
+        
+        Returns:
+            list: Linhas de texto
+        """
+        linhas = [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+        for chave, valores in sorted(self.coletar().items()):
+            linhas.extend(self._amostras(chave, valores))
+        return linhas
+    
+    def _amostras(self, chave, valores):
+        """Linhas de uma combinação de rótulos."""
+        return [f"{self.nome}{_rotulos(self.rotulos, chave)} {_numero(valores[0])}"]
+
+class Contador(Metrica):
+    """Contador monotônico."""
+    
+    tipo = 'counter'
+    
+    def incrementar(self, *rotulos, valor=1):
+        """
+        Soma um valor ao contador.
+        
+        Args:
+            *rotulos: Valores dos rótulos, na ordem declarada
+            valor (int ou float, opcional): Incremento
+        """
+        self._valores(rotulos)[0] += valor
+
+class Histograma(Metrica):
+    """Histograma de valores (em geral, durações em segundos)."""
+    
+    tipo = 'histogram'
+    
+    def __init__(self, nome, ajuda, rotulos=(), limites=LIMITES_LATENCIA):
+        """
+        Registra o histograma.
+        
+        Args:
+            nome (str): Nome exposto
+            ajuda (str): Descrição exposta em # HELP
+            rotulos (tuple, opcional): Nomes dos rótulos
+            limites (tuple, opcional): Limites superiores das faixas, em ordem crescente
+        """
+        self.limites = tuple(limites)
+        super().__init__(nome, ajuda, rotulos)
+    
+    def _vazio(self):
+        # Uma contagem por faixa (a última é +Inf) seguida da soma dos valores
+        return [0] * (len(self.limites) + 2)
+    
+    def observar(self, valor, *rotulos):
+        """
+        Registra um valor.
+        
+        Args:
+            valor (float): Valor observado
+            *rotulos: Valores dos rótulos, na ordem declarada
+        """
+        valores = self._valores(rotulos)
+        valores[bisect.bisect_left(self.limites, valor)] += 1
+        valores[-1] += valor
+    
+    def _amostras(self, chave, valores):
+        linhas = []
+        acumulado = 0
+        for limite, contagem in zip(self.limites + ('+Inf',), valores):
+            acumulado += contagem
+            rotulos = _rotulos(self.rotulos + ('le',), chave + (_numero(limite),))
+            linhas.append(f"{self.nome}_bucket{rotulos} {acumulado}")
+        rotulos = _rotulos(self.rotulos, chave)
+        linhas.append(f"{self.nome}_sum{rotulos} {_numero(valores[-1])}")
+        linhas.append(f"{self.nome}_count{rotulos} {acumulado}")
+        return linhas
+
+class Medidor(Metrica):
+    """
+    Medidor lido no momento da coleta (ex.: tamanho de uma fila), sem custo
+    no caminho das requisições.
+    """
+    
+    tipo = 'gauge'
+    
+    def __init__(self, nome, ajuda, rotulos=()):
+        self._coleta = None
+        super().__init__(nome, ajuda, rotulos)
+    
+    def definir_coleta(self, funcao):
+        """
+        Define a função que fornece o valor do medidor.
+        
+        Args:
+            funcao (callable): Retorna um número ou, com rótulos, um dicionário
+                {valores dos rótulos (tuple): número}
+        """
+        self._coleta = funcao
+    
+    def coletar(self):
+        if self._coleta is None:
+            return {}
+        valores = self._coleta()
+        if not isinstance(valores, dict):
+            return {(): [valores]}
+        return {tuple(chave): [valor] for chave, valor in valores.items()}
+
+def _somar(destino, fragmento):
+    """Soma os valores de um fragmento no dicionário de destino."""
+    for chave, valores in fragmento.items():
+        atual = destino.get(chave)
+        if atual is None:
+            destino[chave] = list(valores)
+        else:
+            for i, valor in enumerate(valores):
+                atual[i] += valor
+
+def _rotulos(nomes, valores):
+    """Formata os rótulos de uma amostra."""
+    if not nomes:
+        return ''
+    pares = []
+    for nome, valor in zip(nomes, valores):
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pares.append(f'{nome}="{valor}"')
+    return '{' + ','.join(pares) + '}'
+
+def _numero(valor):
+    """Formata um valor numérico."""
+    if isinstance(valor, float):
+        return repr(valor)
+    return str(valor)
+
+def gerar_texto():
+    """
+    Gera a exposição de todas as métricas no formato texto do Prometheus.
+    
+    Returns:
+        str: Texto da exposição
+    """
+    linhas = []
+    for metrica in _metricas:
+        try:
+            linhas.extend(metrica.exportar())
+        except Exception as e:
+            logger.error(f"Erro ao coletar a métrica {metrica.nome}: {str(e)}")
+    return '\n'.join(linhas) + '\n'
+
+def registrar_erro_api(api, erro):
+    """
+    Conta uma falha em uma chamada a API, separando os tempos esgotados.
+    
+    Args:
+        api (str): Nome da API
+        erro (Exception): Exceção capturada
+    """
+    # TimeoutError e as exceções de tempo esgotado do requests/aiohttp
+    if isinstance(erro, TimeoutError) or 'Timeout' in type(erro).__name__:
+        TEMPO_ESGOTADO_API.incrementar(api)
+    else:
+        ERROS_API.incrementar(api)
+
+# Métricas das APIs externas
+LATENCIA_API = Histograma(
+    'buscador_api_latencia_segundos', "Duração das buscas em cada API", ('api',)
+)
+RESULTADOS_API = Contador(
+    'buscador_api_resultados_total', "Resultados recebidos de cada API", ('api',)
+)
+ERROS_API = Contador(
+    'buscador_api_erros_total', "Falhas nas chamadas às APIs (exceto tempo esgotado)", ('api',)
+)
+TEMPO_ESGOTADO_API = Contador(
+    'buscador_api_tempo_esgotado_total', "Chamadas às APIs encerradas por tempo esgotado", ('api',)
+)
+ESPERA_LIMITE_API = Contador(
+    'buscador_api_espera_limite_segundos_total', "Tempo aguardado pelo limite de requisições de cada API", ('api',)
+)
+
+# Métricas das buscas e do processamento dos resultados
+DURACAO_BUSCA = Histograma(
+    'buscador_busca_duracao_segundos', "Duração das buscas que consultaram as APIs"
+)
+CONSULTAS_CACHE = Contador(
+    'buscador_cache_consultas_total',
+    "Consultas aos caches por camada (memoria, disco, exportacao) e resultado (acerto, falta, expirado)",
+    ('camada', 'resultado')
+)
+AQUECIMENTOS_CACHE = Contador(
+    'buscador_cache_aquecimentos_total',
+    "Buscas refeitas em segundo plano pelo aquecimento do cache por resultado (atualizada, erro)",
+    ('resultado',)
+)
+ETAPAS_PROCESSAMENTO = Histograma(
+    'buscador_processamento_segundos', "Duração das etapas do processamento dos resultados",
+    ('etapa',), limites=LIMITES_ETAPAS
+)
+DUPLICATAS = Contador(
+    'buscador_duplicatas_total', "Resultados mesclados a um resultado já existente (DOI ou título similar)"
+)
+DESCARTADOS = Contador(
+    'buscador_resultados_invalidos_total', "Resultados descartados por não passarem na validação"
+)
+
+# Métricas das exportações
+DURACAO_EXPORTACAO = Histograma(
+    'buscador_exportacao_duracao_segundos', "Duração das tarefas de exportação por formato e estado final",
+    ('formato', 'estado'), limites=LIMITES_EXPORTACAO
+)
+TAREFAS_EXPORTACAO = Medidor(
+    'buscador_exportacao_tarefas', "Tarefas de exportação na fila deste processo por estado", ('estado',)
+)
+
+for camada in ('memoria', 'disco', 'exportacao'):
+    for resultado in ('acerto', 'falta', 'expirado'):
+        CONSULTAS_CACHE.iniciar(camada, resultado)
+for resultado in ('atualizada', 'erro'):
+    AQUECIMENTOS_CACHE.iniciar(resultado)
+
+# Momento em que o processo iniciou (identifica reinícios dos workers)
+INICIO_PROCESSO = Medidor('buscador_processo_inicio_segundos', "Momento (Unix) em que o processo iniciou")
+INICIO_PROCESSO.definir_coleta(lambda inicio=time.time(): inicio)
@@ -3,14 +3,51 @@ Módulo de utilidades para normalização de dados.
 Contém funções para normalizar textos, datas, DOIs e outros campos.
 """
 import re
+import html
 import logging
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Marcação HTML/JATS e entidades HTML, tratadas em uma única passada.
+# A tag exige um nome logo após '<' para não remover trechos como "p < 0.05".
+_RE_MARCACAO = re.compile(
+    r'<(/?)([A-Za-z][\w:.-]*)(?:\s[^<>]*)?/?>'
+    r'|&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);'
+)
+
+# Tags de bloco (HTML e JATS, sem o prefixo "jats:") que separam palavras;
+# as demais (<i>, <sub>, <jats:italic>...) são removidas sem deixar espaço
+TAGS_BLOCO = frozenset({
+    'p', 'br', 'div', 'li', 'ul', 'ol', 'title', 'sec', 'abstract',
+    'list', 'list-item', 'label', 'caption', 'table', 'tr', 'td', 'th'
+})
+
+# Separadores de autores: ';', ' and ', ', and ', ' & ' e ', & '
+_RE_SEPARADOR_AUTORES = re.compile(r';|,? (?:and|&) ')
+
+def _substituir_marcacao(match):
+    """
+    Substitui uma tag ou entidade HTML encontrada por _RE_MARCACAO.
+    
+    Args:
+        match (re.Match): Ocorrência de tag ou entidade
+    
+    Returns:
+        str: Texto de substituição
+    """
+    nome_tag = match.group(2)
+    if nome_tag is None:
+        return html.unescape(match.group(0))
+    
+    nome_tag = nome_tag.rpartition(':')[2].lower()
+    return ' ' if nome_tag in TAGS_BLOCO else ''
+
 def normalizar_texto(texto):
     """
-    Normaliza um texto, removendo caracteres especiais e espaços extras.
+    Normaliza um texto, removendo marcação HTML/JATS, decodificando
+    entidades HTML e eliminando espaços extras.
     
     Args:
         texto (str): Texto a ser normalizado
@@ -21,13 +58,51 @@ def normalizar_texto(texto):
     if not texto:
         return ""
     
+    # Marcação só é processada quando existe (caso raro fora do Crossref)
+    if '<' in texto or '&' in texto:
+        texto = _RE_MARCACAO.sub(_substituir_marcacao, texto)
+    
     # Remove espaços extras
-    texto = re.sub(r'\s+', ' ', texto).strip()
+    return ' '.join(texto.split())
+
+def normalizar_lote(textos):
+    """
+    Normaliza uma sequência de textos de uma só vez.
+    
+    Args:
+        textos (iterable): Textos a serem normalizados
+    
+    Returns:
+        list: Textos normalizados, na mesma ordem
+    """
+    normalizar = normalizar_texto
+    return [normalizar(texto) for texto in textos]
+
+def reconstruir_resumo(indice_invertido):
+    """
+    Reconstrói o texto de um resumo a partir de um índice invertido
+    (formato abstract_inverted_index do OpenAlex: palavra -> posições).
+    
+    Args:
+        indice_invertido (dict): Mapeamento de palavra para lista de posições
+    
+    Returns:
+        str: Texto do resumo
+    """
+    if not indice_invertido:
+        return ""
+    
+    try:
+        total = 1 + max(max(posicoes) for posicoes in indice_invertido.values() if posicoes)
+    except ValueError:
+        return ""
     
-    # Remove caracteres HTML
-    texto = re.sub(r'<[^>]+>', '', texto)
+    palavras = [''] * total
+    for palavra, posicoes in indice_invertido.items():
+        for posicao in posicoes:
+            palavras[posicao] = palavra
     
-    return texto
+    return normalizar_texto(' '.join(palavras))
 
 def normalizar_doi(doi):
     """
@@ -53,10 +128,38 @@ def normalizar_doi(doi):
     
     return doi.strip()
 
+# Formatos frequentes (YYYY, YYYY-MM, YYYY-MM-DD, YYYY/MM/DD e ISO com hora)
+# reconhecidos diretamente, sem passar pelo strptime
+_RE_DATA_ISO = re.compile(r'^(\d{4})(?:[-/](\d{1,2})(?:[-/](\d{1,2})(?:[T ].*)?)?)?$')
+
+# Ano isolado usado como último recurso
+_RE_ANO = re.compile(r'\b(?:19|20)\d{2}\b')
+
+# Formatos menos comuns, tentados apenas quando a expressão acima não casa
+FORMATOS_DATA_RAROS = [
+    "%d/%m/%Y",        # 15/01/2023
+    "%m/%d/%Y",        # 01/15/2023
+    "%d-%m-%Y",        # 15-01-2023
+    "%d.%m.%Y",        # 15.01.2023
+    "%B %d, %Y",       # January 15, 2023
+    "%d %B %Y",        # 15 January 2023
+]
+
+# Tamanho máximo do cache de datas já normalizadas
+TAMANHO_CACHE_DATAS = 4096
+
+# Datas inválidas já registradas no log (limitado para não crescer sem fim)
+_datas_invalidas_logadas = set()
+_MAX_DATAS_INVALIDAS_LOGADAS = 1024
+
 def normalizar_data(data_str):
     """
     Normaliza uma data para o formato YYYY-MM-DD.
     
+    Os formatos ISO mais comuns são reconhecidos por expressão regular
+    pré-compilada; os demais caem no strptime. Resultados são memorizados
+    em um cache limitado.
+    
     Args:
         data_str (str): Data em formato string
     
@@ -66,40 +169,68 @@ def normalizar_data(data_str):
     if not data_str:
         return ""
     
-    # Formatos comuns de data
-    formatos = [
-        "%Y-%m-%d",        # 2023-01-15
-        "%Y/%m/%d",        # 2023/01/15
-        "%d/%m/%Y",        # 15/01/2023
-        "%m/%d/%Y",        # 01/15/2023
-        "%d-%m-%Y",        # 15-01-2023
-        "%d.%m.%Y",        # 15.01.2023
-        "%B %d, %Y",       # January 15, 2023
-        "%d %B %Y",        # 15 January 2023
-        "%Y-%m",           # 2023-01
-        "%Y"               # 2023
-    ]
-    
-    # Tenta converter a data
-    for formato in formatos:
+    if not isinstance(data_str, str):
+        data_str = str(data_str)
+    
+    return _normalizar_data_cache(data_str.strip())
+
+@lru_cache(maxsize=TAMANHO_CACHE_DATAS)
+def _normalizar_data_cache(data_str):
+    """
+    Implementação memorizada de normalizar_data.
+    
+    Args:
+        data_str (str): Data em formato string, sem espaços nas bordas
+    
+    Returns:
+        str: Data normalizada no formato YYYY-MM-DD
+    """
+    # Caminho rápido: YYYY, YYYY-MM, YYYY-MM-DD e variantes com '/'
+    match = _RE_DATA_ISO.match(data_str)
+    if match:
+        ano, mes, dia = match.groups()
+        mes = int(mes) if mes else 1
+        dia = int(dia) if dia else 1
+        try:
+            return date(int(ano), mes, dia).isoformat()
+        except ValueError:
+            pass
+    
+    # Caminho lento: formatos textuais ou com dia antes do mês
+    for formato in FORMATOS_DATA_RAROS:
         try:
             data = datetime.strptime(data_str, formato)
             return data.strftime("%Y-%m-%d")
-        except:
+        except ValueError:
             continue
     
     # Se não conseguir converter, tenta extrair o ano
-    try:
-        match = re.search(r'\b(19|20)\d{2}\b', data_str)
-        if match:
-            ano = match.group(0)
-            return f"{ano}-01-01"
-    except:
-        pass
-    
-    logger.warning(f"Não foi possível normalizar a data: {data_str}")
+    match = _RE_ANO.search(data_str)
+    if match:
+        return f"{match.group(0)}-01-01"
+    
+    if data_str not in _datas_invalidas_logadas:
+        if len(_datas_invalidas_logadas) < _MAX_DATAS_INVALIDAS_LOGADAS:
+            _datas_invalidas_logadas.add(data_str)
+        logger.warning("Não foi possível normalizar a data: %s", data_str)
     return ""
 
+@lru_cache(maxsize=TAMANHO_CACHE_DATAS)
+def converter_data_iso(data_str):
+    """
+    Converte uma data já normalizada (YYYY-MM-DD) em datetime.
+    
+    Args:
+        data_str (str): Data no formato YYYY-MM-DD
+    
+    Returns:
+        datetime: Data convertida ou None se inválida
+    """
+    try:
+        return datetime.strptime(data_str, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
 def normalizar_autores(autores_str):
     """
     Normaliza uma string de autores.
@@ -114,33 +245,27 @@ def normalizar_autores(autores_str):
         return ""
     
     # Remove espaços extras
-    autores_str = re.sub(r'\s+', ' ', autores_str).strip()
-    
-    # Normaliza separadores
-    separadores = [', and ', ' and ', ', & ', ' & ', '; ']
-    for sep in separadores:
-        autores_str = autores_str.replace(sep, '; ')
+    autores_str = ' '.join(autores_str.split())
     
-    # Normaliza formato
+    # Normaliza separadores e formato
     autores = []
-    for autor in autores_str.split(';'):
+    for autor in _RE_SEPARADOR_AUTORES.split(autores_str):
         autor = autor.strip()
-        if autor:
-            # Verifica se está no formato "Sobrenome, Nome"
-            if ',' in autor:
-                partes = autor.split(',', 1)
-                sobrenome = partes[0].strip()
-                nome = partes[1].strip() if len(partes) > 1 else ""
-                autores.append(f"{sobrenome}, {nome}" if nome else sobrenome)
-            else:
-                # Tenta extrair sobrenome e nome
-                partes = autor.split()
-                if len(partes) > 1:
-                    sobrenome = partes[-1]
-                    nome = ' '.join(partes[:-1])
-                    autores.append(f"{sobrenome}, {nome}")
-                else:
-                    autores.append(autor)
+        if not autor:
+            continue
+        
+        # Verifica se está no formato "Sobrenome, Nome"
+        sobrenome, virgula, nome = autor.partition(',')
+        if virgula:
+            sobrenome = sobrenome.strip()
+            nome = nome.strip()
+            autores.append(f"{sobrenome}, {nome}" if nome else sobrenome)
+        elif autor == 'et al.':
+            autores.append(autor)
+        else:
+            # Tenta extrair sobrenome e nome
+            nome, espaco, sobrenome = autor.rpartition(' ')
+            autores.append(f"{sobrenome}, {nome}" if espaco else autor)
     
     return '; '.join(autores)
 
@@ -158,7 +283,7 @@ def normalizar_termos_busca(termos):
         return ""
     
     # Remove espaços extras
-    termos = re.sub(r'\s+', ' ', termos).strip()
+    termos = ' '.join(termos.split())
     
     # Preserva operadores booleanos
     operadores = ['AND', 'OR', 'NOT']
@@ -189,7 +314,7 @@ def normalizar_autor(autor):
         return ""
     
     # Remove espaços extras
-    autor = re.sub(r'\s+', ' ', autor).strip()
+    autor = ' '.join(autor.split())
     
     # Verifica se está no formato "Sobrenome, Nome"
     if ',' in autor:
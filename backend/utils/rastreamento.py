@@ -0,0 +1,282 @@
+"""
+Rastreamento das etapas de uma requisição (spans).
+Cada busca rastreada registra a duração das suas etapas (consultas às APIs,
+fases HTTP e de interpretação dos adaptadores, etapas do processamento e do
+cache), que podem ser devolvidas na resposta como uma cascata de tempos e
+gravadas em um arquivo JSONL no formato OTLP/JSON do OpenTelemetry.
+
+Fora de um rastro ativo, span() não registra nada e custa apenas a leitura
+de uma variável de contexto.
+"""
+import os
+import json
+import time
+import logging
+import threading
+import functools
+import contextvars
+
+logger = logging.getLogger(__name__)
+
+# Arquivo JSONL em que os rastros são gravados (None desativa a gravação)
+ARQUIVO_RASTROS = None
+
+# Nome do serviço informado nos rastros exportados
+NOME_SERVICO = 'buscador-revistas'
+
+_span_atual = contextvars.ContextVar('span_atual', default=None)
+_lock_arquivo = threading.Lock()
+
+class Rastro:
+    """
+    Conjunto dos spans de uma requisição.
+    """
+    
+    def __init__(self):
+        self.id = os.urandom(16).hex()
+        self.spans = []
+        
+        # Referências para converter o relógio monotônico em horário Unix
+        self.inicio_ns = time.time_ns()
+        self._inicio_perf = time.perf_counter_ns()
+    
+    def horario_ns(self, perf_ns):
+        """Converte uma leitura de time.perf_counter_ns em horário Unix (ns)."""
+        return self.inicio_ns + (perf_ns - self._inicio_perf)
+    
+    def cascata(self):
+        """
+        Monta a cascata de tempos do rastro.
+        
+        Returns:
+            dict: Identificador, duração total e etapas (cada uma seguida das
+                suas subetapas), com início relativo, duração e nível de aninhamento
+        """
+        # Percorre a árvore de spans em profundidade, filhos em ordem de início
+        spans = sorted(self.spans, key=lambda s: s.inicio)
+        filhos = {}
+        for span in spans:
+            filhos.setdefault(span.id_pai, []).append(span)
+        
+        etapas = []
+        pilha = [(span, 0) for span in reversed(filhos.get(None, []))]
+        while pilha:
+            span, nivel = pilha.pop()
+            etapa = {
+                'nome': span.nome,
+                'inicio_ms': round((span.inicio - self._inicio_perf) / 1e6, 3),
+                'duracao_ms': round(span.duracao_ns / 1e6, 3),
+                'nivel': nivel
+            }
+            if span.atributos:
+                etapa['atributos'] = span.atributos
+            if span.erro:
+                etapa['erro'] = span.erro
+            etapas.append(etapa)
+            pilha.extend((filho, nivel + 1) for filho in reversed(filhos.get(span.id, [])))
+        
+        total = max((s.fim for s in spans), default=self._inicio_perf) - self._inicio_perf
+        return {'id_rastro': self.id, 'total_ms': round(total / 1e6, 3), 'etapas': etapas}
+    
+    def como_otlp(self):
+        """
+        Converte o rastro para o formato OTLP/JSON (um ExportTraceServiceRequest).
+        
+        Returns:
+            dict: Rastro no formato do OpenTelemetry
+        """
+        spans = []
+        for span in self.spans:
+            item = {
+                'traceId': self.id,
+                'spanId': span.id,
+                'name': span.nome,
+                'kind': 2 if span.id_pai is None else 1,  # SERVER na raiz, INTERNAL nas demais
+                'startTimeUnixNano': str(self.horario_ns(span.inicio)),
+                'endTimeUnixNano': str(self.horario_ns(span.fim)),
+                'attributes': [_atributo_otlp(chave, valor) for chave, valor in span.atributos.items()],
+                'status': {'code': 2, 'message': span.erro} if span.erro else {'code': 1}
+            }
+            if span.id_pai is not None:
+                item['parentSpanId'] = span.id_pai
+            spans.append(item)
+        
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_atributo_otlp('service.name', NOME_SERVICO)]},
+                'scopeSpans': [{'scope': {'name': __name__}, 'spans': spans}]
+            }]
+        }
+
+class Span:
+    """
+    Etapa rastreada; usada como gerenciador de contexto.
+    """
+    
+    __slots__ = ('rastro', 'nome', 'id', 'id_pai', 'atributos', 'erro', 'inicio', 'fim', '_token')
+    
+    def __init__(self, rastro, nome, id_pai, atributos):
+        self.rastro = rastro
+        self.nome = nome
+        self.id = os.urandom(8).hex()
+        self.id_pai = id_pai
+        self.atributos = atributos
+        self.erro = None
+        self.inicio = None
+        self.fim = None
+        self._token = None
+    
+    @property
+    def duracao_ns(self):
+        return (self.fim or time.perf_counter_ns()) - self.inicio
+    
+    def definir(self, **atributos):
+        """Acrescenta atributos ao span (ex.: número de resultados)."""
+        self.atributos.update(atributos)
+    
+    def registrar_erro(self, erro):
+        """Marca o span com uma exceção tratada dentro dele."""
+        self.erro = f"{type(erro).__name__}: {erro}"
+    
+    def __enter__(self):
+        self._token = _span_atual.set(self)
+        self.inicio = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, tipo, erro, pilha):
+        self.fim = time.perf_counter_ns()
+        _span_atual.reset(self._token)
+        if erro is not None:
+            self.registrar_erro(erro)
+        self.rastro.spans.append(self)
+        return False
+
+class _SpanInativo:
+    """Span usado fora de um rastro ativo: não registra nada."""
+    
+    rastro = None
+    
+    def definir(self, **atributos):
+        pass
+    
+    def registrar_erro(self, erro):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, tipo, erro, pilha):
+        return False
+
+_SPAN_INATIVO = _SpanInativo()
+
+def configurar(arquivo=None):
+    """
+    Ajusta a gravação dos rastros.
+    
+    Args:
+        arquivo (str, opcional): Arquivo JSONL para os rastros (formato OTLP/JSON)
+    """
+    global ARQUIVO_RASTROS
+    
+    if arquivo is not None:
+        ARQUIVO_RASTROS = arquivo or None
+        if ARQUIVO_RASTROS:
+            os.makedirs(os.path.dirname(os.path.abspath(ARQUIVO_RASTROS)), exist_ok=True)
+
+def gravando():
+    """Retorna True se os rastros estão sendo gravados em arquivo."""
+    return ARQUIVO_RASTROS is not None
+
+def iniciar_rastro(nome, ativo=True, **atributos):
+    """
+    Cria o span raiz de um novo rastro.
+    
+    Args:
+        nome (str): Nome da operação (ex.: 'POST /api/buscar')
+        ativo (bool, opcional): False devolve um span inativo (sem custo)
+        **atributos: Atributos do span raiz
+    
+    Returns:
+        Span: Span raiz, a ser usado com with; o rastro fica em span.rastro
+    """
+    if not ativo:
+        return _SPAN_INATIVO
+    return Span(Rastro(), nome, None, atributos)
+
+def span(nome, **atributos):
+    """
+    Cria um span filho do span atual.
+    
+    Args:
+        nome (str): Nome da etapa (ex.: 'pubmed.efetch')
+        **atributos: Atributos da etapa
+    
+    Returns:
+        Span: Span a ser usado com with (inativo fora de um rastro)
+    """
+    pai = _span_atual.get()
+    if pai is None:
+        return _SPAN_INATIVO
+    return Span(pai.rastro, nome, pai.id, atributos)
+
+def rastreado(nome):
+    """
+    Decorador que registra cada chamada da função como um span.
+    
+    Args:
+        nome (str): Nome da etapa
+    
+    Returns:
+        callable: Decorador
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with span(nome):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+def propagar(funcao):
+    """
+    Liga uma função ao contexto atual, para que os spans criados por ela em
+    outra thread (ex.: em um ThreadPoolExecutor) fiquem no mesmo rastro e
+    seus logs levem o identificador da requisição (ver utils.registro).
+    
+    Args:
+        funcao (callable): Função a executar em outra thread
+    
+    Returns:
+        callable: Função que executa no contexto atual
+    """
+    contexto = contextvars.copy_context()
+    return lambda *args, **kwargs: contexto.run(funcao, *args, **kwargs)
+
+def exportar(rastro):
+    """
+    Grava um rastro no arquivo de rastros, se configurado.
+    
+    Args:
+        rastro (Rastro): Rastro finalizado
+    """
+    if rastro is None or ARQUIVO_RASTROS is None:
+        return
+    
+    linha = json.dumps(rastro.como_otlp(), ensure_ascii=False, separators=(',', ':'))
+    try:
+        with _lock_arquivo:
+            with open(ARQUIVO_RASTROS, 'a', encoding='utf-8') as f:
+                f.write(linha + '\n')
+    except OSError as e:
+        logger.error(f"Erro ao gravar rastro: {str(e)}")
+
+def _atributo_otlp(chave, valor):
+    """Converte um atributo para o formato OTLP/JSON."""
+    if isinstance(valor, bool):
+        return {'key': chave, 'value': {'boolValue': valor}}
+    if isinstance(valor, int):
+        return {'key': chave, 'value': {'intValue': str(valor)}}
+    if isinstance(valor, float):
+        return {'key': chave, 'value': {'doubleValue': valor}}
+    return {'key': chave, 'value': {'stringValue': str(valor)}}
@@ -0,0 +1,256 @@
+"""
+Configuração dos logs do Buscador de Revistas Científicas.
+As threads das requisições apenas colocam os registros em uma fila; uma
+thread própria os formata e grava no arquivo (com rotação) e no terminal.
+Com vários processos gravando o mesmo arquivo (workers do servidor), a
+rotação é coordenada por um arquivo de trava, e cada processo reabre o
+arquivo rotacionado por outro.
+Cada registro leva o identificador da requisição que o gerou, e as linhas
+INFO dos módulos de maior volume (adaptadores, busca, processamento e cache)
+podem ser amostradas por requisição.
+"""
+import os
+import re
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import contextvars
+import logging.handlers
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: rotação sem coordenação entre processos
+    fcntl = None
+
+# Arquivo de log
+ARQUIVO_LOG = 'buscador.log'
+
+# Tamanho máximo do arquivo antes da rotação e número de arquivos antigos mantidos
+MAX_BYTES = 10 * 1024 * 1024
+BACKUPS = 5
+
+# Formato dos registros: 'texto' ou 'json' (um objeto por linha)
+FORMATO = 'texto'
+FORMATO_TEXTO = '%(asctime)s - %(name)s - %(levelname)s - [%(id_requisicao)s] %(message)s'
+
+# Fração das requisições cujas linhas INFO dos módulos abaixo são registradas
+# (avisos e erros são sempre registrados)
+TAXA_AMOSTRAGEM = 1.0
+LOGGERS_AMOSTRADOS = ('adaptadores', 'core.motor_busca', 'core.processador', 'core.cache')
+
+# Identificadores de requisição aceitos do cliente (X-Request-ID); os 8
+# primeiros dígitos hexadecimais decidem a amostragem
+_RE_ID_REQUISICAO = re.compile(r'^[0-9a-fA-F]{8}[0-9a-zA-Z-]{0,56}$')
+
+_id_requisicao = contextvars.ContextVar('id_requisicao', default=None)
+_manipuladores = []
+_ouvinte = None
+_manipulador_fila = None
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha."""
+    
+    def format(self, record):
+        dados = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'id_requisicao': getattr(record, 'id_requisicao', None),
+            'processo': record.process,
+            'thread': record.threadName
+        }
+        if record.exc_info:
+            dados['excecao'] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+class FiltroRequisicao(logging.Filter):
+    """
+    Acrescenta o identificador da requisição aos registros e descarta as
+    linhas INFO amostradas. Executado na thread que gerou o registro.
+    """
+    
+    def filter(self, record):
+        id_requisicao = _id_requisicao.get()
+        record.id_requisicao = id_requisicao or '-'
+        
+        if TAXA_AMOSTRAGEM >= 1 or record.levelno > logging.INFO:
+            return True
+        if not record.name.startswith(LOGGERS_AMOSTRADOS):
+            return True
+        
+        # A decisão é a mesma para todas as linhas de uma requisição
+        if id_requisicao:
+            return int(id_requisicao[:8], 16) / 0x100000000 < TAXA_AMOSTRAGEM
+        return random.random() < TAXA_AMOSTRAGEM
+
+class ManipuladorFila(logging.handlers.QueueHandler):
+    """
+    Coloca os registros na fila sem formatá-los: a mensagem só é montada na
+    thread de gravação (a fila é local ao processo, não precisa serializar).
+    """
+    
+    def prepare(self, record):
+        return record
+
+class ManipuladorArquivoRotativo(logging.handlers.RotatingFileHandler):
+    """
+    Rotação do arquivo de log segura entre processos: cada gravação (e a
+    rotação que ela dispare) ocorre com um arquivo de trava travado
+    (fcntl.flock), e o arquivo é reaberto quando outro processo já o
+    rotacionou (como no WatchedFileHandler).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trava = None
+        self._pid_trava = None
+    
+    def emit(self, record):
+        # A trava é aberta em cada processo: após um fork, o descritor
+        # herdado seria compartilhado com o processo original
+        if self._pid_trava != os.getpid():
+            self._trava = open(f"{self.baseFilename}.lock", 'a', encoding='utf-8')
+            self._pid_trava = os.getpid()
+        
+        fcntl.flock(self._trava, fcntl.LOCK_EX)
+        try:
+            self._reabrir_se_rotacionado()
+            super().emit(record)
+        finally:
+            fcntl.flock(self._trava, fcntl.LOCK_UN)
+    
+    def _reabrir_se_rotacionado(self):
+        """Reabre o arquivo se ele foi rotacionado (ou removido) por outro processo."""
+        if self.stream is None:
+            return
+        try:
+            atual = os.stat(self.baseFilename)
+            aberto = os.fstat(self.stream.fileno())
+            if (atual.st_dev, atual.st_ino) == (aberto.st_dev, aberto.st_ino):
+                return
+        except OSError:
+            pass
+        self.stream.close()
+        self.stream = self._open()
+    
+    def close(self):
+        super().close()
+        if self._trava is not None and self._pid_trava == os.getpid():
+            self._trava.close()
+        self._trava = None
+        self._pid_trava = None
+
+def configurar(arquivo=None, formato=None, max_bytes=None, backups=None, amostragem=None, nivel=logging.INFO):
+    """
+    Configura os logs da aplicação (pode ser chamada novamente para ajustes).
+    
+    Args:
+        arquivo (str, opcional): Arquivo de log
+        formato (str, opcional): 'texto' ou 'json'
+        max_bytes (int, opcional): Tamanho do arquivo que dispara a rotação
+        backups (int, opcional): Arquivos antigos mantidos na rotação
+        amostragem (float, opcional): Fração das requisições com linhas INFO
+            dos módulos de maior volume registradas (1 registra todas)
+        nivel (int, opcional): Nível mínimo dos registros
+    """
+    global ARQUIVO_LOG, FORMATO, MAX_BYTES, BACKUPS, TAXA_AMOSTRAGEM, _manipulador_fila
+    
+    if arquivo is not None:
+        ARQUIVO_LOG = arquivo
+    if formato is not None:
+        FORMATO = formato
+    if max_bytes is not None:
+        MAX_BYTES = int(max_bytes)
+    if backups is not None:
+        BACKUPS = int(backups)
+    if amostragem is not None:
+        TAXA_AMOSTRAGEM = min(1.0, max(0.0, float(amostragem)))
+    
+    encerrar()
+    for manipulador in _manipuladores:
+        manipulador.close()
+    
+    formatador = FormatadorJSON() if FORMATO == 'json' else logging.Formatter(FORMATO_TEXTO)
+    classe_arquivo = ManipuladorArquivoRotativo if fcntl is not None else logging.handlers.RotatingFileHandler
+    _manipuladores[:] = [
+        classe_arquivo(ARQUIVO_LOG, maxBytes=MAX_BYTES, backupCount=BACKUPS, encoding='utf-8'),
+        logging.StreamHandler(sys.stderr)
+    ]
+    for manipulador in _manipuladores:
+        manipulador.setFormatter(formatador)
+    
+    raiz = logging.getLogger()
+    raiz.setLevel(nivel)
+    for manipulador in list(raiz.handlers):
+        raiz.removeHandler(manipulador)
+    
+    _manipulador_fila = ManipuladorFila(queue.SimpleQueue())
+    _manipulador_fila.addFilter(FiltroRequisicao())
+    raiz.addHandler(_manipulador_fila)
+    iniciar_gravacao()
+
+def iniciar_gravacao():
+    """Inicia a thread que grava os registros da fila."""
+    global _ouvinte
+    
+    _ouvinte = logging.handlers.QueueListener(
+        _manipulador_fila.queue, *_manipuladores, respect_handler_level=True
+    )
+    _ouvinte.start()
+
+def encerrar():
+    """Grava os registros pendentes e encerra a thread de gravação."""
+    global _ouvinte
+    
+    if _ouvinte is not None:
+        _ouvinte.stop()
+        _ouvinte = None
+
+def _reiniciar_no_filho():
+    """
+    Recria a fila e a thread de gravação em um processo criado por fork
+    (workers do Gunicorn, pools de processos): a thread do processo
+    original não existe no filho.
+    """
+    global _ouvinte
+    
+    if _manipulador_fila is None:
+        return
+    _manipulador_fila.queue = queue.SimpleQueue()
+    _ouvinte = None
+    iniciar_gravacao()
+
+def definir_id_requisicao(id_requisicao=None):
+    """
+    Define o identificador da requisição atual (herdado pelas threads que
+    executam no mesmo contexto, ver utils.rastreamento.propagar).
+    
+    Args:
+        id_requisicao (str, opcional): Identificador recebido do cliente; se
+            ausente ou inválido, um novo é gerado
+    
+    Returns:
+        str: Identificador em uso
+    """
+    if not id_requisicao or not _RE_ID_REQUISICAO.match(id_requisicao):
+        id_requisicao = os.urandom(8).hex()
+    _id_requisicao.set(id_requisicao)
+    return id_requisicao
+
+def limpar_id_requisicao():
+    """Remove o identificador ao fim da requisição (threads são reaproveitadas)."""
+    _id_requisicao.set(None)
+
+def obter_id_requisicao():
+    """Retorna o identificador da requisição atual (ou None)."""
+    return _id_requisicao.get()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_no_filho)
+atexit.register(encerrar)
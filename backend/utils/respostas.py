@@ -0,0 +1,135 @@
+"""
+Codificação e compressão das respostas JSON da API.
+Usa o orjson quando instalado (com a biblioteca padrão como alternativa) e
+comprime as respostas grandes com brotli ou gzip, conforme o que o cliente
+aceita. Corpos já codificados podem ser guardados e reenviados sem nova
+codificação, junto com suas versões comprimidas.
+"""
+import json
+import gzip
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    logger.info("orjson não instalado: usando o módulo json da biblioteca padrão")
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tamanho mínimo (em bytes) do corpo para comprimir a resposta
+LIMIAR_COMPRESSAO = 1024
+
+# Nível de compressão gzip e qualidade brotli (equilíbrio entre CPU e tamanho)
+NIVEL_GZIP = 6
+QUALIDADE_BROTLI = 5
+
+def codificar(dados):
+    """
+    Codifica um objeto em JSON compacto (UTF-8).
+    
+    Args:
+        dados: Objeto serializável em JSON
+    
+    Returns:
+        bytes: JSON codificado
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(dados, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Tipos que o orjson não serializa (ex.: inteiros acima de 64 bits)
+            pass
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def decodificar(conteudo):
+    """
+    Decodifica um documento JSON.
+    
+    Args:
+        conteudo (bytes ou str): JSON codificado
+    
+    Returns:
+        Objeto decodificado
+    
+    Raises:
+        ValueError: Se o conteúdo não for JSON válido
+    """
+    if orjson is not None:
+        return orjson.loads(conteudo)
+    return json.loads(conteudo)
+
+def escolher_codificacao(aceitas, tamanho):
+    """
+    Escolhe a compressão da resposta.
+    
+    Args:
+        aceitas: Cabeçalho Accept-Encoding interpretado (request.accept_encodings)
+        tamanho (int): Tamanho do corpo sem compressão
+    
+    Returns:
+        str: 'br', 'gzip' ou None para enviar sem compressão
+    """
+    if tamanho < LIMIAR_COMPRESSAO:
+        return None
+    if brotli is not None and aceitas['br'] > 0:
+        return 'br'
+    if aceitas['gzip'] > 0:
+        return 'gzip'
+    return None
+
+def comprimir(corpo, codificacao):
+    """
+    Comprime um corpo de resposta.
+    
+    Args:
+        corpo (bytes): Corpo sem compressão
+        codificacao (str): 'br' ou 'gzip'
+    
+    Returns:
+        bytes: Corpo comprimido
+    """
+    if codificacao == 'br':
+        return brotli.compress(corpo, quality=QUALIDADE_BROTLI)
+    return gzip.compress(corpo, compresslevel=NIVEL_GZIP, mtime=0)
+
+class CorpoJSON:
+    """
+    Corpo de resposta JSON já codificado, com as versões comprimidas
+    geradas sob demanda e guardadas para os próximos envios.
+    """
+    
+    def __init__(self, dados):
+        """
+        Codifica o objeto da resposta.
+        
+        Args:
+            dados: Objeto serializável em JSON
+        """
+        self.corpo = codificar(dados)
+        self._comprimidos = {}
+        self._lock = threading.Lock()
+    
+    def obter(self, codificacao=None):
+        """
+        Retorna o corpo na codificação pedida.
+        
+        Args:
+            codificacao (str, opcional): 'br', 'gzip' ou None (sem compressão)
+        
+        Returns:
+            bytes: Corpo da resposta
+        """
+        if codificacao is None:
+            return self.corpo
+        
+        with self._lock:
+            if codificacao not in self._comprimidos:
+                self._comprimidos[codificacao] = comprimir(self.corpo, codificacao)
+            return self._comprimidos[codificacao]
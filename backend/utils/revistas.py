@@ -0,0 +1,140 @@
+"""
+Catálogo de revistas (dados/revistas.json).
+O arquivo é lido uma única vez e recarregado apenas quando sua data de
+modificação muda. Junto com a lista, o catálogo guarda a resposta da API já
+codificada (JSON e gzip) e sua ETag, e oferece aos adaptadores o
+mapeamento dos identificadores internos das revistas para ISSNs.
+"""
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Arquivo do catálogo
+ARQUIVO_REVISTAS = os.path.abspath('../dados/revistas.json')
+
+# Intervalo mínimo (em segundos) entre verificações da data de modificação
+INTERVALO_VERIFICACAO = 2
+
+# Nível de compressão da resposta pré-comprimida
+NIVEL_GZIP = 9
+
+_catalogo = None
+_ultima_verificacao = 0
+_lock = threading.Lock()
+
+class Catalogo:
+    """
+    Versão carregada do catálogo de revistas.
+    """
+    
+    def __init__(self, revistas, assinatura):
+        """
+        Inicializa o catálogo e pré-codifica a resposta da API.
+        
+        Args:
+            revistas (list): Revistas lidas do arquivo
+            assinatura (tuple): Data de modificação e tamanho do arquivo lido
+        """
+        self.revistas = revistas
+        self.assinatura = assinatura
+        self.por_id = {revista.get('id'): revista for revista in revistas}
+        
+        # Resposta da API: JSON compacto, versão gzip e ETag do conteúdo
+        self.corpo = json.dumps(revistas, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.corpo_gzip = gzip.compress(self.corpo, compresslevel=NIVEL_GZIP, mtime=0)
+        self.etag = hashlib.sha256(self.corpo).hexdigest()[:32]
+
+def configurar(arquivo=None):
+    """
+    Ajusta o arquivo do catálogo (recarregado na próxima consulta).
+    
+    Args:
+        arquivo (str, opcional): Caminho do arquivo revistas.json
+    """
+    global ARQUIVO_REVISTAS, _catalogo
+    
+    if arquivo is not None:
+        ARQUIVO_REVISTAS = arquivo
+        with _lock:
+            _catalogo = None
+
+def obter_catalogo():
+    """
+    Retorna o catálogo atual, recarregando o arquivo se ele mudou.
+    
+    Se o arquivo estiver inválido ou inacessível, a última versão carregada
+    continua em uso (ou um catálogo vazio, se nenhuma foi carregada).
+    
+    Returns:
+        Catalogo: Catálogo de revistas
+    """
+    global _catalogo, _ultima_verificacao
+    
+    agora = time.monotonic()
+    catalogo = _catalogo
+    if catalogo is not None and agora - _ultima_verificacao < INTERVALO_VERIFICACAO:
+        return catalogo
+    
+    with _lock:
+        _ultima_verificacao = agora
+        try:
+            info = os.stat(ARQUIVO_REVISTAS)
+            assinatura = (info.st_mtime_ns, info.st_size)
+            if _catalogo is not None and _catalogo.assinatura == assinatura:
+                return _catalogo
+            
+            with open(ARQUIVO_REVISTAS, 'r', encoding='utf-8') as f:
+                _catalogo = Catalogo(json.load(f), assinatura)
+            logger.info(f"Catálogo de revistas carregado: {len(_catalogo.revistas)} revistas")
+        
+        except (OSError, ValueError) as e:
+            logger.error(f"Erro ao carregar revistas: {str(e)}")
+            if _catalogo is None:
+                _catalogo = Catalogo([], None)
+        
+        return _catalogo
+
+def listar():
+    """
+    Retorna a lista de revistas do catálogo.
+    
+    Returns:
+        list: Revistas (não devem ser modificadas)
+    """
+    return obter_catalogo().revistas
+
+def obter(id_revista):
+    """
+    Busca uma revista pelo identificador interno.
+    
+    Args:
+        id_revista (str): Identificador da revista
+    
+    Returns:
+        dict: Revista ou None se não existir
+    """
+    return obter_catalogo().por_id.get(id_revista)
+
+def issns(ids_revistas):
+    """
+    Mapeia identificadores internos de revistas para ISSNs, usados nos
+    filtros das APIs. Identificadores desconhecidos ou sem ISSN são ignorados.
+    
+    Args:
+        ids_revistas (list): Identificadores internos
+    
+    Returns:
+        list: ISSNs das revistas, na ordem recebida
+    """
+    por_id = obter_catalogo().por_id
+    return [
+        por_id[id_revista]['issn']
+        for id_revista in ids_revistas or []
+        if por_id.get(id_revista, {}).get('issn')
+    ]
@@ -7,6 +7,16 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Critérios de ordenação aceitos em /api/buscar
+ORDENACOES = ('data', 'relevancia')
+
+# Número máximo de consultas em /api/buscar/lote
+MAX_CONSULTAS_LOTE = 50
+
+# Campos de /api/buscar/lote que valem para todas as consultas (cada
+# consulta pode sobrescrevê-los)
+CAMPOS_COMUNS_LOTE = ('autor', 'periodo_inicio', 'periodo_fim', 'revistas', 'limite', 'ordenar_por')
+
 def validar_parametros_busca(parametros):
     """
     Valida os parâmetros de busca.
@@ -44,6 +54,22 @@ def validar_parametros_busca(parametros):
             logger.warning(f"Limite de resultados não é um número: {parametros['limite']}")
             return False
     
+    # Valida tamanho da página de resultados
+    if parametros.get('tamanho_pagina') is not None:
+        try:
+            tamanho_pagina = int(parametros['tamanho_pagina'])
+            if tamanho_pagina <= 0:
+                logger.warning(f"Tamanho de página inválido: {tamanho_pagina}")
+                return False
+        except:
+            logger.warning(f"Tamanho de página não é um número: {parametros['tamanho_pagina']}")
+            return False
+
+    # Valida critério de ordenação
+    if parametros.get('ordenar_por') and parametros['ordenar_por'] not in ORDENACOES:
+        logger.warning(f"Critério de ordenação inválido: {parametros['ordenar_por']}")
+        return False
+    
     # Valida revistas
     if 'revistas' in parametros and parametros['revistas']:
         if not isinstance(parametros['revistas'], list):
@@ -52,6 +78,57 @@ def validar_parametros_busca(parametros):
     
     return True
 
+def expandir_consultas_lote(parametros):
+    """
+    Monta os parâmetros de cada consulta de uma busca em lote, combinando os
+    campos comuns com os de cada consulta.
+    
+    Args:
+        parametros (dict): Corpo de /api/buscar/lote; 'consultas' traz os
+            termos de cada consulta ou dicionários com os campos de /api/buscar
+    
+    Returns:
+        list: Parâmetros de cada consulta, no formato de /api/buscar
+    """
+    comuns = {campo: parametros[campo] for campo in CAMPOS_COMUNS_LOTE if campo in parametros}
+    consultas = []
+    for consulta in parametros.get('consultas') or []:
+        if isinstance(consulta, dict):
+            consultas.append({**comuns, **consulta})
+        else:
+            consultas.append({**comuns, 'palavras': consulta})
+    return consultas
+
+def validar_parametros_lote(parametros):
+    """
+    Valida os parâmetros de uma busca em lote.
+    
+    Args:
+        parametros (dict): Corpo de /api/buscar/lote
+    
+    Returns:
+        bool: True se os parâmetros são válidos, False caso contrário
+    """
+    if not isinstance(parametros, dict):
+        logger.warning("Parâmetros da busca em lote inválidos")
+        return False
+    
+    consultas = parametros.get('consultas')
+    if not isinstance(consultas, list) or not consultas:
+        logger.warning("Busca em lote sem lista de consultas")
+        return False
+    
+    if len(consultas) > MAX_CONSULTAS_LOTE:
+        logger.warning(f"Busca em lote com consultas demais: {len(consultas)}")
+        return False
+    
+    for consulta in consultas:
+        if not isinstance(consulta, (str, dict)):
+            logger.warning(f"Consulta inválida na busca em lote: {consulta!r}")
+            return False
+    
+    return all(validar_parametros_busca(consulta) for consulta in expandir_consultas_lote(parametros))
+
 def validar_data(data_str):
     """
     Valida se uma string representa uma data válida no formato YYYY-MM-DD.
@@ -8,13 +8,17 @@ const CONFIG = {
   apiUrl: '/api',
   maxResultados: 120,
   tempoCache: 3600, // segundos
-  formatosExportacao: ['html', 'pdf', 'excel', 'txt']
+  formatosExportacao: ['html', 'pdf', 'excel', 'txt', 'csv', 'ris', 'bibtex'],
+  formatosStreaming: ['csv', 'jsonl', 'ris', 'bibtex'] // Gerados em streaming pelo backend
 };
 
 // Estado global da aplicação
 const ESTADO = {
   revistas: [],
   resultados: [],
+  idResultados: null, // Conjunto de resultados guardado no backend
+  cursor: null, // Cursor da próxima página do conjunto
+  totalResultados: 0,
   ultimaBusca: null,
   carregando: false,
   temaAtual: 'escuro'
@@ -287,6 +291,9 @@ function configurarEventos() {
   document.getElementById('btn-exportar-pdf').addEventListener('click', () => exportarResultados('pdf'));
   document.getElementById('btn-exportar-excel').addEventListener('click', () => exportarResultados('excel'));
   document.getElementById('btn-exportar-txt').addEventListener('click', () => exportarResultados('txt'));
+  document.getElementById('btn-exportar-csv').addEventListener('click', () => exportarResultados('csv'));
+  document.getElementById('btn-exportar-ris').addEventListener('click', () => exportarResultados('ris'));
+  document.getElementById('btn-exportar-bibtex').addEventListener('click', () => exportarResultados('bibtex'));
 }
 
 /**
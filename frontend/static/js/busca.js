@@ -14,6 +14,7 @@ function realizarBusca() {
   const periodoFim = document.getElementById('periodo_fim').value;
   const revistasSelect = document.getElementById('revista');
   const revistas = getValoresSelect(revistasSelect);
+  const ordenarPor = document.getElementById('ordenar_por').value || 'data';
   
   // Obtém limite de resultados
   let limiteResultados = 30;
@@ -37,7 +38,8 @@ function realizarBusca() {
     periodo_inicio: periodoInicio,
     periodo_fim: periodoFim,
     revistas: revistas[0] === 'todas' ? [] : revistas,
-    limite: limiteResultados
+    limite: limiteResultados,
+    ordenar_por: ordenarPor
   };
   
   // Armazena última busca no estado
@@ -55,6 +57,9 @@ function realizarBusca() {
       .then(resultados => {
         // Armazena resultados no estado global
         ESTADO.resultados = resultados;
+        ESTADO.idResultados = null;
+        ESTADO.cursor = null;
+        ESTADO.totalResultados = resultados.length;
         
         // Exibe resultados
         exibirResultados(resultados);
@@ -3,8 +3,13 @@
  * Gerencia a exportação dos resultados em diferentes formatos
  */
 
+// Intervalo entre consultas ao progresso de uma exportação (ms)
+const INTERVALO_CONSULTA_EXPORTACAO = 1000;
+
 /**
  * Exporta os resultados no formato especificado
+ * A exportação é submetida ao backend, que gera o arquivo em segundo plano;
+ * o progresso é consultado periodicamente até o arquivo ficar pronto.
  */
 function exportarResultados(formato) {
   // Verifica se há resultados para exportar
@@ -13,39 +18,136 @@ function exportarResultados(formato) {
     return;
   }
   
+  // Formatos em streaming são baixados diretamente do conjunto guardado no backend
+  if (ESTADO.idResultados && CONFIG.formatosStreaming.includes(formato)) {
+    baixarArquivo(`${CONFIG.apiUrl}/resultados/${encodeURIComponent(ESTADO.idResultados)}/exportar/${formato}`);
+    return;
+  }
+  
   // Exibe indicador de carregamento
-  document.getElementById('loading').style.display = 'flex';
+  exibirProgressoExportacao(formato, 0);
   
-  // Simula tempo de processamento
-  setTimeout(() => {
-    try {
-      switch (formato) {
-        case 'html':
-          exportarHTML();
-          break;
-        case 'pdf':
-          exportarPDF();
-          break;
-        case 'excel':
-          exportarExcel();
-          break;
-        case 'txt':
-          exportarTXT();
-          break;
-        default:
-          throw new Error('Formato de exportação não suportado');
+  // Se os resultados estão guardados no backend, envia apenas o identificador
+  const dadosExportacao = {
+    formato,
+    busca: ESTADO.ultimaBusca
+  };
+  if (ESTADO.idResultados) {
+    dadosExportacao.id_resultados = ESTADO.idResultados;
+  } else {
+    dadosExportacao.resultados = ESTADO.resultados;
+  }
+  
+  // Submete a exportação ao backend
+  fetch(`${CONFIG.apiUrl}/exportar`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json'
+    },
+    body: JSON.stringify(dadosExportacao)
+  })
+  .then(response => response.json().then(data => {
+    if (!response.ok || data.status === 'erro') {
+      throw new Error(data.msg || `Erro na requisição: ${response.status} ${response.statusText}`);
+    }
+    return acompanharExportacao(data.tarefa, formato);
+  }))
+  .then(tarefa => {
+    baixarArquivo(tarefa.url, tarefa.arquivo);
+    exibirMensagem(`Exportação em ${formato.toUpperCase()} realizada com sucesso!`);
+  })
+  .catch(erro => {
+    console.error('Erro na exportação:', erro);
+    exibirMensagem(`Erro ao exportar em ${formato.toUpperCase()}: ${erro.message}. Usando exportação local.`, 'erro');
+    exportarLocalmente(formato);
+  })
+  .finally(() => {
+    // Esconde indicador de carregamento
+    document.getElementById('loading').style.display = 'none';
+    document.querySelector('#loading .loading-text').textContent = 'Buscando...';
+  });
+}
+
+/**
+ * Consulta o progresso de uma exportação até que ela termine
+ * Retorna uma Promise resolvida com a tarefa concluída
+ */
+function acompanharExportacao(tarefa, formato) {
+  return new Promise((resolve, reject) => {
+    const consultar = (atual) => {
+      exibirProgressoExportacao(formato, atual.progresso);
+      
+      if (atual.estado === 'concluida') {
+        resolve(atual);
+        return;
+      }
+      if (atual.estado === 'erro') {
+        reject(new Error(atual.erro || 'Falha ao gerar o arquivo'));
+        return;
       }
       
-      // Exibe mensagem de sucesso
-      exibirMensagem(`Exportação em ${formato.toUpperCase()} realizada com sucesso!`);
-    } catch (erro) {
-      console.error('Erro na exportação:', erro);
-      exibirMensagem(`Erro ao exportar em ${formato.toUpperCase()}: ${erro.message}`, 'erro');
-    } finally {
-      // Esconde indicador de carregamento
-      document.getElementById('loading').style.display = 'none';
+      setTimeout(() => {
+        fetch(`${CONFIG.apiUrl}/exportar/${atual.id}`)
+          .then(response => response.json().then(data => {
+            if (!response.ok || data.status === 'erro') {
+              throw new Error(data.msg || `Erro na requisição: ${response.status} ${response.statusText}`);
+            }
+            consultar(data.tarefa);
+          }))
+          .catch(reject);
+      }, INTERVALO_CONSULTA_EXPORTACAO);
+    };
+    
+    consultar(tarefa);
+  });
+}
+
+/**
+ * Atualiza o indicador de carregamento com o progresso da exportação
+ */
+function exibirProgressoExportacao(formato, progresso) {
+  document.getElementById('loading').style.display = 'flex';
+  document.querySelector('#loading .loading-text').textContent =
+    `Exportando ${formato.toUpperCase()}... ${progresso || 0}%`;
+}
+
+/**
+ * Inicia o download de um arquivo gerado pelo backend
+ */
+function baixarArquivo(url, nomeArquivo) {
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = nomeArquivo || '';
+  document.body.appendChild(link);
+  link.click();
+  document.body.removeChild(link);
+}
+
+/**
+ * Exporta os resultados localmente, sem o backend (fallback)
+ */
+function exportarLocalmente(formato) {
+  try {
+    switch (formato) {
+      case 'html':
+        exportarHTML();
+        break;
+      case 'pdf':
+        exportarPDF();
+        break;
+      case 'excel':
+        exportarExcel();
+        break;
+      case 'txt':
+        exportarTXT();
+        break;
+      default:
+        throw new Error('Formato de exportação não suportado');
     }
-  }, 1000);
+  } catch (erro) {
+    console.error('Erro na exportação local:', erro);
+    exibirMensagem(`Erro ao exportar em ${formato.toUpperCase()}: ${erro.message}`, 'erro');
+  }
 }
 
 /**
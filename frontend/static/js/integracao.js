@@ -12,6 +12,7 @@ function realizarBuscaReal() {
   const periodoFim = document.getElementById('periodo_fim').value;
   const revistasSelect = document.getElementById('revista');
   const revistas = getValoresSelect(revistasSelect);
+  const ordenarPor = document.getElementById('ordenar_por').value || 'data';
   
   // Obtém limite de resultados
   let limiteResultados = 30;
@@ -35,7 +36,8 @@ function realizarBuscaReal() {
     periodo_inicio: periodoInicio,
     periodo_fim: periodoFim,
     revistas: revistas[0] === 'todas' ? [] : revistas,
-    limite: limiteResultados
+    limite: limiteResultados,
+    ordenar_por: ordenarPor
   };
   
   // Armazena última busca no estado
@@ -63,11 +65,14 @@ function realizarBuscaReal() {
   .then(data => {
     // Verifica se a resposta contém resultados
     if (data.status === 'ok' && data.resultados) {
-      // Armazena resultados no estado global
+      // Armazena a primeira página e o conjunto guardado no backend
       ESTADO.resultados = data.resultados;
+      ESTADO.idResultados = data.id;
+      ESTADO.cursor = data.cursor;
+      ESTADO.totalResultados = data.total;
       
       // Exibe resultados
-      exibirResultados(data.resultados);
+      exibirResultados(ESTADO.resultados);
       
       // Exibe mensagem de sucesso se houver
       if (data.msg) {
@@ -77,6 +82,8 @@ function realizarBuscaReal() {
       // Exibe mensagem de erro ou aviso
       exibirMensagem(data.msg || 'Nenhum resultado encontrado.', data.status === 'erro' ? 'erro' : 'sucesso');
       ESTADO.resultados = [];
+      ESTADO.idResultados = null;
+      ESTADO.cursor = null;
       document.getElementById('tabela-resultados').innerHTML = '<div class="sem-resultados">Nenhum resultado encontrado. Tente modificar os termos de busca ou ampliar o período.</div>';
     }
   })
@@ -88,6 +95,8 @@ function realizarBuscaReal() {
     buscarDadosSimulados(parametrosBusca)
       .then(resultados => {
         ESTADO.resultados = resultados;
+        ESTADO.idResultados = null;
+        ESTADO.cursor = null;
         exibirResultados(resultados);
       });
   })
@@ -98,6 +107,30 @@ function realizarBuscaReal() {
   });
 }
 
+/**
+ * Carrega a próxima página do conjunto de resultados guardado no backend
+ */
+function carregarMaisResultados() {
+  if (!ESTADO.idResultados || !ESTADO.cursor) return;
+  
+  fetch(`${CONFIG.apiUrl}/resultados/${ESTADO.idResultados}?cursor=${encodeURIComponent(ESTADO.cursor)}`)
+  .then(response => response.json().then(data => {
+    if (!response.ok || data.status === 'erro') {
+      throw new Error(data.msg || `Erro na requisição: ${response.status} ${response.statusText}`);
+    }
+    
+    // Acrescenta a página aos resultados já exibidos
+    ESTADO.resultados = ESTADO.resultados.concat(data.resultados);
+    ESTADO.cursor = data.cursor;
+    ESTADO.totalResultados = data.total;
+    exibirResultados(ESTADO.resultados);
+  }))
+  .catch(erro => {
+    console.error('Erro ao carregar resultados:', erro);
+    exibirMensagem(`Erro ao carregar mais resultados: ${erro.message}`, 'erro');
+  });
+}
+
 /**
  * Exporta resultados usando o backend
  */
@@ -114,10 +147,16 @@ function exportarResultadosReal(formato) {
   // Prepara dados para exportação
   const dadosExportacao = {
     formato,
-    busca: ESTADO.ultimaBusca,
-    resultados: ESTADO.resultados
+    busca: ESTADO.ultimaBusca
   };
   
+  // Se os resultados estão guardados no backend, envia apenas o identificador
+  if (ESTADO.idResultados) {
+    dadosExportacao.id_resultados = ESTADO.idResultados;
+  } else {
+    dadosExportacao.resultados = ESTADO.resultados;
+  }
+  
   // Faz requisição ao backend
   fetch(`${CONFIG.apiUrl}/exportar`, {
     method: 'POST',
@@ -17,8 +17,10 @@ function exibirResultados(resultados) {
     return;
   }
   
-  // Atualiza contador de resultados
-  contadorResultados.textContent = resultados.length;
+  // Atualiza contador de resultados (total do conjunto, se paginado)
+  contadorResultados.textContent = resultados === ESTADO.resultados && ESTADO.totalResultados > resultados.length
+    ? ESTADO.totalResultados
+    : resultados.length;
   contadorResultados.style.display = 'inline-block';
   
   // Cria tabela
@@ -103,6 +105,16 @@ function exibirResultados(resultados) {
   tabela.appendChild(tbody);
   tabelaContainer.innerHTML = '';
   tabelaContainer.appendChild(tabela);
+  
+  // Botão para buscar a próxima página do conjunto guardado no backend
+  if (ESTADO.cursor && resultados === ESTADO.resultados && typeof carregarMaisResultados === 'function') {
+    const botaoMais = document.createElement('button');
+    botaoMais.type = 'button';
+    botaoMais.className = 'btn-secundario btn-carregar-mais';
+    botaoMais.textContent = `Carregar mais resultados (${resultados.length} de ${ESTADO.totalResultados})`;
+    botaoMais.addEventListener('click', carregarMaisResultados);
+    tabelaContainer.appendChild(botaoMais);
+  }
 }
 
 /**